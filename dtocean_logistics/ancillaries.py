@@ -22,11 +22,18 @@ Created on Wed Jan 27 10:10:16 2016
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+import os
+import hashlib
+import tempfile
+import datetime as dt
 from bisect import bisect_right
+from collections import OrderedDict
 
-import utm
 import numpy as np
-from geopy.distance import great_circle
+import pandas as pd
+
+# Mean earth radius in km, as used by geopy.distance.great_circle
+EARTH_RADIUS = 6371.009
 
 
 def comp(list1, list2):
@@ -51,7 +58,8 @@ def differences(a):
 def distance(UTM_ini, UTM_fin):
     """
     Returns the calculated distance (in kms) between two points defined in the 
-    UTM coordinate system.
+    UTM coordinate system. Results are memoised by the module level
+    DistanceCache, so repeated calls for the same pair of points are cheap.
     
     Parameters
     ----------
@@ -66,33 +74,402 @@ def distance(UTM_ini, UTM_fin):
     direct geographical distance in kms between two UTM coordinates
     """
     
-    UTM_ini_x = UTM_ini[0]
-    UTM_ini_y = UTM_ini[1]
-    UTM_ini_zone = UTM_ini[2]
+    return _distance_cache(UTM_ini, UTM_fin)
+
+
+def utm_to_latlon(x, y, zones):
+    """
+    Converts arrays of UTM coordinates into arrays of latitudes and longitudes
+    (in decimal degrees). The points are converted in bulk for each unique
+    zone.
+    
+    Parameters
+    ----------
+    x : array_like
+    UTM easting coordinates
+    y : array_like
+    UTM northing coordinates
+    zones : array_like or str
+    UTM zones in "30 U" format, either one per point or a single zone for all
+    points
+
+    Returns
+    -------
+    lat, lon : numpy.ndarray
+    latitudes and longitudes of the points in decimal degrees
+    """
+    
+    # Imported here to keep utm out of the import time of the package
+    import utm
+    
+    x = np.atleast_1d(np.asarray(x, dtype=float))
+    y = np.atleast_1d(np.asarray(y, dtype=float))
+    
+    if isinstance(zones, basestring):
+        zones = [zones] * len(x)
+    
+    zones = np.array([str(zone) for zone in zones])
+    
+    lat = np.empty(len(x))
+    lon = np.empty(len(x))
+    
+    for zone in np.unique(zones):
+        
+        mask = zones == zone
+        
+        (lat[mask],
+         lon[mask]) = utm.to_latlon(x[mask],
+                                    y[mask],
+                                    int(zone[0:2]),
+                                    str(zone[3]))
+    
+    return lat, lon
+
+
+def great_circle_distance(lat_ini, lon_ini, lat_fin, lon_fin):
+    """
+    Returns the great circle distances (in kms) between arrays of points
+    given in decimal degrees, using the same formulation as
+    geopy.distance.great_circle. Inputs are broadcast against each other.
+    """
+    
+    lat1 = np.radians(lat_ini)
+    lat2 = np.radians(lat_fin)
+    delta_lng = np.radians(lon_fin) - np.radians(lon_ini)
+    
+    sin_lat1, cos_lat1 = np.sin(lat1), np.cos(lat1)
+    sin_lat2, cos_lat2 = np.sin(lat2), np.cos(lat2)
+    cos_delta_lng, sin_delta_lng = np.cos(delta_lng), np.sin(delta_lng)
+    
+    d = np.arctan2(np.sqrt((cos_lat2 * sin_delta_lng) ** 2 +
+                           (cos_lat1 * sin_lat2 -
+                            sin_lat1 * cos_lat2 * cos_delta_lng) ** 2),
+                   sin_lat1 * sin_lat2 + cos_lat1 * cos_lat2 * cos_delta_lng)
+    
+    return EARTH_RADIUS * d
+
+
+class LRUCache(object):
+    
+    """Bounded, least recently used, key value store. Hits, misses and
+    evictions are counted."""
+    
+    def __init__(self, max_size=None):
+        
+        self._max_size = max_size
+        self._values = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        return
+    
+    def __len__(self):
+        return len(self._values)
+    
+    def __contains__(self, key):
+        return key in self._values
+    
+    def get(self, key, default=None):
+        
+        if key not in self._values:
+            self.misses += 1
+            return default
+        
+        # Move the entry to the most recently used position
+        value = self._values.pop(key)
+        self._values[key] = value
+        self.hits += 1
+        
+        return value
+    
+    def put(self, key, value):
+        
+        if key in self._values: del self._values[key]
+        
+        self._values[key] = value
+        
+        if self._max_size is None: return
+        
+        while len(self._values) > self._max_size:
+            self._values.popitem(last=False)
+            self.evictions += 1
+        
+        return
+    
+    def clear(self):
+        self._values.clear()
+    
+    def get_stats(self):
+        
+        stats = {'hits': self.hits,
+                 'misses': self.misses,
+                 'evictions': self.evictions,
+                 'size': len(self._values)}
+        
+        return stats
+
+
+class DistanceCache(object):
+    
+    """Memoised great circle distances between UTM coordinates. Distances
+    are keyed by the (unordered) pair of points and held in an LRUCache of
+    at most max_size entries."""
+    
+    def __init__(self, max_size=100000):
+        
+        self._distances = LRUCache(max_size)
+        
+        return
+    
+    def __len__(self):
+        return len(self._distances)
+    
+    @classmethod
+    def _get_point_key(cls, UTM_point):
+        return (float(UTM_point[0]), float(UTM_point[1]), str(UTM_point[2]))
+    
+    @classmethod
+    def _get_key(cls, point_key_ini, point_key_fin):
+        
+        if point_key_fin < point_key_ini:
+            return (point_key_fin, point_key_ini)
+        
+        return (point_key_ini, point_key_fin)
+    
+    def clear(self):
+        self._distances.clear()
+    
+    def get_stats(self):
+        """Returns the hits, misses, evictions and size of the cache"""
+        return self._distances.get_stats()
+    
+    def __call__(self, UTM_ini, UTM_fin):
+        
+        dist = self.get_distances(UTM_ini,
+                                  [UTM_fin[0]],
+                                  [UTM_fin[1]],
+                                  [UTM_fin[2]])[0]
+        
+        return dist
+    
+    def get_distances(self, UTM_ini, x_fin, y_fin, zones_fin):
+        
+        """Returns an array of distances (in kms) from the point UTM_ini to
+        the points given by the x_fin, y_fin and zones_fin arrays. Only the
+        pairs not already cached are calculated, in a single vectorised pass.
+        """
+        
+        x_fin = np.atleast_1d(np.asarray(x_fin, dtype=float))
+        y_fin = np.atleast_1d(np.asarray(y_fin, dtype=float))
+        zones_fin = [str(zone) for zone in zones_fin]
+        
+        point_key_ini = self._get_point_key(UTM_ini)
+        
+        dists = np.empty(len(x_fin))
+        keys = []
+        missing = []
+        
+        for i, point_key_fin in enumerate(zip(x_fin, y_fin, zones_fin)):
+            
+            key = self._get_key(point_key_ini, point_key_fin)
+            keys.append(key)
+            
+            dist = self._distances.get(key)
+            
+            if dist is None:
+                missing.append(i)
+            else:
+                dists[i] = dist
+        
+        if not missing: return dists
+        
+        missing = np.array(missing)
+        
+        lat_ini, lon_ini = utm_to_latlon([point_key_ini[0]],
+                                         [point_key_ini[1]],
+                                         [point_key_ini[2]])
+        lat_fin, lon_fin = utm_to_latlon(x_fin[missing],
+                                         y_fin[missing],
+                                         [zones_fin[i] for i in missing])
+        
+        new_dists = great_circle_distance(lat_ini[0],
+                                          lon_ini[0],
+                                          lat_fin,
+                                          lon_fin)
+        
+        for i, dist in zip(missing, new_dists):
+            dist = float(dist)
+            dists[i] = dist
+            self._distances.put(keys[i], dist)
+        
+        return dists
+
+
+_distance_cache = DistanceCache()
+
+
+def get_distance_cache():
+    """Returns the DistanceCache shared by the schedulers and port selection.
+    """
+    return _distance_cache
+
+
+class FrozenDict(dict):
+    
+    """Dictionary that raises TypeError when modified"""
+    
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("FrozenDict can not be modified")
+    
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
 
-    UTM_fin_x = UTM_fin[0]
-    UTM_fin_y = UTM_fin[1]
-    UTM_fin_zone = UTM_fin[2]
+def get_digest(*parts):
+    """Returns a hex digest of the contents of the given parts (see
+    update_digest)"""
     
-    # To get dd.dd from utm
-    [LAT_INI, LONG_INI] = utm.to_latlon(UTM_ini_x,
-                                        UTM_ini_y,
-                                        int(UTM_ini_zone[0:2]),
-                                        str(UTM_ini_zone[3]))
+    digest = hashlib.sha1()
     
-    # To get dd.dd from utm
-    [LAT_FIN, LONG_FIN] = utm.to_latlon(UTM_fin_x,
-                                        UTM_fin_y,
-                                        int(UTM_fin_zone[0:2]),
-                                        str(UTM_fin_zone[3]))
+    for part in parts:
+        update_digest(digest, part)
+    
+    return digest.hexdigest()
+
 
-    point_i = (LAT_INI, LONG_INI)
-    point_f = (LAT_FIN, LONG_FIN)
+def update_digest(digest, value, update=None):
+    """Updates a hashlib digest with the contents of a value, which may be a
+    DataFrame, Series, Index, numpy array or scalar, string, number or date,
+    or a dictionary, list or tuple of these. Equal contents give equal
+    digests between runs and numpy scalars are hashed as the equivalent
+    Python values. Other types contribute their repr. The items of
+    containers are passed to update, if given, so that callers can handle
+    further types."""
+    
+    if update is None: update = update_digest
+    
+    if isinstance(value, np.generic): value = value.item()
     
-    # Gives you a distance (in kms) between two coordinate in dd.dd
-    distance = great_circle(point_i, point_f).kilometers
+    if isinstance(value, pd.DataFrame):
+        
+        digest.update("DataFrame")
+        update(digest, list(value.columns))
+        update(digest, value.index)
+        
+        for i in xrange(value.shape[1]):
+            update(digest, value.iloc[:, i].values)
+    
+    elif isinstance(value, pd.Series):
+        
+        digest.update("Series")
+        update(digest, value.name)
+        update(digest, value.index)
+        update(digest, value.values)
+    
+    elif isinstance(value, pd.Index):
+        
+        digest.update("Index")
+        update(digest, value.name)
+        update(digest, value.values)
+    
+    elif isinstance(value, np.ndarray) and value.dtype.kind != 'O':
+        
+        value = np.ascontiguousarray(value)
+        digest.update("ndarray")
+        digest.update(value.dtype.str)
+        digest.update(repr(value.shape))
+        digest.update(value.tobytes())
+    
+    elif isinstance(value, np.ndarray):
+        
+        digest.update("ndarray")
+        digest.update(repr(value.shape))
+        
+        for item in value.ravel():
+            update(digest, item)
+    
+    elif isinstance(value, dict):
+        
+        digest.update("dict{}".format(len(value)))
+        
+        for k in sorted(value, key=repr):
+            update(digest, k)
+            update(digest, value[k])
+    
+    elif isinstance(value, (list, tuple)):
+        
+        digest.update("{}{}".format(type(value).__name__, len(value)))
+        
+        for item in value:
+            update(digest, item)
+    
+    elif isinstance(value, bool) or value is None:
+        
+        digest.update(repr(value))
+    
+    elif isinstance(value, (int, long)):
+        
+        digest.update("int")
+        digest.update(str(value))
+    
+    elif isinstance(value, float):
+        
+        # The repr of a float round trips exactly
+        digest.update("float")
+        digest.update(repr(value))
+    
+    elif isinstance(value, str):
+        
+        digest.update("str")
+        digest.update(value)
+    
+    elif isinstance(value, unicode):
+        
+        digest.update("unicode")
+        digest.update(value.encode("utf-8"))
+    
+    elif isinstance(value, (dt.datetime, dt.date)):
+        
+        digest.update(type(value).__name__)
+        digest.update(value.isoformat())
+    
+    else:
+        
+        digest.update(repr(value))
+    
+    # Separate the values
+    digest.update("\0")
+    
+    return
 
-    return distance
+
+def write_atomic(path, write):
+    """Writes the file at path by calling write with a binary file object
+    opened on a temporary file in the same directory, which then replaces
+    path. Readers never find a partially written file or no file at all,
+    except on Windows, where an existing file must be removed first."""
+    
+    handle, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    
+    try:
+        
+        with os.fdopen(handle, "wb") as temp_file:
+            write(temp_file)
+        
+        if os.name == "nt" and os.path.exists(path): os.remove(path)
+        os.rename(temp_path, path)
+    
+    finally:
+        
+        if os.path.exists(temp_path): os.remove(temp_path)
+    
+    return
 
 
 def indices(a, func):
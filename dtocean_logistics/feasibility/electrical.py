@@ -29,6 +29,7 @@ function related to the installation of electrical infrastructure.
 from math import pi
 import pandas as pd
 import numpy as np
+from dtocean_logistics.load.cable_route import CableRouteIndex
 from dtocean_logistics.load.snap_2_grid import SnapToGrid
 
 import logging
@@ -55,9 +56,7 @@ def export_feas(log_phase, log_phase_id, site, static_cable, cable_route,
     # Select only export cables database and route
     export_db = static_db[static_db['type [-]'] == 'export']
     export_index = static_db.index.values
-    export_route = route_db[route_db['static cable id [-]'].isin(export_index)]
-    
-    depth = export_route['bathymetry [m]']
+    route_index = CableRouteIndex(route_db)
 
     # Obtain cable characteristics
     export_mass = export_db['dry mass [kg/m]'].fillna(0)/1000.0
@@ -81,20 +80,12 @@ def export_feas(log_phase, log_phase_id, site, static_cable, cable_route,
     export_connect_id.append(export_db['downstream ei id [-]'])
     export_wet_connect = connect_db.loc[export_connect_id]
     
-    # Obtain cable route characteristics
-    burial_depth = export_route['burial depth [m]']
-    
     # Obtain hard-wired collection point characteristics
     if (export_up_ei == 'hard-wired').any():
         export_hardwired_db = export_db[export_db['upstream ei type [-]'] == 'hard-wired']
         export_hardwired_id = list(export_hardwired_db.index.values)   
-        export_hardwired_route = pd.DataFrame()
-        
-        for a in range(len(export_hardwired_id)):
-            cable_id = export_hardwired_id[a]   
-            export_hardwired_route = export_hardwired_route.append( static_route[(static_route['static cable id [-]'] == cable_id)] )
-            
-        depth_hardwired = max( export_hardwired_route['bathymetry [m]'] )
+        depth_hardwired = route_index.get_max(export_hardwired_id,
+                                              'bathymetry [m]')
         
         export_hardwired_mass = export_hardwired_db['dry mass [kg/m]'].fillna(0)/1000.0
         export_hardwired_lenght = export_hardwired_db['length [m]'].fillna(0)
@@ -119,7 +110,7 @@ def export_feas(log_phase, log_phase_id, site, static_cable, cable_route,
     # Vessels       
     turntable_load = max( max(export_total_mass), max(export_lenght*export_mass) )
     turntable_radius = max(export_MBR)*2
-    bathymetry = max(depth)
+    bathymetry = route_index.get_max(export_index, 'bathymetry [m]')
     DP = 1
     if (export_up_ei == 'hard-wired').any():
         deck_area = max(area)
@@ -141,7 +132,7 @@ def export_feas(log_phase, log_phase_id, site, static_cable, cable_route,
         mate_force = 0
 
     # Cable Burial Tool
-    trench_depth = max(burial_depth)
+    trench_depth = route_index.get_max(export_index, 'burial depth [m]')
     trench_diam = max(export_diam)
     MBR = max(export_MBR)
 
@@ -228,9 +219,7 @@ def array_feas(log_phase, log_phase_id, site, static_cable, cable_route,
     # Select only array cables database and route
     array_db = static_db[static_db['type [-]'] == 'array']
     array_index = list(array_db.index.values)    
-    array_route = route_db[route_db['static cable id [-]'].isin(array_index)]                             
-    
-    depth = array_route['bathymetry [m]']
+    route_index = CableRouteIndex(route_db)
 
     # Obtain cable characteristics
     array_mass = array_db['dry mass [kg/m]'].fillna(0)/1000.0
@@ -254,20 +243,12 @@ def array_feas(log_phase, log_phase_id, site, static_cable, cable_route,
     array_connect_id.append(array_db['downstream ei id [-]'])
     array_wet_connect = connect_db.loc[array_connect_id]
     
-    # Obtain cable route characteristics
-    burial_depth = array_route['burial depth [m]']
-   
     # Obtain hard-wired collection point characteristics
     if (array_up_ei == 'hard-wired').any():
         array_hardwired_db = array_db[array_db['upstream ei type [-]'] == 'hard-wired']
         array_hardwired_id = list(array_hardwired_db.index.values)   
-        array_hardwired_route = pd.DataFrame()
-        
-        for a in range(len(array_hardwired_id)):
-            cable_id = array_hardwired_id[a]   
-            array_hardwired_route = array_hardwired_route.append( static_route[(static_route['static cable id [-]'] == cable_id)] )
-            
-        depth_hardwired = max( array_hardwired_route['bathymetry [m]'] )
+        depth_hardwired = route_index.get_max(array_hardwired_id,
+                                              'bathymetry [m]')
         
         array_hardwired_mass = array_hardwired_db['dry mass [kg/m]'].fillna(0)/1000.0
         array_hardwired_lenght = array_hardwired_db['length [m]'].fillna(0)
@@ -292,7 +273,7 @@ def array_feas(log_phase, log_phase_id, site, static_cable, cable_route,
     # Vessels       
     turntable_load = max( max(array_total_mass), max(array_lenght*array_mass) )
     turntable_radius = max(array_MBR)*2
-    bathymetry = max(depth)
+    bathymetry = route_index.get_max(array_index, 'bathymetry [m]')
     DP = 1
     if (array_up_ei == 'hard-wired').any():
         deck_area = max(area)
@@ -314,7 +295,7 @@ def array_feas(log_phase, log_phase_id, site, static_cable, cable_route,
         mate_force = 0
 
     # Cable Burial Tool
-    trench_depth = max(burial_depth)
+    trench_depth = route_index.get_max(array_index, 'burial depth [m]')
     trench_diam = max(array_diam)
     MBR = max(array_MBR)
 
@@ -19,8 +19,10 @@ from .devices import devices_feas
 from .electrical import cp_feas, dynamic_feas, export_feas, array_feas, external_feas
 from .MF import MF_feas
 from .SS import SS_feas
+from ..performance.instrumentation import timed
 
 
+@timed("glob_feas")
 def glob_feas(log_phase, log_phase_id,
               site, device, sub_device,
               layout,
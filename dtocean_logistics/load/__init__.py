@@ -28,8 +28,7 @@ and .csv files to the final SQL solution.
 .. moduleauthor:: Pedro Vicente <pedro.vicente@wavec.org>
 """
 
-import pandas as pd
-
+from .db_cache import open_workbook
 from ..phases import EquipmentType
 
 
@@ -47,7 +46,7 @@ def load_time_olc_data(file_path):
      dictionnary containing a panda dataframe with time duration and olc
     """
     # Transform time and olc database .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
     # Collect data from a particular tab
     time_olc = excel.parse('operations', header=0, index_col=0)
 
@@ -68,7 +67,7 @@ def load_phase_order_data(file_path):
      dictionnary containing a panda dataframe with the phase order
     """
     # Transform phase table .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
     # Collect data from a particular tab
     phase_order = excel.parse('InstallationOrder', header=0, index_col=0)
 
@@ -91,7 +90,7 @@ def load_eq_rates(file_path):
      cable laying/trenching/burial horizontal progress rates
     """
     # Transform equipment performance rates table .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
     # Collect data from a particular tab
     penet_rates = excel.parse('penet', header=0, index_col=0)
     laying_rates = excel.parse('laying', header=0, index_col=0)
@@ -115,7 +114,7 @@ def load_sf(file_path):
      functions
     """
     # Transform equipment performance rates table .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
     # Collect data from a particular tab
     port_sf = excel.parse('port_sf', header=0, index_col=0)
     vessel_sf = excel.parse('vessel_sf', header=0, index_col=0)
@@ -139,7 +138,7 @@ def load_vessel_data(file_path):
      dictionnary containing all classes defining the different vessel types
     """
     # Transform vessel database .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
     # Collect data from a particular tab
     pd_vessel = excel.parse('Python_Format', header=0, index_col=0)
 
@@ -165,7 +164,7 @@ def load_equipment_data(file_path):
     """
 
     # Transform Equipment database .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
 
     # Collect data from a particular tab
     rov = excel.parse('rov', header=0, index_col=0)
@@ -217,7 +216,7 @@ def load_port_data(file_path):
      dictionnary containing a panda dataframe with all ports
     """
     # Transform vessel database .xls into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
     # Collect data from a particular tab
     ports = excel.parse('python', header=0, index_col=0)
 
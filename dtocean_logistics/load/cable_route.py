@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import numpy as np
+
+from ..ancillaries import distance
+
+
+class CableRouteIndex(object):
+
+    """Cable route table grouped by static cable id. The points of each
+    cable's route are held as a contiguous slice of columnar arrays, in table
+    order, so a route can be read without filtering the whole table. Segment
+    lengths, route length, maximum depth and first point of each cable are
+    calculated once."""
+
+    def __init__(self, cable_route):
+
+        cable_ids = cable_route['static cable id [-]'].values
+
+        # A stable sort keeps the order of the points within each route
+        order = np.argsort(cable_ids, kind='mergesort')
+        sorted_ids = cable_ids[order]
+
+        self._columns = {}
+
+        for column in cable_route.columns:
+            self._columns[column] = cable_route[column].values[order]
+
+        self._slices = {}
+
+        if len(sorted_ids) > 0:
+
+            breaks = np.flatnonzero(sorted_ids[1:] != sorted_ids[:-1]) + 1
+            starts = [0] + breaks.tolist()
+            stops = breaks.tolist() + [len(sorted_ids)]
+
+            for start, stop in zip(starts, stops):
+                self._slices[sorted_ids[start]] = slice(start, stop)
+
+        # Segment i joins points i and i + 1, so the last point of each
+        # route has no segment and its entry is left as zero
+        self._segment_lengths = np.zeros(len(sorted_ids))
+        self._lengths = {}
+        self._max_depths = {}
+        self._first_points = {}
+
+        for cable_id, route in self._slices.iteritems():
+
+            for i in xrange(route.start, route.stop - 1):
+                self._segment_lengths[i] = distance(self._get_point(i),
+                                                    self._get_point(i + 1))
+
+            self._lengths[cable_id] = \
+                            self._segment_lengths[route].sum()
+            self._max_depths[cable_id] = \
+                            self._columns['bathymetry [m]'][route].max()
+            self._first_points[cable_id] = self._get_point(route.start)
+
+        return
+
+    def __contains__(self, cable_id):
+        return cable_id in self._slices
+
+    def _get_point(self, i):
+
+        return [self._columns['x coord [m]'][i],
+                self._columns['y coord [m]'][i],
+                self._columns['zone [-]'][i]]
+
+    def _get_slice(self, cable_id):
+
+        if cable_id in self._slices: return self._slices[cable_id]
+
+        return slice(0, 0)
+
+    def get_n_points(self, cable_id):
+
+        route = self._get_slice(cable_id)
+
+        return route.stop - route.start
+
+    def get_column(self, cable_id, column):
+        """Return the values of the given column for the route of a cable,
+        as a read only array view. The view is empty if the cable has no
+        route."""
+
+        values = self._columns[column][self._get_slice(cable_id)]
+        values.flags.writeable = False
+
+        return values
+
+    def get_point(self, cable_id, i):
+        """Return the [x, y, zone] UTM coordinates of point i of the route
+        of a cable"""
+
+        route = self._get_slice(cable_id)
+
+        if not 0 <= i < route.stop - route.start:
+            errStr = "Cable {} has no route point {}".format(cable_id, i)
+            raise IndexError(errStr)
+
+        return self._get_point(route.start + i)
+
+    def get_segment_length(self, cable_id, i):
+        """Return the distance, in km, between points i and i + 1 of the
+        route of a cable"""
+
+        route = self._get_slice(cable_id)
+
+        if not 0 <= i < route.stop - route.start - 1:
+            errStr = "Cable {} has no route segment {}".format(cable_id, i)
+            raise IndexError(errStr)
+
+        return self._segment_lengths[route.start + i]
+
+    def get_first_point(self, cable_id):
+        return list(self._first_points[cable_id])
+
+    def get_length(self, cable_id):
+        """Return the length of the route of a cable, in km"""
+        return self._lengths[cable_id]
+
+    def get_max_depth(self, cable_id):
+        return self._max_depths[cable_id]
+
+    def get_max(self, cable_ids, column):
+        """Return the maximum value of the given column over the routes of
+        the given cables. Cables without a route are ignored."""
+
+        routes = [self._slices[cable_id] for cable_id in cable_ids
+                                                if cable_id in self._slices]
+
+        if not routes:
+            errStr = "None of the given cables has a route"
+            raise ValueError(errStr)
+
+        values = np.concatenate([self._columns[column][route]
+                                                     for route in routes])
+
+        return max(values)
@@ -16,706 +16,174 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import pandas as pd
-
-from check_param import check_float_positive
-from check_param import check_float_positive_null
-from check_param import check_integer_long
+from check_rules import check_rules
+from check_rules import OneOf
+from check_rules import FLOAT_POSITIVE
+from check_rules import FLOAT_POSITIVE_NULL
+from check_rules import INTEGER_LONG
+
+
+ROV_RULES = [
+    ('ROV class [-]', OneOf(['Inspection class', 'Workclass'])),
+    ('Depth rating [m]', FLOAT_POSITIVE),
+    ('Length [m]', FLOAT_POSITIVE),
+    ('Width [m]', FLOAT_POSITIVE),
+    ('Height [m]', FLOAT_POSITIVE),
+    ('Weight [t]', FLOAT_POSITIVE),
+    ('Payload [t]', FLOAT_POSITIVE),
+    ('AE footprint [m^2]', FLOAT_POSITIVE_NULL),
+    ('AE weight [t]', FLOAT_POSITIVE_NULL),
+    ('AE supervisor [-]', INTEGER_LONG),
+    ('AE technician [-]', INTEGER_LONG),
+    ('ROV day rate [EURO/day]', FLOAT_POSITIVE_NULL),
+    ('Supervisor rate [EURO/12h]', FLOAT_POSITIVE_NULL),
+    ('Technician rate [EURO/12h]', FLOAT_POSITIVE_NULL)]
+
+
+DIVERS_RULES = [
+    ('Max operating depth [m]', FLOAT_POSITIVE),
+    ('Deployment eq. footprint [m^2]', FLOAT_POSITIVE),
+    ('Deployment eq. weight [t]', FLOAT_POSITIVE),
+    ('Total day rate [EURO/day]', FLOAT_POSITIVE_NULL)]
+
+
+CABLE_BURIAL_RULES = [
+    ('Max operating depth [m]', FLOAT_POSITIVE),
+    ('Tow force required [t]', FLOAT_POSITIVE),
+    ('Length [m]', FLOAT_POSITIVE),
+    ('Width [m]', FLOAT_POSITIVE),
+    ('Height [m]', FLOAT_POSITIVE),
+    ('Weight [t]', FLOAT_POSITIVE),
+    ('Jetting capability [yes/no]', OneOf(['yes', 'no'], allow_null=True)),
+    ('Ploughing capability [yes/no]', OneOf(['yes', 'no'], allow_null=True)),
+    ('Cutting capability [yes/no]', OneOf(['yes', 'no'], allow_null=True)),
+    ('Jetting trench depth [m]', FLOAT_POSITIVE_NULL),
+    ('Ploughing trench depth [m]', FLOAT_POSITIVE_NULL),
+    ('Cutting trench depth [m]', FLOAT_POSITIVE_NULL),
+    ('Max cable diameter [mm]', FLOAT_POSITIVE),
+    ('Min cable bending radius [m]', FLOAT_POSITIVE),
+    ('AE footprint [m^2]', FLOAT_POSITIVE),
+    ('AE weight [t]', FLOAT_POSITIVE),
+    ('Burial tool day rate [EURO/day]', FLOAT_POSITIVE_NULL),
+    ('Personnel day rate [EURO/12h]', FLOAT_POSITIVE_NULL)]
+
+
+EXCAVATING_RULES = [
+    ('Depth rating [m]', FLOAT_POSITIVE),
+    ('Width [m]', FLOAT_POSITIVE),
+    ('Height [m]', FLOAT_POSITIVE),
+    ('Weight [t]', FLOAT_POSITIVE),
+    ('Excavator day rate [EURO/day]', FLOAT_POSITIVE_NULL),
+    ('Personnel day rate [EURO/12h]', FLOAT_POSITIVE_NULL)]
+
+
+MATTRESS_RULES = [
+    ('Unit lenght [m]', FLOAT_POSITIVE),
+    ('Unit width [m]', FLOAT_POSITIVE),
+    ('Unit thickness [m]', FLOAT_POSITIVE),
+    ('Unit weight air [t]', FLOAT_POSITIVE),
+    ('Cost per unit [EURO]', FLOAT_POSITIVE_NULL)]
+
+
+ROCK_FILTER_BAGS_RULES = [
+    ('Weight [t]', FLOAT_POSITIVE),
+    ('Diameter [m]', FLOAT_POSITIVE),
+    ('Height [m]', FLOAT_POSITIVE),
+    ('Cost per unit [EURO]', FLOAT_POSITIVE_NULL)]
+
+
+SPLIT_PIPES_RULES = [
+    ('Unit length [mm]', FLOAT_POSITIVE),
+    ('Cost per unit [EURO]', FLOAT_POSITIVE_NULL)]
+
+
+HAMMER_RULES = [
+    ('Depth rating [m]', FLOAT_POSITIVE),
+    ('Length [m]', FLOAT_POSITIVE),
+    ('Weight in air [t]', FLOAT_POSITIVE),
+    ('Min pile diameter [mm]', FLOAT_POSITIVE_NULL),
+    ('Max pile diameter [mm]', FLOAT_POSITIVE),
+    ('AE footprint [m^2]', FLOAT_POSITIVE_NULL),
+    ('AE weight [t]', FLOAT_POSITIVE_NULL),
+    ('Hammer day rate [EURO/day]', FLOAT_POSITIVE_NULL),
+    ('Personnel day rate [EURO/12h]', FLOAT_POSITIVE_NULL)]
+
+
+DRILLING_RIGS_RULES = [
+    ('Diameter [m]', FLOAT_POSITIVE),
+    ('Length [m]', FLOAT_POSITIVE),
+    ('Weight [t]', FLOAT_POSITIVE),
+    ('Drilling diameter range [m]', FLOAT_POSITIVE),
+    ('Max drilling depth [m]', FLOAT_POSITIVE),
+    ('Max water depth [m]', FLOAT_POSITIVE),
+    ('AE footprint [m^2]', FLOAT_POSITIVE),
+    ('AE weight [t]', FLOAT_POSITIVE),
+    ('Drill rig day rate [EURO/day]', FLOAT_POSITIVE_NULL),
+    ('Personnel day rate [EURO/day]', FLOAT_POSITIVE_NULL)]
+
+
+VIBRO_DRIVER_RULES = [
+    ('Width [m]', FLOAT_POSITIVE),
+    ('Length [m]', FLOAT_POSITIVE),
+    ('Height [m]', FLOAT_POSITIVE),
+    ('Vibro driver weight [m]', FLOAT_POSITIVE),
+    ('Clamp weight [m]', FLOAT_POSITIVE),
+    ('Min pile diameter [mm]', FLOAT_POSITIVE_NULL),
+    ('Max pile diameter [mm]', FLOAT_POSITIVE),
+    ('Max pile weight [t]', FLOAT_POSITIVE),
+    ('AE footprint [m^2]', FLOAT_POSITIVE_NULL),
+    ('AE weight [t]', FLOAT_POSITIVE_NULL),
+    ('Vibro diver day rate [EURO/day]', FLOAT_POSITIVE_NULL),
+    ('Personnel day rate [EURO/day]', FLOAT_POSITIVE_NULL)]
 
 
 def check_rov(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'ROV class [-]'
-        PARAM = Input_DB[input_param][ind_elem]
-        if not (PARAM == 'Inspection class' or PARAM == 'Workclass'):
-            warning_list.append( 'Input: ' + input_param + ' = ' + str(PARAM) + ' in ' + Input_module + '/index:' + str(ind_elem) + ' is Wrong! '
-                                 + 'Only "Inspection class" or "Workclass" accepted.')
-            ERROR_IN_MODULE = True
-
-        input_param = 'Depth rating [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Length [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Width [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Height [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Payload [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE footprint [m^2]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE supervisor [-]'
-        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE technician [-]'
-        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'ROV day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Supervisor rate [EURO/12h]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Technician rate [EURO/12h]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB, ROV_RULES, Input_module, warning_list)
 
 
 def check_divers(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'Max operating depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Deployment eq. footprint [m^2]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Deployment eq. weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-#        input_param = 'Nr supervisors [-]'
-#        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Nr divers [-]'
-#        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Nr tenders [-]'
-#        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Nr technicians [-]'
-#        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Nr support technicians [-]'
-#        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Deployment eq. day rate [EURO/day]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Supervisor day rate [EURO/day]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Divers day rate [EURO/day]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Tenders day rate [EURO/day]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Technicians day rate [EURO/day]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Life support day rate [EURO/day]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Total day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB, DIVERS_RULES, Input_module, warning_list)
 
 
 def check_cable_burial(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-#        input_param = 'Burial tool type [-]'
-#        PARAM = Input_DB[input_param][ind_elem]
-#        if not (PARAM == 'Plough' or PARAM == 'ROV' or PARAM == 'Tracked' or pd.isnull(PARAM)):
-#            warning_list.append( 'Input: ' + input_param + ' = ' + str(PARAM) + ' in ' + Input_module + '/index:' + str(ind_elem) + ' is Wrong! '
-#                                 + 'Only "Plough" or "ROV" or "Tracked" accepted.')
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Max operating depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Tow force required [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Length [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Width [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Height [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Jetting capability [yes/no]'
-        PARAM = Input_DB[input_param][ind_elem]
-        if not (PARAM == 'yes' or PARAM == 'no' or pd.isnull(PARAM)):
-            warning_list.append( 'Input: ' + input_param + ' = ' + str(PARAM) + ' in ' + Input_module + '/index:' + str(ind_elem) + ' is Wrong!'
-                                 + 'Only "yes" or "no" accepted.')
-            ERROR_IN_MODULE = True
-
-        input_param = 'Ploughing capability [yes/no]'
-        PARAM = Input_DB[input_param][ind_elem]
-        if not (PARAM == 'yes' or PARAM == 'no' or pd.isnull(PARAM)):
-            warning_list.append( 'Input: ' + input_param + ' = ' + str(PARAM) + ' in ' + Input_module + '/index:' + str(ind_elem) + ' is Wrong!'
-                                 + 'Only "yes" or "no" accepted.')
-            ERROR_IN_MODULE = True
-
-        input_param = 'Cutting capability [yes/no]'
-        PARAM = Input_DB[input_param][ind_elem]
-        if not (PARAM == 'yes' or PARAM == 'no' or pd.isnull(PARAM)):
-            warning_list.append( 'Input: ' + input_param + ' = ' + str(PARAM) + ' in ' + Input_module + '/index:' + str(ind_elem) + ' is Wrong!'
-                                 + 'Only "yes" or "no" accepted.')
-            ERROR_IN_MODULE = True
-
-        input_param = 'Jetting trench depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Ploughing trench depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Cutting trench depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Max cable diameter [mm]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Min cable bending radius [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE footprint [m^2]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Burial tool day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Personnel day rate [EURO/12h]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB,
+                       CABLE_BURIAL_RULES,
+                       Input_module,
+                       warning_list)
 
 
 def check_excavating(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'Depth rating [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Width [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Height [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-#        input_param = 'Lenght or diameter [m]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Excavator day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Personnel day rate [EURO/12h]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB, EXCAVATING_RULES, Input_module, warning_list)
 
 
 def check_mattress(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-#        input_param = 'Concrete resistance [N/mm^2]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Concrete density [kg/m^3]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Unit lenght [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Unit width [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Unit thickness [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Unit weight air [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-#        input_param = 'Unit weight water [t]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Nr looped ropes [-]'
-#        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Ropes diameter [mm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Cost per unit [EURO]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB, MATTRESS_RULES, Input_module, warning_list)
 
 
 def check_rockfilterbags(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'Weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        # input_param = 'Particle diameter [mm]'
-        # ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        # if ERROR_IN_PARAM:
-        #     ERROR_IN_MODULE = True
-
-#        input_param = 'Mesh size [mm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Diameter [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Height [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-#        input_param = 'Volume [m^ 3]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Velocity unit [m/s]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Velocity grouped [m/s]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Cost per unit [EURO]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB,
+                       ROCK_FILTER_BAGS_RULES,
+                       Input_module,
+                       warning_list)
 
 
 def check_splitpipes(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-#        input_param = 'Material [-]'
-#        ERROR_IN_PARAM, warning_list = check_unicode(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Unit weight air [kg]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Unit weight water [kg]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Unit length [mm]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-#        input_param = 'Unit wall thichness [mm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Unit inner diameter [mm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Unit outer diameter [mm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Max cable size [mm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Min bending radius [m]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'Cost per unit [EURO]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB, SPLIT_PIPES_RULES, Input_module, warning_list)
 
 
 def check_hammer(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'Depth rating [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Length [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Weight in air [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Min pile diameter [mm]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Max pile diameter [mm]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE footprint [m^2]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Hammer day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Personnel day rate [EURO/12h]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB, HAMMER_RULES, Input_module, warning_list)
 
 
 def check_drillingrigs(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'Diameter [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Length [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Drilling diameter range [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Max drilling depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Max water depth [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-#        input_param = 'Torque [kNm]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-#        input_param = 'Pull back [t]'
-#        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-#        if ERROR_IN_PARAM:
-#            ERROR_IN_MODULE = True
-
-        input_param = 'AE footprint [m^2]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Drill rig day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Personnel day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB,
+                       DRILLING_RIGS_RULES,
+                       Input_module,
+                       warning_list)
 
 
 def check_vibrodriver(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-
-        input_param = 'Width [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Length [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Height [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Vibro driver weight [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Clamp weight [m]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Min pile diameter [mm]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Max pile diameter [mm]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Max pile weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE footprint [m^2]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'AE weight [t]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Vibro diver day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'Personnel day rate [EURO/day]'
-        ERROR_IN_PARAM, warning_list = check_float_positive_null(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-
-
-    return ERROR_IN_MODULE, warning_list
+    return check_rules(Input_DB,
+                       VIBRO_DRIVER_RULES,
+                       Input_module,
+                       warning_list)
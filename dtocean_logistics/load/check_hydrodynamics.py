@@ -15,30 +15,16 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from check_param import check_unicode
-from check_param import check_integer_long
+from check_rules import check_rules
+from check_rules import INTEGER_LONG
+from check_rules import UNICODE
 
 
-def check_hydro(Input_DB, Input_module, warning_list):
-
-    ERROR_IN_MODULE = False # default value:
-
-    for ind_elem, row in Input_DB.iterrows():
-        input_param = 'x coord [m]'
-        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
-
-        input_param = 'y coord [m]'
-        ERROR_IN_PARAM, warning_list = check_integer_long(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
+HYDRO_RULES = [
+    ('x coord [m]', INTEGER_LONG),
+    ('y coord [m]', INTEGER_LONG),
+    ('zone [-]', UNICODE)]
 
-        input_param = 'zone [-]'
-        ERROR_IN_PARAM, warning_list = check_unicode(Input_DB, ind_elem, input_param, Input_module, warning_list)
-        if ERROR_IN_PARAM:
-            ERROR_IN_MODULE = True
 
-
-
-    return ERROR_IN_MODULE, warning_list
\ No newline at end of file
+def check_hydro(Input_DB, Input_module, warning_list):
+    return check_rules(Input_DB, HYDRO_RULES, Input_module, warning_list)
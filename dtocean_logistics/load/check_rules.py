@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Declarative validation of input tables. A rule table is a list of
+(column, rule) pairs which is evaluated column by column with array masks by
+check_rules.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import numbers
+
+import numpy as np
+import pandas as pd
+
+
+class ValueRule(object):
+
+    """Rule testing the type or sign of each value in a column. Empty values
+    always pass. Numeric columns are tested with array operations and other
+    columns are tested value by value."""
+
+    def __init__(self, message, scalar_test, array_test):
+
+        self.message = message
+        self._scalar_test = scalar_test
+        self._array_test = array_test
+
+        return
+
+    def find_errors(self, column):
+        """Return a boolean array which is True for the failing values of
+        the given column"""
+
+        values = column.values
+
+        if values.dtype.kind in 'iuf':
+
+            with np.errstate(invalid='ignore'):
+                valid = self._array_test(values)
+
+        else:
+
+            valid = np.fromiter((self._scalar_test(x) for x in values),
+                                dtype=bool,
+                                count=len(values))
+
+        return ~valid & ~pd.isnull(values)
+
+
+class OneOf(object):
+
+    """Rule accepting only the given values and, optionally, empty
+    values"""
+
+    def __init__(self, accepted, allow_null=False):
+
+        self.accepted = list(accepted)
+        self.allow_null = allow_null
+
+        options = " or ".join(['"{}"'.format(x) for x in self.accepted])
+        self.message = "Only {} accepted.".format(options)
+
+        return
+
+    def find_errors(self, column):
+
+        valid = column.isin(self.accepted).values
+
+        if self.allow_null: valid |= pd.isnull(column.values)
+
+        return ~valid
+
+
+def _is_number(x):
+    return isinstance(x, float) or isinstance(x, numbers.Integral)
+
+
+def _is_integer(x):
+
+    if isinstance(x, numbers.Integral): return True
+
+    return isinstance(x, float) and x.is_integer()
+
+
+def _is_float(values):
+    return values.dtype.kind == 'f'
+
+
+FLOAT_POSITIVE = ValueRule("Value must be a positive float.",
+                           lambda x: _is_number(x) and x > 0,
+                           lambda values: values > 0)
+
+FLOAT_POSITIVE_NULL = ValueRule("Value must be a float >= 0.",
+                                lambda x: _is_number(x) and x >= 0,
+                                lambda values: values >= 0)
+
+FLOAT_INTEGER = ValueRule("Value must be a float or an integer.",
+                          _is_number,
+                          lambda values: np.full(len(values), True))
+
+# Whole floats are accepted
+INTEGER = ValueRule("Value must be integer.",
+                    _is_integer,
+                    lambda values: values == np.floor(values))
+
+# Only integer types are accepted
+INTEGER_LONG = ValueRule("Value must be integer.",
+                         lambda x: isinstance(x, numbers.Integral),
+                         lambda values: np.full(len(values),
+                                                not _is_float(values)))
+
+UNICODE = ValueRule("A string is expected.",
+                    lambda x: isinstance(x, unicode),
+                    lambda values: np.full(len(values), False))
+
+
+def check_rules(Input_DB, rules, Input_module, warning_list):
+    """Check the columns of Input_DB against the (column, rule) pairs in
+    rules and add a warning to warning_list for each failing value. Warnings
+    are ordered by row and then by rule."""
+
+    if Input_DB.empty or not rules: return False, warning_list
+
+    columns = [Input_DB[input_param] for input_param, _ in rules]
+    errors = np.column_stack([rule.find_errors(column)
+                                for column, (_, rule) in zip(columns, rules)])
+
+    for i, j in zip(*np.nonzero(errors)):
+
+        input_param, rule = rules[j]
+        PARAM = columns[j].values[i]
+        ind_elem = Input_DB.index[i]
+
+        warning_list.append('Input: ' + input_param + ' = ' + str(PARAM) +
+                            ' in ' + Input_module + '/index:' +
+                            str(ind_elem) + ' is Wrong! ' + rule.message)
+
+    return bool(errors.any()), warning_list
@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Binary cache of the sheets of the Excel databases. Each parsed sheet is
+stored as one .npy file per column type, holding the values of a pandas
+block, under a directory named by the hash of the workbook contents. Later
+loads build the table from memory mapped numeric blocks rather than parsing
+the workbook.
+
+The cache is used by the loaders of the load and wp_bom modules when a cache
+directory is set in the DTOCEAN_LOGISTICS_DB_CACHE environment variable or a
+directory named __dbcache__ exists next to the workbook. The caches of a
+database directory can be prebuilt from the command line:
+
+    python -m dtocean_logistics.load.db_cache path/to/databases
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import os
+import sys
+import glob
+import pickle
+import hashlib
+import logging
+import argparse
+
+import numpy as np
+import pandas as pd
+from pandas.core.internals import BlockManager, make_block
+
+from ..ancillaries import write_atomic
+
+module_logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = "__dbcache__"
+CACHE_ENV = "DTOCEAN_LOGISTICS_DB_CACHE"
+
+# Increment if the stored format changes
+_FORMAT_VERSION = 2
+
+# Kinds of the columns stored in memory mapped blocks
+_MAPPED_KINDS = 'biufcM'
+
+
+def open_workbook(file_path, cache_dir=None):
+
+    """Returns an object with the parse method of pandas.ExcelFile for the
+    workbook. If cache_dir is given, or found by get_cache_dir, a
+    CachedWorkbook is returned, otherwise a pandas.ExcelFile."""
+
+    if cache_dir is None: cache_dir = get_cache_dir(file_path)
+    if cache_dir is None: return pd.ExcelFile(file_path)
+
+    return CachedWorkbook(file_path, cache_dir)
+
+
+def get_cache_dir(file_path):
+    """Returns the cache directory set in the DTOCEAN_LOGISTICS_DB_CACHE
+    environment variable, or the __dbcache__ directory next to the workbook
+    if it exists, or None"""
+
+    env_dir = os.environ.get(CACHE_ENV)
+    if env_dir: return env_dir
+
+    local_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)),
+                             CACHE_DIR_NAME)
+
+    if os.path.isdir(local_dir): return local_dir
+
+    return None
+
+
+class CachedWorkbook(object):
+
+    """Excel workbook with a binary cache of its parsed sheets. The cache is
+    validated by the size and modification time of the workbook, or by the
+    hash of its contents if they have changed. The workbook is only opened
+    if a sheet is missing from the cache. The numeric blocks of the returned
+    tables are memory mapped copy-on-write, so the tables can be modified."""
+
+    def __init__(self, file_path, cache_dir):
+
+        self.file_path = file_path
+        self.cache_dir = cache_dir
+        self._excel = None
+        self._sheets_dir = None
+
+        return
+
+    @property
+    def sheet_names(self):
+        return self._get_excel().sheet_names
+
+    def parse(self, sheet_name, header=0, index_col=0):
+
+        """Returns the sheet as a DataFrame, as pandas.ExcelFile.parse with
+        the given header and index_col arguments"""
+
+        sheets_dir = self._get_sheets_dir()
+        sheet_key = _get_sheet_key(sheet_name, header, index_col)
+        df = _load_sheet(sheets_dir, sheet_key)
+
+        if df is not None: return df
+
+        df = self._get_excel().parse(sheet_name,
+                                     header=header,
+                                     index_col=index_col)
+
+        try:
+            _store_sheet(sheets_dir, sheet_key, df)
+        except (IOError, OSError):
+            msg = ("Could not store sheet '{}' of workbook '{}' in the "
+                   "database cache").format(sheet_name, self.file_path)
+            module_logger.warning(msg)
+
+        return df
+
+    def _get_excel(self):
+
+        if self._excel is None: self._excel = pd.ExcelFile(self.file_path)
+
+        return self._excel
+
+    def _get_sheets_dir(self):
+
+        if self._sheets_dir is None:
+            digest = _get_workbook_digest(self.file_path, self.cache_dir)
+            name = os.path.splitext(os.path.basename(self.file_path))[0]
+            self._sheets_dir = os.path.join(self.cache_dir,
+                                            "{}-{}".format(name, digest))
+
+        return self._sheets_dir
+
+
+def prebuild(database_dir, cache_dir=None, header=0, index_col=0):
+
+    """Caches every sheet of the Excel workbooks in database_dir. The cache
+    directory defaults to the __dbcache__ directory in database_dir.
+    Returns the paths of the cached workbooks."""
+
+    if cache_dir is None:
+        cache_dir = os.path.join(database_dir, CACHE_DIR_NAME)
+
+    file_paths = []
+
+    for pattern in ("*.xls", "*.xlsx"):
+        file_paths.extend(glob.glob(os.path.join(database_dir, pattern)))
+
+    for file_path in sorted(file_paths):
+
+        workbook = CachedWorkbook(file_path, cache_dir)
+
+        for sheet_name in workbook.sheet_names:
+            workbook.parse(sheet_name, header=header, index_col=index_col)
+
+        module_logger.info("Cached workbook '{}'".format(file_path))
+
+    return sorted(file_paths)
+
+
+def main(argv=None):
+    """Command line interface for prebuilding the database caches"""
+
+    parser = argparse.ArgumentParser(
+                description="Prebuild the binary caches of the Excel "
+                            "databases in a directory")
+    parser.add_argument("database_dir",
+                        help="directory containing the Excel databases")
+    parser.add_argument("-c", "--cache-dir",
+                        help="cache directory (defaults to "
+                             "DATABASE_DIR/{})".format(CACHE_DIR_NAME))
+
+    args = parser.parse_args(argv)
+
+    file_paths = prebuild(args.database_dir, args.cache_dir)
+
+    for file_path in file_paths:
+        print "Cached {}".format(file_path)
+
+    return 0
+
+
+def _get_workbook_digest(file_path, cache_dir):
+
+    """Returns the hash of the workbook contents, which is stored in the
+    cache directory and only recalculated if the size or modification time
+    of the workbook changes"""
+
+    stat = os.stat(file_path)
+    stamp = (stat.st_size, stat.st_mtime)
+
+    path_digest = hashlib.sha1(os.path.abspath(file_path)).hexdigest()
+    stamp_path = os.path.join(cache_dir, "{}.stamp".format(path_digest))
+
+    try:
+        with open(stamp_path, "rb") as stamp_file:
+            stored_stamp, digest = pickle.load(stamp_file)
+        if stored_stamp == stamp: return digest
+    except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+        pass
+
+    digest = hashlib.sha1()
+
+    with open(file_path, "rb") as workbook:
+        for block in iter(lambda: workbook.read(1 << 20), ""):
+            digest.update(block)
+
+    digest = digest.hexdigest()[:16]
+
+    try:
+        _make_dirs(cache_dir)
+        write_atomic(stamp_path,
+                     lambda f: pickle.dump((stamp, digest), f, 2))
+    except (IOError, OSError):
+        pass
+
+    return digest
+
+
+def _get_sheet_key(sheet_name, header, index_col):
+
+    key = repr((_FORMAT_VERSION, sheet_name, header, index_col))
+
+    return hashlib.sha1(key).hexdigest()[:16]
+
+
+def _load_sheet(sheets_dir, sheet_key):
+
+    meta_path = os.path.join(sheets_dir, "{}.meta".format(sheet_key))
+
+    if not os.path.isfile(meta_path): return None
+
+    try:
+
+        with open(meta_path, "rb") as meta_file:
+            meta = pickle.load(meta_file)
+
+        blocks = [make_block(_load_array(sheets_dir, sheet_key, i, kind),
+                             placement=locs)
+                        for i, (kind, locs) in enumerate(meta["blocks"])]
+        index = _load_array(sheets_dir,
+                            sheet_key,
+                            "index",
+                            meta["index_kind"])
+
+    except (IOError, EOFError, ValueError, pickle.UnpicklingError):
+
+        msg = "Ignoring invalid database cache in '{}'".format(sheets_dir)
+        module_logger.warning(msg)
+
+        return None
+
+    # The blocks are already consolidated, so pandas does not copy the
+    # memory mapped values
+    columns = pd.Index(meta["columns"], name=meta["columns_name"])
+    index = pd.Index(index, name=meta["index_name"])
+
+    return pd.DataFrame(BlockManager(blocks, [columns, index]))
+
+
+def _store_sheet(sheets_dir, sheet_key, df):
+
+    _make_dirs(sheets_dir)
+
+    # Group the columns by type, as in the blocks of a DataFrame
+    groups = {}
+
+    for loc, dtype in enumerate(df.dtypes):
+
+        if isinstance(dtype, np.dtype) and dtype.kind in _MAPPED_KINDS:
+            groups.setdefault(dtype, []).append(loc)
+        else:
+            groups.setdefault(np.dtype(object), []).append(loc)
+
+    blocks = []
+
+    for i, (dtype, locs) in enumerate(sorted(groups.items(),
+                                             key=lambda item: item[0].str)):
+
+        # Rows of the array are columns of the table
+        values = np.empty((len(locs), df.shape[0]), dtype=dtype)
+
+        for row, loc in enumerate(locs):
+            values[row, :] = df.iloc[:, loc].values
+
+        kind = _store_array(sheets_dir, sheet_key, i, values)
+        blocks.append((kind, locs))
+
+    index_kind = _store_array(sheets_dir, sheet_key, "index", df.index.values)
+
+    meta = {"columns": list(df.columns),
+            "columns_name": df.columns.name,
+            "blocks": blocks,
+            "index_name": df.index.name,
+            "index_kind": index_kind}
+
+    # The meta file is written last, marking the sheet as complete
+    meta_path = os.path.join(sheets_dir, "{}.meta".format(sheet_key))
+    write_atomic(meta_path, lambda f: pickle.dump(meta, f, 2))
+
+    return
+
+
+def _store_array(sheets_dir, sheet_key, name, values):
+
+    kind = "object" if values.dtype.kind == 'O' else "numeric"
+    path = os.path.join(sheets_dir, "{}.{}.npy".format(sheet_key, name))
+
+    write_atomic(path, lambda f: np.save(f, values, allow_pickle=True))
+
+    return kind
+
+
+def _load_array(sheets_dir, sheet_key, name, kind):
+
+    path = os.path.join(sheets_dir, "{}.{}.npy".format(sheet_key, name))
+
+    if kind == "object": return np.load(path, allow_pickle=True)
+
+    return np.load(path, mmap_mode='c')
+
+
+def _make_dirs(path):
+
+    if os.path.isdir(path): return
+
+    # Another process may create the directory first
+    try:
+        os.makedirs(path)
+    except OSError:
+        if not os.path.isdir(path): raise
+
+    return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -21,17 +21,31 @@
 .. moduleauthor:: Pedro Vicente <pedro.vicente@wavec.org>
 """
 
-from check_vessels import check_vess
-from check_equipments import check_rov, check_divers, check_cable_burial, check_excavating, check_mattress, \
-    check_rockfilterbags, check_splitpipes, check_hammer, check_drillingrigs, check_vibrodriver
-from check_portsDB import check_ports
-
-from check_user_inputs import check_site, check_metocean, check_device, check_subdevice, check_landfall, check_entry_point
-from check_hydrodynamics import check_hydro
-from check_MF import check_found, check_ln
-from check_electrical import check_collect, check_dynamic_cable, check_static_cable, check_cable_route, check_connectors, check_external_protection, check_layout
-
-
+from check_rules import check_rules
+from check_equipments import (ROV_RULES,
+                              DIVERS_RULES,
+                              CABLE_BURIAL_RULES,
+                              EXCAVATING_RULES,
+                              MATTRESS_RULES,
+                              ROCK_FILTER_BAGS_RULES,
+                              SPLIT_PIPES_RULES,
+                              HAMMER_RULES,
+                              DRILLING_RIGS_RULES,
+                              VIBRO_DRIVER_RULES)
+from check_portsDB import PORT_RULES
+from check_user_inputs import (SITE_RULES,
+                               METOCEAN_RULES,
+                               DEVICE_RULES,
+                               SUB_DEVICE_RULES,
+                               LANDFALL_RULES,
+                               ENTRY_POINT_RULES)
+from check_hydrodynamics import HYDRO_RULES
+from check_MF import FOUNDATION_RULES, LINE_RULES
+from check_electrical import (COLLECTION_POINT_RULES,
+                              DYNAMIC_CABLE_RULES,
+                              STATIC_CABLE_RULES,
+                              CONNECTOR_RULES,
+                              EXTERNAL_PROTECTION_RULES)
 
 
 def input_check(vessels, equipments, ports,
@@ -49,161 +63,60 @@ def input_check(vessels, equipments, ports,
     # collect all warning messages rather than print
     warning_list = []
 
-#    # Vessels databases:
-#    Input_module = 'Vessels'
-#    Input_DB = vessels
-#    ERROR_IN_MODULE, warning_list =  check_vess(Input_DB, Input_module, warning_list)
-#    if ERROR_IN_MODULE:
-#        ERROR_IN_INPUT = True
-
-    # Equipments databases:
-    Input_module = 'Equipments/rov'
-    Input_DB = equipments['rov'].panda
-    ERROR_IN_MODULE, warning_list =  check_rov(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/divers'
-    Input_DB = equipments['divers'].panda
-    ERROR_IN_MODULE, warning_list =  check_divers(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/cable_burial'
-    Input_DB = equipments['cable burial'].panda
-    ERROR_IN_MODULE, warning_list =  check_cable_burial(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/excavating'
-    Input_DB = equipments['excavating'].panda
-    ERROR_IN_MODULE, warning_list =  check_excavating(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/mattress'
-    Input_DB = equipments['mattress'].panda
-    ERROR_IN_MODULE, warning_list =  check_mattress(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/rockfilterbags'
-    Input_DB = equipments['rock filter bags'].panda
-    ERROR_IN_MODULE, warning_list =  check_rockfilterbags(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/splitpipes'
-    Input_DB = equipments['split pipe'].panda
-    ERROR_IN_MODULE, warning_list =  check_splitpipes(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/hammer'
-    Input_DB = equipments['hammer'].panda
-    ERROR_IN_MODULE, warning_list =  check_hammer(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/drillingrigs'
-    Input_DB = equipments['drilling rigs'].panda
-    ERROR_IN_MODULE, warning_list =  check_drillingrigs(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Equipments/vibrodriver'
-    Input_DB = equipments['vibro driver'].panda
-    ERROR_IN_MODULE, warning_list =  check_vibrodriver(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-
-
-    # Ports databases:
-    Input_module = 'Ports'
-    Input_DB = ports
-    ERROR_IN_MODULE, warning_list =  check_ports(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-
-    # User inputs:
-    Input_module = 'User Inputs/site'
-    Input_DB = site
-    ERROR_IN_MODULE, warning_list =  check_site(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'User Inputs/metocean'
-    Input_DB = metocean
-    ERROR_IN_MODULE, warning_list =  check_metocean(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'User Inputs/device'
-    Input_DB = device
-    ERROR_IN_MODULE, warning_list =  check_device(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'User Inputs/sub_device'
-    Input_DB = sub_device
-    ERROR_IN_MODULE, warning_list =  check_subdevice(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'User Inputs/landfall'
-    Input_DB = landfall
-    ERROR_IN_MODULE, warning_list =  check_landfall(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'User Inputs/entry_point'
-    Input_DB = entry_point
-    ERROR_IN_MODULE, warning_list =  check_entry_point(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-
-
-    # Hydrodynamics inputs:
-    Input_module = 'Hydrodynamics'
-    Input_DB = layout
-    ERROR_IN_MODULE, warning_list =  check_hydro(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-
-    # Electrical inputs:
-    Input_module = 'Electrical/collection_point'
-    Input_DB = collection_point
-    ERROR_IN_MODULE, warning_list =  check_collect(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Electrical/dynamic_cable'
-    Input_DB = dynamic_cable
-    ERROR_IN_MODULE, warning_list =  check_dynamic_cable(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Electrical/static_cable'
-    Input_DB = static_cable
-    ERROR_IN_MODULE, warning_list =  check_static_cable(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    # Input_module = 'Electrical/cable_route'
-    # Input_DB = cable_route
-    # ERROR_IN_MODULE, warning_list =  check_cable_route(Input_DB, Input_module, warning_list)
-    # if ERROR_IN_MODULE:
-    #     ERROR_IN_INPUT = True
-    Input_module = 'Electrical/connectors'
-    Input_DB = connectors
-    ERROR_IN_MODULE, warning_list =  check_connectors(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'Electrical/external_protection'
-    Input_DB = external_protection
-    ERROR_IN_MODULE, warning_list =  check_external_protection(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-#    Input_module = 'Electrical/topology'
-#    Input_DB = topology
-#    ERROR_IN_MODULE, warning_list =  check_layout(Input_DB, Input_module, warning_list)
-#    if ERROR_IN_MODULE:
-#        ERROR_IN_INPUT = True
-
-    # Moorings and Foundations inputs:
-    Input_module = 'MF/line'
-    Input_DB = line
-    ERROR_IN_MODULE, warning_list =  check_ln(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-    Input_module = 'MF/foundation'
-    Input_DB = foundation
-    ERROR_IN_MODULE, warning_list =  check_found(Input_DB, Input_module, warning_list)
-    if ERROR_IN_MODULE:
-        ERROR_IN_INPUT = True
-
-
-    return ERROR_IN_INPUT, warning_list
\ No newline at end of file
+    # (Input_module, Input_DB, rules) for each checked table. The vessels
+    # (VESSEL_RULES), cable route (CABLE_ROUTE_RULES) and electrical
+    # topology (LAYOUT_RULES) tables are not checked.
+    input_tables = [
+        ('Equipments/rov', equipments['rov'].panda, ROV_RULES),
+        ('Equipments/divers', equipments['divers'].panda, DIVERS_RULES),
+        ('Equipments/cable_burial',
+         equipments['cable burial'].panda,
+         CABLE_BURIAL_RULES),
+        ('Equipments/excavating',
+         equipments['excavating'].panda,
+         EXCAVATING_RULES),
+        ('Equipments/mattress', equipments['mattress'].panda, MATTRESS_RULES),
+        ('Equipments/rockfilterbags',
+         equipments['rock filter bags'].panda,
+         ROCK_FILTER_BAGS_RULES),
+        ('Equipments/splitpipes',
+         equipments['split pipe'].panda,
+         SPLIT_PIPES_RULES),
+        ('Equipments/hammer', equipments['hammer'].panda, HAMMER_RULES),
+        ('Equipments/drillingrigs',
+         equipments['drilling rigs'].panda,
+         DRILLING_RIGS_RULES),
+        ('Equipments/vibrodriver',
+         equipments['vibro driver'].panda,
+         VIBRO_DRIVER_RULES),
+        ('Ports', ports, PORT_RULES),
+        ('User Inputs/site', site, SITE_RULES),
+        ('User Inputs/metocean', metocean, METOCEAN_RULES),
+        ('User Inputs/device', device, DEVICE_RULES),
+        ('User Inputs/sub_device', sub_device, SUB_DEVICE_RULES),
+        ('User Inputs/landfall', landfall, LANDFALL_RULES),
+        ('User Inputs/entry_point', entry_point, ENTRY_POINT_RULES),
+        ('Hydrodynamics', layout, HYDRO_RULES),
+        ('Electrical/collection_point',
+         collection_point,
+         COLLECTION_POINT_RULES),
+        ('Electrical/dynamic_cable', dynamic_cable, DYNAMIC_CABLE_RULES),
+        ('Electrical/static_cable', static_cable, STATIC_CABLE_RULES),
+        ('Electrical/connectors', connectors, CONNECTOR_RULES),
+        ('Electrical/external_protection',
+         external_protection,
+         EXTERNAL_PROTECTION_RULES),
+        ('MF/line', line, LINE_RULES),
+        ('MF/foundation', foundation, FOUNDATION_RULES)]
+
+    for Input_module, Input_DB, rules in input_tables:
+
+        ERROR_IN_MODULE, warning_list = check_rules(Input_DB,
+                                                    rules,
+                                                    Input_module,
+                                                    warning_list)
+
+        if ERROR_IN_MODULE:
+            ERROR_IN_INPUT = True
+
+    return ERROR_IN_INPUT, warning_list
@@ -15,24 +15,21 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import timeit
 from ..phases import VesselType
+from ..performance.instrumentation import timed
 
 
+@timed("safety_factors")
 def safety_factors(ports, vessels_0, equipments, port_sf, vessel_sf, eq_sf):
 
     # PORT:
-    start_time_sf = timeit.default_timer()
     for indx_param, row_param in port_sf.iterrows():
         # print 'indx_param: ' + str(indx_param) # DEBUGGING
 
         param2change = port_sf['Port parameter and unit [-]'][indx_param]
         ports.loc[:,param2change] /= ( 1 + port_sf['Safety factor (in %) [-]'][indx_param] )
-    stop_time_sf = timeit.default_timer()
-    # print 'PORTS Safety factors simulation time [s]: ' + str(stop_time_sf - start_time_sf) # DEBUG!
 
     # VESSEL:
-    start_time_sf = timeit.default_timer()
     for indx_param, row_param in vessel_sf.iterrows():
         # print 'indx_param: ' + str(indx_param) # DEBUGGING
 
@@ -59,12 +56,9 @@ def safety_factors(ports, vessels_0, equipments, port_sf, vessel_sf, eq_sf):
                'PSV': VesselType("Platform Supply Vessel", pd_vessel[pd_vessel['Vessel type [-]'] == 'Platform Support Vessel']),
                'Helicopter': VesselType("Helicopter", pd_vessel[pd_vessel['Vessel type [-]'] == 'Helicopter'])
                }
-    stop_time_sf = timeit.default_timer()
-    # print 'VESSELS Safety factors simulation time [s]: ' + str(stop_time_sf - start_time_sf) # DEBUG!
 
 
     # EQUIPMENT:
-    start_time_sf = timeit.default_timer()
     for indx_param, row_param in eq_sf.iterrows():
         # print 'indx_param: ' + str(indx_param) # DEBUGGING
 
@@ -77,8 +71,6 @@ def safety_factors(ports, vessels_0, equipments, port_sf, vessel_sf, eq_sf):
                 # equipments[indx_eqs_type].panda[ param2change ][indx_eqs] /= ( 1 + eq_sf['Safety factor (in %) [-]'][indx_param] )
                 equipments[indx_eqs_type].panda.loc[:,param2change ] /= ( 1 + eq_sf['Safety factor (in %) [-]'][indx_param] )
 
-    stop_time_sf = timeit.default_timer()
-    # print 'EQUIPS Safety factors simulation time [s]: ' + str(stop_time_sf - start_time_sf) # DEBUG!
 
 
 
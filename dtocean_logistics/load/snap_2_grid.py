@@ -23,7 +23,6 @@ Created on Mon Sep 19 15:45:22 2016
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
-from scipy import spatial
 import numpy as np
 
 
@@ -31,6 +30,9 @@ class SnapToGrid(object):
     
     def __init__(self, grid_points):
         
+        # Imported here to keep scipy out of the import time of the package
+        from scipy import spatial
+        
         self._grid = np.array(grid_points[['x coord [m]', 'y coord [m]']])
         self._tree = spatial.cKDTree(self._grid)
         
@@ -44,3 +46,55 @@ class SnapToGrid(object):
         new_coords = [float(i) for i in new_coords]
         
         return tuple(new_coords)
+
+
+class SitePoints(object):
+    
+    """Solution invariant lookups into the site grid. The snapping tree and
+    the (x, y, zone) index are built once and shared by all the solutions of
+    a logistic phase, through the site_points attribute of the PhasePlan
+    passed to the installation schedulers, rather than filtering the full
+    site table for every element of every solution."""
+    
+    def __init__(self, site):
+        
+        self._site = site
+        self._snap_to_grid = None
+        self._snapped = {}
+        self._index = {}
+        
+        site_keys = zip(site['x coord [m]'].tolist(),
+                        site['y coord [m]'].tolist(),
+                        site['zone [-]'].tolist())
+        
+        # Keep the first matching row, as with a filtered table and iloc[0]
+        for pos, key in enumerate(site_keys):
+            self._index.setdefault(key, pos)
+        
+        return
+    
+    def snap(self, point):
+        
+        point = tuple(point)
+        
+        if point in self._snapped: return self._snapped[point]
+        
+        if self._snap_to_grid is None:
+            self._snap_to_grid = SnapToGrid(self._site)
+        
+        new_coords = self._snap_to_grid(point)
+        self._snapped[point] = new_coords
+        
+        return new_coords
+    
+    def get_value(self, x, y, zone, column):
+        
+        key = (x, y, zone)
+        
+        if key not in self._index:
+            
+            errStr = ("No site point found at coordinates ({}, {}) in zone "
+                      "{}").format(x, y, zone)
+            raise IndexError(errStr)
+        
+        return self._site[column].iat[self._index[key]]
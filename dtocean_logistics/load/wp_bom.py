@@ -30,7 +30,7 @@ the temporary .xlsx and .csv files to the final SQL solution.
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
-import pandas as pd
+from .db_cache import open_workbook
 
 
 def load_user_inputs(file_path_device):
@@ -47,7 +47,7 @@ def load_user_inputs(file_path_device):
      dictionnary containing all required inputs to WP5 coming from WP1/end-user
     """
     # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path_device)
+    excel = open_workbook(file_path_device)
 
     # Collect data from a particular .xls tab
     site = excel.parse('site', header=0, index_col=0)
@@ -75,7 +75,7 @@ def load_hydrodynamic_outputs(file_path):
      dictionnary containing all required inputs to WP5 coming from WP2
     """
     # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
 
     # Collect data from a particular tab
     layout = excel.parse('Units', header=0, index_col=0)
@@ -97,7 +97,7 @@ def load_electrical_outputs(file_path):
      dictionnary containing all required inputs to WP5 coming from WP3
     """
     # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
 
     # Collect data from a particular tab
     collection_point = excel.parse('collection point', header=0, index_col=0)
@@ -126,7 +126,7 @@ def load_MF_outputs(file_path):
      Dataframe containing all required inputs to WP5 coming from WP4
     """
     # Transform the .csv database into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
 
     # Collect data from a particular tab
     line = excel.parse('line', header=0, index_col=0)
@@ -149,7 +149,7 @@ def load_OM_outputs(file_path):
      Dataframe containing all required inputs to WP5 coming from WP6
     """
     # Transform the .xls database into panda type
-    excel = pd.ExcelFile(file_path)
+    excel = open_workbook(file_path)
 
     # Collect data from a particular tab
     om = excel.parse('OM', header=0, index_col=0)
@@ -8,7 +8,6 @@ The function out_plotting plots the results outputed
 
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 
@@ -21,6 +20,8 @@ import numpy as np
 
 def simul_plot_bar(outputs, simul_time, log_phase_description):
 
+    import matplotlib.pyplot as plt
+
     mpl_fig = plt.figure()
 
 
@@ -117,6 +118,8 @@ def simul_plot_bar(outputs, simul_time, log_phase_description):
 
 def simul_plot_pie(outputs, simul_time, log_phase_description):
 
+    import matplotlib.pyplot as plt
+
     mpl_fig = plt.figure()
 
     ax = mpl_fig.add_subplot(121)
@@ -230,6 +233,8 @@ def simul_plot_pie(outputs, simul_time, log_phase_description):
 
 def simul_plot_tables(module, outputs, simul_time):
 
+    import matplotlib.pyplot as plt
+
     # SOLUTION:
     VE_sol = module['VESSELS & EQUIPMENTS']
     Vess_in_sol=[]
@@ -314,16 +319,12 @@ def out_ploting(module, outputs, simul_time, PLOT_FLAG, log_phase_description):
 
 import datetime as dt
 from datetime import timedelta
-import matplotlib.font_manager as font_manager
-import matplotlib.dates
-from matplotlib.dates import MONTHLY, DateFormatter, rrulewrapper, RRuleLocator
-import matplotlib.gridspec as gridspec
-
-from pylab import *
 
 def create_date(year, month, day, hour, minute, second):
     """Creates the date"""
 
+    import matplotlib.dates
+
     date = dt.datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
     mdate = matplotlib.dates.date2num(date)
 
@@ -332,9 +333,16 @@ def create_date(year, month, day, hour, minute, second):
 
 def out_ploting_installation(Installation, logistic_phase_description):
 
+    import matplotlib.pyplot as plt
+    from matplotlib import font_manager
+    from matplotlib.dates import (MONTHLY,
+                                  DateFormatter,
+                                  RRuleLocator,
+                                  rrulewrapper)
+
     # Data
     num_phases = len(Installation['OPERATION'])
-    pos = arange(0.5,(num_phases)/2 + 1.0,0.5)
+    pos = np.arange(0.5,(num_phases)/2 + 1.0,0.5)
 
     ylabels = []
     customDates = []
@@ -370,7 +378,7 @@ def out_ploting_installation(Installation, logistic_phase_description):
     fig = plt.figure()
 
     # ax = subplot2grid((1,3), (0,1), colspan=2)
-    ax = subplot2grid((1,2), (0,1), colspan=1)
+    ax = plt.subplot2grid((1,2), (0,1), colspan=1)
 
     # Plot the data:
     start_date, end_prep_begin_waiting_date, end_waiting_begin_sea_date, end_date = task_dates[ylabels[0]]
@@ -388,7 +396,7 @@ def out_ploting_installation(Installation, logistic_phase_description):
 
     # Format the y-axis
 
-    locsy, labelsy = yticks(pos,ylabels)
+    locsy, labelsy = plt.yticks(pos,ylabels)
     plt.setp(labelsy, fontsize = 12)
 
     # Format the x-axis
@@ -8,7 +8,6 @@ The function out_plotting plots the results outputed
 
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
 
 
@@ -23,6 +22,8 @@ color_VEC = ["lightskyblue", "yellowgreen", "mediumpurple", "red", "blue"] # CON
 
 def plot_bar(PARAM_SET, INPUTS, VARIABLE, OUTPUTS, PARAM):
 
+    import matplotlib.pyplot as plt
+
     mpl_fig = plt.figure()
 
     ax = mpl_fig.add_subplot(111)
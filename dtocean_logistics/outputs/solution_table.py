@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Tables of every solution evaluated for a logistic phase, with one row per
+scheduled and costed solution. The tables are stored in compressed numpy
+.npz files, holding one array per column:
+
+    table = get_solution_table(log_phase, log_phase_id)
+    write_solution_table(table, "Driven.npz")
+    table = read_solution_table("Driven.npz")
+
+The vessels and equipment of a solution are given as "|" separated lists of
+their types, database indices and quantities, in the order of the
+solution's 'VEs' list.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from ..performance.optim_sol import get_schedule_times
+
+module_logger = logging.getLogger(__name__)
+
+# Columns of the solution tables
+SOLUTION_COLUMNS = ["phase",
+                    "strategy",
+                    "seq",
+                    "ind_sol",
+                    "rank",
+                    "vessel types",
+                    "vessel ids",
+                    "vessel quantities",
+                    "equipment types",
+                    "equipment ids",
+                    "equipment quantities",
+                    "prep time [h]",
+                    "waiting time [h]",
+                    "sea operation time [h]",
+                    "sea transit time [h]",
+                    "sea time [h]",
+                    "total time [h]",
+                    "nb of journeys",
+                    "start_dt",
+                    "depart_dt",
+                    "end_dt",
+                    "vessel cost [EUR]",
+                    "equipment cost [EUR]",
+                    "port cost [EUR]",
+                    "fuel cost [EUR]",
+                    "total cost [EUR]"]
+
+# Keys of the solution costs and their columns, in the order used by opt_sol
+# to choose the optimal solution
+_COST_COLUMNS = [("total cost", "total cost [EUR]"),
+                 ("vessel cost", "vessel cost [EUR]"),
+                 ("equipment cost", "equipment cost [EUR]"),
+                 ("port cost", "port cost [EUR]"),
+                 ("fuel cost", "fuel cost [EUR]")]
+
+_TIME_COLUMNS = [("prep time", "prep time [h]"),
+                 ("waiting time", "waiting time [h]"),
+                 ("sea operation time", "sea operation time [h]"),
+                 ("sea transit time", "sea transit time [h]"),
+                 ("sea time", "sea time [h]"),
+                 ("total time", "total time [h]"),
+                 ("nb of journeys", "nb of journeys")]
+
+_DATE_COLUMNS = [("weather windows start_dt", "start_dt"),
+                 ("weather windows depart_dt", "depart_dt"),
+                 ("weather windows end_dt", "end_dt")]
+
+_COLUMNS_KEY = "__columns__"
+
+
+def get_solution_table(log_phase, log_phase_id):
+
+    """Returns a DataFrame of the solutions of a logistic phase after the
+    cost step, with the columns in SOLUTION_COLUMNS. Solutions are ranked by
+    cost as in opt_sol, so the solution of rank 1 is the optimal
+    solution."""
+
+    records = []
+
+    for seq in range(len(log_phase.op_ve)):
+
+        op_ve = log_phase.op_ve[seq]
+
+        for ind_sol in range(len(op_ve.sol)):
+
+            sol = op_ve.sol[ind_sol]
+            sol_cost = op_ve.sol_cost[ind_sol]
+            schedule = sol['schedule']
+
+            record = {"phase": log_phase_id,
+                      "strategy": op_ve.description,
+                      "seq": seq,
+                      "ind_sol": ind_sol}
+            record.update(_get_ve_fields(sol['VEs']))
+
+            times = get_schedule_times(schedule, log_phase_id)
+
+            for key, column in _TIME_COLUMNS:
+                record[column] = times[key]
+
+            for key, column in _DATE_COLUMNS:
+                record[column] = schedule[key]
+
+            for key, column in _COST_COLUMNS:
+                record[column] = sol_cost[key]
+
+            records.append(record)
+
+    table = pd.DataFrame(records, columns=SOLUTION_COLUMNS)
+
+    if table.empty: return table
+
+    sort_columns = [column for _, column in _COST_COLUMNS] + ["ind_sol",
+                                                              "seq"]
+    order = table.sort_values(sort_columns, kind="mergesort").index
+    table.loc[order, "rank"] = np.arange(1, len(table) + 1)
+    table["rank"] = table["rank"].astype(int)
+
+    for _, column in _TIME_COLUMNS[:-1]:
+        table[column] = table[column].astype(float)
+
+    for _, column in _DATE_COLUMNS:
+        table[column] = pd.to_datetime(table[column])
+
+    return table
+
+
+def write_solution_table(table, file_path):
+
+    """Writes a solution table to a compressed .npz file, with one array
+    per column. Text columns are stored as unicode arrays, so the file can
+    be read without unpickling."""
+
+    arrays = {_COLUMNS_KEY: np.array(table.columns, dtype=unicode)}
+
+    for i, column in enumerate(table.columns):
+
+        values = table[column].values
+        if values.dtype.kind == 'O': values = values.astype(unicode)
+
+        arrays["column_{}".format(i)] = values
+
+    np.savez_compressed(file_path, **arrays)
+
+    return
+
+
+def read_solution_table(file_path):
+    """Reads a solution table written by write_solution_table"""
+
+    with np.load(file_path, allow_pickle=False) as data:
+
+        columns = [str(column) for column in data[_COLUMNS_KEY]]
+        values = {column: data["column_{}".format(i)]
+                                        for i, column in enumerate(columns)}
+
+    return pd.DataFrame(values, columns=columns)
+
+
+def _get_ve_fields(ves):
+
+    vessel_types = []
+    vessel_ids = []
+    vessel_quantities = []
+    equipment_types = []
+    equipment_ids = []
+    equipment_quantities = []
+
+    for ve_comb in ves:
+
+        vessel_types.append(ve_comb[0])
+        vessel_ids.append(ve_comb[2].name)
+        vessel_quantities.append(ve_comb[1])
+
+        for eq_comb in ve_comb[3:]:
+            equipment_types.append(eq_comb[0])
+            equipment_ids.append(eq_comb[2].name)
+            equipment_quantities.append(eq_comb[1])
+
+    fields = {"vessel types": _join(vessel_types),
+              "vessel ids": _join(vessel_ids),
+              "vessel quantities": _join(vessel_quantities),
+              "equipment types": _join(equipment_types),
+              "equipment ids": _join(equipment_ids),
+              "equipment quantities": _join(equipment_quantities)}
+
+    return fields
+
+
+def _join(values):
+    return "|".join(str(value) for value in values)
@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Timers and counters for the stages of the logistics pipeline. The
+instruments are disabled by default, in which case the timers and counters
+do nothing. Once enabled, the time spent in each timed stage and the values
+of the counters are recorded against the current logistic phase and can be
+exported as a report:
+
+    from dtocean_logistics.performance import instrumentation
+
+    instrumentation.enable()
+    ...
+    report = instrumentation.get_report()
+    instrumentation.write_report("report.json")
+
+Timers are inclusive, so the time of a stage includes the time of any timed
+stages that it calls.
+
+Hooks, added with add_hook, are called with a ProfileEvent for each
+scheduled solution and each vessel journey whose weather windows are
+searched. Hooks are called whether or not the timers and counters are
+enabled. See the profiling module for a hook that writes a trace file.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import json
+import logging
+import functools
+import timeit
+from collections import namedtuple
+from contextlib import contextmanager
+
+module_logger = logging.getLogger(__name__)
+
+# Name of the phase of timers and counters used outside of a phase
+GLOBAL_PHASE = "global"
+
+# Event passed to the profiling hooks. The stage is "plan" or "weather" for
+# the schedules of the installation solutions, "schedule" for the O&M
+# solutions and "journey" for the vessel journeys of a solution. For
+# journeys, the strategy is "whole" or "combined" for the weather window
+# search used, "none" if no windows were found or "reused" if the journey
+# matches an earlier journey of the solution, n_windows is the number of
+# weather windows searched and olc is the (Hs, Tp, Ws, Cs) operational
+# limits of the windows, where unset limits are given as the maximum of the
+# metocean data.
+ProfileEvent = namedtuple("ProfileEvent", ["phase",
+                                           "stage",
+                                           "seq",
+                                           "ind_sol",
+                                           "journey",
+                                           "elapsed",
+                                           "strategy",
+                                           "n_windows",
+                                           "olc"])
+
+
+class Instruments(object):
+
+    """Store of the timers and counters of each logistic phase"""
+
+    def __init__(self):
+
+        self.enabled = False
+        self._phase = GLOBAL_PHASE
+        self._timers = {}
+        self._counters = {}
+        self._hooks = []
+        self._solution = (None, None)
+
+        return
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Removes the recorded timers and counters"""
+        self._timers = {}
+        self._counters = {}
+
+    @contextmanager
+    def phase(self, name):
+
+        """Context manager recording the timers and counters used within it
+        against the given phase"""
+
+        previous = self._phase
+        self._phase = name
+
+        try:
+            yield
+        finally:
+            self._phase = previous
+
+    def timer(self, name):
+        """Returns a context manager timing its contents as the given
+        stage"""
+        if not self.enabled: return _NULL_CONTEXT
+        return _Timer(self, name)
+
+    def add_hook(self, hook):
+        """Adds a callable that is called with each ProfileEvent"""
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self._hooks.remove(hook)
+
+    def has_hooks(self):
+        return bool(self._hooks)
+
+    def profile(self, stage, seq, ind_sol, phase=None):
+
+        """Returns a context manager firing an event of the given stage for
+        the solution ind_sol of operation sequence seq, timing its contents.
+        Journey events fired within it are given the same solution. If phase
+        is given, it replaces the current phase within the context."""
+
+        if not self._hooks: return _NULL_CONTEXT
+
+        return _Profile(self, stage, seq, ind_sol, phase)
+
+    def fire(self, stage, elapsed, journey=None,
+                                   strategy=None,
+                                   n_windows=None,
+                                   olc=None):
+
+        """Calls the hooks with an event of the current phase and
+        solution"""
+
+        if not self._hooks: return
+
+        seq, ind_sol = self._solution
+        event = ProfileEvent(self._phase,
+                             stage,
+                             seq,
+                             ind_sol,
+                             journey,
+                             elapsed,
+                             strategy,
+                             n_windows,
+                             olc)
+
+        for hook in list(self._hooks): hook(event)
+
+        return
+
+    def add_time(self, name, seconds):
+
+        """Records a call of the given stage of the current phase, lasting
+        the given number of seconds"""
+
+        key = (self._phase, name)
+        record = self._timers.get(key)
+
+        if record is None:
+            self._timers[key] = [1, seconds, seconds]
+            return
+
+        record[0] += 1
+        record[1] += seconds
+        record[2] = max(record[2], seconds)
+
+        return
+
+    def count(self, name, value=1):
+        """Adds value to the given counter of the current phase"""
+
+        if not self.enabled: return
+
+        key = (self._phase, name)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+        return
+
+    def get_report(self):
+
+        """Returns a dictionary of the timers and counters of each phase,
+        and their totals over all phases. Each timer gives the number of
+        calls and the total and maximum time of a call, in seconds."""
+
+        phases = {}
+        totals = {"timers": {}, "counters": {}}
+
+        for (phase, name), (calls, total, most) in self._timers.iteritems():
+
+            phase_timers = phases.setdefault(phase,
+                                             {"timers": {},
+                                              "counters": {}})["timers"]
+            phase_timers[name] = {"calls": calls,
+                                  "total": total,
+                                  "max": most}
+
+            record = totals["timers"].setdefault(name, {"calls": 0,
+                                                        "total": 0.,
+                                                        "max": 0.})
+            record["calls"] += calls
+            record["total"] += total
+            record["max"] = max(record["max"], most)
+
+        for (phase, name), value in self._counters.iteritems():
+
+            phase_counters = phases.setdefault(phase,
+                                               {"timers": {},
+                                                "counters": {}})["counters"]
+            phase_counters[name] = value
+
+            totals["counters"][name] = totals["counters"].get(name, 0) + value
+
+        return {"phases": phases, "totals": totals}
+
+    def write_report(self, file_path):
+        """Writes the report of get_report to a JSON file"""
+
+        with open(file_path, "w") as report_file:
+            json.dump(self.get_report(), report_file, indent=2, sort_keys=True)
+
+        return
+
+
+class _Timer(object):
+
+    def __init__(self, instruments, name):
+        self._instruments = instruments
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = timeit.default_timer()
+        return self
+
+    def __exit__(self, *args):
+        seconds = timeit.default_timer() - self._start
+        self._instruments.add_time(self._name, seconds)
+        return False
+
+
+class _Profile(object):
+
+    def __init__(self, instruments, stage, seq, ind_sol, phase):
+        self._instruments = instruments
+        self._stage = stage
+        self._solution = (seq, ind_sol)
+        self._phase = phase
+        self._previous = None
+        self._start = None
+
+    def __enter__(self):
+
+        self._previous = (self._instruments._phase,
+                          self._instruments._solution)
+
+        if self._phase is not None: self._instruments._phase = self._phase
+        self._instruments._solution = self._solution
+        self._start = timeit.default_timer()
+
+        return self
+
+    def __exit__(self, *args):
+
+        seconds = timeit.default_timer() - self._start
+        self._instruments.fire(self._stage, seconds)
+
+        (self._instruments._phase,
+         self._instruments._solution) = self._previous
+
+        return False
+
+
+class _NullContext(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_NULL_CONTEXT = _NullContext()
+_instruments = Instruments()
+
+
+def get_instruments():
+    """Returns the shared Instruments object"""
+    return _instruments
+
+
+def enable():
+    _instruments.enable()
+
+
+def disable():
+    _instruments.disable()
+
+
+def reset():
+    _instruments.reset()
+
+
+def phase(name):
+    return _instruments.phase(name)
+
+
+def timer(name):
+    return _instruments.timer(name)
+
+
+def add_hook(hook):
+    _instruments.add_hook(hook)
+
+
+def remove_hook(hook):
+    _instruments.remove_hook(hook)
+
+
+def profile(stage, seq, ind_sol, phase=None):
+    return _instruments.profile(stage, seq, ind_sol, phase)
+
+
+def count(name, value=1):
+    _instruments.count(name, value)
+
+
+def get_report():
+    return _instruments.get_report()
+
+
+def write_report(file_path):
+    _instruments.write_report(file_path)
+
+
+def timed(name):
+
+    """Decorator timing every call of the decorated function as the given
+    stage. Disabled instruments only add a test of the enabled flag."""
+
+    def decorator(func):
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+
+            if not _instruments.enabled: return func(*args, **kwargs)
+
+            with _Timer(_instruments, name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -18,7 +18,8 @@
 
 """
 The function opt_sol indicates based on the cost calculation for each solution,
-the minimal cost and respective solution
+the minimal cost and respective solution. The SolutionSelector class keeps the
+solutions with the lowest cost as they are costed.
 
 .. moduleauthor:: Boris Teillant <boris.teillant@wavec.org>
 .. moduleauthor:: Paulo Chainho <paulo@wavec.org>
@@ -26,91 +27,158 @@ the minimal cost and respective solution
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+import heapq
 
-def opt_sol(log_phase, log_phase_id):
+from .instrumentation import count, timed
 
-    # loop over the number of operation sequencing options
-    sol_index_inseq_vec = []
-    for seq in range(len(log_phase.op_ve)):
-        # loop over the number of solutions, i.e feasible combinations of port/vessel(s)/equipment(s)
-        total_cost_vec = []
-        if not len(log_phase.op_ve[seq].sol) == 0: # a strategy with no solutions!
+
+class SolutionSelector(object):
+
+    """Streaming selection of the k solutions of a logistic phase with the
+    lowest cost. Solutions are pushed as they are costed and only the k best
+    are kept, in a bounded heap. Ties are broken by the solution and
+    sequence indices, as in opt_sol. If release is given, it is called with
+    the seq and ind_sol of each solution as soon as it can not be one of the
+    k best."""
+
+    def __init__(self, k=1, release=None):
+
+        if k < 1: raise ValueError("Argument k must be at least one")
+
+        self.k = k
+        self.release = release
+        self._heap = []
+
+        return
+
+    def push(self, sol_cost, seq, ind_sol):
+        """Adds the solution ind_sol of operation sequence seq with the
+        given costs"""
+
+        # The heap holds the negated keys, so the worst kept solution is
+        # at the top
+        key = (-sol_cost['total cost'],
+               -sol_cost['vessel cost'],
+               -sol_cost['equipment cost'],
+               -sol_cost['port cost'],
+               -sol_cost['fuel cost'],
+               -ind_sol,
+               -seq)
+        item = (key, seq, ind_sol)
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+            return
+
+        if item > self._heap[0]: item = heapq.heapreplace(self._heap, item)
+
+        if self.release is None: return
+
+        self.release(item[1], item[2])
+        count("solutions_released")
+
+        return
+
+    def get_best(self):
+        """Returns the (seq, ind_sol) pairs of the kept solutions, from the
+        lowest cost"""
+        return [(seq, ind_sol)
+                    for _, seq, ind_sol in sorted(self._heap, reverse=True)]
+
+
+@timed("opt_sol")
+def opt_sol(log_phase, log_phase_id, selector=None):
+
+    """Returns a dictionary of the results of the solution of the logistic
+    phase with the minimum cost. If selector (SolutionSelector) is given,
+    the best solution it kept is used, otherwise all the costed solutions
+    are compared."""
+
+    if selector is None:
+
+        selector = SolutionSelector()
+
+        for seq in range(len(log_phase.op_ve)):
             for ind_sol in range(len(log_phase.op_ve[seq].sol)):
-                vessel_cost = log_phase.op_ve[seq].sol_cost[ind_sol]['vessel cost']
-                equip_cost = log_phase.op_ve[seq].sol_cost[ind_sol]['equipment cost']
-                port_cost = log_phase.op_ve[seq].sol_cost[ind_sol]['port cost']
-                fuel_cost = log_phase.op_ve[seq].sol_cost[ind_sol]['fuel cost']
-                total_cost = log_phase.op_ve[seq].sol_cost[ind_sol]['total cost']
-                strategy = log_phase.op_ve[seq].description
-                total_cost_vec.append([total_cost, vessel_cost, equip_cost, port_cost, fuel_cost, ind_sol, seq, strategy])
-                # total_cost_vec.append(total_cost)
-                # min_total_cost = min(total_cost_vec)
-                # if min_total_cost == total_cost:
-                #     sol_index_inseq = [total_cost, vessel_cost, equip_cost, port_cost, ind_sol, seq]
-
-            min_total_cost = min(total_cost_vec)
-            sol_index_inseq_vec.append(min_total_cost)
-
-    min_sol_cost_sorted = sorted(sol_index_inseq_vec)
-    # min_sol_cost_sorted = sol_index_inseq_vec
-    # min_sol_cost_sorted.sort()
-    min_total_cost_final_sol = min_sol_cost_sorted[0][0]
-    min_vessel_cost_final_sol = min_sol_cost_sorted[0][1]
-    min_equip_cost_final_sol = min_sol_cost_sorted[0][2]
-    min_port_cost_final_sol = min_sol_cost_sorted[0][3]
-    min_fuel_cost_final_sol = min_sol_cost_sorted[0][4]
-    sol_nr_final_sol = min_sol_cost_sorted[0][5]
-    seq_final_sol = min_sol_cost_sorted[0][6]
-    strategy_sol = min_sol_cost_sorted[0][7]
+                selector.push(log_phase.op_ve[seq].sol_cost[ind_sol],
+                              seq,
+                              ind_sol)
+
+    seq_final_sol, sol_nr_final_sol = selector.get_best()[0]
+
+    sol_cost = log_phase.op_ve[seq_final_sol].sol_cost[sol_nr_final_sol]
+    strategy_sol = log_phase.op_ve[seq_final_sol].description
 
     sol = log_phase.op_ve[seq_final_sol].sol[sol_nr_final_sol]
-    if log_phase_id == 'LpM6' or log_phase_id == 'LpM7':
-        sol_sched_seaoptime = sol['schedule']['sea time_retrieve'] + \
-                            sol['schedule']['sea time_replace'] - sol['schedule']['transit time']
-        sol_sched_seatransittime = sol['schedule']['transit time']
-        sol_sched_seatime = sol['schedule']['sea time_retrieve'] + \
-                            sol['schedule']['sea time_replace']
-        sol_sched_waitingtime = sum(sol['schedule']['waiting time_retrieve'] \
-                                    + sol['schedule']['waiting time_replace'])
-        sol_sched_preptime = sol['schedule']['prep time_retrieve'] + \
-                             sol['schedule']['prep time_replace']
-        sol_sched_totaltime = sol['schedule']['total time_retrieve'] + \
-                              sol['schedule']['total time_replace']
-        sol_sched_nb_journeys = sol['schedule']['global']['nb of journeys_retrieve'] + \
-                                sol['schedule']['global']['nb of journeys_replace']
-        sol_sched_elems_p_journeys = sol['schedule']['global']['nb of elements per journey']
-    else:
-        sol_sched_seaoptime = sol['schedule']['sea time'] - sol['schedule']['transit time']
-        sol_sched_seatransittime = sol['schedule']['transit time']
-        sol_sched_seatime = sol['schedule']['sea time']
-        sol_sched_waitingtime = sum(sol['schedule']['waiting time'])
-        sol_sched_preptime = sol['schedule']['prep time']
-        sol_sched_totaltime = sol['schedule']['prep time'] + sum(sol['schedule']['waiting time']) + sol['schedule']['sea time']
-        sol_sched_nb_journeys = sol['schedule']['global']['nb of journeys']
-        sol_sched_elems_p_journeys = sol['schedule']['global']['nb of elements per journey']
+    times = get_schedule_times(sol['schedule'], log_phase_id)
 
+    sol_schedule = sol['schedule']
     start_dt = sol['schedule']['weather windows start_dt']
     depart_dt = sol['schedule']['weather windows depart_dt']
     end_dt = sol['schedule']['weather windows end_dt']
 
-    sol = {'total cost': min_total_cost_final_sol,
-           'vessel cost': min_vessel_cost_final_sol,
-           'equipment cost': min_equip_cost_final_sol,
-           'port cost': min_port_cost_final_sol,
-           'fuel cost': min_fuel_cost_final_sol,
-           'schedule sea operation time': sol_sched_seaoptime,
-           'schedule sea transit time': sol_sched_seatransittime,
-           'schedule sea time': sol_sched_seatime,
-           'schedule waiting time': sol_sched_waitingtime,
-           'schedule prep time': sol_sched_preptime,
-           'schedule total time': sol_sched_totaltime,
+    sol = {'total cost': sol_cost['total cost'],
+           'vessel cost': sol_cost['vessel cost'],
+           'equipment cost': sol_cost['equipment cost'],
+           'port cost': sol_cost['port cost'],
+           'fuel cost': sol_cost['fuel cost'],
+           'schedule sea operation time': times['sea operation time'],
+           'schedule sea transit time': times['sea transit time'],
+           'schedule sea time': times['sea time'],
+           'schedule waiting time': times['waiting time'],
+           'schedule prep time': times['prep time'],
+           'schedule total time': times['total time'],
 
            'start_dt': start_dt, 'depart_dt': depart_dt, 'end_dt': end_dt,
 
-           'numb of journeys': sol_sched_nb_journeys,
-           'elems per journey': sol_sched_elems_p_journeys,
+           'numb of journeys': times['nb of journeys'],
+           'elems per journey': times['elems per journey'],
            'logistic operations': sol['schedule']['global'],
            'strategy': strategy_sol,
            'vessel_equipment': sol['VEs']}
 
+    # Weather risk percentiles, if calculated by the schedule
+    if 'weather percentiles' in sol_schedule:
+        sol['weather percentiles'] = sol_schedule['weather percentiles']
+        sol['total cost percentiles'] = sol_cost['total cost percentiles']
+
     return sol
+
+
+def get_schedule_times(schedule, log_phase_id):
+
+    """Returns a dictionary of the sea operation, sea transit, sea, waiting,
+    preparation and total times and the number of journeys and elements per
+    journey of the schedule of a solution"""
+
+    if log_phase_id == 'LpM6' or log_phase_id == 'LpM7':
+        sea_time = schedule['sea time_retrieve'] + \
+                   schedule['sea time_replace']
+        waiting_time = sum(schedule['waiting time_retrieve'] + \
+                           schedule['waiting time_replace'])
+        prep_time = schedule['prep time_retrieve'] + \
+                    schedule['prep time_replace']
+        total_time = schedule['total time_retrieve'] + \
+                     schedule['total time_replace']
+        nb_journeys = schedule['global']['nb of journeys_retrieve'] + \
+                      schedule['global']['nb of journeys_replace']
+    else:
+        sea_time = schedule['sea time']
+        waiting_time = sum(schedule['waiting time'])
+        prep_time = schedule['prep time']
+        total_time = prep_time + waiting_time + sea_time
+        nb_journeys = schedule['global']['nb of journeys']
+
+    transit_time = schedule['transit time']
+
+    times = {'sea operation time': sea_time - transit_time,
+             'sea transit time': transit_time,
+             'sea time': sea_time,
+             'waiting time': waiting_time,
+             'prep time': prep_time,
+             'total time': total_time,
+             'nb of journeys': nb_journeys,
+             'elems per journey':
+                         schedule['global']['nb of elements per journey']}
+
+    return times
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Trace files of the profiling events of the instrumentation module. A
+TraceCollector records a sample of the events in a compressed trace file:
+
+    from dtocean_logistics.performance.profiling import TraceCollector
+
+    with TraceCollector("trace.gz", sample_every=10, min_elapsed=0.1):
+        ...
+
+The most expensive solutions and operational limit conditions of a trace
+can be ranked from the command line:
+
+    python -m dtocean_logistics.performance.profiling trace.gz
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import sys
+import gzip
+import json
+import logging
+import argparse
+
+import pandas as pd
+
+from .instrumentation import ProfileEvent, get_instruments
+
+module_logger = logging.getLogger(__name__)
+
+# Increment if the trace format changes
+_FORMAT_VERSION = 1
+
+# Fields of each trace record. The weight is the number of events that the
+# record represents.
+TRACE_FIELDS = list(ProfileEvent._fields) + ["weight"]
+
+# Stages of the events of whole solutions
+SOLUTION_STAGES = ["plan", "weather", "schedule"]
+
+
+class TraceCollector(object):
+
+    """Profiling hook writing a sample of the events to a gzip compressed
+    trace file. Events lasting at least min_elapsed seconds are always
+    written and one in every sample_every of the other events is written,
+    weighted by sample_every. Used as a context manager, the collector is
+    added to the shared instruments on entry and removed and closed on
+    exit."""
+
+    def __init__(self, file_path, sample_every=1, min_elapsed=None):
+
+        if sample_every < 1:
+            raise ValueError("Argument sample_every must be at least one")
+
+        self.file_path = file_path
+        self.sample_every = sample_every
+        self.min_elapsed = min_elapsed
+        self._n_skipped = 0
+        self._file = gzip.open(file_path, "wb")
+
+        header = {"version": _FORMAT_VERSION, "fields": TRACE_FIELDS}
+        self._file.write(json.dumps(header) + "\n")
+
+        return
+
+    def __call__(self, event):
+
+        if self.min_elapsed is not None and event.elapsed >= self.min_elapsed:
+            self._write(event, 1)
+            return
+
+        self._n_skipped += 1
+
+        if self._n_skipped < self.sample_every: return
+
+        self._n_skipped = 0
+        self._write(event, self.sample_every)
+
+        return
+
+    def __enter__(self):
+        get_instruments().add_hook(self)
+        return self
+
+    def __exit__(self, *args):
+        get_instruments().remove_hook(self)
+        self.close()
+        return False
+
+    def close(self):
+        self._file.close()
+
+    def _write(self, event, weight):
+
+        record = list(event) + [weight]
+        self._file.write(json.dumps(record, separators=(',', ':')) + "\n")
+
+        return
+
+
+def read_trace(file_path):
+
+    """Returns the records of a trace file as a DataFrame with the columns
+    in TRACE_FIELDS. The olc column contains tuples."""
+
+    with gzip.open(file_path, "rb") as trace_file:
+
+        header = json.loads(trace_file.readline())
+
+        if header.get("version") != _FORMAT_VERSION:
+            err_msg = "Unsupported trace file version: {}".format(
+                                                        header.get("version"))
+            raise ValueError(err_msg)
+
+        records = [json.loads(line) for line in trace_file]
+
+    df = pd.DataFrame(records, columns=header["fields"])
+    df["olc"] = [tuple(olc) if olc is not None else None
+                                                        for olc in df["olc"]]
+
+    return df
+
+
+def get_expensive_solutions(trace, top=10):
+
+    """Returns a DataFrame of the solutions with the largest total time in
+    the trace, with the phase, seq and ind_sol of each solution, its
+    estimated total time and number of events, ordered by total time"""
+
+    solutions = trace[trace["stage"].isin(SOLUTION_STAGES)]
+    solutions = solutions.assign(total=solutions["elapsed"] *
+                                                        solutions["weight"])
+
+    grouped = solutions.groupby(["phase", "seq", "ind_sol"])
+    ranked = pd.DataFrame({"total": grouped["total"].sum(),
+                           "events": grouped["weight"].sum()})
+    ranked = ranked.sort_values("total", ascending=False).head(top)
+
+    return ranked.reset_index()[["phase",
+                                 "seq",
+                                 "ind_sol",
+                                 "total",
+                                 "events"]]
+
+
+def get_expensive_olcs(trace, top=10):
+
+    """Returns a DataFrame of the operational limit conditions with the
+    largest total journey time in the trace, with the estimated total time,
+    number of journeys and mean number of weather windows searched, ordered
+    by total time"""
+
+    journeys = trace[trace["stage"] == "journey"]
+    journeys = journeys.assign(total=journeys["elapsed"] *
+                                                        journeys["weight"],
+                               windows=journeys["n_windows"] *
+                                                        journeys["weight"])
+
+    grouped = journeys.groupby("olc")
+    ranked = pd.DataFrame({"total": grouped["total"].sum(),
+                           "journeys": grouped["weight"].sum(),
+                           "windows": grouped["windows"].sum()})
+    ranked["mean windows"] = ranked["windows"] / ranked["journeys"]
+    ranked = ranked.sort_values("total", ascending=False).head(top)
+
+    return ranked.reset_index()[["olc", "total", "journeys", "mean windows"]]
+
+
+def main(argv=None):
+    """Command line interface for summarising a trace file"""
+
+    parser = argparse.ArgumentParser(
+                description="Rank the most expensive solutions and "
+                            "operational limit conditions of a trace file")
+    parser.add_argument("trace_path",
+                        help="trace file written by a TraceCollector")
+    parser.add_argument("-n", "--top",
+                        type=int,
+                        default=10,
+                        help="number of entries to rank (default: 10)")
+
+    args = parser.parse_args(argv)
+
+    trace = read_trace(args.trace_path)
+
+    print "Most expensive solutions:"
+    print get_expensive_solutions(trace, args.top).to_string(index=False)
+    print
+    print "Most expensive operational limit conditions (Hs, Tp, Ws, Cs):"
+    print get_expensive_olcs(trace, args.top).to_string(index=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
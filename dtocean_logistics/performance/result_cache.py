@@ -0,0 +1,542 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Content addressed cache of the results of the installation logistic phases.
+Each phase is split into stages, whose results are keyed by a hash of the
+input tables and columns read by the stage and the keys of the stages it
+depends on, so changing an input only re-runs the stages that read it and
+the stages after them.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import os
+import hashlib
+import logging
+import cPickle as pickle
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from ..ancillaries import (LRUCache,
+                           get_digest,
+                           update_digest,
+                           write_atomic)
+from .instrumentation import count
+from ..phases import EquipmentType, VesselType
+
+module_logger = logging.getLogger(__name__)
+
+# Increment if the stored results change
+_FORMAT_VERSION = 1
+
+# Stages of the installation logistic phases, in order of evaluation:
+#   select: requirements, selection and matching (glob_feas to
+#           compatibility_ve)
+#   plan: schedule of each solution, before weather windows (get_sched_sols)
+#   weather: start dates and weather windows (sched_weather)
+#   cost: solution costs and the optimal solution (cost and opt_sol)
+INSTALL_STAGES = ['select', 'plan', 'weather', 'cost']
+
+# Inputs read by the stages of every installation logistic phase. The
+# vessels, equipments and other_rates inputs are split into the columns (or
+# rows) only read by the cost stage, with a ":cost" suffix, and the rest.
+INSTALL_STAGE_INPUTS = {'select': ['vessels',
+                                   'equipments',
+                                   'site',
+                                   'device',
+                                   'port'],
+                        'plan': ['schedule_OLC',
+                                 'site',
+                                 'entry_point',
+                                 'device',
+                                 'port',
+                                 'other_rates'],
+                        'weather': ['metocean'],
+                        'cost': ['vessels:cost',
+                                 'equipments:cost',
+                                 'other_rates:cost']}
+
+_MF_INPUTS = ['layout', 'line', 'foundation', 'penet_rates']
+_CABLE_INPUTS = ['static_cable',
+                 'cable_route',
+                 'connectors',
+                 'collection_point',
+                 'laying_rates']
+
+# Additional inputs read by the select and plan stages of each installation
+# logistic phase. Phases not listed read every input.
+INSTALL_PHASE_INPUTS = {'Devices': ['sub_device', 'layout'],
+                        'E_export': ['landfall'] + _CABLE_INPUTS,
+                        'E_array': _CABLE_INPUTS,
+                        'E_dynamic': ['dynamic_cable',
+                                      'connectors',
+                                      'collection_point'],
+                        'E_cp_seabed': ['collection_point'],
+                        'E_cp_surface': ['collection_point'],
+                        'E_external': ['external_protection'],
+                        'Driven': _MF_INPUTS,
+                        'Gravity': _MF_INPUTS,
+                        'M_direct': _MF_INPUTS,
+                        'M_suction': _MF_INPUTS,
+                        'M_drag': _MF_INPUTS,
+                        'M_pile': _MF_INPUTS,
+                        'S_structure': ['sub_device', 'layout']}
+
+# Columns of the vessel and equipment tables only read by the cost stage
+VESSEL_COST_COLUMNS = ['Gross tonnage [ton]',
+                       'Consumption [l/h]',
+                       'Consumption towing [l/h]',
+                       'Op max Day Rate [EURO/day]',
+                       'Op min Day Rate [EURO/day]',
+                       'Mob percentage [%]']
+EQUIPMENT_COST_COLUMNS = ['ROV day rate [EURO/day]',
+                          'AE supervisor [-]',
+                          'Supervisor rate [EURO/12h]',
+                          'AE technician [-]',
+                          'Technician rate [EURO/12h]',
+                          'Total day rate [EURO/day]',
+                          'Burial tool day rate [EURO/day]',
+                          'Personnel day rate [EURO/12h]',
+                          'Personnel day rate [EURO/day]',
+                          'Excavator day rate [EURO/day]',
+                          'Cost per unit [EURO]',
+                          'Hammer day rate [EURO/day]',
+                          'Drill rig day rate [EURO/day]',
+                          'Vibro diver day rate [EURO/day]']
+
+# Cost columns of the types reduced to their cheapest entry when matching,
+# which are also read by the select stage
+MATCH_COST_COLUMNS = {'Tugboat': ['Op max Day Rate [EURO/day]',
+                                  'Op min Day Rate [EURO/day]'],
+                      'Multicat': ['Op max Day Rate [EURO/day]',
+                                   'Op min Day Rate [EURO/day]'],
+                      'rov': ['ROV day rate [EURO/day]'],
+                      'split pipe': ['Cost per unit [EURO]']}
+
+# Rows of the other_rates table only read by the cost stage
+COST_RATES = ['Fuel cost rate [EUR/l]', 'Port percentual cost [%]']
+
+# Entries of the install dictionary set by the select and cost stages
+_SELECT_RESULTS = ['requirement', 'eq_select', 've_select', 'combi_select']
+_COST_RESULTS = ['COST', 'optimal']
+
+
+class ResultCache(object):
+
+    """Content addressed store of results. Results are pickled and kept in
+    memory in a bounded LRU cache of at most max_size entries and, if
+    cache_dir is given, in files named by their key, which are shared
+    between runs. Every get returns a new copy of the stored result."""
+
+    def __init__(self, max_size=64, cache_dir=None):
+
+        self.cache_dir = cache_dir
+        self._results = LRUCache(max_size)
+
+        return
+
+    def __contains__(self, key):
+
+        if key in self._results: return True
+        if self.cache_dir is None: return False
+
+        return os.path.isfile(self._get_path(key))
+
+    def get(self, key, default=None):
+
+        data = self._results.get(key)
+
+        if data is None and self.cache_dir is not None:
+            data = self._read(key)
+            if data is not None: self._results.put(key, data)
+
+        if data is None: return default
+
+        return pickle.loads(data)
+
+    def put(self, key, value):
+
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        self._results.put(key, data)
+
+        if self.cache_dir is not None: self._write(key, data)
+
+        return
+
+    def get_stats(self):
+        """Returns the hits, misses, evictions and size of the in memory
+        cache"""
+        return self._results.get_stats()
+
+    def clear(self):
+        """Clears the in memory cache. Stored files are kept."""
+        self._results.clear()
+
+    def _get_path(self, key):
+        return os.path.join(self.cache_dir, "{}.pkl".format(key))
+
+    def _read(self, key):
+
+        try:
+            with open(self._get_path(key), "rb") as result_file:
+                return result_file.read()
+        except IOError:
+            return None
+
+    def _write(self, key, data):
+
+        try:
+
+            if not os.path.isdir(self.cache_dir): os.makedirs(self.cache_dir)
+
+            write_atomic(self._get_path(key),
+                         lambda result_file: result_file.write(data))
+
+        except (IOError, OSError):
+
+            msg = "Could not store result '{}' in '{}'".format(key,
+                                                              self.cache_dir)
+            module_logger.warning(msg)
+
+        return
+
+
+def get_content_digest(value):
+    """Returns a hex digest of the contents of a value, which may be a
+    DataFrame, Series, numpy array, vessel or equipment type or a
+    dictionary, list or tuple of these or other values. Equal contents give
+    equal digests between runs."""
+
+    digest = hashlib.sha1()
+    _update_digest(digest, value)
+
+    return digest.hexdigest()
+
+
+def get_input_digests(**inputs):
+    """Returns a dictionary of the content digests of the given inputs"""
+    return {name: get_content_digest(value)
+                                        for name, value in inputs.iteritems()}
+
+
+def get_install_digests(vessels, equipments, other_rates, **inputs):
+
+    """Returns a dictionary of the content digests of the inputs of the
+    installation logistic phases. The vessels, equipments and other_rates
+    inputs are split into the columns or rows only read by the cost stage,
+    named with a ":cost" suffix, and the rest."""
+
+    digests = get_input_digests(**inputs)
+
+    for name, types, cost_columns in (
+                                ("vessels", vessels, VESSEL_COST_COLUMNS),
+                                ("equipments", equipments,
+                                 EQUIPMENT_COST_COLUMNS)):
+
+        tables = {}
+        cost_tables = {}
+
+        for key, ve_type in types.iteritems():
+
+            panda = ve_type.panda
+            match_columns = MATCH_COST_COLUMNS.get(ve_type.id, [])
+
+            is_cost = panda.columns.isin(cost_columns)
+            is_select = ~is_cost | panda.columns.isin(match_columns)
+
+            tables[key] = (ve_type.id, panda.loc[:, is_select])
+            cost_tables[key] = panda.loc[:, is_cost]
+
+        digests[name] = get_content_digest(tables)
+        digests[name + ":cost"] = get_content_digest(cost_tables)
+
+    is_cost = other_rates.index.isin(COST_RATES)
+
+    digests["other_rates"] = get_content_digest(other_rates[~is_cost])
+    digests["other_rates:cost"] = get_content_digest(other_rates[is_cost])
+
+    return digests
+
+
+class InstallStages(object):
+
+    """Incremental evaluation of the stages of the installation logistic
+    phases (see INSTALL_STAGES), using a ResultCache. The key of each stage
+    is a hash of the inputs it reads (see INSTALL_STAGE_INPUTS and
+    INSTALL_PHASE_INPUTS) and the key of the stage before it. The select
+    stage is also keyed by the select stage of the previous phase, which
+    filters the shared vessel and equipment tables, and the weather stage by
+    the dates after which the phase can start.
+
+    Thus, changing a day rate re-runs the cost stages only, changing the
+    metocean data re-runs the weather and cost stages, and changing the
+    operational limit conditions re-runs all but the select stages. The
+    vessel and equipment rows of restored solutions are replaced with the
+    current rows, so that their costs are up to date.
+
+    Arguments
+    ---------
+    result_cache : ResultCache
+     the cache of the stage results
+    vessels, equipments : dict
+     the vessel and equipment types, shared between the phases
+    other_rates : pandas.DataFrame
+     the other rates table
+    **inputs
+     the other input tables, named as in INSTALL_STAGE_INPUTS and
+     INSTALL_PHASE_INPUTS
+    """
+
+    def __init__(self, result_cache,
+                       vessels,
+                       equipments,
+                       other_rates,
+                       **inputs):
+
+        self.result_cache = result_cache
+        self._types = {"vessels": vessels, "equipments": equipments}
+        self._type_ids = {
+            "vessels": {v.id: v for v in vessels.itervalues()},
+            "equipments": {e.id: e for e in equipments.itervalues()}}
+        self._tables = {(group, key): ve_type.panda
+                            for group, types in self._types.iteritems()
+                                for key, ve_type in types.iteritems()}
+        self._digests = get_install_digests(vessels,
+                                            equipments,
+                                            other_rates,
+                                            **inputs)
+        self._log_phase_id = None
+        self._position = None
+        self._keys = {}
+        self._reused = Counter()
+        self._evaluated = Counter()
+
+        return
+
+    def start_phase(self, log_phase_id, position):
+        """Start the stages of the installation logistic phase at the given
+        (layer, index) position of the installation plan"""
+
+        self._log_phase_id = log_phase_id
+        self._position = tuple(position)
+        self._keys = {'previous': self._keys.get('select')}
+
+        return
+
+    def get_stats(self):
+        """Returns dictionaries of the number of reused and evaluated
+        results of each stage"""
+        return {"reused": dict(self._reused),
+                "evaluated": dict(self._evaluated)}
+
+    def restore(self, stage, install, log_phase):
+
+        """Sets the stored results of the given stage of the current phase
+        in install and log_phase. Returns the stored exit flag of the select
+        and weather stages, the schedules of the plan stage or True for the
+        cost stage, or None if the results are not stored."""
+
+        key = self._get_key(stage, install)
+        stored = self.result_cache.get(key)
+
+        if stored is None:
+            count("cache_misses")
+            return None
+
+        if stage == 'select':
+
+            results, op_ve, nr_sol, indices, value = stored
+
+            install.update(results)
+
+            for seq, (ve_combination, sol) in op_ve.iteritems():
+                log_phase.op_ve[seq].ve_combination = ve_combination
+                log_phase.op_ve[seq].sol = sol
+
+            log_phase.nr_sol_feas, log_phase.nr_sol_match = nr_sol
+
+            for (group, type_key), index in indices.iteritems():
+                self._types[group][type_key].panda = \
+                                self._tables[(group, type_key)].loc[index]
+
+            self._refresh_rows(log_phase)
+
+        elif stage == 'plan':
+
+            value = stored
+
+        elif stage == 'weather':
+
+            install['end_dt'], sols, value = stored
+
+            for seq, sol in sols.iteritems():
+                log_phase.op_ve[seq].sol = sol
+
+            self._refresh_rows(log_phase)
+
+        else:
+
+            install.update(stored)
+
+            for seq, sol_cost in stored['COST'].iteritems():
+                log_phase.op_ve[seq].sol_cost = sol_cost
+
+            value = True
+
+        self._reused[stage] += 1
+        count("cache_hits")
+
+        return value
+
+    def store(self, stage, install, log_phase, value=None):
+
+        """Stores the results of the given stage of the current phase, from
+        install and log_phase. The value is the exit flag of the select and
+        weather stages or the schedules of the plan stage."""
+
+        key = self._get_key(stage, install)
+
+        if stage == 'select':
+
+            results = {name: install[name] for name in _SELECT_RESULTS}
+            op_ve = {seq: (op.ve_combination, op.sol)
+                                    for seq, op in log_phase.op_ve.iteritems()}
+            nr_sol = (log_phase.nr_sol_feas, log_phase.nr_sol_match)
+            indices = {(group, type_key): ve_type.panda.index
+                            for group, types in self._types.iteritems()
+                                for type_key, ve_type in types.iteritems()}
+
+            stored = (results, op_ve, nr_sol, indices, value)
+
+        elif stage == 'plan':
+
+            stored = value
+
+        elif stage == 'weather':
+
+            sols = {seq: op.sol for seq, op in log_phase.op_ve.iteritems()}
+            stored = (install['end_dt'], sols, value)
+
+        else:
+
+            stored = {name: install[name] for name in _COST_RESULTS}
+
+        self.result_cache.put(key, stored)
+        self._evaluated[stage] += 1
+
+        return
+
+    def _get_key(self, stage, install):
+
+        # The weather and cost keys depend on the previous stage keys, which
+        # are only set once the previous stage is restored or stored
+        if stage in self._keys: return self._keys[stage]
+
+        names = list(INSTALL_STAGE_INPUTS[stage])
+
+        if stage in ('select', 'plan'):
+            if self._log_phase_id in INSTALL_PHASE_INPUTS:
+                names += INSTALL_PHASE_INPUTS[self._log_phase_id]
+            else:
+                names = sorted(self._digests)
+
+        parts = [(name, self._digests.get(name)) for name in names]
+
+        if stage == 'select':
+            context = self._keys['previous']
+        elif stage == 'weather':
+            context = (self._keys['plan'], _get_start_context(self._position,
+                                                               install))
+        else:
+            previous = INSTALL_STAGES[INSTALL_STAGES.index(stage) - 1]
+            context = self._keys[previous]
+
+        key = get_digest(_FORMAT_VERSION,
+                         stage,
+                         self._log_phase_id,
+                         self._position,
+                         parts,
+                         context)
+
+        self._keys[stage] = key
+
+        return key
+
+    def _refresh_rows(self, log_phase):
+
+        # Replace the vessel and equipment rows of the solutions with the
+        # rows of the current tables, shared between solutions
+        rows = {}
+
+        for op in log_phase.op_ve.itervalues():
+            for sol in op.sol.itervalues():
+                for ve_comb in sol['VEs']:
+
+                    ve_comb[2] = self._get_row("vessels", ve_comb, rows)
+
+                    for eq_comb in ve_comb[3:]:
+                        eq_comb[2] = self._get_row("equipments",
+                                                   eq_comb,
+                                                   rows)
+
+        return
+
+    def _get_row(self, group, comb, rows):
+
+        key = (group, comb[0], comb[2].name)
+
+        if key not in rows:
+            ve_type = self._type_ids[group][comb[0]]
+            rows[key] = ve_type.panda.ix[comb[2].name]
+
+        return rows[key]
+
+
+def _get_start_context(position, install):
+
+    """Returns a digest of the dates after which the phase at the given
+    position of the installation plan can start, as used by get_start_end
+    of the schedule_ins module"""
+
+    x = position[0]
+    end_dates = []
+
+    if x > min(install['plan']) and x - 1 in install['plan']:
+        end_dates = [outcome['DATE']['End Date']
+                        for outcome in install['plan'][x - 1]
+                                                if isinstance(outcome, dict)]
+
+    return get_content_digest((x == min(install['plan']),
+                               install['end_dt'],
+                               end_dates))
+
+
+def _update_digest(digest, value):
+
+    if not isinstance(value, (VesselType, EquipmentType)):
+        update_digest(digest, value, _update_digest)
+        return
+
+    digest.update(type(value).__name__)
+    _update_digest(digest, value.id)
+    _update_digest(digest, value.panda)
+    digest.update("\0")
+
+    return
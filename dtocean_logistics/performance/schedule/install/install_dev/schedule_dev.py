@@ -38,7 +38,7 @@ import logging
 module_logger = logging.getLogger(__name__)
 
 def sched_dev(seq, ind_sol, install, log_phase, site, entry_point, device, sub_device,
-              layout, sched_sol):
+              layout, sched_sol, plan=None):
     """sched_dev determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
         - the time value duration can be extracted from a direct average
@@ -74,13 +74,15 @@ def sched_dev(seq, ind_sol, install, log_phase, site, entry_point, device, sub_d
 #    """
     if log_phase.op_ve[seq].description == 'On-deck transportation':
         sched_sol = sched_dev_deck(seq, ind_sol, install, log_phase, site, entry_point,
-                                   device, sub_device, layout, sched_sol)
+                                   device, sub_device, layout, sched_sol,
+                                   plan)
 #    """
 #    Towing device transportation
 #    """
     elif log_phase.op_ve[seq].description == 'Towing transportation':
         sched_sol = sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point,
-                                   device, sub_device, layout, sched_sol)          
+                                   device, sub_device, layout, sched_sol,
+                                   plan)          
     else:
         
         msg = ("Unknow device transportation method: {}. Only 'On-deck "
@@ -27,12 +27,13 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import distance, nan2zero
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, sub_device,
-                  layout, sched_sol):
+                  layout, sched_sol, plan=None):
     """
     sched_dev_deck determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
@@ -80,6 +81,10 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
     op_id_demob_jour = {0:[]}
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
+
+    if plan is None: plan = PhasePlan(site)
+    site_points = plan.site_points
+
     # number of devices to install    
     nb_dev = len(layout)
     # number of vessel type in this feasible solution
@@ -123,11 +128,8 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]): # direct value
                 if log_op_prep.description == "Load-out:Lifted away":
@@ -198,14 +200,10 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to element being installed each 'jour'
         id_first_elem = layout.iloc[jour].name
-        UTM_elem = [layout['x coord [m]'].ix[id_first_elem],
-                    layout['y coord [m]'].ix[id_first_elem],
-                    layout['zone [-]'].ix[id_first_elem]]
+        UTM_elem = plan.get_point(layout, id_first_elem)
         site_2_elem_dist = distance(UTM_site,UTM_elem) # distance function returns [km]
         # loop over the nb of vessel types  
         ves_speed = []  
@@ -248,11 +246,8 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
         # Loop over the different offshore logistic operations of elem_id #
         ###################################################################          
         for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]: 
-            # create a panda series suitable for the discrimination
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_sea.time_value,
-                                     log_op_sea.time_function,
-                                     log_op_sea.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_sea)
             olc_method = log_op_sea.olc
             # discriminate between the time assessment methods
             #################################### 
@@ -271,14 +266,12 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
                             olc_trans = [olc_Hs, olc_Tp, olc_Ws, olc_Cs]
                             olc_trans = nan2zero(olc_trans)
                             # SPEED:
-                            UTM_elem = [ layout['x coord [m]'].ix[elem_id],
-                                         layout['y coord [m]'].ix[elem_id],
-                                         layout['zone [-]'].ix[elem_id] ]
+                            UTM_elem = plan.get_point(layout, elem_id)
                             # obtain site depth for the coordinates
-                            site_depth = site[ (site['x coord [m]'] == UTM_elem[0]) & \
-                                               (site['y coord [m]'] == UTM_elem[1]) & \
-                                               (site['zone [-]'] == UTM_elem[2]) ]
-                            location_depth = site_depth['bathymetry [m]'].iloc[0]
+                            location_depth = site_points.get_value(UTM_elem[0],
+                                                                   UTM_elem[1],
+                                                                   UTM_elem[2],
+                                                                   'bathymetry [m]')
                             jackup_speed = ve_combi[0][2].ix['JackUp speed down [m/min]']
                             time_value_ves_pos_min = location_depth / jackup_speed
                             time_value_ves_pos = time_value_ves_pos_min/60.0 # in hour
@@ -339,13 +332,9 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
                     ves_speed = []
                     olc = []                            
                     # extract the coordinates of the lease area entry point
-                    UTM_site = [entry_point['x coord [m]'].ix[0],
-                                entry_point['y coord [m]'].ix[0],
-                                entry_point['zone [-]'].ix[0]]
+                    UTM_site = plan.get_point(entry_point, 0)
                     # extract the coordinates of the current element being installed                                  
-                    UTM_elem = [layout['x coord [m]'].ix[elem_id],
-                                layout['y coord [m]'].ix[elem_id],
-                                layout['zone [-]'].ix[elem_id]]
+                    UTM_elem = plan.get_point(layout, elem_id)
                     # compute distance from last element to the lease area entry point
                     elem_2_site_dist = distance(UTM_elem, UTM_site)                                
                     # loop over the nb of vessel types in the combination
@@ -442,9 +431,7 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types  
@@ -483,11 +470,8 @@ def sched_dev_tow(seq, ind_sol, install, log_phase, site, entry_point, device, s
 
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])  
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
@@ -29,13 +29,14 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import indices, distance, nan2zero
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                   static_cable, cable_route, laying_rates, other_rates,
-                  sched_sol):
+                  sched_sol, plan=None):
     """sched_export determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
         - the time value duration can be extracted from a direct average
@@ -83,9 +84,12 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
 
+    if plan is None: plan = PhasePlan(site, cable_route)
+    site_points = plan.site_points
+    route_index = plan.route_index
+
     # number of cables to install    
-    static_db = static_cable
-    array_db = static_db[static_db['type [-]'] == 'array']
+    array_db = plan.get_table(_get_array_db, static_cable)
     nb_cables = len(array_db)
     # Extract trenching technique
     strategy = log_phase.op_ve[seq].description
@@ -191,11 +195,8 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination 
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]):  # direct value
                 op_dur_prep.append(nb_el_journey[jour]*log_op_prep.time_value)
@@ -259,15 +260,10 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to first element
         id_first_elem = id_el_journey[jour][0]
-        elem_route = cable_route[cable_route['static cable id [-]'] == id_first_elem]
-        UTM_elem = [elem_route['x coord [m]'].iloc[0],
-                    elem_route['y coord [m]'].iloc[0],
-                    elem_route['zone [-]'].iloc[0]]
+        UTM_elem = route_index.get_first_point(id_first_elem)
         site_2_elem_dist = distance(UTM_site,UTM_elem)    
         # loop over the nb of vessel types  
         ves_speed = []      
@@ -311,11 +307,8 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
             # Loop over the different offshore logistic operations of elem_id #
             ###################################################################          
             for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]: 
-                # create a panda series suitable for the discrimination
-                # between type of methods for time assessment
-                time_method = pd.Series([log_op_sea.time_value,
-                                         log_op_sea.time_function,
-                                         log_op_sea.time_other])
+                # get the methods for time assessment
+                time_method = plan.get_time_method(log_op_sea)
                 olc_method = log_op_sea.olc
                 # discriminate between the time assessment methods
                 #################################### 
@@ -334,14 +327,12 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                                 olc_trans = [olc_Hs, olc_Tp, olc_Ws, olc_Cs]
                                 olc_trans = nan2zero(olc_trans)
                                 # SPEED:
-                                UTM_elem = [ array_db['x coord [m]'].ix[elem_id],
-                                             array_db['y coord [m]'].ix[elem_id],
-                                             array_db['zone [-]'].ix[elem_id] ]
+                                UTM_elem = plan.get_point(array_db, elem_id)
                                 # obtain site depth for the coordinates
-                                site_depth = site[ (site['x coord [m]'] == UTM_elem[0]) & \
-                                                   (site['y coord [m]'] == UTM_elem[1]) & \
-                                                   (site['zone [-]'] == UTM_elem[2]) ]
-                                location_depth = site_depth['bathymetry [m]'].iloc[0]
+                                location_depth = site_points.get_value(UTM_elem[0],
+                                                                       UTM_elem[1],
+                                                                       UTM_elem[2],
+                                                                       'bathymetry [m]')
                                 jackup_speed = ve_combi[0][2].ix['JackUp speed down [m/min]']
                                 time_value_ves_pos_min = location_depth / jackup_speed
                                 time_value_ves_pos = time_value_ves_pos_min/60.0 # in hour
@@ -400,22 +391,14 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                 ##############################
                 elif not pd.isnull(time_method[1]): 
                     # obtain the cable route of the cable being installed 'elem_id'
-                    elem_route = cable_route[cable_route['static cable id [-]'] == elem_id]
+                    nb_route_points = route_index.get_n_points(elem_id)
                     # type of function
                     if log_op_sea.time_function == "surface_time":
                         
-                        if route_counter < (len(elem_route)-1):  # excludes the last element from the calculations
-                            # extract route coordinates
-                            x_coord = elem_route['x coord [m]'].iloc[route_counter]
-                            y_coord = elem_route['y coord [m]'].iloc[route_counter]
-                            zone_coord = elem_route['zone [-]'].iloc[route_counter]
-                            UTM_ini = [x_coord, y_coord, zone_coord]             
-                            x_coord_next = elem_route['x coord [m]'].iloc[route_counter+1]
-                            y_coord_next = elem_route['y coord [m]'].iloc[route_counter+1]
-                            zone_coord_next = elem_route['zone [-]'].iloc[route_counter+1]
-                            UTM_fin = [x_coord_next, y_coord_next, zone_coord_next]
+                        if route_counter < (nb_route_points-1):  # excludes the last element from the calculations
                             # compute total lenght and route time
-                            length = distance(UTM_ini,UTM_fin)*1000.0 # [m]
+                            length = route_index.get_segment_length(elem_id,
+                                                                    route_counter)*1000.0 # [m]
                             route_time = length/surface_rate
                             # increment the route counter
                             route_counter = route_counter + 1
@@ -441,17 +424,10 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                         
                     elif log_op_sea.time_function == "pipe_time":
                         
-                        if route_counter < (len(elem_route)-1): # excludes the last element from the calculations                            
-                            x_coord = elem_route['x coord [m]'].iloc[route_counter]
-                            y_coord = elem_route['y coord [m]'].iloc[route_counter]
-                            zone_coord = elem_route['zone [-]'].iloc[route_counter]
-                            UTM_ini = [x_coord, y_coord, zone_coord]                                
-                            x_coord_next = elem_route['x coord [m]'].iloc[route_counter+1]
-                            y_coord_next = elem_route['y coord [m]'].iloc[route_counter+1]
-                            zone_coord_next = elem_route['zone [-]'].iloc[route_counter+1]
-                            UTM_fin = [x_coord_next, y_coord_next, zone_coord_next]
+                        if route_counter < (nb_route_points-1): # excludes the last element from the calculations                            
                             # compute total lenght and route time                           
-                            length = distance(UTM_ini,UTM_fin)*1000.0 # [m]                              
+                            length = route_index.get_segment_length(elem_id,
+                                                                    route_counter)*1000.0 # [m]                              
                             route_time = length/pipe_rate                                
                             # increment the route counter                             
                             route_counter = route_counter + 1
@@ -477,20 +453,14 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                             
                     elif log_op_sea.time_function == "burial_time":       
                         
-                        if route_counter < (len(elem_route)-1):  # excludes the last element from the calculations                                   
-                            x_coord = elem_route['x coord [m]'].iloc[route_counter]
-                            y_coord = elem_route['y coord [m]'].iloc[route_counter]
-                            zone_coord = elem_route['zone [-]'].iloc[route_counter]
-                            UTM_ini = [x_coord, y_coord, zone_coord]                                
-                            x_coord_next = elem_route['x coord [m]'].iloc[route_counter+1]
-                            y_coord_next = elem_route['y coord [m]'].iloc[route_counter+1]
-                            zone_coord_next = elem_route['zone [-]'].iloc[route_counter+1]
-                            UTM_fin = [x_coord_next, y_coord_next, zone_coord_next]
+                        if route_counter < (nb_route_points-1):  # excludes the last element from the calculations                                   
                             # extract burial rate based on the trenching technique and soil type
-                            soil_type = elem_route['soil type [-]'].iloc[route_counter]
+                            soil_type = route_index.get_column(elem_id,
+                                                               'soil type [-]')[route_counter]
                             burial_rate = laying_rates[soil_type][trench_type]
                             # compute total lenght and route time                           
-                            length = distance(UTM_ini,UTM_fin)*1000.0 # [m]
+                            length = route_index.get_segment_length(elem_id,
+                                                                    route_counter)*1000.0 # [m]
                             route_time = length/burial_rate                                
                             # increment the route counter                             
                             route_counter = route_counter + 1
@@ -517,19 +487,13 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                     elif log_op_sea.time_function == "distance":
                         ves_speed = []
                         olc = []                            
-                        # extract the cable route for the cable being installed
-                        current_elem_route = cable_route[cable_route['static cable id [-]'] == elem_id]
                         
                         elem_ix = id_el_journey[jour].index(elem_id)
                         last_elem_ix = len(id_el_journey[jour])-1
                         # extract the coordinates of the lease area entry point
-                        UTM_site = [entry_point['x coord [m]'].ix[0],
-                                    entry_point['y coord [m]'].ix[0],
-                                    entry_point['zone [-]'].ix[0]]
+                        UTM_site = plan.get_point(entry_point, 0)
                         # extract the coordinates of the current element being installed                                  
-                        UTM_elem = [current_elem_route['x coord [m]'].iloc[route_counter],
-                                    current_elem_route['y coord [m]'].iloc[route_counter],
-                                    current_elem_route['zone [-]'].iloc[route_counter]]                            
+                        UTM_elem = route_index.get_point(elem_id, route_counter)
                         # check if it's the last element in the journey
                         if  elem_ix == last_elem_ix:
                             # compute distance from last element to the lease area entry point
@@ -570,10 +534,7 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
                             # extract the id of the next cable being installed in this journey
                             next_elem_id = id_el_journey[jour][elem_ix+1]
                             # extract the inital coordinates of the cable route               
-                            next_elem_route = cable_route[cable_route['static cable id [-]'] == next_elem_id]                            
-                            UTM_next_elem = [next_elem_route['x coord [m]'].iloc[0],
-                                             next_elem_route['y coord [m]'].iloc[0],
-                                             next_elem_route['zone [-]'].iloc[0]]
+                            UTM_next_elem = route_index.get_first_point(next_elem_id)
                             # compute distance from last element to the lease area entry point
                             elem_2_elem_dist = distance(UTM_elem, UTM_next_elem)
                             # loop over the nb of vessel types in the combination
@@ -623,9 +584,7 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types  
@@ -673,11 +632,8 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
     # print op_olc_sea
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
@@ -753,4 +709,12 @@ def sched_e_array(seq, ind_sol, install, log_phase, site, entry_point,
     sched_sol['transit time'] = sum(op_dur_transit)    
     sched_sol['total time'] = sched_sol['prep time'] + sched_sol['sea time'] #+ op_dur_demob_clean
     return sched_sol
-            
\ No newline at end of file
+
+
+def _get_array_db(static_cable):
+    """Returns the table of the array cables to install"""
+
+    static_db = static_cable
+    array_db = static_db[static_db['type [-]'] == 'array']
+
+    return array_db
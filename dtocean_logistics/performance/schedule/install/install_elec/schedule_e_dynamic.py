@@ -27,12 +27,13 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import distance, indices, nan2zero
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
-                    dynamic_cable, other_rates, sched_sol):
+                    dynamic_cable, other_rates, sched_sol, plan=None):
     """sched_export determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
         - the time value duration can be extracted from a direct average
@@ -80,6 +81,9 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
 
+    if plan is None: plan = PhasePlan(site)
+    site_points = plan.site_points
+
     # number of cables to install    
     dynamic_db = dynamic_cable
     nb_cables = len(dynamic_db)
@@ -161,11 +165,8 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination 
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]): # direct value
                 op_dur_prep.append(nb_el_journey[jour]*log_op_prep.time_value)
@@ -225,14 +226,10 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to first element
         id_first_elem = id_el_journey[jour][0]
-        UTM_elem = [dynamic_db['downstream termination x coord [m]'].ix[id_first_elem],
-                    dynamic_db['downstream termination y coord [m]'].ix[id_first_elem],
-                    dynamic_db['downstream termination zone [-]'].ix[id_first_elem]]
+        UTM_elem = plan.get_point(dynamic_db, id_first_elem, 'downstream termination ')
         site_2_elem_dist = distance(UTM_site,UTM_elem)    
         # loop over the nb of vessel types  
         ves_speed = []      
@@ -276,11 +273,8 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
             # Loop over the different offshore logistic operations of elem_id #
             ###################################################################          
             for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]: 
-                # create a panda series suitable for the discrimination
-                # between type of methods for time assessment
-                time_method = pd.Series([log_op_sea.time_value,
-                                         log_op_sea.time_function,
-                                         log_op_sea.time_other])
+                # get the methods for time assessment
+                time_method = plan.get_time_method(log_op_sea)
                 olc_method = log_op_sea.olc
                 # discriminate between the time assessment methods
                 #################################### 
@@ -299,14 +293,12 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
                                 olc_trans = [olc_Hs, olc_Tp, olc_Ws, olc_Cs]
                                 olc_trans = nan2zero(olc_trans)
                                 # SPEED:
-                                UTM_elem = [ dynamic_db['x coord [m]'].ix[elem_id],
-                                             dynamic_db['y coord [m]'].ix[elem_id],
-                                             dynamic_db['zone [-]'].ix[elem_id] ]
+                                UTM_elem = plan.get_point(dynamic_db, elem_id)
                                 # obtain site depth for the coordinates
-                                site_depth = site[ (site['x coord [m]'] == UTM_elem[0]) & \
-                                                   (site['y coord [m]'] == UTM_elem[1]) & \
-                                                   (site['zone [-]'] == UTM_elem[2]) ]
-                                location_depth = site_depth['bathymetry [m]'].iloc[0]
+                                location_depth = site_points.get_value(UTM_elem[0],
+                                                                       UTM_elem[1],
+                                                                       UTM_elem[2],
+                                                                       'bathymetry [m]')
                                 jackup_speed = ve_combi[0][2].ix['JackUp speed down [m/min]']
                                 time_value_ves_pos_min = location_depth / jackup_speed
                                 time_value_ves_pos = time_value_ves_pos_min/60.0 # in hour
@@ -367,14 +359,8 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
                     # type of function
                     if log_op_sea.time_function == "surface_time":
                     
-                        x_coord = dynamic_db['downstream termination x coord [m]'].ix[elem_id]
-                        y_coord = dynamic_db['downstream termination y coord [m]'].ix[elem_id]
-                        zone_coord = dynamic_db['downstream termination zone [-]'].ix[elem_id]
-                        UTM_ini = [x_coord, y_coord, zone_coord]             
-                        x_coord_next = dynamic_db['upstream termination x coord [m]'].ix[elem_id]
-                        y_coord_next = dynamic_db['upstream termination y coord [m]'].ix[elem_id]
-                        zone_coord_next = dynamic_db['upstream termination zone [-]'].ix[elem_id]
-                        UTM_fin = [x_coord_next, y_coord_next, zone_coord_next]
+                        UTM_ini = plan.get_point(dynamic_db, elem_id, 'downstream termination ')
+                        UTM_fin = plan.get_point(dynamic_db, elem_id, 'upstream termination ')
                         # compute total lenght and route time
                         length = distance(UTM_ini,UTM_fin)*1000.0 # [m]
                         route_time = length/surface_rate
@@ -407,13 +393,9 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
                         elem_ix = id_el_journey[jour].index(elem_id)
                         last_elem_ix = len(id_el_journey[jour])-1
                         # extract the coordinates of the lease area entry point
-                        UTM_site = [entry_point['x coord [m]'].ix[0],
-                                    entry_point['y coord [m]'].ix[0],
-                                    entry_point['zone [-]'].ix[0]]
+                        UTM_site = plan.get_point(entry_point, 0)
                         # extract the coordinates of the current element being installed                                  
-                        UTM_elem = [dynamic_db['upstream termination x coord [m]'].ix[elem_id],
-                                    dynamic_db['upstream termination y coord [m]'].ix[elem_id],
-                                    dynamic_db['upstream termination zone [-]'].ix[elem_id]]           
+                        UTM_elem = plan.get_point(dynamic_db, elem_id, 'upstream termination ')
                         # check if it's the last element in the journey
                         if  elem_ix == last_elem_ix:
                             # compute distance from last element to the lease area entry point
@@ -453,9 +435,7 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
                             # extract the id of the next cable being installed in this journey
                             next_elem_id = id_el_journey[jour][elem_ix+1]
                             # extract the inital coordinates of the cable route                                          
-                            UTM_next_elem = [dynamic_db['downstream termination x coord [m]'].ix[next_elem_id],
-                                             dynamic_db['downstream termination y coord [m]'].ix[next_elem_id],
-                                             dynamic_db['downstream termination zone [-]'].ix[next_elem_id] ]     
+                            UTM_next_elem = plan.get_point(dynamic_db, next_elem_id, 'downstream termination ')
                             # compute distance from last element to the lease area entry point
                             elem_2_elem_dist = distance(UTM_elem, UTM_next_elem)
                             # loop over the nb of vessel types in the combination
@@ -504,9 +484,7 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types  
@@ -545,11 +523,8 @@ def sched_e_dynamic(seq, ind_sol, install, log_phase, site, entry_point,
     # print op_olc_sea
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
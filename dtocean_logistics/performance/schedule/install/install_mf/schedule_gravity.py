@@ -30,13 +30,13 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import distance, indices, nan2zero
-from .....load.snap_2_grid import SnapToGrid
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, layout, foundation,
-                  sched_sol):
+                  sched_sol, plan=None):
     """sched_dev_deck determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
         - the time value duration can be extracted from a direct average
@@ -83,14 +83,11 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
     
-    snap_to_grid = SnapToGrid(site)
+    if plan is None: plan = PhasePlan(site)
+    site_points = plan.site_points
 
     # number of gravity anchors to install
-    found_db = foundation
-    gravity_db = found_db[found_db['type [-]'] == 'gravity foundation']
-    gravity_db = gravity_db.append(found_db[found_db['type [-]'] == 'gravity anchor'])
-    gravity_db = gravity_db.append(found_db[found_db['type [-]'] == 'shallow foundation'])
-    gravity_db = gravity_db.append(found_db[found_db['type [-]'] == 'shallow anchor'])
+    gravity_db = plan.get_table(_get_gravity_db, foundation)
     nb_anch = len(gravity_db)
 
     # number of vessel type in this feasible solution
@@ -200,11 +197,8 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
 
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]): # direct value
@@ -253,14 +247,10 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to first element
         id_first_elem = id_el_journey[jour][0]
-        UTM_elem = [gravity_db['x coord [m]'].ix[id_first_elem],
-                    gravity_db['y coord [m]'].ix[id_first_elem],
-                    gravity_db['zone [-]'].ix[id_first_elem]]
+        UTM_elem = plan.get_point(gravity_db, id_first_elem)
         site_2_elem_dist = distance(UTM_site,UTM_elem) # distance function returns [km]
         # loop over the nb of vessel types  
         ves_speed = []  
@@ -303,11 +293,8 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
             # Loop over the different offshore logistic operations of elem_id #
             ###################################################################          
             for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]: 
-                # create a panda series suitable for the discrimination
-                # between type of methods for time assessment
-                time_method = pd.Series([log_op_sea.time_value,
-                                         log_op_sea.time_function,
-                                         log_op_sea.time_other])
+                # get the methods for time assessment
+                time_method = plan.get_time_method(log_op_sea)
                 olc_method = log_op_sea.olc
                 # discriminate between the time assessment methods
                 #################################### 
@@ -326,16 +313,14 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
                                 olc_trans = [olc_Hs, olc_Tp, olc_Ws, olc_Cs]
                                 olc_trans = nan2zero(olc_trans)
                                 # SPEED:
-                                UTM_elem_x = gravity_db['x coord [m]'].ix[elem_id]
-                                UTM_elem_y = gravity_db['y coord [m]'].ix[elem_id]
-                                UTM_zone = gravity_db['zone [-]'].ix[elem_id]
+                                UTM_elem_x, UTM_elem_y, UTM_zone = plan.get_point(gravity_db, elem_id)
                                 # check the closest point in the site data
-                                closest_point = snap_to_grid((UTM_elem_x,UTM_elem_y))
+                                closest_point = site_points.snap((UTM_elem_x,UTM_elem_y))
                                 # obtain site data for the coordinates
-                                site_coord = site[ (site['x coord [m]'] == float( closest_point[0] )) & \
-                                                   (site['y coord [m]'] == float( closest_point[1] )) & \
-                                                   (site['zone [-]'] == UTM_zone) ]
-                                location_depth = site_coord['bathymetry [m]'].iloc[0]
+                                site_x = float( closest_point[0] )
+                                site_y = float( closest_point[1] )
+                                location_depth = site_points.get_value(site_x, site_y, UTM_zone,
+                                                                       'bathymetry [m]')
                                 jackup_speed = ve_combi[0][2].ix['JackUp speed down [m/min]']
                                 time_value_ves_pos_min = location_depth / jackup_speed
                                 time_value_ves_pos = time_value_ves_pos_min/60.0 # in hour
@@ -431,13 +416,9 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
                         elem_ix = id_el_journey[jour].index(elem_id)
                         last_elem_ix = len(id_el_journey[jour])-1                   
                         # extract the coordinates of the lease area entry point
-                        UTM_site = [entry_point['x coord [m]'].ix[0],
-                                    entry_point['y coord [m]'].ix[0],
-                                    entry_point['zone [-]'].ix[0]]
+                        UTM_site = plan.get_point(entry_point, 0)
                         # extract the coordinates of the current element being installed                                  
-                        UTM_elem = [gravity_db['x coord [m]'].ix[elem_id],
-                                    gravity_db['y coord [m]'].ix[elem_id],
-                                    gravity_db['zone [-]'].ix[elem_id]]  
+                        UTM_elem = plan.get_point(gravity_db, elem_id)
                         # check if it's the last element in the journey
                         if  elem_ix == last_elem_ix:
                             # compute distance from last element to the lease area entry point
@@ -446,9 +427,7 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
                             # extract the id of the next element being installed in this journey
                             next_elem_id = id_el_journey[jour][elem_ix+1]      
                             # extract the coordinates of the next element being installed  
-                            UTM_next_elem = [gravity_db['x coord [m]'].ix[next_elem_id],
-                                             gravity_db['y coord [m]'].ix[next_elem_id],
-                                             gravity_db['zone [-]'].ix[next_elem_id] ]                              
+                            UTM_next_elem = plan.get_point(gravity_db, next_elem_id)
                             # compute distance from last element to the lease area entry point
                             dist = distance(UTM_elem, UTM_next_elem)                               
                         # loop over the nb of vessel types in the combination
@@ -486,16 +465,14 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
                     # type of function 
                     elif log_op_sea.time_function == "lowering":
                         # extract the coordinates of the current element being installed
-                        UTM_elem_x = gravity_db['x coord [m]'].ix[elem_id]
-                        UTM_elem_y = gravity_db['y coord [m]'].ix[elem_id]
-                        UTM_zone = gravity_db['zone [-]'].ix[elem_id]
+                        UTM_elem_x, UTM_elem_y, UTM_zone = plan.get_point(gravity_db, elem_id)
                         # check the closest point in the site data
-                        closest_point = snap_to_grid((UTM_elem_x,UTM_elem_y))
+                        closest_point = site_points.snap((UTM_elem_x,UTM_elem_y))
                         # obtain site data for the coordinates
-                        site_coord = site[ (site['x coord [m]'] == float( closest_point[0] )) & \
-                                           (site['y coord [m]'] == float( closest_point[1] )) & \
-                                           (site['zone [-]'] == UTM_zone) ]
-                        ins_depth = site_coord['bathymetry [m]'].iloc[0]
+                        site_x = float( closest_point[0] )
+                        site_y = float( closest_point[1] )
+                        ins_depth = site_points.get_value(site_x, site_y, UTM_zone,
+                                                          'bathymetry [m]')
 
 
                         # obtain operation limit conditions for the operation                  
@@ -548,9 +525,7 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types  
@@ -589,11 +564,8 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
 
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])  
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
@@ -665,5 +637,16 @@ def sched_gravity(seq, ind_sol, install, log_phase, site, entry_point, device, l
     sched_sol['transit time'] = sum(op_dur_transit)
     sched_sol['total time'] = sched_sol['prep time'] + sched_sol['sea time'] #+ op_dur_demob_clean
     return sched_sol
-            
-            
\ No newline at end of file
+
+
+def _get_gravity_db(foundation):
+    """Returns the table of the gravity and shallow foundations and anchors
+    to install"""
+
+    found_db = foundation
+    gravity_db = found_db[found_db['type [-]'] == 'gravity foundation']
+    gravity_db = gravity_db.append(found_db[found_db['type [-]'] == 'gravity anchor'])
+    gravity_db = gravity_db.append(found_db[found_db['type [-]'] == 'shallow foundation'])
+    gravity_db = gravity_db.append(found_db[found_db['type [-]'] == 'shallow anchor'])
+
+    return gravity_db
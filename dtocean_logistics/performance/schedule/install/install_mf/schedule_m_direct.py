@@ -30,13 +30,13 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import distance, indices, nan2zero
-from .....load.snap_2_grid import SnapToGrid
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device, layout, foundation, penet_rates,
-                  sched_sol):
+                  sched_sol, plan=None):
     """sched_dev_deck determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
         - the time value duration can be extracted from a direct average
@@ -83,11 +83,11 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
     
-    snap_to_grid = SnapToGrid(site)
+    if plan is None: plan = PhasePlan(site)
+    site_points = plan.site_points
 
     # number of gravity anchors to install
-    found_db = foundation
-    direct_db = found_db[found_db['type [-]'] == 'direct-embedment anchor']
+    direct_db = plan.get_table(_get_direct_db, foundation)
     nb_anch = len(direct_db)
 
     # number of vessel type in this feasible solution
@@ -193,11 +193,8 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
 
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]): # direct value
@@ -242,14 +239,10 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to first element
         id_first_elem = id_el_journey[jour][0]
-        UTM_elem = [direct_db['x coord [m]'].ix[id_first_elem],
-                    direct_db['y coord [m]'].ix[id_first_elem],
-                    direct_db['zone [-]'].ix[id_first_elem]]
+        UTM_elem = plan.get_point(direct_db, id_first_elem)
         site_2_elem_dist = distance(UTM_site,UTM_elem) # distance function returns [km]
         # loop over the nb of vessel types  
         ves_speed = []  
@@ -292,11 +285,8 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
             # Loop over the different offshore logistic operations of elem_id #
             ################################################################### 
             for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]:  # loop over the nb of offshore logistic operations
-                # create a panda series suitable for the discrimination
-                # between type of methods for time assessment
-                time_method = pd.Series([log_op_sea.time_value,
-                                         log_op_sea.time_function,
-                                         log_op_sea.time_other])
+                # get the methods for time assessment
+                time_method = plan.get_time_method(log_op_sea)
                 olc_method = log_op_sea.olc
 
                 # discriminate between the time assessment methods
@@ -359,13 +349,9 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
                         elem_ix = id_el_journey[jour].index(elem_id)
                         last_elem_ix = len(id_el_journey[jour])-1                   
                         # extract the coordinates of the lease area entry point
-                        UTM_site = [entry_point['x coord [m]'].ix[0],
-                                    entry_point['y coord [m]'].ix[0],
-                                    entry_point['zone [-]'].ix[0]]
+                        UTM_site = plan.get_point(entry_point, 0)
                         # extract the coordinates of the current element being installed                                  
-                        UTM_elem = [direct_db['x coord [m]'].ix[elem_id],
-                                    direct_db['y coord [m]'].ix[elem_id],
-                                    direct_db['zone [-]'].ix[elem_id]]  
+                        UTM_elem = plan.get_point(direct_db, elem_id)
                         # check if it's the last element in the journey
                         if  elem_ix == last_elem_ix:
                             # compute distance from last element to the lease area entry point
@@ -374,9 +360,7 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
                             # extract the id of the next element being installed in this journey
                             next_elem_id = id_el_journey[jour][elem_ix+1]      
                             # extract the coordinates of the next element being installed  
-                            UTM_next_elem = [direct_db['x coord [m]'].ix[next_elem_id],
-                                             direct_db['y coord [m]'].ix[next_elem_id],
-                                             direct_db['zone [-]'].ix[next_elem_id] ]                              
+                            UTM_next_elem = plan.get_point(direct_db, next_elem_id)
                             # compute distance from last element to the lease area entry point
                             dist = distance(UTM_elem, UTM_next_elem)                               
                         # loop over the nb of vessel types in the combination
@@ -427,17 +411,16 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
                         op_time = []
 
 
-                        UTM_elem_x = direct_db['x coord [m]'].ix[elem_id]
-                        UTM_elem_y = direct_db['y coord [m]'].ix[elem_id]
-                        UTM_zone = direct_db['zone [-]'].ix[elem_id]
+                        UTM_elem_x, UTM_elem_y, UTM_zone = plan.get_point(direct_db, elem_id)
                         # check the closest point in the site data
-                        closest_point = snap_to_grid((UTM_elem_x,UTM_elem_y))
+                        closest_point = site_points.snap((UTM_elem_x,UTM_elem_y))
                         # obtain site data for the coordinates
-                        site_coord = site[ (site['x coord [m]'] == float( closest_point[0] )) & \
-                                           (site['y coord [m]'] == float( closest_point[1] )) & \
-                                           (site['zone [-]'] == UTM_zone) ]
-                        soil_type = site_coord['soil type [-]'].iloc[0]
-                        ins_depth = site_coord['bathymetry [m]'].iloc[0]
+                        site_x = float( closest_point[0] )
+                        site_y = float( closest_point[1] )
+                        soil_type = site_points.get_value(site_x, site_y, UTM_zone,
+                                                          'soil type [-]')
+                        ins_depth = site_points.get_value(site_x, site_y, UTM_zone,
+                                                          'bathymetry [m]')
                         depth_of_ins = direct_db['installation depth [m]'].ix[elem_id]
 
 
@@ -488,9 +471,7 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types  
@@ -531,11 +512,8 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
 
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])  
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
@@ -608,5 +586,12 @@ def sched_m_direct(seq, ind_sol, install, log_phase, site, entry_point, device,
     sched_sol['transit time'] = sum(op_dur_transit)
     sched_sol['total time'] = sched_sol['prep time'] + sched_sol['sea time'] #+ op_dur_demob_clean
     return sched_sol
-            
-            
\ No newline at end of file
+
+
+def _get_direct_db(foundation):
+    """Returns the table of the direct-embedment anchors to install"""
+
+    found_db = foundation
+    direct_db = found_db[found_db['type [-]'] == 'direct-embedment anchor']
+
+    return direct_db
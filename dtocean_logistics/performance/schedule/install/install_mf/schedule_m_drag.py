@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 #    Copyright (C) 2016 Boris Teillant, Paulo Chainho
+#    Copyright (C) 2017-2018 Mathew Topper
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -18,6 +19,7 @@
 """
 .. moduleauthor:: Boris Teillant <boris.teillant@wavec.org>
 .. moduleauthor:: Paulo Chainho <paulo@wavec.org>
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
 import math
@@ -27,12 +29,13 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import distance, indices, nan2zero
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, layout, foundation,
-                  sched_sol):
+                  sched_sol, plan=None):
     """sched_dev_deck determines the duration of each individual logistic operations
     for the installtion of ocean energy devices following a common methodology:
         - the time value duration can be extracted from a direct average
@@ -79,9 +82,10 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
 
+    if plan is None: plan = PhasePlan(site)
+
     # number of gravity anchors to install
-    found_db = foundation
-    drag_db = found_db[found_db['type [-]'] == 'drag-embedment anchor']
+    drag_db = plan.get_table(_get_drag_db, foundation)
     nb_anch = len(drag_db)
 
     # number of vessel type in this feasible solution
@@ -194,11 +198,8 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
 
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]): # direct value
@@ -247,14 +248,10 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to first element
         id_first_elem = id_el_journey[jour][0]
-        UTM_elem = [drag_db['x coord [m]'].ix[id_first_elem],
-                    drag_db['y coord [m]'].ix[id_first_elem],
-                    drag_db['zone [-]'].ix[id_first_elem]]
+        UTM_elem = plan.get_point(drag_db, id_first_elem)
         site_2_elem_dist = distance(UTM_site,UTM_elem) # distance function returns [km]
         # loop over the nb of vessel types  
         ves_speed = []  
@@ -296,11 +293,8 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
             # Loop over the different offshore logistic operations of elem_id #
             ################################################################### 
             for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]:  # loop over the nb of offshore logistic operations
-                # create a panda series suitable for the discrimination
-                # between type of methods for time assessment
-                time_method = pd.Series([log_op_sea.time_value,
-                                         log_op_sea.time_function,
-                                         log_op_sea.time_other])
+                # get the methods for time assessment
+                time_method = plan.get_time_method(log_op_sea)
                 olc_method = log_op_sea.olc
                 # discriminate between the time assessment methods                
                 if not pd.isnull(time_method[0]): # default value
@@ -383,13 +377,9 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
                         elem_ix = id_el_journey[jour].index(elem_id)
                         last_elem_ix = len(id_el_journey[jour])-1                   
                         # extract the coordinates of the lease area entry point
-                        UTM_site = [entry_point['x coord [m]'].ix[0],
-                                    entry_point['y coord [m]'].ix[0],
-                                    entry_point['zone [-]'].ix[0]]
+                        UTM_site = plan.get_point(entry_point, 0)
                         # extract the coordinates of the current element being installed                                  
-                        UTM_elem = [drag_db['x coord [m]'].ix[elem_id],
-                                    drag_db['y coord [m]'].ix[elem_id],
-                                    drag_db['zone [-]'].ix[elem_id]]  
+                        UTM_elem = plan.get_point(drag_db, elem_id)
                         # check if it's the last element in the journey
                         if  elem_ix == last_elem_ix:
                             # compute distance from last element to the lease area entry point
@@ -398,9 +388,7 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
                             # extract the id of the next element being installed in this journey
                             next_elem_id = id_el_journey[jour][elem_ix+1]      
                             # extract the coordinates of the next element being installed  
-                            UTM_next_elem = [drag_db['x coord [m]'].ix[next_elem_id],
-                                             drag_db['y coord [m]'].ix[next_elem_id],
-                                             drag_db['zone [-]'].ix[next_elem_id] ]                              
+                            UTM_next_elem = plan.get_point(drag_db, next_elem_id)
                             # compute distance from last element to the lease area entry point
                             dist = distance(UTM_elem, UTM_next_elem)                               
                         # loop over the nb of vessel types in the combination
@@ -448,9 +436,7 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types  
@@ -489,11 +475,8 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
                 
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])  
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
@@ -566,5 +549,12 @@ def sched_m_drag(seq, ind_sol, install, log_phase, site, entry_point, device, la
     sched_sol['transit time'] = sum(op_dur_transit)
     sched_sol['total time'] = sched_sol['prep time'] + sched_sol['sea time'] #+ op_dur_demob_clean
     return sched_sol
-            
-            
\ No newline at end of file
+
+
+def _get_drag_db(foundation):
+    """Returns the table of the drag-embedment anchors to install"""
+
+    found_db = foundation
+    drag_db = found_db[found_db['type [-]'] == 'drag-embedment anchor']
+
+    return drag_db
@@ -30,13 +30,13 @@ import numpy as np
 import pandas as pd
 
 from .....ancillaries import distance, indices, nan2zero
-from .....load.snap_2_grid import SnapToGrid
+from ..phase_plan import PhasePlan
 
 module_logger = logging.getLogger(__name__)
 
 
 def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device, sub_device,
-                   layout, sched_sol):
+                   layout, sched_sol, plan=None):
     """
     sched_dev_deck determines the duration of each individual logistic
     operations for the installtion of ocean energy devices
@@ -85,7 +85,8 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
     op_dur_demob_jour = {0:[]}
     op_olc_jour = {0:[]}
     
-    snap_to_grid = SnapToGrid(site)
+    if plan is None: plan = PhasePlan(site)
+    site_points = plan.site_points
 
     # number of supports to install
     support_db = sub_device.ix['D'] # corresponds to 'D' - support structure
@@ -209,11 +210,8 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
         # determine the duration of the logistic phase preparation before departure of the vessel(s)
         for op_prep in range(nb_op_prep): # loop over the nb of onshore logistic operations
             log_op_prep = log_phase.op_ve[seq].op_seq_prep[op_prep]
-            # create a panda series suitable for the discrimination
-            # between type of methods for time assessment
-            time_method = pd.Series([log_op_prep.time_value,
-                                     log_op_prep.time_function,
-                                     log_op_prep.time_other])
+            # get the methods for time assessment
+            time_method = plan.get_time_method(log_op_prep)
 
             # discriminate between the time assessment methods
             if not pd.isnull(time_method[0]): # direct value
@@ -262,14 +260,10 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
         #########################################################################  
         # obtain distance from port to site
         port_2_site_dist = install['port']['Distance port-site [km]']
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # compute distance from site to first element
         id_first_elem = id_el_journey[jour][0]
-        UTM_elem = [device_db['x coord [m]'].ix[id_first_elem],
-                    device_db['y coord [m]'].ix[id_first_elem],
-                    device_db['zone [-]'].ix[id_first_elem]]
+        UTM_elem = plan.get_point(device_db, id_first_elem)
         site_2_elem_dist = distance(UTM_site,UTM_elem) # distance function returns [km]
         # loop over the nb of vessel types  
         ves_speed = []  
@@ -312,11 +306,8 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
             # Loop over the different offshore logistic operations of elem_id #
             ###################################################################          
             for log_op_sea in log_phase.op_ve[seq].op_seq_sea[elem_id]: 
-                # create a panda series suitable for the discrimination
-                # between type of methods for time assessment
-                time_method = pd.Series([log_op_sea.time_value,
-                                         log_op_sea.time_function,
-                                         log_op_sea.time_other])
+                # get the methods for time assessment
+                time_method = plan.get_time_method(log_op_sea)
                 olc_method = log_op_sea.olc
                 # discriminate between the time assessment methods
                 #################################### 
@@ -335,16 +326,14 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
                                 olc_trans = [olc_Hs, olc_Tp, olc_Ws, olc_Cs]
                                 olc_trans = nan2zero(olc_trans)
                                 # SPEED:
-                                UTM_elem_x = support_db['x coord [m]'].ix[elem_id]
-                                UTM_elem_y = support_db['y coord [m]'].ix[elem_id]
-                                UTM_zone = support_db['zone [-]'].ix[elem_id]
+                                UTM_elem_x, UTM_elem_y, UTM_zone = plan.get_point(support_db, elem_id)
                                 # check the closest point in the site data
-                                closest_point = snap_to_grid((UTM_elem_x,UTM_elem_y))
+                                closest_point = site_points.snap((UTM_elem_x,UTM_elem_y))
                                 # obtain site data for the coordinates
-                                site_coord = site[ (site['x coord [m]'] == float( closest_point[0] )) & \
-                                                   (site['y coord [m]'] == float( closest_point[1] )) & \
-                                                   (site['zone [-]'] == UTM_zone) ]
-                                location_depth = site_coord['bathymetry [m]'].iloc[0]
+                                site_x = float( closest_point[0] )
+                                site_y = float( closest_point[1] )
+                                location_depth = site_points.get_value(site_x, site_y, UTM_zone,
+                                                                       'bathymetry [m]')
                                 jackup_speed = ve_combi[0][2].ix['JackUp speed down [m/min]']
                                 time_value_ves_pos_min = location_depth / jackup_speed
                                 time_value_ves_pos = time_value_ves_pos_min/60.0 # in hour
@@ -408,13 +397,9 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
                         elem_ix = id_el_journey[jour].index(elem_id)
                         last_elem_ix = len(id_el_journey[jour])-1
                         # extract the coordinates of the lease area entry point
-                        UTM_site = [entry_point['x coord [m]'].ix[0],
-                                    entry_point['y coord [m]'].ix[0],
-                                    entry_point['zone [-]'].ix[0]]
+                        UTM_site = plan.get_point(entry_point, 0)
                         # extract the coordinates of the current element being installed                                  
-                        UTM_elem = [device_db['x coord [m]'].ix[elem_id],
-                                    device_db['y coord [m]'].ix[elem_id],
-                                    device_db['zone [-]'].ix[elem_id]]
+                        UTM_elem = plan.get_point(device_db, elem_id)
                         # check if it's the last element in the journey
                         if  elem_ix == last_elem_ix:
                             # compute distance from last element to the lease area entry point
@@ -455,9 +440,7 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
                             # extract the id of the next element being installed in this journey
                             next_elem_id = id_el_journey[jour][elem_ix+1]
                             # extract the inital coordinates of the element                                           
-                            UTM_next_elem = [device_db['x coord [m]'].ix[next_elem_id],
-                                             device_db['y coord [m]'].ix[next_elem_id],
-                                             device_db['zone [-]'].ix[next_elem_id] ]     
+                            UTM_next_elem = plan.get_point(device_db, next_elem_id)
                             # compute distance from last element to the lease area entry point
                             elem_2_elem_dist = distance(UTM_elem, UTM_next_elem)
                             # loop over the nb of vessel types in the combination
@@ -507,9 +490,7 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
         # include transportation from last element to port after each journey #
         #######################################################################  
         # extract site coordinates and last element of the journey coordinates          
-        UTM_site = [entry_point['x coord [m]'].ix[0],
-                    entry_point['y coord [m]'].ix[0],
-                    entry_point['zone [-]'].ix[0]]
+        UTM_site = plan.get_point(entry_point, 0)
         # obtain distance from site to port            
         site_2_port_dist = install['port']['Distance port-site [km]']
         # loop over the nb of vessel types
@@ -548,11 +529,8 @@ def sched_s_struct(seq, ind_sol, install, log_phase, site, entry_point, device,
 
     # add demobilisation time to finalise the logistic phase 
     log_op_demob = log_phase.op_ve[seq].op_seq_demob[0]
-    # create a panda series suitable for the discrimination
-    # between type of methods for time assessment
-    time_method = pd.Series([log_op_demob.time_value,
-                             log_op_demob.time_function,
-                             log_op_demob.time_other])  
+    # get the methods for time assessment
+    time_method = plan.get_time_method(log_op_demob)
     if not pd.isnull(time_method[2]):
         ves_demob_time = []
         for vt in nb_ves_type:
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+from ....load.cable_route import CableRouteIndex
+from ....load.snap_2_grid import SitePoints
+
+
+class PhasePlan(object):
+
+    """Solution invariant inputs of the installation schedulers. A plan is
+    built once per logistic phase by get_sched_sols and passed to the
+    scheduler of every solution of every operation sequence, so only the
+    solution dependent work is repeated per solution.
+
+    The plan holds the site grid lookups (see SitePoints) and the cable route
+    index, and stores the time assessment methods of the logistic
+    operations, the element tables selected from the phase inputs and the
+    coordinates of the elements the first time they are requested."""
+
+    def __init__(self, site, cable_route=None):
+
+        self.site_points = SitePoints(site)
+        self.route_index = None
+
+        if cable_route is not None:
+            self.route_index = CableRouteIndex(cable_route)
+
+        # Inputs are held with the stored values, so their ids are not
+        # reused while the plan exists
+        self._time_methods = {}
+        self._tables = {}
+        self._points = {}
+
+        return
+
+    def get_time_method(self, log_op):
+
+        """Returns the time value, time function and other time method of
+        a logistic operation, of which the first that is not null is used
+        to assess the operation's duration"""
+
+        key = id(log_op)
+
+        if key not in self._time_methods:
+            time_method = (log_op.time_value,
+                           log_op.time_function,
+                           log_op.time_other)
+            self._time_methods[key] = (log_op, time_method)
+
+        return self._time_methods[key][1]
+
+    def get_table(self, select, *args):
+
+        """Returns the result of select(*args), which must only depend on
+        the phase inputs. The result is shared between solutions and must not
+        be modified."""
+
+        key = (select,) + tuple(id(arg) for arg in args)
+
+        if key not in self._tables:
+            self._tables[key] = (args, select(*args))
+
+        return self._tables[key][1]
+
+    def get_point(self, table, label, prefix=""):
+
+        """Returns the [x, y, zone] coordinates of the element of table with
+        the given label, from the columns named with the given prefix"""
+
+        key = (id(table), label, prefix)
+
+        if key not in self._points:
+            point = [table[prefix + 'x coord [m]'].ix[label],
+                     table[prefix + 'y coord [m]'].ix[label],
+                     table[prefix + 'zone [-]'].ix[label]]
+            self._points[key] = (table, point)
+
+        return list(self._points[key][1])
@@ -22,13 +22,16 @@
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
-import timeit
 import logging
 import datetime as dt
-from copy import deepcopy
 from datetime import timedelta
 
-from .schedule_shared import WaitingTime
+from .schedule_shared import (WaitingTime,
+                              get_year_totals,
+                              get_weather_percentiles)
+from ..instrumentation import count, profile, timed, timer
+from ...selection.match import copy_solution
+from .install.phase_plan import PhasePlan
 from ...performance.schedule.install import (sched_dev,
                                              sched_e_export,
                                              sched_e_array,
@@ -48,6 +51,7 @@ from ...performance.schedule.install import (sched_dev,
 module_logger = logging.getLogger(__name__)
 
 
+@timed("sched")
 def sched(x,
           y,
           install,
@@ -70,25 +74,122 @@ def sched(x,
           foundation,
           penet_rates,
           laying_rates,
-          other_rates):
+          other_rates,
+          custom_waiting=None):
 
     # initialisation
-    waiting_time = WaitingTime(metocean)
-
-    # end_dt_last = [] # to make only devices work?!?!?!!!
-        
-    # loop over the number of operations
-    for seq, operation in log_phase.op_ve.iteritems():  
+    if custom_waiting is None:
+        waiting_time = WaitingTime(metocean)
+    else:
+        waiting_time = custom_waiting
+
+    sched_sols = get_sched_sols(install,
+                                log_phase,
+                                log_phase_id,
+                                site,
+                                device,
+                                sub_device,
+                                entry_point,
+                                layout,
+                                collection_point,
+                                dynamic_cable,
+                                static_cable,
+                                cable_route,
+                                external_protection,
+                                foundation,
+                                penet_rates,
+                                laying_rates,
+                                other_rates)
+
+    return sched_weather(x,
+                         install,
+                         log_phase,
+                         sched_sols,
+                         device,
+                         waiting_time)
+
+
+@timed("get_sched_sols")
+def get_sched_sols(install,
+                   log_phase,
+                   log_phase_id,
+                   site,
+                   device,
+                   sub_device,
+                   entry_point,
+                   layout,
+                   collection_point,
+                   dynamic_cable,
+                   static_cable,
+                   cable_route,
+                   external_protection,
+                   foundation,
+                   penet_rates,
+                   laying_rates,
+                   other_rates):
+
+    """Returns a dictionary of the lists of schedules of the solutions of
+    each operation sequence of the logistic phase, before the weather
+    windows are considered"""
+
+    sched_sols = iter_sched_sols(install,
+                                 log_phase,
+                                 log_phase_id,
+                                 site,
+                                 device,
+                                 sub_device,
+                                 entry_point,
+                                 layout,
+                                 collection_point,
+                                 dynamic_cable,
+                                 static_cable,
+                                 cable_route,
+                                 external_protection,
+                                 foundation,
+                                 penet_rates,
+                                 laying_rates,
+                                 other_rates)
+
+    return {seq: list(seq_sched_sols)
+                            for seq, seq_sched_sols in sched_sols.iteritems()}
+
+
+def iter_sched_sols(install,
+                    log_phase,
+                    log_phase_id,
+                    site,
+                    device,
+                    sub_device,
+                    entry_point,
+                    layout,
+                    collection_point,
+                    dynamic_cable,
+                    static_cable,
+                    cable_route,
+                    external_protection,
+                    foundation,
+                    penet_rates,
+                    laying_rates,
+                    other_rates):
+
+    """As get_sched_sols, but returns a dictionary of iterators, which
+    calculate each schedule as it is requested. Passed to sched_weather, only
+    the schedules of the solutions kept by the caller remain in memory."""
+
+    # Solution invariant inputs are prepared once for all the solutions
+    with timer("phase_plan"):
+        
+        if log_phase_id in ['E_export', 'E_array']:
+            plan = PhasePlan(site, cable_route)
+        else:
+            plan = PhasePlan(site)
 
-        new_sol = {}
+    def iter_seq(seq, operation):
 
         # loop over the number of solutions, i.e feasible combinations of
         # port/vessel(s)/equipment(s)
         for ind_sol in range(len(operation.sol)):
             
-            # start_time = timeit.default_timer()  # TIME ASSESSMENT
-            # print 'seq: ' + str(seq) + ', sol: ' + str(ind_sol)
-            
             ve_groups = []
             ve_names = []
             
@@ -105,25 +206,58 @@ def sched(x,
             msgStr = "Vessel & equipment combinations: {}".format(comb_str)
             module_logger.info(msgStr)
             
-            sched_sol = get_sched_sol(log_phase_id,
-                                      seq,
-                                      ind_sol,
-                                      install,
-                                      log_phase,
-                                      site,
-                                      entry_point,
-                                      device,
-                                      sub_device,
-                                      layout,
-                                      static_cable,
-                                      dynamic_cable,
-                                      collection_point,
-                                      external_protection,
-                                      cable_route,
-                                      foundation,
-                                      laying_rates,
-                                      penet_rates,
-                                      other_rates)
+            with profile("plan", seq, ind_sol):
+                sched_sol = get_sched_sol(log_phase_id,
+                                          seq,
+                                          ind_sol,
+                                          install,
+                                          log_phase,
+                                          site,
+                                          entry_point,
+                                          device,
+                                          sub_device,
+                                          layout,
+                                          static_cable,
+                                          dynamic_cable,
+                                          collection_point,
+                                          external_protection,
+                                          cable_route,
+                                          foundation,
+                                          laying_rates,
+                                          penet_rates,
+                                          other_rates,
+                                          plan)
+
+            yield sched_sol
+
+    return {seq: iter_seq(seq, operation)
+                            for seq, operation in log_phase.op_ve.iteritems()}
+
+
+@timed("sched_weather")
+def sched_weather(x,
+                  install,
+                  log_phase,
+                  sched_sols,
+                  device,
+                  waiting_time,
+                  on_solution=None):
+
+    """Adds the start date and weather window delays to the schedules
+    returned by get_sched_sols (or iter_sched_sols), using the given
+    WaitingTime object, and replaces the solutions of the logistic phase
+    with those that have a weather window. If on_solution is given, it is
+    called with the seq, new index and solution of each of these as soon as
+    its schedule is complete."""
+        
+    # loop over the number of operations
+    for seq, operation in log_phase.op_ve.iteritems():  
+
+        new_sol = {}
+
+        # loop over the number of solutions, i.e feasible combinations of
+        # port/vessel(s)/equipment(s)
+        for ind_sol, sched_sol in enumerate(sched_sols[seq]):
             
             rt_dt, end_dt_last = get_start_end(x,
                                                install,
@@ -133,14 +267,15 @@ def sched(x,
             st_exp_dt = rt_dt + dt.timedelta(
                                         hours=float(sched_sol['prep time']))
 
-            journey, WWINDOW_FLAG = waiting_time(log_phase,
-                                                 sched_sol,
-                                                 st_exp_dt)
-
-            # stop_time1 = timeit.default_timer()  # TIME ASSESSMENT   
+            with profile("weather", seq, ind_sol):
+                journey, WWINDOW_FLAG = waiting_time(log_phase,
+                                                     sched_sol,
+                                                     st_exp_dt)
 
             # Loop if no weather window
             if WWINDOW_FLAG == 'NoWWindows': continue
+            
+            prior_waiting = sum(sched_sol['waiting time'])
 
             if not sched_sol['waiting time']:
                 sched_sol['waiting time'] = journey['wait_dur']
@@ -163,16 +298,31 @@ def sched(x,
             sched_sol['weather windows depart_dt'] = departure_dt
             sched_sol['weather windows end_dt'] = end_dt
             
-            old_sol_item = deepcopy(log_phase.op_ve[seq].sol[ind_sol])
+            # Weather risk percentiles, if the per year values were kept
+            year_totals = get_year_totals(journey)
+            
+            if year_totals is not None:
+                
+                year_delay, year_waiting = year_totals
+                
+                sched_sol['weather percentiles'] = get_weather_percentiles(
+                                                waiting_time,
+                                                st_exp_dt,
+                                                year_delay,
+                                                prior_waiting + year_waiting,
+                                                float(sched_sol['sea time']))
+            
+            old_sol_item = copy_solution(log_phase.op_ve[seq].sol[ind_sol])
             old_sol_item['schedule'] = sched_sol
 
             new_sol_idx = len(new_sol)
             new_sol[new_sol_idx] = old_sol_item
-
-            # TIME ASSESSMENT
-            # stop_time = timeit.default_timer()
-            # print 'Solution Duration [s]: ' + str(stop_time - start_time)  
+            
+            if on_solution is not None:
+                on_solution(seq, new_sol_idx, old_sol_item)
         
+        count("solutions_scheduled", len(new_sol))
+
         # Exit if no solutions were found
         if len(new_sol) == 0: return [], log_phase, 'NoWWindows'
         
@@ -202,7 +352,8 @@ def get_sched_sol(log_phase_id,
                   foundation,
                   laying_rates,
                   penet_rates,
-                  other_rates):
+                  other_rates,
+                  plan=None):
     
     sched_sol = {'total time': [],
                  'prep time': [],
@@ -227,7 +378,8 @@ def get_sched_sol(log_phase_id,
                               device,
                               sub_device,
                               layout,
-                              sched_sol)
+                              sched_sol,
+                              plan)
         
     elif log_phase_id == 'E_export':
         
@@ -241,7 +393,8 @@ def get_sched_sol(log_phase_id,
                                    cable_route,
                                    laying_rates,
                                    other_rates,
-                                   sched_sol)
+                                   sched_sol,
+                                   plan)
         
     elif log_phase_id == 'E_array':
         
@@ -255,7 +408,8 @@ def get_sched_sol(log_phase_id,
                                   cable_route,
                                   laying_rates,
                                   other_rates,
-                                  sched_sol)
+                                  sched_sol,
+                                  plan)
         
     elif log_phase_id == 'E_dynamic':
         
@@ -267,7 +421,8 @@ def get_sched_sol(log_phase_id,
                                     entry_point,
                                     dynamic_cable,
                                     other_rates,
-                                    sched_sol)
+                                    sched_sol,
+                                    plan)
         
     elif log_phase_id == 'E_cp_seabed':
         
@@ -278,7 +433,8 @@ def get_sched_sol(log_phase_id,
                                       site,
                                       entry_point,
                                       collection_point,
-                                      sched_sol)
+                                      sched_sol,
+                                      plan)
         
     elif log_phase_id == 'E_cp_surface':
         
@@ -289,7 +445,8 @@ def get_sched_sol(log_phase_id,
                                        site,
                                        entry_point,
                                        collection_point,
-                                       sched_sol)
+                                       sched_sol,
+                                       plan)
         
     elif log_phase_id == 'E_external':
         
@@ -300,7 +457,8 @@ def get_sched_sol(log_phase_id,
                                      site,
                                      entry_point,
                                      external_protection,
-                                     sched_sol)
+                                     sched_sol,
+                                     plan)
         
     elif log_phase_id == 'Driven':
         
@@ -314,7 +472,8 @@ def get_sched_sol(log_phase_id,
                                  foundation,
                                  penet_rates,
                                  other_rates,
-                                 sched_sol)
+                                 sched_sol,
+                                 plan)
         
     elif log_phase_id == 'Gravity':
         
@@ -327,7 +486,8 @@ def get_sched_sol(log_phase_id,
                                   device,
                                   layout,
                                   foundation,
-                                  sched_sol)
+                                  sched_sol,
+                                  plan)
         
     elif log_phase_id == 'M_direct':
         
@@ -341,7 +501,8 @@ def get_sched_sol(log_phase_id,
                                    layout,
                                    foundation,
                                    penet_rates,
-                                   sched_sol)
+                                   sched_sol,
+                                   plan)
         
     elif log_phase_id == 'M_suction':
         
@@ -355,7 +516,8 @@ def get_sched_sol(log_phase_id,
                                     layout,
                                     foundation,
                                     penet_rates,
-                                    sched_sol)
+                                    sched_sol,
+                                    plan)
         
     elif log_phase_id == 'M_drag':
         
@@ -368,7 +530,8 @@ def get_sched_sol(log_phase_id,
                                  device,
                                  layout,
                                  foundation,
-                                 sched_sol)
+                                 sched_sol,
+                                 plan)
         
     elif log_phase_id == 'M_pile':
         
@@ -381,7 +544,8 @@ def get_sched_sol(log_phase_id,
                                  device,
                                  layout,
                                  foundation,
-                                 sched_sol)
+                                 sched_sol,
+                                 plan)
         
     elif log_phase_id == 'S_structure':
         
@@ -394,7 +558,8 @@ def get_sched_sol(log_phase_id,
                                    device,
                                    sub_device,
                                    layout,
-                                   sched_sol)
+                                   sched_sol,
+                                   plan)
         
     else:
         
@@ -24,11 +24,17 @@ Created on Sun Aug 16 11:53:24 2015
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
-import timeit
 import logging
 import datetime as dt
+from collections import OrderedDict, namedtuple
 
-from .schedule_shared import WaitingTime
+import pandas as pd
+
+from .schedule_shared import (WaitingTime,
+                              get_year_totals,
+                              get_weather_percentiles)
+from ..instrumentation import profile
+from ...ancillaries import LRUCache, FrozenDict, get_digest
 from ...performance.schedule.om.schedule_site import sched_site
 from ...performance.schedule.om.schedule_retrieve import sched_retrieve
 from ...performance.schedule.om.schedule_replace import sched_replace
@@ -36,22 +42,97 @@ from ...performance.schedule.om.schedule_replace import sched_replace
 # Set up logging
 module_logger = logging.getLogger(__name__)
 
+# Stands in for the logistic phase when finding weather windows for a plan
+_PhaseLabel = namedtuple('_PhaseLabel', ['description'])
+
+# Columns of the schedule_events results table
+EVENT_COLUMNS = ['event [-]',
+                 'log phase [-]',
+                 'seq [-]',
+                 'solution [-]',
+                 'weather windows start_dt',
+                 'weather windows depart_dt',
+                 'weather windows end_dt',
+                 'prep time',
+                 'sea time',
+                 'waiting time',
+                 'total time',
+                 'schedule']
+
+
+class LegDelays(object):
+    
+    """Wraps a WaitingTime object, memoising the weather window results of
+    the retrieve and replace legs of LpM6 and LpM7 plans by leg and start
+    date. Results are returned as copies."""
+    
+    def __init__(self, waiting_time):
+        
+        self._waiting_time = waiting_time
+        self._results = {}
+        
+        return
+    
+    def get_start_delays(self, log_phase, sched_sol, start_dates):
+        return self._waiting_time.get_start_delays(log_phase,
+                                                   sched_sol,
+                                                   start_dates)
+    
+    def get_percentiles(self, year_values):
+        return self._waiting_time.get_percentiles(year_values)
+    
+    def get_leg_delays(self, leg_key, log_phase, sched_sol, start_dates):
+        
+        """As get_start_delays, but only the start dates not already
+        evaluated for the leg given by leg_key are passed to the WaitingTime
+        object"""
+        
+        missing = []
+        pending = set()
+        
+        for start_date in start_dates:
+            
+            if (leg_key, start_date) in self._results: continue
+            if start_date in pending: continue
+            
+            missing.append(start_date)
+            pending.add(start_date)
+        
+        if missing:
+            
+            results = self._waiting_time.get_start_delays(log_phase,
+                                                          sched_sol,
+                                                          missing)
+            
+            for start_date, result in zip(missing, results):
+                self._results[(leg_key, start_date)] = result
+        
+        return [_copy_delays(self._results[(leg_key, start_date)])
+                                                for start_date in start_dates]
+
 
 class SchedOM(object):
     
-    def __init__(self):
+    """Scheduler for the O&M logistic phases. The site schedules and the
+    retrieve and replace legs calculated for each phase, operation sequence,
+    solution and set of element positions are kept in a bounded LRU cache of
+    at most cache_size entries. Cached schedules are frozen and shared
+    between calls."""
+    
+    def __init__(self, cache_size=1000):
         
-        self._pre_site = {}
-        self._pre_replace = {}
-        self._pre_retrieve = {}
-        self._old_sched = None
-        self._old_sched_log_phase_id = None
-        self._old_sched_seq = None
-        self._old_sched_ind_sol = None
-        self._old_sched_element_IDs = None
+        self._sched_cache = LRUCache(cache_size)
         
         return
     
+    def get_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the schedule
+        cache"""
+        return self._sched_cache.get_stats()
+    
+    def clear_cache(self):
+        self._sched_cache.clear()
+    
     def _get_sched_site(self, log_phase_id,
                               seq,
                               ind_sol,
@@ -62,42 +143,13 @@ class SchedOM(object):
                               om,
                               sched_sol):
         
-        element_IDs = om['element_ID [-]'].unique()
-        x_coord = om['x coord [m]'].astype(float)
-        y_coord = om['y coord [m]'].astype(float)
+        key = get_digest(log_phase_id,
+                         seq,
+                         ind_sol,
+                         _get_om_digest(om))
         
-        if (log_phase_id in self._pre_site and
-            seq in self._pre_site[log_phase_id] and
-            ind_sol in self._pre_site[log_phase_id][seq]):
-            
-            saved_tuples = self._pre_site[log_phase_id][seq][ind_sol]
-            
-            for (test_elements,
-                 test_x_coord,
-                 test_y_coord,
-                 saved_sched_sol) in saved_tuples:
-
-                if (set(element_IDs) == set(test_elements) and
-                    x_coord.equals(test_x_coord) and
-                    y_coord.equals(test_y_coord)):
-                    
-#                    if (self._old_sched is not None and
-#                        self._old_sched_log_phase_id == log_phase_id and
-#                        self._old_sched_seq == seq and
-#                        self._old_sched_ind_sol == ind_sol and
-#                        self._old_sched_element_IDs == set(element_IDs)):
-#                        
-#                        compare_sched(saved_sched_sol,
-#                                      self._old_sched)
-#                        
-#                        self._old_sched = None
-                    
-                    return copy_sched(saved_sched_sol)
-        
-        save_tuple = (element_IDs,
-                      x_coord,
-                      y_coord,
-                      copy_sched(sched_sol))
+        site_sched = self._sched_cache.get(key)
+        if site_sched is not None: return site_sched
         
         sched_sol = sched_site(log_phase_id,
                                seq,
@@ -109,96 +161,256 @@ class SchedOM(object):
                                om,
                                sched_sol)
         
-        save_tuple = (element_IDs,
-                      x_coord,
-                      y_coord,
-                      copy_sched(sched_sol))
-        
-        if log_phase_id in self._pre_site:
+        site_sched = _freeze_sched(sched_sol)
+        self._sched_cache.put(key, site_sched)
         
-            if seq in self._pre_site[log_phase_id]:
-                
-                seq_dict = self._pre_site[log_phase_id][seq]
-                
-                if ind_sol in seq_dict:
-                    seq_dict[ind_sol].append(save_tuple)
-                else:
-                    seq_dict[ind_sol] = [save_tuple]
-            
-            else:
-                
-                save_dict = {ind_sol: [save_tuple]}
-                self._pre_site[log_phase_id][seq] = save_dict
+        return site_sched
+    
+    def _get_base_legs(self, log_phase_id,
+                             seq,
+                             ind_sol,
+                             log_phase,
+                             site,
+                             device,
+                             sub_device,
+                             entry_point,
+                             layout,
+                             om,
+                             sched_sol):
         
-        else:
-            
-            save_dict = {seq: {ind_sol: [save_tuple]}}
-            self._pre_site[log_phase_id] = save_dict
-#        
-#        if self._old_sched is None:
-#            
-#            self._old_sched = deepcopy(sched_sol)
-#            self._old_sched_log_phase_id = log_phase_id
-#            self._old_sched_seq = seq
-#            self._old_sched_ind_sol = ind_sol
-#            self._old_sched_element_IDs = set(element_IDs)
-        
-        return sched_sol
-    
-    def _get_wws_site(self, rt_dt,
-                            waiting_time,
-                            log_phase_id,
-                            seq,
-                            ind_sol,
-                            log_phase,
-                            site,
-                            layout,
-                            entry_point,
-                            om,
-                            sched_sol):
-        
-        sched_sol = self._get_sched_site(log_phase_id,
-                                         seq,
-                                         ind_sol,
-                                         log_phase,
-                                         site,
-                                         layout,
-                                         entry_point,
-                                         om,
-                                         sched_sol)
-        
-        st_exp_dt = rt_dt + dt.timedelta(
-                            hours=float(sched_sol['prep time']))
-                        
-        journey, WWINDOW_FLAG = waiting_time(log_phase,
-                                             sched_sol,
-                                             st_exp_dt)
+        """Returns the cache key and the frozen retrieve and replace legs of
+        a LpM6 or LpM7 solution"""
         
-        # Loop if no weather window
-        if WWINDOW_FLAG == 'NoWWindows':
-            return False
+        key = get_digest('base',
+                         log_phase_id,
+                         seq,
+                         ind_sol,
+                         _get_om_digest(om))
         
-        if not sched_sol['waiting time']:
-            sched_sol['waiting time'] = journey['wait_dur']
-        else:
-            sched_sol['waiting time'] += journey['wait_dur']
+        legs = self._sched_cache.get(key)
+        if legs is not None: return key, legs
         
-        start_delays = journey['start_delay']
-        mean_delay = sum(start_delays) / float(len(start_delays))
+        legs = _get_base_legs(log_phase_id,
+                              seq,
+                              ind_sol,
+                              log_phase,
+                              site,
+                              device,
+                              sub_device,
+                              entry_point,
+                              layout,
+                              om,
+                              sched_sol)
         
-        # Update total time
-        sched_sol['total time'] += [mean_delay] + sched_sol['waiting time']
+        self._sched_cache.put(key, legs)
+        
+        return key, legs
+    
+    def _get_plan(self, log_phase,
+                        log_phase_id,
+                        seq,
+                        ind_sol,
+                        site,
+                        device,
+                        sub_device,
+                        entry_point,
+                        layout,
+                        om):
+        
+        ve_groups = []
+        ve_names = []
+        
+        for ve_comb in log_phase.op_ve[seq].sol[ind_sol]['VEs']:
+            ve_groups.append(ve_comb[0])
+            ve_names.append(ve_comb[2]["Name"])
+        
+        comb_strs = []
+        
+        for group, name in zip(ve_groups, ve_names):
+            comb_strs.append("{}: {}".format(group, name))
+        
+        comb_str = ", ".join(comb_strs)
+        msgStr = "Vessel & equipment combinations: {}".format(comb_str)
+        module_logger.info(msgStr)
+        
+        sched_sol = {'olc': [],
+                     'total time': [],
+                     'prep time': [],
+                     'sea time': [],
+                     'weather windows': [],
+                     'weather windows start_dt': [],
+                     'weather windows depart_dt': [],
+                     'weather windows end_dt': [],
+                     'waiting time': [],
+                     'all': {},
+                     'journey': {},
+                     'transit time': []
+                     }
+        
+        # check the nature of the logistic phase
+        if log_phase_id not in ['LpM6', 'LpM7']:
+            
+            site_sched = self._get_sched_site(log_phase_id,
+                                              seq,
+                                              ind_sol,
+                                              log_phase,
+                                              site,
+                                              layout,
+                                              entry_point,
+                                              om,
+                                              sched_sol)
+            
+            plan = {'type': 'site',
+                    'schedule': site_sched}
         
-        departure_dt = st_exp_dt + dt.timedelta(hours=mean_delay)
-        end_dt = departure_dt + \
-                    dt.timedelta(hours=sched_sol['sea time']) + \
-                        dt.timedelta(hours=sum(sched_sol['waiting time']))
+        else:
+            
+            leg_key, legs = self._get_base_legs(log_phase_id,
+                                                seq,
+                                                ind_sol,
+                                                log_phase,
+                                                site,
+                                                device,
+                                                sub_device,
+                                                entry_point,
+                                                layout,
+                                                om,
+                                                sched_sol)
+            
+            # The repair duration moves the start of the replace leg
+            plan = dict(legs)
+            plan['type'] = 'base'
+            plan['leg key'] = leg_key
+            plan['om time'] = float(om['d_om [hour]'].ix[0])
+        
+        plan['log phase id'] = log_phase_id
+        plan['description'] = log_phase.description
+        plan['seq'] = seq
+        plan['solution'] = ind_sol
+        
+        return FrozenDict(plan)
+    
+    def get_plans(self, log_phase,
+                        log_phase_id,
+                        site,
+                        device,
+                        sub_device,
+                        entry_point,
+                        layout,
+                        om):
+        
+        """First stage of the two stage scheduling API. Returns an ordered
+        dictionary, keyed by (seq, ind_sol), of frozen plans holding the
+        durations and operational limits of every solution of the logistic
+        phase, none of which depend on the start date. A plan can then be
+        scheduled for any number of start dates with schedule_plan. The
+        logistic phase is not modified."""
+        
+        _check_phase_id(log_phase_id)
+        
+        plans = OrderedDict()
+        
+        for seq, operation in log_phase.op_ve.iteritems():
+            for ind_sol in range(len(operation.sol)):
+                plans[(seq, ind_sol)] = self._get_plan(log_phase,
+                                                       log_phase_id,
+                                                       seq,
+                                                       ind_sol,
+                                                       site,
+                                                       device,
+                                                       sub_device,
+                                                       entry_point,
+                                                       layout,
+                                                       om)
+        
+        return plans
+    
+    def schedule_plan(self, plan, rt_dts, waiting_time):
+        
+        """Second stage of the two stage scheduling API. Returns a schedule,
+        with the start delays, waiting times and end date of the plan, for
+        each of the requested start dates in rt_dts, or False if no weather
+        window was found for the date. The weather windows are found with
+        the given WaitingTime object."""
+        
+        if plan['type'] == 'site':
+            return _schedule_site_plan(plan, rt_dts, waiting_time)
+        
+        if not isinstance(waiting_time, LegDelays):
+            waiting_time = LegDelays(waiting_time)
+        
+        return _schedule_base_plan(plan, rt_dts, waiting_time)
+    
+    def _get_schedules(self, log_phase,
+                             log_phase_id,
+                             site,
+                             device,
+                             sub_device,
+                             entry_point,
+                             layout,
+                             om,
+                             rt_dts,
+                             waiting_time):
+        
+        """Find the schedules of every solution of the logistic phase for
+        each of the requested start dates in rt_dts. Returns a list of the
+        (seq, ind_sol, sched_sol) tuples found for each date and a list
+        which is False for the dates where an operation sequence has no
+        solutions. The operation sequences following a failed sequence are
+        not scheduled."""
+        
+        if not isinstance(waiting_time, LegDelays):
+            waiting_time = LegDelays(waiting_time)
+        
+        n_dates = len(rt_dts)
+        
+        date_scheds = [[] for _ in xrange(n_dates)]
+        found = [True] * n_dates
+        active = range(n_dates)
         
-        sched_sol['weather windows start_dt'] = st_exp_dt
-        sched_sol['weather windows depart_dt'] = departure_dt
-        sched_sol['weather windows end_dt'] = end_dt
+        # loop over the number of operations
+        for seq, operation in log_phase.op_ve.iteritems():
+            
+            # Exit if no dates have solutions
+            if not active: break
+            
+            seq_found = set()
+            
+            # loop over the number of solutions, i.e feasible combinations of
+            # port/vessel(s)/equipment(s)
+            for ind_sol in range(len(operation.sol)):
+                
+                with profile("schedule", seq, ind_sol, log_phase_id):
+                    
+                    plan = self._get_plan(log_phase,
+                                          log_phase_id,
+                                          seq,
+                                          ind_sol,
+                                          site,
+                                          device,
+                                          sub_device,
+                                          entry_point,
+                                          layout,
+                                          om)
+                    
+                    active_rt_dts = [rt_dts[i] for i in active]
+                    sched_sols = self.schedule_plan(plan,
+                                                    active_rt_dts,
+                                                    waiting_time)
+                
+                for i, sched_sol in zip(active, sched_sols):
+                    
+                    if not sched_sol: continue
+                    
+                    date_scheds[i].append((seq, ind_sol, sched_sol))
+                    seq_found.add(i)
+            
+            for i in active:
+                if i not in seq_found: found[i] = False
+            
+            active = [i for i in active if i in seq_found]
         
-        return sched_sol
+        return date_scheds, found
     
     def __call__(self,
                  log_phase,
@@ -213,24 +425,7 @@ class SchedOM(object):
                  optimise_delay=False,
                  custom_waiting=None):
         
-        # Check the phase ID
-        allowed_phases = ['LpM1',
-                          'LpM2',
-                          'LpM3',
-                          'LpM4',
-                          'LpM5',
-                          'LpM6',
-                          'LpM7',
-                          'LpM8']
-        
-        if log_phase_id not in allowed_phases:
-        
-            allowed_phases_str = ", ".join(allowed_phases)
-            errStr = ("Unknown logistic phase ID {}. Allowed IDs are: "
-                      "{}").format(log_phase_id,
-                                   allowed_phases_str)
-            
-            raise ValueError(errStr)
+        _check_phase_id(log_phase_id)
         
         # initialisation
         if custom_waiting is None:
@@ -240,120 +435,235 @@ class SchedOM(object):
         
         waiting_time.set_optimise_delay(optimise_delay)
         
-        # loop over the number of operations
-        for seq, operation in log_phase.op_ve.iteritems():  
+        # Get requested start time
+        rt_dt = get_start(om)
+        
+        date_scheds, found = self._get_schedules(log_phase,
+                                                 log_phase_id,
+                                                 site,
+                                                 device,
+                                                 sub_device,
+                                                 entry_point,
+                                                 layout,
+                                                 om,
+                                                 [rt_dt],
+                                                 waiting_time)
+        
+        scheds = date_scheds[0]
+        new_sols = {}
+        
+        for seq, ind_sol, sched_sol in scheds:
             
-            new_sol = {}
+            old_sol_item = log_phase.op_ve[seq].sol[ind_sol]
+            old_sol_item['schedule'] = sched_sol
             
-            # loop over the number of solutions, i.e feasible combinations of
-            # port/vessel(s)/equipment(s)
-            for ind_sol in range(len(operation.sol)):
-                
-                # start_time = timeit.default_timer()  # TIME ASSESSMENT
-                # print 'seq: ' + str(seq) + ', sol: ' + str(ind_sol)
-                
-                ve_groups = []
-                ve_names = []
-                
-                for ve_comb in log_phase.op_ve[seq].sol[ind_sol]['VEs']:
-                    ve_groups.append(ve_comb[0])
-                    ve_names.append(ve_comb[2]["Name"])
-                
-                comb_strs = []
-                
-                for group, name in zip(ve_groups, ve_names):
-                    comb_strs.append("{}: {}".format(group, name))
-                
-                comb_str = ", ".join(comb_strs)
-                msgStr = "Vessel & equipment combinations: {}".format(comb_str)
-                module_logger.info(msgStr)
-                
-                sched_sol = {'olc': [],
-                             'total time': [],
-                             'prep time': [],
-                             'sea time': [],
-                             'weather windows': [],
-                             'weather windows start_dt': [],
-                             'weather windows depart_dt': [],
-                             'weather windows end_dt': [],
-                             'waiting time': [],
-                             'all': {},
-                             'journey': {},
-                             'transit time': []
-                             }
-                
-                # Get requested start time
-                rt_dt = get_start(om)
-                
-                # check the nature of the logistic phase
-                if log_phase_id not in ['LpM6', 'LpM7']:
-                    
-                    sched_sol = self._get_wws_site(rt_dt,
-                                                   waiting_time,
-                                                   log_phase_id,
-                                                   seq,
-                                                   ind_sol,
-                                                   log_phase,
-                                                   site,
-                                                   layout,
-                                                   entry_point,
-                                                   om,
-                                                   sched_sol)
-                    
-                    if not sched_sol: continue
-                
-                else:
-                    
-                    sched_sol = _get_wws_base(rt_dt,
-                                              waiting_time,
+            new_sol = new_sols.setdefault(seq, {})
+            new_sol_idx = len(new_sol)
+            new_sol[new_sol_idx] = old_sol_item
+        
+        # Replace the log phase solutions
+        for seq, new_sol in new_sols.iteritems():
+            log_phase.op_ve[seq].sol = new_sol
+        
+        # Exit if no solutions were found for an operation sequence
+        if not found[0]: return log_phase, 'NoWWindows'
+        
+        EXIT_FLAG = 'ScheduleFound'
+        
+        return log_phase, EXIT_FLAG
+    
+    def schedule_events(self,
+                        log_phases,
+                        site,
+                        device,
+                        sub_device,
+                        entry_point,
+                        metocean,
+                        layout,
+                        events,
+                        optimise_delay=False,
+                        custom_waiting=None):
+        
+        """Schedule a table of O&M events. The events table has the columns
+        of the om table, with the rows of each event identified by the
+        'event [-]' column and its logistic phase ID given by the
+        'log phase [-]' column. log_phases maps the phase IDs to prepared
+        logistic phases, which are not modified.
+        
+        Events with the same phase and elements are grouped, so the
+        schedules that do not depend on the start date are calculated once
+        per group and the weather windows are evaluated for all of the
+        group's start dates together. The weather windows of the retrieve
+        and replace legs are also shared between groups.
+        
+        Returns a table with a row for each scheduled solution of each event,
+        in the order of the events. Events for which an operation sequence
+        has no solutions are not included.
+        """
+        
+        if custom_waiting is None:
+            waiting_time = WaitingTime(metocean)
+        else:
+            waiting_time = custom_waiting
+        
+        waiting_time.set_optimise_delay(optimise_delay)
+        waiting_time = LegDelays(waiting_time)
+        
+        event_ids = pd.unique(events['event [-]'])
+        groups = group_events(events)
+        event_rows = {}
+        
+        for key, group in groups.iteritems():
+            
+            log_phase_id = key[0]
+            rt_dts = [get_start(om) for _, om in group]
+            
+            # The first event provides the elements for the group
+            om = group[0][1]
+            
+            if log_phase_id not in log_phases:
+                errStr = "No logistic phase given for ID {}".format(
+                                                                log_phase_id)
+                raise KeyError(errStr)
+            
+            date_scheds, found = self._get_schedules(
+                                              log_phases[log_phase_id],
                                               log_phase_id,
-                                              seq,
-                                              ind_sol,
-                                              log_phase,
                                               site,
                                               device,
                                               sub_device,
                                               entry_point,
                                               layout,
                                               om,
-                                              sched_sol)
-                    
-                    if not sched_sol: continue
-                
-                old_sol_item = log_phase.op_ve[seq].sol[ind_sol]
-                old_sol_item['schedule'] = sched_sol
+                                              rt_dts,
+                                              waiting_time)
+            
+            for (event_id, _), scheds, event_found in zip(group,
+                                                          date_scheds,
+                                                          found):
                 
-                new_sol_idx = len(new_sol)
-                new_sol[new_sol_idx] = old_sol_item
+                if not event_found:
+                    
+                    logMsg = ("No weather windows found for event {} of "
+                              "phase {}").format(event_id, log_phase_id)
+                    module_logger.info(logMsg)
+                    
+                    continue
                 
-                # TIME ASSESSMENT
-                # stop_time = timeit.default_timer()
-                # print 'Solution Duration [s]: ' + str(stop_time - start_time
+                event_rows[event_id] = [_get_event_row(event_id,
+                                                       log_phase_id,
+                                                       seq,
+                                                       ind_sol,
+                                                       sched_sol)
+                                        for seq, ind_sol, sched_sol in scheds]
+        
+        rows = []
+        
+        for event_id in event_ids:
+            if event_id in event_rows: rows.extend(event_rows[event_id])
+        
+        return pd.DataFrame(rows, columns=EVENT_COLUMNS)
+
+
+def _check_phase_id(log_phase_id):
+    
+    allowed_phases = ['LpM1',
+                      'LpM2',
+                      'LpM3',
+                      'LpM4',
+                      'LpM5',
+                      'LpM6',
+                      'LpM7',
+                      'LpM8']
+    
+    if log_phase_id not in allowed_phases:
+    
+        allowed_phases_str = ", ".join(allowed_phases)
+        errStr = ("Unknown logistic phase ID {}. Allowed IDs are: "
+                  "{}").format(log_phase_id,
+                               allowed_phases_str)
+        
+        raise ValueError(errStr)
+    
+    return
+
+
+def _schedule_site_plan(plan, rt_dts, waiting_time):
+    
+    site_sched = plan['schedule']
+    
+    prep_time = dt.timedelta(hours=float(site_sched['prep time']))
+    st_exp_dts = [rt_dt + prep_time for rt_dt in rt_dts]
+    
+    journeys = waiting_time.get_start_delays(_PhaseLabel(plan['description']),
+                                             site_sched,
+                                             st_exp_dts)
+    
+    sched_sols = []
+    
+    for st_exp_dt, (journey, WWINDOW_FLAG) in zip(st_exp_dts, journeys):
+        
+        # Loop if no weather window
+        if WWINDOW_FLAG == 'NoWWindows':
+            sched_sols.append(False)
+            continue
+        
+        # The plan is shared, so build a new schedule for each date
+        sched_sol = dict(site_sched)
+        sched_sol['total time'] = list(site_sched['total time'])
+        sched_sol['waiting time'] = list(site_sched['waiting time'])
+        
+        if not sched_sol['waiting time']:
+            sched_sol['waiting time'] = journey['wait_dur']
+        else:
+            sched_sol['waiting time'] += journey['wait_dur']
+        
+        start_delays = journey['start_delay']
+        mean_delay = sum(start_delays) / float(len(start_delays))
+        
+        # Update total time
+        sched_sol['total time'] += [mean_delay] + sched_sol['waiting time']
+        
+        departure_dt = st_exp_dt + dt.timedelta(hours=mean_delay)
+        end_dt = departure_dt + \
+                    dt.timedelta(hours=sched_sol['sea time']) + \
+                        dt.timedelta(hours=sum(sched_sol['waiting time']))
+        
+        sched_sol['weather windows start_dt'] = st_exp_dt
+        sched_sol['weather windows depart_dt'] = departure_dt
+        sched_sol['weather windows end_dt'] = end_dt
+        
+        # Weather risk percentiles, if the per year values were kept
+        year_totals = get_year_totals(journey)
+        
+        if year_totals is not None:
             
-            # Exit if no solutions were found
-            if len(new_sol) == 0: return log_phase, 'NoWWindows'
+            year_delay, year_waiting = year_totals
+            prior_waiting = sum(site_sched['waiting time'])
             
-            # Replace the log phase solutions
-            log_phase.op_ve[seq].sol = new_sol
+            sched_sol['weather percentiles'] = get_weather_percentiles(
+                                                waiting_time,
+                                                st_exp_dt,
+                                                year_delay,
+                                                prior_waiting + year_waiting,
+                                                float(sched_sol['sea time']))
         
-        EXIT_FLAG = 'ScheduleFound'
-        
-        return log_phase, EXIT_FLAG
+        sched_sols.append(sched_sol)
+    
+    return sched_sols
 
 
-def _get_wws_base(rt_dt,
-                  waiting_time,
-                  log_phase_id,
-                  seq,
-                  ind_sol,
-                  log_phase,
-                  site,
-                  device,
-                  sub_device,
-                  entry_point,
-                  layout,
-                  om,
-                  sched_sol):
+def _get_base_legs(log_phase_id,
+                   seq,
+                   ind_sol,
+                   log_phase,
+                   site,
+                   device,
+                   sub_device,
+                   entry_point,
+                   layout,
+                   om,
+                   sched_sol):
     
     # Retrieve stage
     sched_sol = sched_retrieve(log_phase_id,
@@ -368,30 +678,9 @@ def _get_wws_base(rt_dt,
                                om,
                                sched_sol)
     
-    st_exp_dt_retrieve = rt_dt + dt.timedelta(
-                            hours=float(sched_sol['prep time_retrieve']))
-    journey_retrieve, WWINDOW_FLAG = waiting_time(log_phase,
-                                                  sched_sol,
-                                                  st_exp_dt_retrieve)
-    
-    # Loop if no weather window
-    if WWINDOW_FLAG == 'NoWWindows': return False
-    
-    if not sched_sol['waiting time']:
-        waiting_time_retrieve = journey_retrieve['wait_dur']
-    else:
-        waiting_time_retrieve = sched_sol['waiting time'] + \
-                                            journey_retrieve['wait_dur']
-                                    
-    start_delays = journey_retrieve['start_delay']
-    mean_retrieve_delay = sum(start_delays) / float(len(start_delays))
-                                    
-    retrieve_time = [mean_retrieve_delay] +  waiting_time_retrieve
-    om_time = float(om['d_om [hour]'].ix[0])
-                                    
-    st_rts_dt = st_exp_dt_retrieve + \
-                    dt.timedelta(hours=sum(retrieve_time)) + \
-                        dt.timedelta(hours=om_time)
+    # The replace stage modifies the journeys, so keep the retrieve journeys
+    retrieve_journey = FrozenDict(sched_sol['journey'])
+    retrieve_waiting = tuple(sched_sol['waiting time'])
     
     # Replace stage
     sched_sol = sched_replace(log_phase_id,
@@ -406,54 +695,220 @@ def _get_wws_base(rt_dt,
                               om,
                               sched_sol)
     
-    st_exp_dt_replace = st_rts_dt + dt.timedelta(
+    # The weather windows of the retrieve leg only depend on its journeys,
+    # so they can be shared by legs with other repair durations
+    retrieve_key = get_digest('retrieve', log_phase_id, retrieve_journey)
+    
+    legs = FrozenDict({'schedule': _freeze_sched(sched_sol),
+                       'retrieve key': retrieve_key,
+                       'retrieve journey': retrieve_journey,
+                       'retrieve waiting': retrieve_waiting})
+    
+    return legs
+
+
+def _schedule_base_plan(plan, rt_dts, waiting_time):
+    
+    sched_sol = plan['schedule']
+    phase_label = _PhaseLabel(plan['description'])
+    
+    prep_time_retrieve = dt.timedelta(
+                            hours=float(sched_sol['prep time_retrieve']))
+    prep_time_replace = dt.timedelta(
                             hours=float(sched_sol['prep time_replace']))
     
+    st_exp_dts_retrieve = [rt_dt + prep_time_retrieve for rt_dt in rt_dts]
+    journeys_retrieve = waiting_time.get_leg_delays(
+                                    plan['retrieve key'],
+                                    phase_label,
+                                    {'journey': plan['retrieve journey']},
+                                    st_exp_dts_retrieve)
+    
+    retrieve_results = []
+    
+    for st_exp_dt_retrieve, (journey_retrieve,
+                             WWINDOW_FLAG) in zip(st_exp_dts_retrieve,
+                                                  journeys_retrieve):
+        
+        # Loop if no weather window
+        if WWINDOW_FLAG == 'NoWWindows': continue
+        
+        if not plan['retrieve waiting']:
+            waiting_time_retrieve = journey_retrieve['wait_dur']
+        else:
+            waiting_time_retrieve = list(plan['retrieve waiting']) + \
+                                                journey_retrieve['wait_dur']
+        
+        start_delays = journey_retrieve['start_delay']
+        mean_retrieve_delay = sum(start_delays) / float(len(start_delays))
+        
+        retrieve_time = [mean_retrieve_delay] + waiting_time_retrieve
+        
+        st_rts_dt = st_exp_dt_retrieve + \
+                        dt.timedelta(hours=sum(retrieve_time)) + \
+                            dt.timedelta(hours=plan['om time'])
+        
+        st_exp_dt_replace = st_rts_dt + prep_time_replace
+        
+        retrieve_results.append((st_exp_dt_retrieve,
+                                 st_exp_dt_replace,
+                                 waiting_time_retrieve,
+                                 mean_retrieve_delay,
+                                 retrieve_time,
+                                 get_year_totals(journey_retrieve)))
+    
     ## TODO: Why is the existing total time not taken into account in this 
     ## case?
-    journey_replace, WWINDOW_FLAG = waiting_time(log_phase,
-                                                 sched_sol,
-                                                 st_exp_dt_replace)
+    journeys_replace = waiting_time.get_leg_delays(
+                                        (plan['leg key'], 'replace'),
+                                        phase_label,
+                                        sched_sol,
+                                        [x[1] for x in retrieve_results])
+    journeys_replace = iter(journeys_replace)
+    retrieve_results = iter(retrieve_results)
     
-    # Loop if no weather window
-    if WWINDOW_FLAG == 'NoWWindows': return False
+    sched_sols = []
     
-    if not sched_sol['waiting time']:
-        waiting_time_replace = journey_replace['wait_dur']
-    else:
-        waiting_time_replace = sched_sol['waiting time'] + \
-                                            journey_replace['wait_dur']
-                                    
-    start_delays = journey_replace['start_delay']
-    mean_replace_delay = sum(start_delays) / float(len(start_delays))
+    for journey_retrieve, WWINDOW_FLAG in journeys_retrieve:
+        
+        if WWINDOW_FLAG == 'NoWWindows':
+            sched_sols.append(False)
+            continue
+        
+        (st_exp_dt_retrieve,
+         st_exp_dt_replace,
+         waiting_time_retrieve,
+         mean_retrieve_delay,
+         retrieve_time,
+         retrieve_totals) = next(retrieve_results)
+        journey_replace, WWINDOW_FLAG = next(journeys_replace)
+        
+        # Loop if no weather window
+        if WWINDOW_FLAG == 'NoWWindows':
+            sched_sols.append(False)
+            continue
+        
+        if not sched_sol['waiting time']:
+            waiting_time_replace = journey_replace['wait_dur']
+        else:
+            waiting_time_replace = list(sched_sol['waiting time']) + \
+                                                journey_replace['wait_dur']
+        
+        start_delays = journey_replace['start_delay']
+        mean_replace_delay = sum(start_delays) / float(len(start_delays))
+        
+        replace_time = [mean_replace_delay] + waiting_time_replace
+        
+        # Record solution
+        date_sol = dict(sched_sol)
+        
+        date_sol['waiting time_retrieve'] = waiting_time_retrieve
+        date_sol['waiting time_replace'] = waiting_time_replace
+        date_sol['waiting time'] = waiting_time_retrieve + \
+                                                    waiting_time_replace
+        
+        date_sol['total time'] = retrieve_time + replace_time
+        
+        date_sol['weather windows start_dt'] = st_exp_dt_retrieve
+        date_sol['weather windows end_dt'] = st_exp_dt_replace + \
+                                        dt.timedelta(hours=sum(replace_time))
+        
+        depart_dt = {}
+        
+        ww_ddt_retrieve = st_exp_dt_retrieve + \
+                                    dt.timedelta(hours=mean_retrieve_delay)
+        ww_ddt_replace = st_exp_dt_replace + \
+                                    dt.timedelta(hours=mean_replace_delay)
+        
+        depart_dt['weather windows depart_dt_retrieve'] = ww_ddt_retrieve
+        depart_dt['weather windows depart_dt_replace'] = ww_ddt_replace
+        
+        date_sol['weather windows depart_dt'] = depart_dt
+        
+        # Weather risk percentiles of both legs, if the per year values were
+        # kept. The legs' values are combined year by year.
+        replace_totals = get_year_totals(journey_replace)
+        
+        if retrieve_totals is not None and replace_totals is not None:
+            
+            year_delay = retrieve_totals[0] + replace_totals[0]
+            year_waiting = retrieve_totals[1] + replace_totals[1] + \
+                                    sum(plan['retrieve waiting']) + \
+                                            sum(sched_sol['waiting time'])
+            other_hours = plan['om time'] + \
+                                    prep_time_replace.total_seconds() / 3600.
+            
+            date_sol['weather percentiles'] = get_weather_percentiles(
+                                                        waiting_time,
+                                                        st_exp_dt_retrieve,
+                                                        year_delay,
+                                                        year_waiting,
+                                                        other_hours)
+        
+        sched_sols.append(date_sol)
     
-    replace_time = [mean_replace_delay] + waiting_time_replace
+    return sched_sols
+
+
+def _copy_delays(result):
+    """Copy a (journey, flag) result of WaitingTime.get_start_delays"""
     
-    # Record solution
-    sched_sol['waiting time_retrieve'] = waiting_time_retrieve
-    sched_sol['waiting time_replace'] = waiting_time_replace
-    sched_sol['waiting time'] = waiting_time_retrieve + \
-                                                waiting_time_replace
-                                            
-    sched_sol['total time'] = retrieve_time + replace_time
-                              
-    sched_sol['weather windows start_dt'] = st_exp_dt_retrieve
-    sched_sol['weather windows end_dt'] = st_exp_dt_replace + \
-                                    dt.timedelta(hours=sum(replace_time))
+    journey, WWINDOW_FLAG = result
     
-    depart_dt = {}
+    if isinstance(journey, dict):
+        journey = {k: list(v) for k, v in journey.iteritems()}
     
-    ww_ddt_retrieve = st_exp_dt_retrieve + \
-                                dt.timedelta(hours=mean_retrieve_delay)
-    ww_ddt_replace = st_exp_dt_replace + \
-                                dt.timedelta(hours=mean_replace_delay)
+    return journey, WWINDOW_FLAG
+
+
+def _get_event_row(event_id, log_phase_id, seq, ind_sol, sched_sol):
+    """Returns a row of the schedule_events results table"""
+    
+    depart_dt = sched_sol['weather windows depart_dt']
+    
+    # Report the first departure of the retrieve and replace phases
+    if isinstance(depart_dt, dict):
+        depart_dt = depart_dt['weather windows depart_dt_retrieve']
+    
+    row = [event_id,
+           log_phase_id,
+           seq,
+           ind_sol,
+           sched_sol['weather windows start_dt'],
+           depart_dt,
+           sched_sol['weather windows end_dt'],
+           sched_sol['prep time'],
+           sched_sol['sea time'],
+           sum(sched_sol['waiting time']),
+           sum(sched_sol['total time']),
+           sched_sol]
+    
+    return row
+
+
+def group_events(events):
+    """Returns an OrderedDict of the events in a schedule_events table
+    grouped by logistic phase ID and om table (excluding the start date).
+    The keys are (log phase ID, om digest) and the values are lists of
+    (event ID, om table), in the order of the events."""
     
-    depart_dt['weather windows depart_dt_retrieve'] = ww_ddt_retrieve
-    depart_dt['weather windows depart_dt_replace'] = ww_ddt_replace
+    om_columns = [col for col in events.columns
+                        if col not in ['event [-]', 'log phase [-]']]
     
-    sched_sol['weather windows depart_dt'] = depart_dt
+    groups = OrderedDict()
     
-    return sched_sol
+    for event_id, event in events.groupby('event [-]', sort=False):
+        
+        log_phase_id = event['log phase [-]'].iloc[0]
+        om = event[om_columns].reset_index(drop=True)
+        
+        key = (log_phase_id, _get_om_digest(om))
+        
+        if key not in groups: groups[key] = []
+        
+        groups[key].append((event_id, om))
+    
+    return groups
 
 
 def get_start(om):
@@ -480,91 +935,27 @@ def get_start(om):
     return rt_dt
 
 
-def copy_sched(old):
-    
-    new = {}
+def _get_om_digest(om, exclude=('t_start [-]',)):
+    """Returns a digest of the index and values of the om table, excluding
+    the requested start date or the given columns"""
     
-    for k, v in old.iteritems():
-        
-        if k in ['total time', 'waiting time']:
-            new[k] = v[:]
-        else:
-            new[k] = v
+    columns = sorted(col for col in om.columns if col not in exclude)
+    values = [om[col].values for col in columns]
     
-    return new
+    return get_digest(om.index.values, columns, *values)
 
 
-def compare_sched(new, old):
-    
-    def check_recursive(new_obj, old_obj):
-        
-        if isinstance(new_obj, dict):
-            
-            assert isinstance(old_obj, dict)
-            
-            for k, v in new_obj.iteritems():
-                assert k in old_obj
-                check_recursive(v, old_obj[k])
-        
-        elif isinstance(new_obj, list):
-            
-            assert isinstance(old_obj, list)
-            assert len(new_obj) == len(old_obj)
-            
-            for i, v in enumerate(new_obj):
-                check_recursive(v, old_obj[i])
-        
-        else:
-            
-            assert new_obj == old_obj
+def _freeze_sched(sched_sol):
+    """Returns a FrozenDict copy of a schedule, with its lists of times
+    converted to tuples"""
     
-    for k, v in new.iteritems():
-        assert k in old
-        old_v = old[k]
-        check_recursive(v, old_v)
-
-
-def print_sched(new, old):
+    frozen = {}
     
-    def print_recursive(new_obj, old_obj):
-        
-        result = [True]
-        
-        if isinstance(new_obj, dict):
-            for k, v in new_obj.iteritems():
-                print "key", k
-                assert k in old_obj
-                result.extend(print_recursive(v, old_obj[k]))
-        
-        elif isinstance(new_obj, list):
-            
-            if not isinstance(old_obj, list):
-                print "fail not list", old_obj
-                return [False]
-            elif len(new_obj) != len(old_obj):
-                print "fail length", len(new_obj), len(old_obj)
-                return [False]
-            else:
-                for i, v in enumerate(new_obj):
-                    print "list index", i
-                    result.extend(print_recursive(v, old_obj[i]))
+    for k, v in sched_sol.iteritems():
         
+        if k in ['total time', 'waiting time'] and isinstance(v, list):
+            frozen[k] = tuple(v)
         else:
-            
-            if not new_obj == old_obj:
-                print "fail compare", new_obj, old_obj
-                return [False]
-            
-            return [True]
-        
-        return result
-    
-    check = []
-    
-    for k, v in new.iteritems():
-        print "key", k
-        assert k in old
-        old_v = old[k]
-        check.extend(print_recursive(v, old_v))
+            frozen[k] = v
     
-    return all(check)
+    return FrozenDict(frozen)
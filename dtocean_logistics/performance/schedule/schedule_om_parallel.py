@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Scheduling of O&M events with a pool of worker processes. The metocean and
+site tables are published once to memory mapped files, which the workers
+attach to without copying.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import multiprocessing
+import cPickle as pickle
+
+import numpy as np
+import pandas as pd
+from pandas.core.internals import BlockManager, make_block
+
+from .schedule_om import SchedOM, EVENT_COLUMNS, group_events
+from .schedule_shared import WaitingTime
+
+# Set up logging
+module_logger = logging.getLogger(__name__)
+
+# Numpy dtype kinds of the columns written to memory mapped files
+_SHARED_KINDS = 'biufcM'
+
+# Number of tasks given to each worker process, for load balancing
+_TASKS_PER_PROCESS = 4
+
+# Inputs and scheduler of a worker process
+_worker = {}
+
+
+class SharedFrame(object):
+
+    """Handle to a DataFrame published to .npy files, one for each block of
+    columns with the same numpy dtype. Attaching memory maps the files read
+    only, so the values are shared between processes rather than copied.
+    Columns of other dtypes and the index are pickled and loaded normally.
+    The handle itself is small and can be pickled."""
+
+    def __init__(self, path, name, columns, blocks):
+
+        self.path = path
+        self.name = name
+        self.columns = columns
+        self.blocks = blocks
+
+        return
+
+    @classmethod
+    def publish(cls, df, path, name):
+
+        """Write the DataFrame to files in the directory path, with names
+        starting with name, and return a handle to them."""
+
+        shared = {}
+        unshared = []
+
+        for loc, dtype in enumerate(df.dtypes):
+
+            if isinstance(dtype, np.dtype) and dtype.kind in _SHARED_KINDS:
+                shared.setdefault(dtype.str, []).append(loc)
+            else:
+                unshared.append(loc)
+
+        blocks = []
+
+        for i, dtype_str in enumerate(sorted(shared)):
+
+            locs = shared[dtype_str]
+            file_name = "{}_{}.npy".format(name, i)
+
+            # Rows of the array are columns of the frame, as in a pandas
+            # block
+            values = np.array([df.iloc[:, loc].values for loc in locs])
+            np.save(os.path.join(path, file_name), values)
+
+            blocks.append((file_name, locs))
+
+        others = (df.index, unshared, df.iloc[:, unshared])
+
+        with open(os.path.join(path, name + ".pkl"), "wb") as f:
+            pickle.dump(others, f, pickle.HIGHEST_PROTOCOL)
+
+        return cls(path, name, list(df.columns), blocks)
+
+    def attach(self):
+
+        """Returns the published DataFrame. The values of the memory mapped
+        columns are read only."""
+
+        with open(os.path.join(self.path, self.name + ".pkl"), "rb") as f:
+            index, unshared, others = pickle.load(f)
+
+        shared_locs = sorted(loc for _, locs in self.blocks for loc in locs)
+        shared_ids = {loc: i for i, loc in enumerate(shared_locs)}
+
+        blocks = []
+
+        for file_name, locs in self.blocks:
+
+            values = np.load(os.path.join(self.path, file_name),
+                             mmap_mode='r')
+            placement = [shared_ids[loc] for loc in locs]
+
+            blocks.append(make_block(values, placement=placement))
+
+        columns = pd.Index([self.columns[loc] for loc in shared_locs])
+        df = pd.DataFrame(BlockManager(blocks, [columns, index]))
+
+        for i, loc in enumerate(unshared):
+            df.insert(loc, self.columns[loc], others.iloc[:, i])
+
+        return df
+
+
+class ParallelSchedOM(object):
+
+    """Schedule tables of O&M events with a pool of worker processes, giving
+    the same results as SchedOM.schedule_events.
+
+    The inputs are published when the executor is started and each worker
+    loads them once, keeping its own SchedOM and weather window caches until
+    the executor is closed. The metocean table (as prepared by the
+    WaitingTime) and the site table are memory mapped; the logistic phases
+    and the other inputs are pickled to the same directory. If custom_waiting
+    is not a WaitingTime it is pickled with the other inputs.
+
+    Events with the same phase and elements are always scheduled by the same
+    task and the task results are merged in the order of the events. If
+    processes is 1, the events are scheduled in this process.
+    """
+
+    def __init__(self, log_phases,
+                       site,
+                       device,
+                       sub_device,
+                       entry_point,
+                       metocean,
+                       layout,
+                       optimise_delay=False,
+                       custom_waiting=None,
+                       processes=None,
+                       cache_size=1000,
+                       path=None):
+
+        if processes is None: processes = multiprocessing.cpu_count()
+
+        self._inputs = {'log_phases': log_phases,
+                        'site': site,
+                        'device': device,
+                        'sub_device': sub_device,
+                        'entry_point': entry_point,
+                        'metocean': metocean,
+                        'layout': layout,
+                        'optimise_delay': optimise_delay,
+                        'custom_waiting': custom_waiting}
+        self._processes = processes
+        self._cache_size = cache_size
+        self._path = path
+        self._temp_dir = None
+        self._pool = None
+        self._state = None
+
+        return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self):
+
+        """Publish the inputs and start the worker processes"""
+
+        if self._state is not None or self._pool is not None: return
+
+        if self._path is None:
+            self._temp_dir = tempfile.mkdtemp(prefix="dtocean_om_")
+            path = self._temp_dir
+        else:
+            path = self._path
+
+        context = _publish(path, self._inputs, self._cache_size)
+
+        if self._processes == 1:
+            self._state = _attach(context)
+        else:
+            self._pool = multiprocessing.Pool(self._processes,
+                                              initializer=_init_worker,
+                                              initargs=(context,))
+
+        logMsg = "Started O&M scheduling with {} process(es)".format(
+                                                            self._processes)
+        module_logger.debug(logMsg)
+
+        return
+
+    def close(self):
+
+        """Stop the worker processes and remove the published inputs, if
+        they were written to a temporary directory"""
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+        self._state = None
+
+        if self._temp_dir is not None:
+            shutil.rmtree(self._temp_dir, ignore_errors=True)
+            self._temp_dir = None
+
+        return
+
+    def get_tasks(self, events):
+
+        """Split the events table into tasks. Groups of events with the same
+        phase and elements are assigned, largest first, to the task with the
+        fewest events. The rows of each task keep their original order."""
+
+        groups = group_events(events).values()
+        n_tasks = min(len(groups), self._processes * _TASKS_PER_PROCESS)
+
+        if n_tasks == 0: return []
+
+        sizes = [len(group) for group in groups]
+        order = sorted(range(len(sizes)), key=lambda i: (-sizes[i], i))
+
+        task_ids = [[] for _ in xrange(n_tasks)]
+        task_sizes = [0] * n_tasks
+
+        for i in order:
+
+            # Ties go to the lowest task number
+            task = task_sizes.index(min(task_sizes))
+            task_ids[task].extend(event_id for event_id, _ in groups[i])
+            task_sizes[task] += sizes[i]
+
+        tasks = [events[events['event [-]'].isin(ids)] for ids in task_ids]
+
+        return tasks
+
+    def schedule_events(self, events):
+
+        """Schedule a table of O&M events, in the format of
+        SchedOM.schedule_events, and return the results table."""
+
+        if self._state is None and self._pool is None:
+            errStr = "The executor must be started before scheduling events"
+            raise RuntimeError(errStr)
+
+        tasks = self.get_tasks(events)
+
+        if not tasks: return pd.DataFrame(columns=EVENT_COLUMNS)
+
+        if self._pool is None:
+            results = [_schedule(self._state, task) for task in tasks]
+        else:
+            results = self._pool.map(_schedule_task, tasks)
+
+        return merge_results(events, results)
+
+
+def merge_results(events, results):
+    """Concatenate schedule_events results tables and sort the rows into the
+    order of the events in the events table. The order of the rows of each
+    event is kept."""
+
+    results = [result for result in results if not result.empty]
+
+    if not results: return pd.DataFrame(columns=EVENT_COLUMNS)
+
+    result = pd.concat(results, ignore_index=True)
+
+    event_ids = pd.unique(events['event [-]'])
+    positions = pd.Series(np.arange(len(event_ids)), index=event_ids)
+    event_order = positions.loc[result['event [-]'].values].values
+
+    order = np.argsort(event_order, kind='mergesort')
+    result = result.iloc[order].reset_index(drop=True)
+
+    return result
+
+
+def _publish(path, inputs, cache_size):
+    """Write the inputs to the directory path and return the context used
+    by the workers to load them"""
+
+    inputs = dict(inputs)
+    context = {'path': path,
+               'cache_size': cache_size,
+               'metocean': None,
+               'site': None,
+               'waiting': None}
+
+    waiting_time = inputs.pop('custom_waiting')
+
+    if waiting_time is None:
+        waiting_time = WaitingTime(inputs['metocean'])
+
+    if isinstance(waiting_time, WaitingTime):
+
+        metocean, context['waiting'] = waiting_time.get_prepared()
+        context['metocean'] = SharedFrame.publish(metocean, path, "metocean")
+        inputs['custom_waiting'] = None
+
+    else:
+
+        inputs['custom_waiting'] = waiting_time
+
+    # The prepared metocean table replaces the original
+    inputs['metocean'] = None
+
+    if isinstance(inputs['site'], pd.DataFrame):
+        context['site'] = SharedFrame.publish(inputs['site'], path, "site")
+        inputs['site'] = None
+
+    with open(os.path.join(path, "inputs.pkl"), "wb") as f:
+        pickle.dump(inputs, f, pickle.HIGHEST_PROTOCOL)
+
+    return context
+
+
+def _attach(context):
+    """Load the published inputs and create a scheduler"""
+
+    with open(os.path.join(context['path'], "inputs.pkl"), "rb") as f:
+        inputs = pickle.load(f)
+
+    if context['metocean'] is not None:
+
+        metocean = context['metocean'].attach()
+        inputs['custom_waiting'] = WaitingTime.from_prepared(
+                                                    metocean,
+                                                    **context['waiting'])
+
+    if context['site'] is not None:
+        inputs['site'] = context['site'].attach()
+
+    state = {'sched': SchedOM(context['cache_size']),
+             'inputs': inputs}
+
+    return state
+
+
+def _schedule(state, events):
+    return state['sched'].schedule_events(events=events, **state['inputs'])
+
+
+def _init_worker(context):
+    _worker.clear()
+    _worker.update(_attach(context))
+
+
+def _schedule_task(events):
+    return _schedule(_worker, events)
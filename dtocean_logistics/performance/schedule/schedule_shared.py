@@ -22,8 +22,7 @@
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
-import math
-#import timeit
+import timeit
 import logging
 import datetime as dt
 from bisect import bisect_left
@@ -34,33 +33,156 @@ from collections import OrderedDict
 import numpy as np
 import pandas as pd
 
-from ...ancillaries import indices, indices_gtoet, indices_mono_gtoet
+from ...ancillaries import (LRUCache,
+                            indices,
+                            indices_gtoet,
+                            indices_mono_gtoet)
+from ..instrumentation import get_instruments, timed
 
 # Start the logger
 module_logger = logging.getLogger(__name__)
 
+# Operational limit conditions of the sea operations, in the order given
+# in the journeys
+_OLC_NAMES = ['maxHs', 'maxTp', 'maxWs', 'maxCs']
+
 
 class WaitingTime(object):
     
+    """Weather window search for the journeys of a scheduled solution. Each
+    start date is evaluated in every year of the metocean data and the mean
+    start delay and waiting time are returned.
+    
+    If percentiles (a list of values between 0 and 100) are given, the
+    per year start delays and waiting times are also kept in the results
+    (see get_start_delays) and the get_percentiles method is enabled. If
+    n_bootstrap is greater than zero the percentiles are estimated from
+    n_bootstrap resamples of the years, using bootstrap_seed to seed the
+    random number generator.
+    
+    If sequential is True, the journeys of a solution are simulated one
+    after another, rather than all starting on the requested date. Each
+    journey starts when the previous journey ends and waits for its own
+    weather window, in every year of the metocean data at once. The single
+    start delay returned is then the total weather delay of all the
+    journeys (see get_start_delays).
+    
+    Journeys are reduced to a key of their weather windows and sea time.
+    The results of each key and start date are kept in a bounded LRU cache
+    of at most cache_size entries, which is shared by all the solutions
+    evaluated with the instance."""
+    
+    @timed("WaitingTime")
     def __init__(self, metocean,
                        min_window_years=3,
                        match_tolerance=0.1,
-                       max_start_delay=8760):
+                       max_start_delay=8760,
+                       percentiles=None,
+                       n_bootstrap=0,
+                       bootstrap_seed=None,
+                       sequential=False,
+                       cache_size=10000):
         
         time_step_hours = self._init_time_step_hours(metocean)
+        metocean = self._init_years(metocean,
+                                    min_window_years,
+                                    time_step_hours)
+        
+        self._setup(metocean,
+                    time_step_hours,
+                    match_tolerance,
+                    max_start_delay,
+                    percentiles,
+                    n_bootstrap,
+                    bootstrap_seed,
+                    sequential,
+                    cache_size)
         
-        self.metocean = self._init_years(metocean,
-                                         min_window_years,
-                                         time_step_hours)
+        return
+    
+    def _setup(self, metocean,
+                     time_step_hours,
+                     match_tolerance,
+                     max_start_delay,
+                     percentiles=None,
+                     n_bootstrap=0,
+                     bootstrap_seed=None,
+                     sequential=False,
+                     cache_size=10000):
+        
+        if percentiles is not None:
+            
+            percentiles = [float(x) for x in percentiles]
+            
+            if not all(0 <= x <= 100 for x in percentiles):
+                errStr = "Percentiles must be between 0 and 100"
+                raise ValueError(errStr)
+        
+        if n_bootstrap < 0:
+            errStr = "The number of bootstrap samples can not be negative"
+            raise ValueError(errStr)
+        
+        self.metocean = metocean
         self._unique_years = self.metocean['year [-]'].unique()[:-1]
         self._time_step_hours = time_step_hours
         self._match_tol = match_tolerance
         self._max_start_delay = max_start_delay
+        self._percentiles = percentiles
+        self._n_bootstrap = n_bootstrap
+        self._bootstrap_seed = bootstrap_seed
+        self._sequential = sequential
         self._optimise_delay = False
         self._olc_ww = []
+        self._olc_index = {}
+        self._cache_size = cache_size
+        self._delay_cache = LRUCache(cache_size)
         
         return
     
+    @classmethod
+    def from_prepared(cls, metocean,
+                           time_step_hours,
+                           match_tolerance=0.1,
+                           max_start_delay=8760,
+                           percentiles=None,
+                           n_bootstrap=0,
+                           bootstrap_seed=None,
+                           sequential=False,
+                           cache_size=10000):
+        
+        """Create a WaitingTime from the prepared metocean table and time step
+        of another instance (see get_prepared). The table is not checked or
+        copied."""
+        
+        waiting_time = cls.__new__(cls)
+        waiting_time._setup(metocean,
+                            time_step_hours,
+                            match_tolerance,
+                            max_start_delay,
+                            percentiles,
+                            n_bootstrap,
+                            bootstrap_seed,
+                            sequential,
+                            cache_size)
+        
+        return waiting_time
+    
+    def get_prepared(self):
+        
+        """Returns the prepared metocean table and the keyword arguments of
+        from_prepared."""
+        
+        kwargs = {'time_step_hours': self._time_step_hours,
+                  'match_tolerance': self._match_tol,
+                  'max_start_delay': self._max_start_delay,
+                  'percentiles': self._percentiles,
+                  'n_bootstrap': self._n_bootstrap,
+                  'bootstrap_seed': self._bootstrap_seed,
+                  'sequential': self._sequential,
+                  'cache_size': self._cache_size}
+        
+        return self.metocean, kwargs
+    
     @classmethod
     def _init_time_step_hours(cls, metocean):
         
@@ -206,6 +328,14 @@ class WaitingTime(object):
         
         return final_metocean
     
+    def get_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the start delay
+        cache"""
+        return self._delay_cache.get_stats()
+    
+    def clear_cache(self):
+        self._delay_cache.clear()
+    
     def set_optimise_delay(self, value):
         
         self._optimise_delay = value
@@ -445,96 +575,133 @@ class WaitingTime(object):
                                      start_date,
                                      sea_time):
         
-        mean_delay = None
         waiting_time = None
         
-        start_delays = []
+        start_delays = self._whole_window_delays(weather_windows,
+                                                 [start_date],
+                                                 sea_time)
+        
+        if np.isnan(start_delays[0]): return None, waiting_time
+        
+        return start_delays[0], waiting_time
+    
+    def _whole_window_delays(self, weather_windows,
+                                   start_dates,
+                                   sea_time):
+        
+        """Attempt to find whole weather windows, starting in each year of
+        the metocean data, for each of the given start dates. Returns an
+        array of the mean start delay for each date, which is NaN if the
+        strategy fails for the date. The dates are evaluated together, using
+        array operations.
+        """
+        
+        start_delays, valid = self._whole_window_year_delays(weather_windows,
+                                                             start_dates,
+                                                             sea_time)
+        
+        mean_delays = np.empty(len(start_dates))
+        mean_delays.fill(np.nan)
+        mean_delays[valid] = start_delays[:, valid].mean(axis=0)
+        
+        return mean_delays
+    
+    def _whole_window_year_delays(self, weather_windows,
+                                        start_dates,
+                                        sea_time):
+        
+        """As _whole_window_delays, but returns an array of the start delays
+        in each year (rows) for each date (columns) and a boolean array
+        which is True for the dates where the strategy succeeded"""
+        
+        n_windows = len(weather_windows['start_dt'])
+        n_dates = len(start_dates)
+        n_years = len(self._unique_years)
+        
+        start_delays = np.zeros((n_years, n_dates))
+        valid = np.ones(n_dates, dtype=bool)
+        
+        if n_windows == 0 or n_dates == 0 or n_years == 0:
+            valid[:] = False
+            return start_delays, valid
+        
+        window_arrays = _get_window_arrays(weather_windows, sea_time)
         
-        # Attempt to find whole weather windows, starting in each year of the
-        # metocean data and then calculate the mean start delay
         for i, year in enumerate(self._unique_years):
             
-            # Set the year to match metocean data and avoid reaching the 29th
-            # of February in a 366 days year
-            if (not is_leap_year(year) and
-                start_date.month == 2 and
-                start_date.day > 28):
-                
-                start_date_met = dt.datetime(year,
-                                             3,
-                                             1,
-                                             start_date.hour)
-            
-            else:
-                
-                start_date_met = dt.datetime(year,
-                                             start_date.month,
-                                             start_date.day,
-                                             start_date.hour)
+            start_dates_met = [_get_met_date(start_date, year)
+                                                for start_date in start_dates]
+            op_starts = _get_hours(start_dates_met)
             
-            # Trim the windows to the operation start
-            trimmed_windows = trim_weather_windows(weather_windows,
-                                                   start_date_met)
-                
-            # Look for indexes of weather windows starting after the given
-            # start date
-            ind_ww_all = self._get_whole_windows(trimmed_windows,
-                                                 start_date_met,
-                                                 sea_time)
+            start_delay, found = _get_whole_window_delays(window_arrays,
+                                                          op_starts,
+                                                          sea_time)
             
-            if not ind_ww_all:
+            for j in np.flatnonzero(valid & ~found):
                 
                 date_format = lambda x: "{:%d-%b %H:%M}".format(x)
                 
                 logStr = ("No combined start dates and durations found "
                           "for operation with start date '{}' and "
                           "duration {} hours in year {}").format(
-                                                  date_format(start_date),
-                                                  sea_time,
-                                                  i)
+                                              date_format(start_dates[j]),
+                                              sea_time,
+                                              i)
                 
                 module_logger.warning(logStr)
-                
-                return mean_delay, waiting_time
-            
-            # Find the index of the first suitable weather window
-            ind_ww_first = min(ind_ww_all)
             
-            # Get the start delay
-            start_delay = self._get_start_delay(trimmed_windows,
-                                                start_date_met,
-                                                ind_ww_first)
+            valid &= found
             
-            # If the start delay exceeds the maximum then abort the strategy
-            if (self._max_start_delay is not None and
-                start_delay > self._max_start_delay):
+            # If the start delay exceeds the maximum then the strategy fails
+            if self._max_start_delay is not None:
                 
-                date_format = lambda x: "{:%d-%b %H:%M}".format(x)
+                too_long = valid & (start_delay > self._max_start_delay)
                 
-                logStr = ("No continuous weather windows found "
-                          "for operation with start date '{}' and "
-                          "duration {} hours in year {}, below the maximum "
-                          "start delay of {} hours.").format(
-                                                      date_format(start_date),
-                                                      sea_time,
-                                                      year,
-                                                      self._max_start_delay)
-                
-                module_logger.warning(logStr)
+                for j in np.flatnonzero(too_long):
+                    
+                    date_format = lambda x: "{:%d-%b %H:%M}".format(x)
+                    
+                    logStr = ("No continuous weather windows found "
+                              "for operation with start date '{}' and "
+                              "duration {} hours in year {}, below the "
+                              "maximum start delay of {} hours.").format(
+                                              date_format(start_dates[j]),
+                                              sea_time,
+                                              year,
+                                              self._max_start_delay)
+                    
+                    module_logger.warning(logStr)
                 
-                return mean_delay, waiting_time
+                valid &= ~too_long
             
-            start_delays.append(start_delay)
+            start_delays[i, :] = start_delay
         
-        if start_delays:
-            mean_delay = np.array(start_delays).mean()
-        
-        return mean_delay, waiting_time
+        return start_delays, valid
     
     def _combined_window_strategy(self, weather_windows,
                                         start_date,
                                         sea_time):
         
+        start_delays, waiting_times = self._combined_window_years(
+                                                            weather_windows,
+                                                            start_date,
+                                                            sea_time)
+        
+        if start_delays is None: return None, None
+        
+        mean_start_delay = sum(start_delays) / float(len(start_delays))
+        mean_waiting_time = sum(waiting_times) / float(len(waiting_times))
+        
+        return mean_start_delay, mean_waiting_time
+    
+    def _combined_window_years(self, weather_windows,
+                                     start_date,
+                                     sea_time):
+        
+        """Returns lists of the start delay and waiting time of the combined
+        window strategy in each year of the metocean data, or None, None if
+        the strategy fails"""
+        
         start_delays = []
         waiting_times = []
         
@@ -543,65 +710,13 @@ class WaitingTime(object):
         # calculate the mean start delay and waiting time
         for i, year in enumerate(self._unique_years):
             
-            # Set the year to match metocean data and avoid reaching the 29th
-            # of February in a 366 days year
-            if (not is_leap_year(year) and
-                start_date.month == 2 and
-                start_date.day > 28):
-                
-                start_date_met = dt.datetime(year,
-                                             3,
-                                             1,
-                                             start_date.hour)
-            
-            else:
-                
-                start_date_met = dt.datetime(year,
-                                             start_date.month,
-                                             start_date.day,
-                                             start_date.hour)
-            
-            # Trim the windows to the operation start
-            trimmed_windows = trim_weather_windows(weather_windows,
-                                                   start_date_met)
-            
-            # Get time to first window
-            first_window_gap = (trimmed_windows['start_dt'][0] - 
-                                        start_date_met).total_seconds() / 3600
-            
-            all_cum_durations = np.array(trimmed_windows['cum_duration'])
-            all_cum_gaps = np.array(trimmed_windows['cum_gap'])
-            
-            if self._optimise_delay:
-                
-                (start_delay,
-                 waiting_time) = _get_combined_delay_wait(all_cum_durations,
-                                                          all_cum_gaps,
-                                                          sea_time,
-                                                          0)
+            start_date_met = _get_met_date(start_date, year)
             
-            else:
-                
-                (delays,
-                 wait_times) = self._get_combined_windows(
-                                                     all_cum_durations,
-                                                     all_cum_gaps,
-                                                     sea_time,
-                                                     self._max_start_delay,
-                                                     first_window_gap)
-                
-                if not delays:
-                    
-                    start_delay = -1
-                    waiting_time = -1
-                
-                else:
-                    
-                    # Get the group of windows with minimum waiting time
-                    min_wait_idx = np.argmin(wait_times)
-                    
-                    start_delay = delays[min_wait_idx]
-                    waiting_time = wait_times[min_wait_idx]
+            (start_delay,
+             waiting_time,
+             first_window_gap) = self._combined_window_at(weather_windows,
+                                                          start_date_met,
+                                                          sea_time)
             
             # If no cumulative windows were found (possibly within the
             # maximum waiting time) then abort the strategy
@@ -627,85 +742,107 @@ class WaitingTime(object):
             start_delays.append(start_delay + first_window_gap)
             waiting_times.append(waiting_time)
         
-        mean_start_delay = sum(start_delays) / float(len(start_delays))
-        mean_waiting_time = sum(waiting_times) / float(len(waiting_times))
-        
-        return mean_start_delay, mean_waiting_time
+        return start_delays, waiting_times
     
-    def __call__(self, log_phase, sched_sol, start_date):
+    def _combined_window_at(self, weather_windows,
+                                  start_date_met,
+                                  sea_time):
         
-        """
-        Waiting time calculation based on requested time and weather window
-        """
+        """Returns the start delay (from the first window), waiting time and
+        gap to the first window of the combined window strategy for an
+        operation starting on a date in the metocean data. The start delay
+        and waiting time are -1 if the strategy fails."""
         
-        olc_names = ['maxHs',
-                     'maxTp',
-                     'maxWs',
-                     'maxCs']
+        # No windows remain after the start
+        if start_date_met >= weather_windows['end_dt'][-1]: return -1, -1, 0
         
-        start_delays = []
-        wait_times = []
-        result = {}
+        # Trim the windows to the operation start
+        trimmed_windows = trim_weather_windows(weather_windows,
+                                               start_date_met)
         
-        # loop over the number of vessel journeys
-        for journey in sched_sol['journey'].itervalues():
+        # Get time to first window
+        first_window_gap = (trimmed_windows['start_dt'][0] - 
+                                    start_date_met).total_seconds() / 3600
+        
+        all_cum_durations = np.array(trimmed_windows['cum_duration'])
+        all_cum_gaps = np.array(trimmed_windows['cum_gap'])
+        
+        if self._optimise_delay:
             
-            # nansum will ignore NaN values (created by bugs...)
-            sea_time = np.nansum(journey['sea_dur'])
+            (start_delay,
+             waiting_time) = _get_combined_delay_wait(all_cum_durations,
+                                                      all_cum_gaps,
+                                                      sea_time,
+                                                      0)
+        
+        else:
             
-            # initialisation of the parameters for the weather window
-            # calculation
-            olc = {'maxHs': [],
-                   'maxTp': [],
-                   'maxWs': [],
-                   'maxCs': []}
+            (delays,
+             wait_times) = self._get_combined_windows(all_cum_durations,
+                                                      all_cum_gaps,
+                                                      sea_time,
+                                                      self._max_start_delay,
+                                                      first_window_gap)
             
-            for op_name, op_sea in zip(journey['sea_id'], journey['sea_olc']):
+            if not delays:
                 
-                olcMsgs = ["{}: {}".format(cond, op_sea_olc)
-                            for cond, op_sea_olc in zip(olc_names, op_sea)]
-                olcMsg = ", ".join(olcMsgs)
-                logMsg = ("Checking limit conditions for phase '{}': "
-                          "{}").format(op_name, olcMsg)
-                module_logger.info(logMsg)
-                
-                for i, name in enumerate(olc_names):
-                    
-                    op_sea_olc = op_sea[i]
-                    
-                    # replace 'nan' and negative OLC values by zero
-                    if op_sea_olc <= 0 or math.isnan(op_sea_olc):
-                        op_sea_olc = 0
-                    
-                    # Append OLC values
-                    olc[name].append(op_sea_olc)
-            
-            # Extract the most restrictive OLC of the sea operation 
-            if any(olc_hs > 0 for olc_hs in olc['maxHs']):
-                olc['maxHs'] = min(i for i in olc['maxHs'] if i > 0)
-            else:
-                olc['maxHs'] = 0
-            
-            if any(olc_tp > 0 for olc_tp in olc['maxTp']):
-                olc['maxTp'] = min(i for i in olc['maxTp'] if i > 0)
-            else:
-                olc['maxTp'] = 0
+                start_delay = -1
+                waiting_time = -1
             
-            if any(olc_ws > 0 for olc_ws in olc['maxWs']):
-                olc['maxWs'] = min(i for i in olc['maxWs'] if i > 0)
             else:
-                olc['maxWs'] = 0
+                
+                # Get the group of windows with minimum waiting time
+                min_wait_idx = np.argmin(wait_times)
+                
+                start_delay = delays[min_wait_idx]
+                waiting_time = wait_times[min_wait_idx]
+        
+        return start_delay, waiting_time, first_window_gap
+    
+    def __call__(self, log_phase, sched_sol, start_date):
+        
+        """
+        Waiting time calculation based on requested time and weather window
+        """
+        
+        return self.get_start_delays(log_phase, sched_sol, [start_date])[0]
+    
+    def _get_journey_key(self, log_phase, journey):
+        
+        """Returns the canonical key of a vessel journey, a tuple of the
+        index of the stored weather windows of its most restrictive
+        operational limits and its sea time. Journeys with the same key have
+        the same start delays and waiting times."""
+        
+        # nansum will ignore NaN values (created by bugs...)
+        sea_time = float(np.nansum(journey['sea_dur']))
+        
+        # Replace 'nan' and negative OLC values by zero and extract the
+        # most restrictive OLC of the sea operations
+        olc_values = np.array([list(op_sea)[:4]
+                                            for op_sea in journey['sea_olc']],
+                              dtype=float).reshape(-1, 4)
+        
+        with np.errstate(invalid='ignore'):
+            olc_values[~(olc_values > 0)] = np.inf
+        
+        limits = olc_values.min(axis=0) if len(olc_values) else \
+                                                        np.repeat(np.inf, 4)
+        limits[np.isinf(limits)] = 0
+        olc_key = tuple(limits)
+        
+        ww_idx = self._olc_index.get(olc_key)
+        
+        if ww_idx is None:
             
-            if any(olc_cs > 0 for olc_cs in olc['maxCs']):
-                olc['maxCs'] = min(i for i in olc['maxCs'] if i > 0)
-            else:
-                olc['maxCs'] = 0
+            olc = dict(zip(_OLC_NAMES, olc_key))
             
             # Return phase OLC
             msg = []
             
             if olc['maxHs'] > 0:
-                msg.append("Significant wave height: {}m".format(olc['maxHs']))
+                msg.append("Significant wave height: {}m".format(
+                                                                olc['maxHs']))
             
             if olc['maxTp'] > 0:
                 msg.append("Peak period: {}s".format(olc['maxTp']))
@@ -714,94 +851,634 @@ class WaitingTime(object):
                 msg.append("Maximum wind speed: {}m/s".format(olc['maxWs']))
             
             if olc['maxCs'] > 0:
-                msg.append("Maximum current speed: {}m/s".format(olc['maxCs']))
+                msg.append("Maximum current speed: {}m/s".format(
+                                                                olc['maxCs']))
             
             msg_str = ', '.join(msg)
             module_logger.info("Combined operational limit for phase {}: "
                                "{}".format(log_phase.description, msg_str))
             
-            # start_time = timeit.default_timer()      ## TIME ASSESSMENT
+            ww_idx = self._find_weather_windows(olc)
+            self._olc_index[olc_key] = ww_idx
+        
+        return ww_idx, sea_time
+    
+    def _find_weather_windows(self, olc):
+        
+        """Returns the index of the stored weather windows matching the
+        given operational limits, calculating and storing new windows if
+        there is no match"""
+        
+        # See if the same weather windows have been calculated and stored
+        # before
+        for i, ww_dict in enumerate(self._olc_ww):
             
-            # See if the same weather windows have been calculated and stored
-            # before
-            weather_wind = None
+            ww_olc = ww_dict['olc']
+            delta = [abs(v - ww_olc[k]) for k, v in olc.items()]
             
-            for ww_dict in self._olc_ww:
-                
-                ww_olc = ww_dict['olc']
-                delta = [abs(v - ww_olc[k]) for k, v in olc.items()]
-                
-                if all([x <= self._match_tol for x in delta]):
-                    weather_wind = ww_dict['ww']
-                    break
+            if all([x <= self._match_tol for x in delta]): return i
+        
+        # Calculate new weather windows
+        weather_wind = self.get_weather_windows(olc)
+        self._olc_ww.append({'olc': olc,
+                             'ww': weather_wind})
+        
+        return len(self._olc_ww) - 1
+    
+    def _get_journey_delays(self, log_phase, journey_key, start_dates, mask):
+        
+        """Returns a list of the results of a journey key for the start
+        dates selected by mask (None for the others). Each result is a tuple
+        of the start delay, waiting time (None for whole windows) and per
+        year arrays of both (None if percentiles are not set), or False if
+        no plan could be found. Results are memoised, so journeys sharing
+        keys and dates, in this or other solutions, are evaluated once."""
+        
+        ww_idx, sea_time = journey_key
+        weather_wind = self._olc_ww[ww_idx]['ww']
+        n_dates = len(start_dates)
+        
+        # OLC conditions allow no weather windows
+        if not weather_wind: return [False] * n_dates
+        
+        keep_years = self._percentiles is not None
+        results = [None] * n_dates
+        missing = []
+        
+        for k in np.flatnonzero(mask):
             
-            # Calculate new weather windows
-            if weather_wind is None:
-                
-                weather_wind = self.get_weather_windows(olc)
-                self._olc_ww.append({'olc': olc,
-                                     'ww': weather_wind})
+            memo_key = (ww_idx,
+                        sea_time,
+                        start_dates[k],
+                        self._optimise_delay,
+                        keep_years)
+            result = self._delay_cache.get(memo_key)
             
-            # OLC conditions allow no weather windows
-            if not weather_wind: return [], 'NoWWindows'
-            
-            # stop_time = timeit.default_timer()  # TIME ASSESSMENT
+            if result is None:
+                missing.append(k)
+            else:
+                results[k] = result
+        
+        if not missing: return results
+        
+        for k in missing:
             
-            # Start looking for whole weather windows in the metocean data
-            # unless self._optimise_delay is True
-            msgStr = ("Creating logistics plan for operation length {} hours "
-                      "for phase {} on date {}").format(sea_time,
-                                                        log_phase.description,
-                                                        start_date)
+            msgStr = ("Creating logistics plan for operation length {} "
+                      "hours for phase {} on date {}").format(
+                                                  sea_time,
+                                                  log_phase.description,
+                                                  start_dates[k])
             module_logger.info(msgStr)
+        
+        # Start looking for whole weather windows in the metocean data
+        # unless self._optimise_delay is True
+        if self._optimise_delay:
             
-            start_delay = None
+            whole_year_delays = np.zeros((len(self._unique_years),
+                                          len(missing)))
+            whole_valid = np.zeros(len(missing), dtype=bool)
+        
+        else:
             
-            if not self._optimise_delay:
+            (whole_year_delays,
+             whole_valid) = self._whole_window_year_delays(
+                                            weather_wind,
+                                            [start_dates[k] for k in missing],
+                                            sea_time)
+        
+        whole_delays = np.empty(len(missing))
+        whole_delays.fill(np.nan)
+        whole_delays[whole_valid] = \
+                            whole_year_delays[:, whole_valid].mean(axis=0)
+        
+        for j, k in enumerate(missing):
             
-                (start_delay,
-                 wait_time) = self._whole_window_strategy(weather_wind,
-                                                          start_date,
-                                                          sea_time)
+            wait_time = None
+            year_waits = None
             
-            # If self._optimise_delay is True or if a whole window can not be
-            # found look for cumulative windows
-            if start_delay is None:
+            # If self._optimise_delay is True or if a whole window can
+            # not be found look for cumulative windows
+            if whole_valid[j]:
                 
-                (start_delay,
-                 wait_time) = self._combined_window_strategy(
-                                                         weather_wind,
-                                                         start_date,
-                                                         sea_time)
+                year_delays = whole_year_delays[:, j]
+                start_delay = whole_delays[j]
             
-            if start_delay is not None:
+            else:
+                
+                (year_delays,
+                 year_waits) = self._combined_window_years(weather_wind,
+                                                           start_dates[k],
+                                                           sea_time)
                 
-                start_delays.append(start_delay)
+                if year_delays is None:
+                    result = False
+                    year_waits = None
+                
+                else:
+                    start_delay = sum(year_delays) / float(len(year_delays))
+                    wait_time = sum(year_waits) / float(len(year_waits))
+            
+            if year_delays is not None:
                 
                 if start_delay > 720:
                     module_logger.warning("Long start delay found in phase "
                                           "{}: {} hours".format(
                                                       log_phase.description,
                                                       start_delay))
+                
+                if wait_time is not None and wait_time > 720:
+                    module_logger.warning("Long waiting time found in "
+                                          "phase {}: {} hours".format(
+                                                      log_phase.description,
+                                                      wait_time))
+                
+                if keep_years:
+                    year_delays = np.array(year_delays, dtype=float)
+                    if year_waits is not None:
+                        year_waits = np.array(year_waits, dtype=float)
+                else:
+                    year_delays = None
+                
+                result = (start_delay, wait_time, year_delays, year_waits)
+            
+            memo_key = (ww_idx,
+                        sea_time,
+                        start_dates[k],
+                        self._optimise_delay,
+                        keep_years)
+            self._delay_cache.put(memo_key, result)
+            results[k] = result
+        
+        return results
+    
+    @timed("WaitingTime.get_start_delays")
+    def get_start_delays(self, log_phase, sched_sol, start_dates):
+        
+        """
+        Waiting time calculation for a number of requested start dates. The
+        operational limits and weather windows of each journey are found once
+        and the whole window strategy is evaluated for all dates together.
+        Returns a list of (result, flag) tuples, as per __call__, for each
+        date.
+        
+        If percentiles are set, each result also contains the per year
+        values of each start delay and waiting time, in the lists
+        'year_start_delay' and 'year_wait_dur'.
+        
+        In sequential mode, 'start_delay' contains a single value, the total
+        weather delay of the journeys, and 'journey_delay' contains the
+        delay of each journey after the end of the previous one.
+        """
+        
+        if self._sequential:
+            return self._get_sequential_delays(log_phase,
+                                               sched_sol,
+                                               start_dates)
+        
+        n_dates = len(start_dates)
+        
+        start_delays = [[] for _ in xrange(n_dates)]
+        wait_times = [[] for _ in xrange(n_dates)]
+        year_start_delays = [[] for _ in xrange(n_dates)]
+        year_wait_times = [[] for _ in xrange(n_dates)]
+        found = np.ones(n_dates, dtype=bool)
+        
+        keep_years = self._percentiles is not None
+        
+        # Journeys with the same key are evaluated once
+        journey_results = {}
+        
+        instruments = get_instruments()
+        profiling = instruments.has_hooks()
+        
+        # loop over the number of vessel journeys
+        for journey_id, journey in sched_sol['journey'].iteritems():
+            
+            # Dates for which a plan could not be found are not checked
+            # for later journeys
+            if not found.any(): break
+            
+            if profiling: start = timeit.default_timer()
+            
+            journey_key = self._get_journey_key(log_phase, journey)
             
+            if journey_key in journey_results:
+                strategy = "reused"
             else:
+                journey_results[journey_key] = self._get_journey_delays(
+                                                                log_phase,
+                                                                journey_key,
+                                                                start_dates,
+                                                                found)
+                strategy = None
+            
+            date_results = journey_results[journey_key]
+            
+            if profiling:
+                
+                if strategy is None:
+                    strategy = _get_strategy(
+                                    [date_results[k]
+                                            for k in np.flatnonzero(found)])
                 
-                return [], 'NoWWindows'
+                self._fire_journey(instruments,
+                                   journey_id,
+                                   journey_key[0],
+                                   strategy,
+                                   timeit.default_timer() - start)
             
-            if wait_time is not None:
+            for k in np.flatnonzero(found):
                 
-                wait_times.append(wait_time)
+                if date_results[k] is False:
+                    found[k] = False
+                    continue
                 
-                if wait_time > 720:
-                    module_logger.warning("Long waiting time found in phase "
-                                          "{}: {} hours".format(
+                (start_delay,
+                 wait_time,
+                 year_delays,
+                 year_waits) = date_results[k]
+                
+                start_delays[k].append(start_delay)
+                
+                if keep_years:
+                    year_start_delays[k].append(year_delays)
+                
+                if wait_time is not None:
+                    
+                    wait_times[k].append(wait_time)
+                    
+                    if keep_years:
+                        year_wait_times[k].append(year_waits)
+        
+        results = []
+        
+        for k in xrange(n_dates):
+            
+            if not found[k]:
+                results.append(([], 'NoWWindows'))
+                continue
+            
+            result = {'start_delay': start_delays[k],
+                      'wait_dur': wait_times[k]}
+            
+            if keep_years:
+                result['year_start_delay'] = year_start_delays[k]
+                result['year_wait_dur'] = year_wait_times[k]
+            
+            results.append((result, 'WeatherWindowsFound'))
+        
+        return results
+    
+    def _get_sequential_delays(self, log_phase, sched_sol, start_dates):
+        
+        """Simulate the journeys of a solution one after another, for each
+        of the start dates in each year of the metocean data. The whole
+        window strategy is evaluated for all years and dates of a journey
+        together; the combined window strategy is used for the remaining
+        points. Returns the results as per get_start_delays."""
+        
+        n_dates = len(start_dates)
+        n_years = len(self._unique_years)
+        
+        found = np.ones(n_dates, dtype=bool)
+        if n_years == 0: found[:] = False
+        
+        # Current time of each year (rows) and date (columns), in hours
+        # since the epoch
+        now = np.zeros((n_years, n_dates))
+        
+        for i, year in enumerate(self._unique_years):
+            now[i, :] = _get_hours([_get_met_date(start_date, year)
+                                            for start_date in start_dates])
+        
+        journey_delays = []
+        journey_waits = []
+        journey_combined = []
+        
+        instruments = get_instruments()
+        profiling = instruments.has_hooks()
+        
+        # loop over the number of vessel journeys
+        for journey_id, journey in sched_sol['journey'].iteritems():
+            
+            if not found.any(): break
+            
+            if profiling: start = timeit.default_timer()
+            
+            ww_idx, sea_time = self._get_journey_key(log_phase, journey)
+            weather_wind = self._olc_ww[ww_idx]['ww']
+            
+            # OLC conditions allow no weather windows
+            if not weather_wind:
+                
+                found[:] = False
+                
+                if profiling:
+                    self._fire_journey(instruments,
+                                       journey_id,
+                                       ww_idx,
+                                       "none",
+                                       timeit.default_timer() - start)
+                
+                break
+            
+            delays = np.zeros((n_years, n_dates))
+            waits = np.zeros((n_years, n_dates))
+            
+            if self._optimise_delay:
+                
+                whole = np.zeros((n_years, n_dates), dtype=bool)
+            
+            else:
+                
+                window_arrays = _get_window_arrays(weather_wind, sea_time)
+                whole_delays, whole = _get_whole_window_delays(window_arrays,
+                                                               now.ravel(),
+                                                               sea_time)
+                
+                whole_delays = whole_delays.reshape(n_years, n_dates)
+                whole = whole.reshape(n_years, n_dates)
+                
+                if self._max_start_delay is not None:
+                    whole &= whole_delays <= self._max_start_delay
+                
+                delays[whole] = whole_delays[whole]
+            
+            # Look for cumulative windows where a whole window can not be
+            # found
+            combined = ~whole & found
+            
+            for i, k in zip(*np.nonzero(combined)):
+                
+                if not found[k]: continue
+                
+                start_date_met = _get_datetime(now[i, k])
+                
+                (start_delay,
+                 waiting_time,
+                 first_window_gap) = self._combined_window_at(weather_wind,
+                                                              start_date_met,
+                                                              sea_time)
+                
+                if start_delay == -1:
+                    
+                    date_format = lambda x: "{:%d-%b %H:%M}".format(x)
+                    
+                    logStr = ("No weather windows found for journey "
+                              "starting on '{}' of the sequence with start "
+                              "date '{}' in year {}").format(
+                                              date_format(start_date_met),
+                                              date_format(start_dates[k]),
+                                              i)
+                    module_logger.warning(logStr)
+                    
+                    found[k] = False
+                    continue
+                
+                delays[i, k] = start_delay + first_window_gap
+                waits[i, k] = waiting_time
+            
+            # The next journey starts at the end of this one
+            now += delays + sea_time + waits
+            
+            journey_delays.append(delays)
+            journey_waits.append(waits)
+            journey_combined.append(combined)
+            
+            if profiling:
+                
+                strategy = "combined" if combined.any() else "whole"
+                
+                self._fire_journey(instruments,
+                                   journey_id,
+                                   ww_idx,
+                                   strategy,
+                                   timeit.default_timer() - start)
+        
+        keep_years = self._percentiles is not None
+        results = []
+        
+        for k in xrange(n_dates):
+            
+            if not found[k]:
+                results.append(([], 'NoWWindows'))
+                continue
+            
+            year_delay = sum(journey_delay[:, k]
+                                        for journey_delay in journey_delays)
+            start_delay = year_delay.mean()
+            
+            if start_delay > 720:
+                module_logger.warning("Long start delay found in phase "
+                                      "{}: {} hours".format(
                                                       log_phase.description,
-                                                      wait_time))
+                                                      start_delay))
+            
+            # Only journeys using cumulative windows have waiting times
+            year_waits = [journey_wait[:, k]
+                    for journey_wait, journey_comb in zip(journey_waits,
+                                                          journey_combined)
+                                                if journey_comb[:, k].any()]
+            
+            result = {'start_delay': [start_delay],
+                      'wait_dur': [year_wait.mean()
+                                            for year_wait in year_waits],
+                      'journey_delay': [journey_delay[:, k].mean()
+                                        for journey_delay in journey_delays]}
+            
+            if keep_years:
+                result['year_start_delay'] = [year_delay]
+                result['year_wait_dur'] = year_waits
+            
+            results.append((result, 'WeatherWindowsFound'))
+        
+        return results
+    
+    def _fire_journey(self, instruments, journey_id, ww_idx,
+                                                     strategy,
+                                                     elapsed):
+        
+        ww_dict = self._olc_ww[ww_idx]
+        n_windows = len(ww_dict['ww']['start_dt']) if ww_dict['ww'] else 0
+        olc = tuple(float(ww_dict['olc'][name]) for name in _OLC_NAMES)
+        
+        instruments.fire("journey",
+                         elapsed,
+                         journey=journey_id,
+                         strategy=strategy,
+                         n_windows=n_windows,
+                         olc=olc)
+        
+        return
+    
+    def get_percentiles(self, year_values):
+        
+        """Returns the percentiles of a dictionary of per year value arrays,
+        calculated together using array operations. The returned dictionary
+        contains the list of percentiles, under 'percentiles', and an array
+        of the percentile values for each key of year_values. If bootstrap
+        resampling is enabled, the percentiles are the mean over the
+        resamples and the standard deviations are given in a dictionary
+        under 'bootstrap std'."""
+        
+        if self._percentiles is None:
+            errStr = "Percentiles were not set for this WaitingTime"
+            raise RuntimeError(errStr)
         
-        result['start_delay'] = start_delays
-        result['wait_dur'] = wait_times
+        keys = list(year_values)
+        values = np.array([year_values[key] for key in keys], dtype=float)
         
-        return result, 'WeatherWindowsFound'
+        result = {'percentiles': list(self._percentiles)}
+        
+        if self._n_bootstrap == 0:
+            
+            # Shape is (n_percentiles, n_keys)
+            values_pc = np.percentile(values, self._percentiles, axis=1)
+            
+            for i, key in enumerate(keys):
+                result[key] = values_pc[:, i]
+            
+            return result
+        
+        n_years = values.shape[1]
+        random = np.random.RandomState(self._bootstrap_seed)
+        samples = random.randint(n_years, size=(self._n_bootstrap, n_years))
+        
+        # Shape is (n_percentiles, n_keys, n_bootstrap)
+        values_pc = np.percentile(values[:, samples],
+                                  self._percentiles,
+                                  axis=2)
+        means = values_pc.mean(axis=2)
+        stds = values_pc.std(axis=2)
+        
+        result['bootstrap std'] = {}
+        
+        for i, key in enumerate(keys):
+            result[key] = means[:, i]
+            result['bootstrap std'][key] = stds[:, i]
+        
+        return result
+
+
+def _get_strategy(date_results):
+    
+    """Returns the weather window strategy of the results of
+    _get_journey_delays: "none" if a plan was not found for any date,
+    "combined" if any date used combined windows or otherwise "whole"."""
+    
+    if any(result is False for result in date_results): return "none"
+    if any(result[1] is not None for result in date_results):
+        return "combined"
+    
+    return "whole"
+
+
+def get_year_totals(journey):
+    
+    """Returns arrays of the mean start delay and the total waiting time of
+    the vessel journeys of a WaitingTime.get_start_delays result, for each
+    year of the metocean data, or None if the per year values were not kept.
+    """
+    
+    if 'year_start_delay' not in journey: return None
+    
+    start_delay = np.mean(journey['year_start_delay'], axis=0)
+    
+    if journey['year_wait_dur']:
+        waiting_time = np.sum(journey['year_wait_dur'], axis=0)
+    else:
+        waiting_time = np.zeros(len(start_delay))
+    
+    return start_delay, waiting_time
+
+
+def get_weather_percentiles(waiting_time,
+                            start_dt,
+                            start_delay,
+                            total_waiting,
+                            other_hours):
+    
+    """Returns the percentiles of the per year start delay and total waiting
+    time of a scheduled solution and the end date at each percentile. The end
+    date is measured from start_dt and includes the start delay, the waiting
+    time and other_hours (the remaining hours which do not depend on the
+    weather)."""
+    
+    year_values = {'start delay': start_delay,
+                   'waiting time': total_waiting,
+                   'end hours': start_delay + total_waiting + other_hours}
+    
+    result = waiting_time.get_percentiles(year_values)
+    result['end_dt'] = [start_dt + dt.timedelta(hours=float(hours))
+                                            for hours in result['end hours']]
+    
+    return result
+
+
+def _get_window_arrays(weather_windows, sea_time):
+    
+    """Returns the window start and end hours and, for each window, the index
+    of the first window at or after it which is long enough for the
+    operation (or the number of windows if there isn't one)"""
+    
+    n_windows = len(weather_windows['start_dt'])
+    
+    window_starts = _get_hours(weather_windows['start_dt'])
+    window_ends = _get_hours(weather_windows['end_dt'])
+    durations = np.array(weather_windows['duration'], dtype=float)
+    
+    long_idxs = np.flatnonzero(durations >= sea_time)
+    next_long = np.append(long_idxs, n_windows)[
+            np.searchsorted(long_idxs, np.arange(n_windows + 1))]
+    
+    return window_starts, window_ends, next_long
+
+
+def _get_whole_window_delays(window_arrays, op_starts, sea_time):
+    
+    """Returns arrays of the delay until the first whole window, long enough
+    for the operation, after each of the op_starts (in hours since the epoch)
+    and whether such a window was found"""
+    
+    window_starts, window_ends, next_long = window_arrays
+    n_windows = len(window_starts)
+    
+    # Trim the windows to the operation start (as per
+    # trim_weather_windows). Windows ending at or before the start
+    # are removed and a window containing the start is shortened.
+    untrimmed = window_starts[0] >= op_starts
+    
+    first = np.searchsorted(window_ends, op_starts)
+    first[untrimmed] = 0
+    no_windows = first >= n_windows
+    first[no_windows] = n_windows - 1
+    
+    first_start = window_starts[first]
+    first_end = window_ends[first]
+    
+    ends_at_start = ~untrimmed & (first_end == op_starts)
+    contains_start = (~untrimmed &
+                      ~ends_at_start &
+                      (first_start <= op_starts))
+    
+    # Look for the first window that is long enough
+    search_from = first.copy()
+    search_from[ends_at_start | contains_start] += 1
+    
+    window_idx = next_long[search_from]
+    found = window_idx < n_windows
+    window_idx[~found] = 0
+    
+    start_delay = np.floor(window_starts[window_idx] - op_starts)
+    
+    # A shortened window which is long enough starts immediately
+    long_start = (contains_start &
+                  (np.floor(first_end - op_starts) >= sea_time))
+    
+    start_delay[long_start] = 0
+    found = (found | long_start) & ~no_windows
+    
+    return start_delay, found
 
 
 def get_window_indexes(WW_bin, time_step_hours):
@@ -839,6 +1516,37 @@ def get_groups(data):
     return groups
 
 
+def _get_met_date(start_date, year):
+    
+    """Set the year of start_date to match the metocean data, avoiding the
+    29th of February in a 365 day year"""
+    
+    if (not is_leap_year(year) and
+        start_date.month == 2 and
+        start_date.day > 28):
+        
+        return dt.datetime(year, 3, 1, start_date.hour)
+    
+    return dt.datetime(year,
+                       start_date.month,
+                       start_date.day,
+                       start_date.hour)
+
+
+def _get_datetime(hours):
+    """Convert hours since the epoch to a datetime"""
+    return dt.datetime(1970, 1, 1) + dt.timedelta(hours=float(hours))
+
+
+def _get_hours(dates):
+    """Convert a sequence of datetimes to an array of hours since the epoch
+    """
+    
+    seconds = np.array(dates, dtype='datetime64[s]').astype(np.int64)
+    
+    return seconds / 3600.
+
+
 def is_leap_year(year):
     divisible = lambda x: not bool(year % x)
     return divisible(400) if divisible(100) else divisible(4)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Benchmark of the cold import time of the package modules. Each module is
+imported in a new interpreter, recording the total import time, the time
+after numpy and pandas are imported and any of the lazily imported
+dependencies (see LAZY_MODULES) that are loaded:
+
+    python -m dtocean_logistics.performance.startup
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+
+# Modules of the core scheduling API
+CORE_MODULES = ["dtocean_logistics.performance.schedule.schedule_shared",
+                "dtocean_logistics.performance.schedule.schedule_om",
+                "dtocean_logistics.performance.schedule.schedule_ins"]
+
+# Dependencies that are only imported when the features using them are
+# called
+LAZY_MODULES = ["matplotlib.pyplot", "scipy", "utm", "xlrd"]
+
+_SCRIPT = """
+import sys
+import json
+import timeit
+
+start = timeit.default_timer()
+
+import numpy
+import pandas
+
+middle = timeit.default_timer()
+
+import {module}
+
+end = timeit.default_timer()
+
+lazy = [name for name in {lazy!r} if name in sys.modules]
+
+print json.dumps({{"total": end - start,
+                  "package": end - middle,
+                  "loaded": lazy}})
+"""
+
+
+def measure_import(module_name, repeat=5, python=None):
+
+    """Imports the given module in repeat new interpreters and returns a
+    dictionary of the lists of the total import times ("total") and the
+    import times after numpy and pandas ("package"), in seconds, and the
+    list of the lazily imported modules that were loaded ("loaded")"""
+
+    if python is None: python = sys.executable
+
+    script = _SCRIPT.format(module=module_name, lazy=LAZY_MODULES)
+    result = {"total": [], "package": [], "loaded": []}
+
+    for _ in xrange(repeat):
+
+        output = subprocess.check_output([python, "-c", script])
+        record = json.loads(output.strip().splitlines()[-1])
+
+        result["total"].append(record["total"])
+        result["package"].append(record["package"])
+        result["loaded"] = record["loaded"]
+
+    return result
+
+
+def main(argv=None):
+    """Command line interface for the startup benchmark"""
+
+    parser = argparse.ArgumentParser(
+                description="Measure the cold import time of the package "
+                            "modules")
+    parser.add_argument("modules",
+                        nargs="*",
+                        default=CORE_MODULES,
+                        help="modules to import (default: the core "
+                             "scheduling modules)")
+    parser.add_argument("-r", "--repeat",
+                        type=int,
+                        default=5,
+                        help="number of imports of each module (default: 5)")
+
+    args = parser.parse_args(argv)
+
+    print "{:<60} {:>10} {:>10}  {}".format("Module",
+                                            "Total [s]",
+                                            "Package [s]",
+                                            "Lazy modules loaded")
+
+    for module_name in args.modules:
+
+        result = measure_import(module_name, args.repeat)
+
+        print "{:<60} {:>10.3f} {:>10.3f}  {}".format(
+                                            module_name,
+                                            min(result["total"]),
+                                            min(result["package"]),
+                                            ", ".join(result["loaded"]))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -60,7 +60,7 @@ import logging
 
 from .classes import DefPhase, LogPhase
 from .shared import get_burial_equip
-from ...ancillaries import distance
+from ...load.cable_route import CableRouteIndex
 
 # Start logging
 module_logger = logging.getLogger(__name__)
@@ -83,6 +83,7 @@ def init_e_export_phase(log_op, vessels, equipments, landfall,
 
         route_db = cable_route
         export_route = route_db[route_db['static cable id [-]'].isin(export_index)]
+        route_index = CableRouteIndex(export_route)
 
         cp_db = collection_point
         pipe_db = equipments['split pipe'].panda
@@ -91,20 +92,12 @@ def init_e_export_phase(log_op, vessels, equipments, landfall,
         number_pipes = [0]
 
         for index, row in export_db.iterrows():
-            index_route_db = export_route[export_route['static cable id [-]'] == index]
+            split_pipe = route_index.get_column(index, 'split pipe [-]')
 
-            for a in range(len(index_route_db.index)-1):
-                if index_route_db['split pipe [-]'].iloc[a] == 'yes':
+            for a in range(len(split_pipe)-1):
+                if split_pipe[a] == 'yes':
 
-                    UTM_ini = [index_route_db['x coord [m]'].iloc[a],
-                               index_route_db['y coord [m]'].iloc[a],
-                               index_route_db['zone [-]'].iloc[a]]
-
-                    UTM_fin = [index_route_db['x coord [m]'].iloc[a+1],
-                               index_route_db['y coord [m]'].iloc[a+1],
-                               index_route_db['zone [-]'].iloc[a+1]]
-
-                    dist = distance(UTM_ini, UTM_fin)*1000  # obtain the distance in meters 
+                    dist = route_index.get_segment_length(index, a)*1000.0  # obtain the distance in meters 
 
                     pipe_length = max(pipe_db['Unit length [mm]'])/1000.0  # obtain the length of the pipes in meters 
 
@@ -189,13 +182,14 @@ def init_e_export_phase(log_op, vessels, equipments, landfall,
                     module_logger.warning(msg)
 
                 # include cable route laying operation between terminations
-                index_route_db = export_route[export_route['static cable id [-]'] == index]
+                burial_depth = route_index.get_column(index, 'burial depth [m]')
+                split_pipe = route_index.get_column(index, 'split pipe [-]')
 
                 trenching = 0 # variable stating trenching status, 0 == not trenching / 1 = trenching
-                for index1, row in index_route_db.iterrows():
+                for point in range(len(burial_depth)):
 
-                    if index_route_db['burial depth [m]'].ix[index1] == 0 and \
-                       index_route_db['split pipe [-]'].ix[index1] == 'no':
+                    if burial_depth[point] == 0 and \
+                       split_pipe[point] == 'no':
 
                        if trenching == 0:
                            phase.op_ve[a].op_seq_sea[index].extend([log_op["CableLay_Route"]])
@@ -205,8 +199,8 @@ def init_e_export_phase(log_op, vessels, equipments, landfall,
                                                                     log_op["CableLay_Route"]])
                            trenching = 0
 
-                    elif index_route_db['burial depth [m]'].ix[index1] == 0 and \
-                         index_route_db['split pipe [-]'].ix[index1] == 'yes':
+                    elif burial_depth[point] == 0 and \
+                         split_pipe[point] == 'yes':
         
                            if trenching == 0:
                                phase.op_ve[a].op_seq_sea[index].extend([log_op["CableLay_SplitPipe"]])
@@ -216,7 +210,7 @@ def init_e_export_phase(log_op, vessels, equipments, landfall,
                                                                         log_op["CableLay_SplitPipe"]])
                                trenching = 0
 
-                    elif index_route_db['burial depth [m]'].ix[index1] != 0:
+                    elif burial_depth[point] != 0:
 
                          if trenching == 0:
                              phase.op_ve[a].op_seq_sea[index].extend([log_op["BurialToolDeploy"],
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Precomputed distances from the ports of a port database to a list of sites,
+which can be stored in a cache directory and memory mapped by later runs.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import os
+import logging
+
+import numpy as np
+
+from ..ancillaries import (LRUCache,
+                           get_digest,
+                           get_distance_cache,
+                           write_atomic)
+
+module_logger = logging.getLogger(__name__)
+
+_port_distances = LRUCache(8)
+
+
+class PortDistances(object):
+
+    """Matrix of the distances (in km) from each port (rows) of a port
+    database to each of a list of sites (columns), given in [x, y, zone] UTM
+    format. Ports without coordinates have NaN distances. Distances are read
+    by port position and site coordinates in constant time."""
+
+    def __init__(self, labels, sites_coords, matrix):
+
+        self.labels = labels
+        self.matrix = matrix
+        self._columns = {}
+
+        for i, site_coords in enumerate(sites_coords):
+            self._columns.setdefault(_get_site_key(site_coords), i)
+
+        return
+
+    def __contains__(self, site_coords):
+        return _get_site_key(site_coords) in self._columns
+
+    def get(self, position, site_coords):
+        """Returns the distance from the port at the given position in the
+        database to the site. KeyError is raised for unknown sites."""
+        column = self._columns[_get_site_key(site_coords)]
+        return float(self.matrix[position, column])
+
+    def get_site(self, site_coords):
+        """Returns the distances from every port to the site. KeyError is
+        raised for unknown sites."""
+        column = self._columns[_get_site_key(site_coords)]
+        return self.matrix[:, column]
+
+
+def build_port_distances(port_data, sites_coords, sea_router=None):
+
+    """Returns a matrix of the distances (in km) from each port in port_data
+    (rows) to each of the sites (columns). If a SeaRouter (see
+    transit_algorithm) is given, sea distances are used, otherwise, or for
+    ports that can not reach a site by sea, the direct distances are used.
+    """
+
+    located = np.flatnonzero(port_data['UTM x [m]'].notnull().values)
+
+    x = port_data['UTM x [m]'].values[located]
+    y = port_data['UTM y [m]'].values[located]
+    zones = port_data['UTM zone [-]'].values[located]
+    ports_coords = zip(x, y, zones)
+
+    matrix = np.empty((len(port_data), len(sites_coords)))
+    matrix.fill(np.nan)
+
+    if len(located) == 0: return matrix
+
+    distance_cache = get_distance_cache()
+
+    for i, site_coords in enumerate(sites_coords):
+
+        if sea_router is None:
+            dists = np.empty(len(located))
+            dists.fill(np.inf)
+        else:
+            dists = sea_router.get_distances_to(site_coords, ports_coords)
+
+        direct = ~np.isfinite(dists)
+
+        if direct.any():
+            dists[direct] = distance_cache.get_distances(site_coords,
+                                                         x[direct],
+                                                         y[direct],
+                                                         zones[direct])
+
+        matrix[located, i] = dists
+
+    return matrix
+
+
+def get_port_distances(port_data,
+                       sites_coords,
+                       sea_router=None,
+                       cache_dir=None):
+
+    """Returns the PortDistances of the ports in port_data and the given
+    sites, reusing the matrix built for the same ports, sites and sea graph.
+    If cache_dir is given, the matrix is stored there in a file named by
+    the hash of its inputs and later calls memory map the stored file."""
+
+    sites_keys = [_get_site_key(site_coords) for site_coords in sites_coords]
+
+    if sea_router is None:
+        router_digest = None
+    else:
+        router_digest = sea_router.get_digest()
+
+    key = get_digest(port_data.index.values,
+                     port_data['UTM x [m]'].values,
+                     port_data['UTM y [m]'].values,
+                     port_data['UTM zone [-]'].values,
+                     sites_keys,
+                     router_digest)
+
+    port_distances = _port_distances.get(key)
+    if port_distances is not None: return port_distances
+
+    shape = (len(port_data), len(sites_coords))
+    matrix = None
+
+    if cache_dir is not None:
+
+        cache_path = os.path.join(cache_dir,
+                                  "port_distances_{}.npy".format(key))
+
+        if os.path.isfile(cache_path):
+            matrix = _load_matrix(cache_path, shape)
+
+    if matrix is None:
+
+        matrix = build_port_distances(port_data, sites_coords, sea_router)
+
+        if cache_dir is not None:
+            _save_matrix(cache_path, matrix)
+
+    port_distances = PortDistances(port_data.index, sites_coords, matrix)
+    _port_distances.put(key, port_distances)
+
+    return port_distances
+
+
+def _get_site_key(site_coords):
+    return (float(site_coords[0]), float(site_coords[1]), str(site_coords[2]))
+
+
+def _load_matrix(cache_path, shape):
+
+    try:
+        matrix = np.load(cache_path, mmap_mode='r')
+    except (IOError, ValueError):
+        matrix = None
+
+    if matrix is None or matrix.shape != shape:
+
+        msg = ("Ignoring invalid port distance cache file "
+               "'{}'").format(cache_path)
+        module_logger.warning(msg)
+
+        return None
+
+    return matrix
+
+
+def _save_matrix(cache_path, matrix):
+
+    try:
+        write_atomic(cache_path, lambda cache_file: np.save(cache_file,
+                                                            matrix))
+    except (IOError, OSError):
+        msg = ("Could not store port distance cache file "
+               "'{}'").format(cache_path)
+        module_logger.warning(msg)
+
+    return
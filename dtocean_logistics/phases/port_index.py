@@ -0,0 +1,330 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Spatial index of the port database, used by the installation and O&M port
+selection.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import logging
+
+import numpy as np
+
+from ..ancillaries import (EARTH_RADIUS,
+                           LRUCache,
+                           distance,
+                           get_digest,
+                           great_circle_distance,
+                           utm_to_latlon)
+
+module_logger = logging.getLogger(__name__)
+
+# Columns of the port database read by the index
+PORT_INDEX_COLUMNS = ['Name [-]',
+                      'UTM x [m]',
+                      'UTM y [m]',
+                      'UTM zone [-]',
+                      'Terminal load bearing [t/m^2]',
+                      'Terminal area [m^2]',
+                      'Type of terminal [Quay/Dry-dock]']
+
+# Relative tolerance used when comparing tree and great circle distances
+_DISTANCE_RTOL = 1e-9
+
+_port_indexes = LRUCache(8)
+
+
+class PortIndex(object):
+
+    """Index of a port database. The port positions are converted to
+    latitude and longitude once and a cKDTree is built of their positions on
+    the unit sphere, so the closest ports to a site are found without
+    measuring the distance to every port. Ports are referred to by their
+    position in the database and requirements are applied to arrays of
+    positions."""
+
+    def __init__(self, port_data):
+
+        self.labels = port_data.index
+        self.names = port_data['Name [-]'].values
+        self._values = {}
+
+        for column in ['Terminal load bearing [t/m^2]',
+                       'Terminal area [m^2]']:
+            self._values[column] = np.asarray(port_data[column].values,
+                                              dtype=float)
+
+        self._terminal_types = port_data[
+                                'Type of terminal [Quay/Dry-dock]'].values
+
+        # Only ports with coordinates can be selected
+        located = port_data['UTM x [m]'].notnull().values
+        self._located = np.flatnonzero(located)
+
+        self._x = port_data['UTM x [m]'].values
+        self._y = port_data['UTM y [m]'].values
+        self._zones = port_data['UTM zone [-]'].values
+
+        self._lat, self._lon = utm_to_latlon(self._x[located],
+                                             self._y[located],
+                                             self._zones[located])
+
+        if len(self._located) > 0:
+            # Imported here to keep scipy out of the import time of the
+            # package
+            from scipy import spatial
+            self._tree = spatial.cKDTree(_to_unit_sphere(self._lat,
+                                                         self._lon))
+        else:
+            self._tree = None
+
+        return
+
+    def __len__(self):
+        return len(self.labels)
+
+    def get_all(self):
+        """Returns the positions of all the ports"""
+        return np.arange(len(self.labels))
+
+    def filter_terminal_type(self, positions, terminal_type):
+        """Returns the positions with the given terminal type"""
+        return positions[self._terminal_types[positions] == terminal_type]
+
+    def apply_minimum(self, positions, column, minimum):
+
+        """Returns the positions of the ports meeting the minimum value of
+        the given column, followed by those with no value, and the positions
+        of the ports that do not."""
+
+        values = self._values[column][positions]
+        missing = np.isnan(values)
+
+        with np.errstate(invalid='ignore'):
+            accepted = values >= minimum
+            rejected = values < minimum
+
+        kept = np.concatenate([positions[accepted], positions[missing]])
+
+        return kept, positions[rejected]
+
+    def get_closest(self, site_coords, positions=None, n=5):
+        """Returns the distances (in km) and positions of the n closest ports
+        to the site, as described in get_closest_many"""
+        return self.get_closest_many([site_coords], positions, n)[0]
+
+    def get_closest_many(self, sites_coords, positions=None, n=5):
+
+        """Returns, for each of the sites given in [x, y, zone] UTM format, a
+        list of up to n (distance, position) pairs of the closest located
+        ports, limited to the given positions. Ports are ordered by
+        distance, database index and name, and ports with the same name as
+        the port before them are skipped."""
+
+        if self._tree is None: return [[] for _ in sites_coords]
+
+        allowed = np.zeros(len(self.labels), dtype=bool)
+
+        if positions is None:
+            allowed[:] = True
+        else:
+            allowed[positions] = True
+
+        allowed = allowed[self._located]
+        n_located = len(self._located)
+
+        x, y, zones = zip(*sites_coords)
+        site_lats, site_lons = utm_to_latlon(x, y, zones)
+        site_points = _to_unit_sphere(site_lats, site_lons)
+
+        k = min(n_located, max(4 * n, 16))
+        chords, ids = self._tree.query(site_points, k)
+
+        results = []
+
+        for i in xrange(len(sites_coords)):
+
+            site_k = k
+            site_chords = np.atleast_1d(chords[i])
+            site_ids = np.atleast_1d(ids[i])
+
+            while True:
+
+                closest = self._select(site_lats[i],
+                                       site_lons[i],
+                                       site_ids[allowed[site_ids]],
+                                       n)
+
+                if site_k == n_located: break
+
+                # Ports outside of the query are further than the furthest
+                # port returned
+                limit = _chord_to_distance(site_chords[-1])
+
+                if (len(closest) == n and
+                    closest[-1][0] < limit * (1 - _DISTANCE_RTOL)): break
+
+                site_k = min(n_located, 2 * site_k)
+                site_chords, site_ids = self._tree.query(site_points[i],
+                                                         site_k)
+                site_chords = np.atleast_1d(site_chords)
+                site_ids = np.atleast_1d(site_ids)
+
+            results.append(closest)
+
+        return results
+
+    def choose(self, site_coords,
+                     positions=None,
+                     n=5,
+                     sea_router=None,
+                     port_distances=None):
+        """Returns the distance (in km) and position of the port chosen for
+        the site from the n closest ports, as described in choose_many"""
+        return self.choose_many([site_coords],
+                                positions,
+                                n,
+                                sea_router,
+                                port_distances)[0]
+
+    def choose_many(self, sites_coords,
+                          positions=None,
+                          n=5,
+                          sea_router=None,
+                          port_distances=None):
+
+        """Returns the distance (in km) and position of the port chosen for
+        each site from its n closest ports. The distances to the closest
+        ports are measured with ancillaries.distance, or as sea distances if
+        a SeaRouter (see transit_algorithm) is given, and, of the ports tied
+        with the shortest distance, the last is chosen. If none of the
+        closest ports can reach a site by sea, the direct distances are used.
+        If a PortDistances (see port_distances) containing a site is given,
+        the distances are read from its matrix instead. ValueError is raised
+        if none of the ports have coordinates."""
+
+        all_closest = self.get_closest_many(sites_coords, positions, n)
+        choices = []
+
+        for site_coords, closest in zip(sites_coords, all_closest):
+
+            if not closest:
+                raise ValueError("None of the ports have coordinates")
+
+            choice = None
+            ports_coords = [[self._x[position],
+                             self._y[position],
+                             self._zones[position]]
+                                                for _, position in closest]
+
+            if port_distances is not None and site_coords in port_distances:
+                dists = [port_distances.get(position, site_coords)
+                                                for _, position in closest]
+            elif sea_router is None:
+                dists = [distance(site_coords, port_coords)
+                                            for port_coords in ports_coords]
+            else:
+                dists = self._get_sea_distances(sea_router,
+                                                site_coords,
+                                                ports_coords)
+
+            for (_, position), dist in zip(closest, dists):
+
+                if choice is None or dist <= choice[0]:
+                    choice = (dist, position)
+
+            choices.append(choice)
+
+        return choices
+
+    @classmethod
+    def _get_sea_distances(cls, sea_router, site_coords, ports_coords):
+
+        dists = sea_router.get_distances_to(site_coords, ports_coords)
+
+        if np.isfinite(dists).any(): return [float(x) for x in dists]
+
+        msg = ("No sea route found from the closest ports to the site at {}. "
+               "Direct distances will be used").format(site_coords)
+        module_logger.warning(msg)
+
+        return [distance(site_coords, port_coords)
+                                            for port_coords in ports_coords]
+
+    def _select(self, site_lat, site_lon, ids, n):
+
+        dists = great_circle_distance(site_lat,
+                                      site_lon,
+                                      self._lat[ids],
+                                      self._lon[ids])
+        positions = self._located[ids]
+
+        ports = sorted(zip(dists,
+                           self.labels[positions],
+                           self.names[positions],
+                           positions))
+
+        closest = []
+        last_name = None
+
+        for dist, _, name, position in ports:
+
+            is_repeat = last_name is not None and name == last_name
+            last_name = name
+
+            if is_repeat: continue
+
+            closest.append((float(dist), position))
+
+            if len(closest) == n: break
+
+        return closest
+
+
+def get_port_index(port_data):
+    """Returns the PortIndex of the port database, reusing the index built
+    for an identical database"""
+
+    columns = [col for col in PORT_INDEX_COLUMNS if col in port_data.columns]
+    values = [port_data[col].values for col in columns]
+    key = get_digest(port_data.index.values, columns, *values)
+
+    port_index = _port_indexes.get(key)
+
+    if port_index is None:
+        port_index = PortIndex(port_data)
+        _port_indexes.put(key, port_index)
+
+    return port_index
+
+
+def _to_unit_sphere(lat, lon):
+
+    lat = np.radians(lat)
+    lon = np.radians(lon)
+
+    points = np.column_stack((np.cos(lat) * np.cos(lon),
+                              np.cos(lat) * np.sin(lon),
+                              np.sin(lat)))
+
+    return points
+
+
+def _chord_to_distance(chord):
+    return EARTH_RADIUS * 2 * np.arcsin(min(chord / 2., 1.))
@@ -28,10 +28,9 @@ this will be upgraded for the beta version due to october.
 .. moduleauthor:: Paulo Chainho <paulo@wavec.org>
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
-import math
 import logging
 
-from ..ancillaries import distance
+from .port_index import get_port_index
 # from .transit_algorithm import transit_algorithm
 # from ..configure import get_install_paths
 
@@ -45,7 +44,10 @@ def install_port(device, sub_device,
                  collection_point,
                  instal_order,
                  point_path=None,
-                 graph_path=None):
+                 graph_path=None,
+                 port_index=None,
+                 sea_router=None,
+                 port_distances=None):
     """install_port function selects the home port used by all logistic phases
     during installation. This selection is based on a 2 step process: 
         1 - the port feasibility functions from all logistic phases are taken
@@ -64,6 +66,12 @@ def install_port(device, sub_device,
     port_data : DataFrame
      panda table containing the ports database
     point_path and graph_path are inputs required for the transport_algorithm
+    port_index : PortIndex, optional
+     index of the ports database, which is created (or reused) if not given
+    sea_router : SeaRouter, optional
+     if given, ports are chosen by sea distance (see transit_algorithm)
+    port_distances : PortDistances, optional
+     precomputed port to site distances (see port_distances)
 
     Returns
     -------
@@ -71,7 +79,9 @@ def install_port(device, sub_device,
      dictionnary containing the results port_listof the port selection
     """
     # initialisation
-    port_data = ports
+    if port_index is None: port_index = get_port_index(ports)
+
+    positions = port_index.get_all()
     port = {'Terminal load bearing [t/m^2]': 0,
             'Terminal area [m^2]': 0,
             'Port list satisfying the minimum requirements': 0,
@@ -157,12 +167,12 @@ def install_port(device, sub_device,
             # check load out strategy
             loadout_methd = device['load out [-]'].ix[0]
             if loadout_methd == 'float away':
-                port_data = port_data[port_data[
-                            'Type of terminal [Quay/Dry-dock]'] == 'Dry-dock']
+                positions = port_index.filter_terminal_type(positions,
+                                                            'Dry-dock')
                 module_logger.info("Dry-dock type ports selected")
             else:
-                port_data = port_data[port_data[
-                            'Type of terminal [Quay/Dry-dock]'] == 'Quay']
+                positions = port_index.filter_terminal_type(positions,
+                                                            'Quay')
                 module_logger.info("Quay type ports selected")
 
             max_dev_area = 0
@@ -179,16 +189,14 @@ def install_port(device, sub_device,
 
     # terminal load bearing minimum requirement
     port['Terminal load bearing [t/m^2]'] = float(max_total_load)/1000.0  # t/m^2
-    port_pd_nan = port_data
-    port_data = port_data[ port_data['Terminal load bearing [t/m^2]'] >= port['Terminal load bearing [t/m^2]'] ]
-    port_data = port_data.append(port_pd_nan[port_pd_nan['Terminal load bearing [t/m^2]'].isnull()])
-
-    deselected = port_pd_nan[port_pd_nan['Terminal load bearing [t/m^2]'] <
-                                       port['Terminal load bearing [t/m^2]']]
+    positions, deselected = port_index.apply_minimum(
+                                        positions,
+                                        'Terminal load bearing [t/m^2]',
+                                        port['Terminal load bearing [t/m^2]'])
     
-    if not deselected.empty:
+    if len(deselected) > 0:
         
-        port_names = deselected['Name [-]']
+        port_names = port_index.names[deselected]
         ports_str = ", ".join(port_names)
         
         logMsg = ("The following ports did not meet the 'Terminal load bearing' "
@@ -198,16 +206,14 @@ def install_port(device, sub_device,
         module_logger.info(logMsg)
 
     port['Terminal area [m^2]'] = float(max_total_area)
-    port_pd_nan = port_data
-    port_data = port_data[ port_data['Terminal area [m^2]'] >= port['Terminal area [m^2]'] ]
-    port_data = port_data.append(port_pd_nan[port_pd_nan['Terminal area [m^2]'].isnull()])
-    
-    deselected = port_pd_nan[port_pd_nan['Terminal area [m^2]'] <
-                                                 port['Terminal area [m^2]']]
+    positions, deselected = port_index.apply_minimum(
+                                                positions,
+                                                'Terminal area [m^2]',
+                                                port['Terminal area [m^2]'])
 
-    if not deselected.empty:
+    if len(deselected) > 0:
 
-        port_names = deselected['Name [-]']
+        port_names = port_index.names[deselected]
         ports_str = ", ".join(port_names)
         
         logMsg = ("The following ports did not meet the 'Terminal area' "
@@ -216,9 +222,10 @@ def install_port(device, sub_device,
                                           ports_str.encode('utf-8'))
         module_logger.info(logMsg)
 
-    port['Port list satisfying the minimum requirements'] = port_data
+    port['Port list satisfying the minimum requirements'] = \
+                                                        ports.iloc[positions]
 
-    if len(port_data)==0:
+    if len(positions)==0:
         
         msg = ("There is no port that satisfies the project requirements. "
                "The closest port will be used. Requirements are: "
@@ -228,7 +235,7 @@ def install_port(device, sub_device,
                    port['Terminal area [m^2]']))
         module_logger.info(msg)                   
 
-        port_data = ports
+        positions = port_index.get_all()
 
     # Distance ports-site calculation to be implemented once the transit distance algorithm is available
     # by making use of the grid coordinate position of the site and the ports
@@ -239,61 +246,17 @@ def install_port(device, sub_device,
     site_coords_zone = entry_point['zone [-]'].ix[0]
 
     site_coords = [site_coords_x, site_coords_y, site_coords_zone]
-    dist_to_port_vec = []
-    for ind_port, row in port_data.iterrows():
-        port_coords_x = port_data['UTM x [m]'][ind_port]
-        port_coords_y = port_data['UTM y [m]'][ind_port]
-        port_coords_zone = port_data['UTM zone [-]'][ind_port]
-        port_coords = [port_coords_x, port_coords_y, port_coords_zone]
-
-        if math.isnan(port_coords_x):
-            continue
-        dist_to_port_i = distance(site_coords, port_coords)   # closest ports by geo distance!
-        dist_to_port_vec.append( [dist_to_port_i, ind_port, port_data['Name [-]'][ind_port]] )
-    closest_ports_all=sorted(dist_to_port_vec)
-    # furthest_ports_all = closest_ports_all.reverse()
-
-    # check if repeted port (by terminal)
-    LEN_clst = len(closest_ports_all)-1
-    ind_clst=0
-    while ind_clst < LEN_clst:
-        if closest_ports_all[ind_clst+1][2] == closest_ports_all[ind_clst][2]:   # if same name
-            del closest_ports_all[ind_clst+1]
-            LEN_clst = LEN_clst-1
-        else:
-            ind_clst = ind_clst+1
-
-
-    # Identify the n=num_ports_consider closest ports:
-    # num_ports_consider = len(dist_to_port_vec)  # consider all
-    num_ports_consider = 5
-    closest_ports_n = closest_ports_all[:min(num_ports_consider,len(closest_ports_all))]
-
-
-    # Find the closest port using the transit_algorithm:
-    dist_to_clost_port_vec=[]
-    for ind_closest_port in range(len(closest_ports_n)):
-        ind_port= closest_ports_n[ind_closest_port][1]
-        port_coords_x = port_data['UTM x [m]'][ind_port]
-        port_coords_y = port_data['UTM y [m]'][ind_port]
-        port_coords_zone = port_data['UTM zone [-]'][ind_port]
-        port_coords = [port_coords_x, port_coords_y, port_coords_zone]
-
-        if math.isnan(port_coords_x):
-            continue
-
-        # dist_to_port_i = transit_algorithm(site_coords, port_coords, point_path, graph_path)
-        dist_to_port_i = distance(site_coords, port_coords)  # simplification just for testing
 
-        dist_to_clost_port_vec.append(dist_to_port_i)
-        min_dist_to_clst_port = min(dist_to_clost_port_vec)
-        if min_dist_to_clst_port == dist_to_port_i:
-            port_choice_index = ind_port
+    # Choose from the 5 closest ports
+    dist_to_port, port_choice = port_index.choose(
+                                            site_coords,
+                                            positions,
+                                            sea_router=sea_router,
+                                            port_distances=port_distances)
 
     # Nearest port selection to be modified by making use of port['Distance port-site'] will be implemented
-    port['Selected base port for installation'] = port_data.ix[port_choice_index]
-    port['Distance port-site [km]'] = min_dist_to_clst_port
-    # print 'Port Selected!'
+    port['Selected base port for installation'] = ports.iloc[port_choice]
+    port['Distance port-site [km]'] = dist_to_port
 
     return port
 
@@ -25,11 +25,10 @@ activities.
 .. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
-import math
 import logging
+from collections import OrderedDict
 
-import utm
-from geopy.distance import great_circle
+from .port_index import get_port_index
 
 # from .transit_algorithm import transit_algorithm
 # from ..configure import get_install_paths
@@ -37,46 +36,13 @@ from geopy.distance import great_circle
 module_logger = logging.getLogger(__name__)
 
 
-def distance(UTM_ini, UTM_fin):
-    """
-    distance returns the calculated distance (in kms) between two points
-    defined in the UTM coordinate system using geographical distances
-    
-    Parameters
-    ----------
-    UTM_ini : list
-    initial UTM coordinates in x,y, zone format
-    UTM_fin : list
-    final UTM coordinates in x,y, zone format
-
-    Returns
-    -------
-    dist : float
-    direct geographical distance in kms between two UTM coordinates
-    """
-
-    UTM_ini_x = UTM_ini[0]
-    UTM_ini_y = UTM_ini[1]
-    UTM_ini_zone = UTM_ini[2]
-
-    UTM_fin_x = UTM_fin[0]
-    UTM_fin_y = UTM_fin[1]
-    UTM_fin_zone = UTM_fin[2]
-
-    [LAT_INI, LONG_INI] = utm.to_latlon(UTM_ini_x, UTM_ini_y, int(UTM_ini_zone[0:2]), str(UTM_ini_zone[3]))  # to get dd.dd from utm
-    [LAT_FIN, LONG_FIN] = utm.to_latlon(UTM_fin_x, UTM_fin_y, int(UTM_fin_zone[0:2]), str(UTM_fin_zone[3]))  # to get dd.dd from utm
-
-    point_i = (LAT_INI, LONG_INI)
-    point_f = (LAT_FIN, LONG_FIN)
-
-    distance = great_circle(point_i, point_f).kilometers # gives you a distance (in kms) between two coordinate in dd.dd
-    
-    return distance
-
 def OM_port(OM_outputs,
             port_data,
             point_path=None,
-            graph_path=None):
+            graph_path=None,
+            port_index=None,
+            sea_router=None,
+            port_distances=None):
     """main_OM_PortSelection.py is the file of the WP5 module for the selection of the port dedicated to the
 Operation and Maintenance within the suite of design tools developped under the EU FP7 DTOcean project.
 main_OM_PortSelection.py provides an estimation of the distance to port and port chosen for the OM operation.
@@ -99,6 +65,12 @@ The OM_port function selects the port used by OM logistic phases
     port_data : DataFrame
      panda table containing the ports database     
     point_path and graph_path are files required for transit algorithm.
+    port_index : PortIndex, optional
+     index of port_data, which is created (or reused) if not given
+    sea_router : SeaRouter, optional
+     if given, ports are chosen by sea distance (see transit_algorithm)
+    port_distances : PortDistances, optional
+     precomputed port to site distances (see port_distances)
 
     Returns
     -------
@@ -121,6 +93,67 @@ The OM_port function selects the port used by OM logistic phases
 
 
 
+    if port_index is None: port_index = get_port_index(port_data)
+
+    port, positions = _get_feasible_ports(OM_outputs, port_data, port_index)
+
+    # using UTM coordinates in the input which should match the ones of the entry point to be considered
+    site_coords = _get_site_coords(OM_outputs)
+
+    # Choose from the 5 closest ports
+    dist_to_port, port_choice = port_index.choose(
+                                            site_coords,
+                                            positions,
+                                            sea_router=sea_router,
+                                            port_distances=port_distances)
+
+    _set_port_choice(port, port_data, dist_to_port, port_choice)
+
+    return port
+
+
+def OM_ports(OM_outputs_list,
+             port_data,
+             port_index=None,
+             sea_router=None,
+             port_distances=None):
+    """Select the O&M ports for a list of OM_outputs tables, as OM_port.
+    Sites with the same feasible ports are queried from the port index
+    together. Returns a list of port dictionaries in the same order."""
+
+    if port_index is None: port_index = get_port_index(port_data)
+
+    ports = []
+    groups = OrderedDict()
+
+    for i, OM_outputs in enumerate(OM_outputs_list):
+
+        port, positions = _get_feasible_ports(OM_outputs,
+                                              port_data,
+                                              port_index)
+        ports.append(port)
+
+        key = tuple(positions)
+        groups.setdefault(key, (positions, []))[1].append(i)
+
+    for positions, ids in groups.values():
+
+        sites_coords = [_get_site_coords(OM_outputs_list[i]) for i in ids]
+        choices = port_index.choose_many(sites_coords,
+                                         positions,
+                                         sea_router=sea_router,
+                                         port_distances=port_distances)
+
+        for i, (dist_to_port, port_choice) in zip(ids, choices):
+            _set_port_choice(ports[i], port_data, dist_to_port, port_choice)
+
+    return ports
+
+
+def _get_feasible_ports(OM_outputs, port_data, port_index):
+    """Returns the initialised port dictionary and the positions of the
+    ports in port_data which meet the requirements of the O&M outputs"""
+
     # initialisation
     port = {'Terminal load bearing [t/m^2]': 0,
             'Terminal area [m^2]': 0,
@@ -129,6 +162,7 @@ The OM_port function selects the port used by OM logistic phases
             'Selected base port for installation': 0,
             'Port database index' : 0}
 
+    positions = port_index.get_all()
 
     if OM_outputs['ID [-]'].ix[0] == 'INS_PORT':
 
@@ -151,121 +185,73 @@ The OM_port function selects the port used by OM logistic phases
         SP_area = float(lenght_SP) * float(width_SP)
         SP_loading = float(total_mass_SP) / float(SP_area) / 1000
 
-        # terminal load bearing minimum requirement
-        port_pd_nan = port_data
-        port_data = port_data[port_data['Terminal area [m^2]'] >= SP_area]
-        port_data = port_data.append(port_pd_nan[port_pd_nan['Terminal area [m^2]'].isnull()])
-
-        deselected = port_pd_nan[port_pd_nan['Terminal area [m^2]'] < SP_area]
-    
-        if not deselected.empty:
-    
-            port_names = deselected['Name [-]']
+        # terminal area minimum requirement
+        positions, deselected = port_index.apply_minimum(
+                                                    positions,
+                                                    'Terminal area [m^2]',
+                                                    SP_area)
+
+        if len(deselected) > 0:
+
+            port_names = port_index.names[deselected]
             ports_str = ", ".join(port_names)
-            
+
             logMsg = (u"The following ports did not meet the 'Terminal area' "
                       "requirement of {} m^2: "
                       "{}").format(SP_area, ports_str).encode('utf-8')
             module_logger.info(logMsg)
 
-        port_pd_nan = port_data
-        port_data = port_data[port_data['Terminal load bearing [t/m^2]'] >= SP_loading] # t/m^2
-        port_data = port_data.append(port_pd_nan[port_pd_nan['Terminal load bearing [t/m^2]'].isnull()])
+        # terminal load bearing minimum requirement
+        positions, deselected = port_index.apply_minimum(
+                                            positions,
+                                            'Terminal load bearing [t/m^2]',
+                                            SP_loading)
+
+        if len(deselected) > 0:
 
-        deselected = port_pd_nan[
-                    port_pd_nan['Terminal load bearing [t/m^2]'] < SP_loading]
-    
-        if not deselected.empty:
-            
-            port_names = deselected['Name [-]']
+            port_names = port_index.names[deselected]
             ports_str = ", ".join(port_names)
-            
-            logMsg = ("The following ports did not meet the 'Terminal load "
+
+            logMsg = (u"The following ports did not meet the 'Terminal load "
                       "bearing' requirement of {} t/m^2: {}").format(
-                                                                  SP_loading,
-                                                                  ports_str)
+                                                SP_loading,
+                                                ports_str).encode('utf-8')
             module_logger.info(logMsg)
 
-        port['Port list satisfying the minimum requirements'] = port_data
+        port['Port list satisfying the minimum requirements'] = \
+                                                    port_data.iloc[positions]
 
-        if len(port_data)==0:
+        if len(positions) == 0:
             msg = ("There is no port that satisfies the project requirements. "
                    "The closest port will be used. "
                    "Requirements are: "
                    "Terminal load bearing {} [t/m^2], "
-                   "Terminal area {} [m^2]".format(
-                       port['Terminal load bearing [t/m^2]'],
-                       port['Terminal area [m^2]']))
-            module_logger.info(msg)           
-            port_data = port_data
-
+                   "Terminal area {} [m^2]".format(SP_loading, SP_area))
+            module_logger.info(msg)
+            positions = port_index.get_all()
 
     else:
         msg = ("ERROR: unknown ID {} for port calculation. Accepted: INS_PORT "
                " or OM_PORT.".format(OM_outputs['ID [-]'].ix[0]))
         module_logger.warning(msg)
 
-    # using UTM coordinates in the input which should match the ones of the entry point to be considered
+    return port, positions
+
+
+def _get_site_coords(OM_outputs):
+
     site_coords_x = OM_outputs['x coord [m]'].ix[0]
     site_coords_y = OM_outputs['y coord [m]'].ix[0]
     site_coords_zone = OM_outputs['zone [-]'].ix[0]
-    site_coords = [site_coords_x, site_coords_y, site_coords_zone]
-
-    dist_to_port_vec = []
-    for ind_port, row in port_data.iterrows():
-        port_coords_x = port_data['UTM x [m]'][ind_port]
-        port_coords_y = port_data['UTM y [m]'][ind_port]
-        port_coords_zone = port_data['UTM zone [-]'][ind_port]
-        port_coords = [port_coords_x, port_coords_y, port_coords_zone]
-
-        if math.isnan(port_coords_x):
-            continue
-        dist_to_port_i = distance(site_coords, port_coords)   # closest ports by geo distance!
-        dist_to_port_vec.append( [dist_to_port_i, ind_port, port_data['Name [-]'][ind_port]] )
-    closest_ports_all=sorted(dist_to_port_vec)
-    # furthest_ports_all = closest_ports_all.reverse()
-
-    # check if repeted port (by terminal)
-    LEN_clst = len(closest_ports_all)-1
-    ind_clst=0
-    while ind_clst < LEN_clst:
-        if closest_ports_all[ind_clst+1][2] == closest_ports_all[ind_clst][2]:  # if same name
-            del closest_ports_all[ind_clst+1]
-            LEN_clst = LEN_clst-1
-        else:
-            ind_clst = ind_clst+1
-
-
-    # Identify the n=num_ports_consider closest ports:
-    # num_ports_consider = len(dist_to_port_vec)  # consider all
-    num_ports_consider = 5
-    closest_ports_n = closest_ports_all[:min(num_ports_consider,len(closest_ports_all))]
-
-
-    # Find the closest port using the transit_algorithm:
-    dist_to_clost_port_vec=[]
-    for ind_closest_port in range(len(closest_ports_n)):
-        ind_port= closest_ports_n[ind_closest_port][1]
-        port_coords_x = port_data['UTM x [m]'][ind_port]
-        port_coords_y = port_data['UTM y [m]'][ind_port]
-        port_coords_zone = port_data['UTM zone [-]'][ind_port]
-        port_coords = [port_coords_x, port_coords_y, port_coords_zone]
-
-        if math.isnan(port_coords_x):
-            continue
-
-#        dist_to_port_i = transit_algorithm(site_coords, port_coords, point_path, graph_path)
-        dist_to_port_i = distance(site_coords, port_coords)  # simplification just for TESTING!!!!!!!!!!!!!!!!!!!!!!!!!
-
-        dist_to_clost_port_vec.append(dist_to_port_i)
-        min_dist_to_clst_port = min(dist_to_clost_port_vec)
-        if min_dist_to_clst_port == dist_to_port_i:
-            port_choice_index = ind_port
-
-
-    port['Selected base port for installation'] = port_data.ix[port_choice_index]
-    port['Distance port-site [km]'] = min_dist_to_clst_port
-    port['Port database index [-]'] = int(port_choice_index)
-
-
-    return port
\ No newline at end of file
+
+    return [site_coords_x, site_coords_y, site_coords_zone]
+
+
+def _set_port_choice(port, port_data, dist_to_port, port_choice):
+
+    port['Selected base port for installation'] = \
+                                            port_data.iloc[port_choice]
+    port['Distance port-site [km]'] = dist_to_port
+    port['Port database index [-]'] = int(port_data.index[port_choice])
+
+    return
@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 #    Copyright (C) 2016 Adam Collin, Pedro Vicente
+#    Copyright (C) 2018 Mathew Topper
 #
 #    This program is free software: you can redistribute it and/or modify
 #    it under the terms of the GNU General Public License as published by
@@ -20,37 +21,283 @@ Created on Mon Nov 30 10:04:16 2015
 
 The transit algorithm calculates the distance and route between two sea points, considering the European coastline.
 It is used to calculate the ship routing for the vessels performing installation or operation&maintenance activities.
-It receives the coordinates in utm of the two points and returns the distance (together with the graphical representation
-of the route).
+It receives the coordinates in utm of the two points and returns the distance.
+
+The sea points and graph are loaded once into a SeaRouter, which holds the
+graph as a compressed sparse row (CSR) adjacency matrix, snaps coordinates
+to the graph with a cKDTree and caches the shortest path tree of each source
+point.
 
 .. moduleauthor:: Adam Collin <adam.collin@ieee.org>
 .. moduleauthor:: Pedro Vicente <pedro.vicente@wavec.org>
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
 """
 
+import os
 import csv
 import pickle
-import timeit
 import logging
 
-import utm
-import networkx as nx
-import matplotlib.pyplot as plt
+import numpy as np
+
+from ..ancillaries import LRUCache, get_digest, utm_to_latlon
+from .port_index import _to_unit_sphere
 
 module_logger = logging.getLogger(__name__)
 
+_sea_routers = LRUCache(4)
+
 
 def transit_algorithm(point_INI, point_FIN, point_path, graph_path):
+    """Returns the sea distance (in km) between two points given in [x, y,
+    zone] UTM format, using the SeaRouter of the given sea point and graph
+    files."""
+
+    sea_router = get_sea_router(point_path, graph_path)
+
+    return sea_router.get_distance(point_INI, point_FIN)
+
+
+class SeaRouter(object):
+
+    """Shortest sea routes between points of a graph of sea points. The
+    graph is held as a CSR adjacency matrix, where the weight of each edge
+    is the distance between its points in km. Coordinates are snapped to the
+    closest point in the graph and the shortest path tree of each source
+    point is kept in a bounded LRU cache of at most cache_size trees.
+
+    Arguments
+    ---------
+    lat, lon : array_like
+     latitudes and longitudes of the sea points, in decimal degrees
+    edges : array_like
+     (start, end, weight) rows of the graph edges, referring to sea points
+     by position
+    directed : bool, optional
+     if False, the edges are used in both directions
+    snap_tolerance : float, optional
+     maximum latitude or longitude difference (in decimal degrees) between
+     a coordinate and its snapped point before a warning is logged
+    cache_size : int, optional
+     maximum number of shortest path trees kept
+    """
+
+    def __init__(self, lat,
+                       lon,
+                       edges,
+                       directed=False,
+                       snap_tolerance=None,
+                       cache_size=64):
+
+        self._lat = np.asarray(lat, dtype=float)
+        self._lon = np.asarray(lon, dtype=float)
+        self._directed = directed
+        self._snap_tolerance = snap_tolerance
+        self._tree_cache = LRUCache(cache_size)
+        self._digest = None
+
+        n_points = len(self._lat)
+        edges = np.asarray(edges, dtype=float).reshape(-1, 3)
+
+        starts = edges[:, 0].astype(int)
+        ends = edges[:, 1].astype(int)
+        weights = edges[:, 2]
+
+        if not directed:
+            starts, ends = (np.concatenate([starts, ends]),
+                            np.concatenate([ends, starts]))
+            weights = np.concatenate([weights, weights])
+
+        # Keep the shortest of any repeated edges, as the CSR constructor
+        # would otherwise sum them
+        order = np.lexsort((weights, ends, starts))
+        starts, ends, weights = starts[order], ends[order], weights[order]
+
+        first = np.ones(len(starts), dtype=bool)
+        first[1:] = (starts[1:] != starts[:-1]) | (ends[1:] != ends[:-1])
+
+        # Imported here to keep scipy out of the import time of the package
+        from scipy import sparse, spatial
+
+        self._graph = sparse.csr_matrix((weights[first],
+                                         (starts[first], ends[first])),
+                                        shape=(n_points, n_points))
+
+        # Only points in the graph can be snapped to
+        self._nodes = np.unique(np.concatenate([starts, ends]))
+
+        if len(self._nodes) > 0:
+            self._kdtree = spatial.cKDTree(
+                                _to_unit_sphere(self._lat[self._nodes],
+                                                self._lon[self._nodes]))
+        else:
+            self._kdtree = None
+
+        return
+
+    @classmethod
+    def from_files(cls, point_path, graph_path, cache_size=64):
+
+        """Create a SeaRouter from the tab separated sea point file and the
+        pickled networkx graph of the transit algorithm. Edges without a
+        'weight' attribute have a weight of one."""
+
+        lat, lon = read_sea_points(point_path)
+
+        with open(graph_path, "rb") as graph_file:
+            graph = pickle.load(graph_file)
+
+        edges = [(start, end, data.get('weight', 1))
+                            for start, end, data in graph.edges(data=True)]
+
+        # As per the transit algorithm, points are matched within a square
+        # of side relative to the grid spacing
+        snap_tolerance = abs(lon[1] - lon[0]) / 0.125
+
+        sea_router = cls(lat,
+                         lon,
+                         edges,
+                         graph.is_directed(),
+                         snap_tolerance,
+                         cache_size)
+
+        return sea_router
+
+    def get_cache_stats(self):
+        """Returns the hits, misses, evictions and size of the shortest path
+        tree cache"""
+        return self._tree_cache.get_stats()
+
+    def get_digest(self):
+        """Returns a hex digest of the sea points and graph"""
+
+        if self._digest is None:
+            self._digest = get_digest(self._lat,
+                                      self._lon,
+                                      self._graph.data,
+                                      self._graph.indices,
+                                      self._graph.indptr,
+                                      self._directed)
+
+        return self._digest
+
+    def snap(self, UTM_points):
+
+        """Returns the positions of the closest graph points to a list of
+        points given in [x, y, zone] UTM format. ValueError is raised if the
+        graph has no edges."""
+
+        if self._kdtree is None:
+            raise ValueError("The sea graph contains no edges")
+
+        x, y, zones = zip(*UTM_points)
+        lat, lon = utm_to_latlon(x, y, zones)
+
+        _, ids = self._kdtree.query(_to_unit_sphere(lat, lon))
+        nodes = self._nodes[np.atleast_1d(ids)]
+
+        if self._snap_tolerance is not None:
+
+            far = ((np.abs(self._lat[nodes] - lat) > self._snap_tolerance) |
+                   (np.abs(self._lon[nodes] - lon) > self._snap_tolerance))
+
+            for i in np.flatnonzero(far):
+
+                msg = ("Sea routing: coordinates {} are not accurate. The "
+                       "closest sea point is at latitude {}, longitude "
+                       "{}").format(UTM_points[i],
+                                    self._lat[nodes[i]],
+                                    self._lon[nodes[i]])
+                module_logger.warning(msg)
+
+        return nodes
+
+    def get_distance(self, UTM_ini, UTM_fin):
+        """Returns the sea distance (in km) between two points given in [x,
+        y, zone] UTM format, or inf if there is no route between them"""
+        return self.get_distances(UTM_ini, [UTM_fin])[0]
+
+    def get_distances(self, UTM_ini, UTM_fins):
+
+        """Returns an array of the sea distances (in km) from a point to each
+        of a list of points, given in [x, y, zone] UTM format. Unreachable
+        points have a distance of inf."""
+
+        nodes = self.snap([UTM_ini] + list(UTM_fins))
+        dists, _ = self._get_tree(nodes[0])
+
+        return dists[nodes[1:]]
+
+    def get_distances_to(self, UTM_fin, UTM_inis):
+
+        """Returns an array of the sea distances (in km) from each of a list
+        of points to a single point, given in [x, y, zone] UTM format. For
+        undirected graphs, a single shortest path tree is used."""
+
+        if not self._directed: return self.get_distances(UTM_fin, UTM_inis)
+
+        nodes = self.snap(list(UTM_inis) + [UTM_fin])
+        dists = [self._get_tree(node)[0][nodes[-1]] for node in nodes[:-1]]
+
+        return np.array(dists)
+
+    def get_route(self, UTM_ini, UTM_fin):
+
+        """Returns the latitudes and longitudes of the sea points on the
+        shortest route between two points given in [x, y, zone] UTM format,
+        or None if there is no route"""
+
+        start, end = self.snap([UTM_ini, UTM_fin])
+        dists, predecessors = self._get_tree(start)
+
+        if np.isinf(dists[end]): return None
+
+        route = [end]
+
+        while route[-1] != start:
+            route.append(predecessors[route[-1]])
+
+        route = np.array(route[::-1])
+
+        return self._lat[route], self._lon[route]
+
+    def _get_tree(self, node):
+
+        tree = self._tree_cache.get(node)
+
+        if tree is None:
+
+            from scipy.sparse import csgraph
+
+            dists, predecessors = csgraph.dijkstra(self._graph,
+                                                   directed=True,
+                                                   indices=node,
+                                                   return_predecessors=True)
+            tree = (dists, predecessors)
+            self._tree_cache.put(node, tree)
+
+        return tree
+
+
+def get_sea_router(point_path, graph_path):
+    """Returns the SeaRouter of the given sea point and graph files, reusing
+    the router of unmodified files"""
+
+    key = tuple((os.path.abspath(path), os.path.getmtime(path))
+                                            for path in (point_path, graph_path))
+
+    sea_router = _sea_routers.get(key)
+
+    if sea_router is None:
+        sea_router = SeaRouter.from_files(point_path, graph_path)
+        _sea_routers.put(key, sea_router)
+
+    return sea_router
 
-    ini_x_utm = point_INI[0]
-    ini_y_utm = point_INI[1]
-    ini_zone_utm = point_INI[2]
 
-    fin_x_utm = point_FIN[0]
-    fin_y_utm = point_FIN[1]
-    fin_zone_utm = point_FIN[2]
-    
-    # [LAT_INI, LONG_INI] = utm.to_latlon(ini_x_utm, ini_y_utm, int(ini_zone_utm[0:2]), str(ini_zone_utm[3]))
-    # [LAT_FIN, LONG_FIN] = utm.to_latlon(fin_x_utm, fin_y_utm, int(fin_zone_utm[0:2]), str(fin_zone_utm[3]))
+def read_sea_points(point_path):
+    """Returns arrays of the latitudes and longitudes of the sea points in the
+    tab separated point file of the transit algorithm"""
 
     ### Loading the water points off the European Coast:
     num_points = 1
@@ -59,8 +306,6 @@ def transit_algorithm(point_INI, point_FIN, point_path, graph_path):
     with open(point_path, 'rb') as csvfile:
         datareader = csv.reader(csvfile, delimiter='\t')
         for row in datareader:
-            # print num_points
-            # print ', '.join(row)
 
             if num_points<=1000:
                 lat_i.append(float(row[2])/1e15)
@@ -83,105 +328,4 @@ def transit_algorithm(point_INI, point_FIN, point_path, graph_path):
 
             num_points = num_points+1
 
-    # delt_lat = abs(lat_i[1168] - lat_i[0])
-    delt_long = abs(long_i[1] - long_i[0])
-
-    ### Loading of the graph
-    start_time = timeit.default_timer()
-    
-    with open(graph_path, "rb" ) as graph_file:
-        graph = pickle.load(graph_file)
-
-    print '» graph loaded'
-    stop_time = timeit.default_timer()
-    print 'duration [s]:' + str(stop_time - start_time)
-
-    ### Coordinates of the locations to graph points:
-    ERROR_POINTS = delt_long/0.125
-
-    [LAT_INI, LONG_INI] = utm.to_latlon(ini_x_utm, ini_y_utm, int(ini_zone_utm[0:2]), str(ini_zone_utm[3]))
-    found_point_INI=0
-    for point_vec in range(len(lat_i)):
-
-        LAT_ini = lat_i[point_vec]
-        LONG_ini = long_i[point_vec]
-        # print [LAT, LONG]
-
-        # dist_vec.append( distance(site_coords, port_coords) )
-
-        if LAT_ini>LAT_INI-ERROR_POINTS and LAT_ini<LAT_INI+ERROR_POINTS:
-            if LONG_ini>LONG_INI-ERROR_POINTS and LONG_ini<LONG_INI+ERROR_POINTS:
-                if graph.has_node(point_vec):
-                    point_INI = point_vec
-                    found_point_INI=1
-                    # print point_INI
-                    break
-
-    if found_point_INI==0:
-        
-        msg = ("Error in port selection: initial coordinates not accurate.")
-        module_logger.warning(msg)
-
-    [LAT_FIN, LONG_FIN] = utm.to_latlon(fin_x_utm, fin_y_utm, int(fin_zone_utm[0:2]), str(fin_zone_utm[3]))
-    found_point_FIN=0
-    for point_vec in range(len(lat_i)):
-
-        LAT_fin = lat_i[point_vec]
-        LONG_fin = long_i[point_vec]
-        # print [LAT, LONG]
-
-        if LAT_fin>LAT_FIN-ERROR_POINTS and LAT_fin<LAT_FIN+ERROR_POINTS:
-            if LONG_fin>LONG_FIN-ERROR_POINTS and LONG_fin<LONG_FIN+ERROR_POINTS:
-                if graph.has_node(point_vec):
-                    point_FIN = point_vec
-                    found_point_FIN=1
-                    # print point_FIN
-                    break
-
-    if found_point_FIN==0:
-        msg = ("Error in port selection: final coordinates not accurate.")
-        module_logger.warning(msg)
-
-    ### define start and end point:
-    start = point_INI # port
-    end = point_FIN # array location
-
-    ### Calculate route:
-    print '» routing!'
-    start_time = timeit.default_timer()
-    # print start_time
-
-    # if path exists, run this
-    if nx.has_path(graph,start,end):
-        route = nx.dijkstra_path(graph,start,end)
-        route_length = nx.dijkstra_path_length(graph,start,end)
-
-    stop_time = timeit.default_timer()
-    # print stop_time
-    print 'duration [s]:' + str(stop_time - start_time)
-    #print '* route:'
-    #print route
-    print '* distance [km]:' + str(route_length)
-
-    ### Plot route on map:
-    LONG_ROUTE = []
-    LAT_ROUTE = []
-    for ind_rout in range(len(route)):
-        LONG_ROUTE.append(long_i[route[ind_rout]])
-        LAT_ROUTE.append(lat_i[route[ind_rout]])
-        
-    plt.figure()
-
-    # european sea points:
-    plt.plot(long_i,lat_i, 'ro')
-
-    # origin and destination points:
-    plt.plot(LONG_ini,LAT_ini, 'yo')
-    plt.plot(LONG_fin,LAT_fin, 'yo')
-
-    # route:
-    plt.plot(LONG_ROUTE,LAT_ROUTE,'y-')
-
-    plt.show()
-
-    return route_length
\ No newline at end of file
+    return np.array(lat_i), np.array(long_i)
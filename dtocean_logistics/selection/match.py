@@ -33,12 +33,16 @@ not been implemented, this module should suffer major changes for the beta versi
 import math
 import logging
 import itertools
+from copy import deepcopy
 
 import numpy
 
+from ..performance.instrumentation import count, timed
+
 module_logger = logging.getLogger(__name__)
 
 
+@timed("compatibility_ve")
 def compatibility_ve(install, log_phase, port_chosen_data):
     """This function is currently limited to the selection of the first two
     feasible solutions for the installation logistic phase in analysis.
@@ -258,9 +262,28 @@ def compatibility_ve(install, log_phase, port_chosen_data):
     log_phase.nr_sol_feas = nr_sol_feas
     log_phase.nr_sol_match = nr_sol_match
 
+    count("solutions_generated", nr_sol_feas)
+    count("solutions_pruned", nr_sol_feas - nr_sol_match)
+
     return final_sol, log_phase, EXIT_FLAG
 
 
+def copy_solution(sol):
+    """Deep copy a logistic solution, sharing the vessel and equipment rows
+    held in its 'VEs' list rather than copying them."""
+
+    memo = {}
+
+    for ve_comb in sol['VEs']:
+
+        memo[id(ve_comb[2])] = ve_comb[2]
+
+        for eq_comb in ve_comb[3:]:
+            memo[id(eq_comb[2])] = eq_comb[2]
+
+    return deepcopy(sol, memo)
+
+
 def compatibility_vessels(req_m_ev,
                           log_phase,
                           sols_ve_indxs_combs_inseq,
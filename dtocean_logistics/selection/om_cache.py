@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Memoised initialisation, feasibility, selection and matching of the O&M
+logistic phases.
+
+.. moduleauthor:: Mathew Topper <mathew.topper@dataonlygreater.com>
+"""
+
+import copy
+import logging
+
+from .match import compatibility_ve, copy_solution
+from .select_ve import select_e, select_v
+from ..ancillaries import LRUCache, get_digest
+from ..feasibility.feasability_om import feas_om
+from ..phases.om import logPhase_om_init
+
+# Set up logging
+module_logger = logging.getLogger(__name__)
+
+# Columns of the om table read by the phase initialisation and feasibility
+# functions
+OM_MATCH_COLUMNS = ['ID [-]',
+                    'element_type [-]',
+                    'element_subtype [-]',
+                    'element_ID [-]',
+                    'depth [m]',
+                    'helideck [-]',
+                    'technician [-]',
+                    'sp_dry_mass [kg]',
+                    'sp_length [m]',
+                    'sp_width [m]']
+
+
+class OMMatchCache(object):
+
+    """Initialise and match the O&M logistic phases, reusing the results for
+    events with the same signature. The signature is the phase id, the index
+    and OM_MATCH_COLUMNS values of the om table, the chosen port and the
+    version of the vessel and equipment tables. At most max_size results
+    are kept.
+
+    The device, cable and logistic operation inputs are fixed for the life
+    of the cache. Vessels and equipments are replaced using set_ve_types,
+    which changes the tables version.
+    """
+
+    def __init__(self, log_op,
+                       vessels,
+                       equipments,
+                       device,
+                       sub_device,
+                       collection_point,
+                       connectors,
+                       dynamic_cable,
+                       static_cable,
+                       max_size=100):
+
+        self._log_op = log_op
+        self._device = device
+        self._sub_device = sub_device
+        self._collection_point = collection_point
+        self._connectors = connectors
+        self._dynamic_cable = dynamic_cable
+        self._static_cable = static_cable
+        self._cache = LRUCache(max_size)
+
+        self._vessels = None
+        self._equipments = None
+        self._ve_version = None
+
+        self.set_ve_types(vessels, equipments)
+
+        return
+
+    def set_ve_types(self, vessels, equipments):
+
+        self._vessels = vessels
+        self._equipments = equipments
+        self._ve_version = get_ve_version(vessels, equipments)
+
+        return
+
+    def get_ve_version(self):
+        return self._ve_version
+
+    def get_stats(self):
+        """Returns the hits, misses, evictions and size of the cache"""
+        return self._cache.get_stats()
+
+    def clear(self):
+        self._cache.clear()
+
+    def get_key(self, log_phase_id, om, port_chosen_data):
+
+        columns = [col for col in OM_MATCH_COLUMNS if col in om.columns]
+        values = [om[col].values for col in columns]
+
+        key = get_digest(log_phase_id,
+                         self._ve_version,
+                         om.index.values,
+                         columns,
+                         *values)
+
+        port_key = get_digest(port_chosen_data.name,
+                              list(port_chosen_data.index),
+                              port_chosen_data.values)
+
+        return key, port_key
+
+    def __call__(self, log_phase_id, om, port_chosen_data):
+
+        """Returns the install dictionary (with the 'requirement',
+        'eq_select', 've_select' and 'combi_select' keys), the matched
+        logistic phase and the matching exit flag. The logistic phase and its
+        solutions are copied from the cache, so they may be modified by the
+        caller."""
+
+        key = self.get_key(log_phase_id, om, port_chosen_data)
+        entry = self._cache.get(key)
+
+        if entry is None:
+
+            entry = self._match(log_phase_id, om, port_chosen_data)
+            self._cache.put(key, entry)
+
+        else:
+
+            logMsg = ("Reusing vessel and equipment combinations for log "
+                      "phase: {}").format(entry[1].description)
+            module_logger.info(logMsg)
+
+        install, log_phase, MATCH_FLAG = entry
+
+        log_phase = copy_matched_phase(log_phase)
+
+        install = dict(install)
+        install['combi_select'] = [log_phase.op_ve[seq].sol
+                                        for seq in sorted(log_phase.op_ve)]
+
+        return install, log_phase, MATCH_FLAG
+
+    def _match(self, log_phase_id, om, port_chosen_data):
+
+        # Selection replaces the tables of the vessel and equipment types
+        # used by the phase, so give the phase its own type objects
+        vessels = {k: copy.copy(v) for k, v in self._vessels.iteritems()}
+        equipments = {k: copy.copy(v)
+                                    for k, v in self._equipments.iteritems()}
+
+        log_phase = logPhase_om_init(log_phase_id,
+                                     self._log_op,
+                                     vessels,
+                                     equipments,
+                                     om)
+
+        install = {}
+        install['requirement'] = feas_om(log_phase,
+                                         log_phase_id,
+                                         om,
+                                         self._device,
+                                         self._sub_device,
+                                         self._collection_point,
+                                         self._connectors,
+                                         self._dynamic_cable,
+                                         self._static_cable)
+
+        install['eq_select'], log_phase = select_e(install, log_phase)
+        install['ve_select'], log_phase = select_v(install, log_phase)
+
+        (install['combi_select'],
+         log_phase,
+         MATCH_FLAG) = compatibility_ve(install, log_phase, port_chosen_data)
+
+        return install, log_phase, MATCH_FLAG
+
+
+def get_ve_version(vessels, equipments):
+    """Returns a digest of the ids and tables of the given vessel and
+    equipment types"""
+
+    parts = []
+
+    for types in [vessels, equipments]:
+
+        for name in sorted(types):
+
+            ve_type = types[name]
+            panda = ve_type.panda
+
+            parts.extend([name,
+                          ve_type.id,
+                          list(panda.columns),
+                          panda.index.values,
+                          panda.values])
+
+    return get_digest(*parts)
+
+
+def copy_matched_phase(log_phase):
+    """Copy a matched logistic phase, so that its operation sequences and
+    solutions can be modified without changing the original. Vessel and
+    equipment rows are shared."""
+
+    new_phase = copy.copy(log_phase)
+    new_phase.op_ve = {}
+
+    for seq, op_ve in log_phase.op_ve.iteritems():
+
+        new_op_ve = copy.copy(op_ve)
+        new_op_ve.sol = {ind_sol: copy_solution(sol)
+                                    for ind_sol, sol in op_ve.sol.iteritems()}
+        new_op_ve.sol_cost = copy.deepcopy(op_ve.sol_cost)
+
+        new_phase.op_ve[seq] = new_op_ve
+
+    return new_phase
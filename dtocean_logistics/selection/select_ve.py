@@ -39,10 +39,13 @@ import logging
 
 import numpy as np
 
+from ..performance.instrumentation import timed
+
 # Start logger
 module_logger = logging.getLogger(__name__)
 
 
+@timed("select_e")
 def select_e(install, log_phase):
     """select_e function selects the equipments that satisfy the minimum
     requirements calculated in the feasibility functions. The current method
@@ -155,6 +158,7 @@ def select_e(install, log_phase):
     return eq, log_phase
 
 
+@timed("select_v")
 def select_v(install, log_phase):
     """select_v function selects the vessels that satisfy the minimum requirements
     calculated in the feasibility functions. The current method consists of
@@ -76,6 +76,7 @@ See also: ...
 """
 
 
+import os
 import copy
 import logging
 from datetime import timedelta
@@ -89,13 +90,21 @@ from dtocean_logistics.phases import select_port
 from dtocean_logistics.feasibility.glob import glob_feas
 from dtocean_logistics.selection.select_ve import select_e, select_v
 from dtocean_logistics.selection.match import compatibility_ve
-from dtocean_logistics.performance.schedule.schedule_ins import sched
-from dtocean_logistics.performance.economic.eco import cost
-from dtocean_logistics.performance.optim_sol import opt_sol
+from dtocean_logistics.performance.schedule.schedule_ins import (
+                                                            get_sched_sols,
+                                                            iter_sched_sols,
+                                                            sched_weather)
+from dtocean_logistics.performance.schedule.schedule_shared import WaitingTime
+from dtocean_logistics.performance.economic.eco import cost, get_sol_cost
+from dtocean_logistics.performance.optim_sol import SolutionSelector, opt_sol
 from dtocean_logistics.outputs.output_processing import out_process
 from dtocean_logistics.outputs.output_plotting2 import out_ploting
+from dtocean_logistics.outputs.solution_table import (get_solution_table,
+                                                      write_solution_table)
 from dtocean_logistics.load.safe_factors import safety_factors
 from dtocean_logistics.performance.economic.cost_year import cost_p_year
+from dtocean_logistics.performance.result_cache import InstallStages
+from dtocean_logistics.performance.instrumentation import phase
 
 from dtocean_logistics.load.input_checkin import input_check
 
@@ -114,7 +123,9 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
                       csv_filename = None,
                       plan_only=False,
                       skip_phase=False,
-                      check_inputs=False):
+                      check_inputs=False,
+                      result_cache=None,
+                      solutions_dir=None):
                           
     '''The main file of the installation module, providing an estimation of the
     predicted performance of feasible maritime infrastructure solutions that
@@ -179,6 +190,12 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
         results per logistic phase should be produced.
         csv_filename (string) [-]: name to give to the csv output file (if
             requested as an output)
+        result_cache (ResultCache) [-]: if given, the results of the stages
+            of each logistic phase are reused from or stored in the cache,
+            so that only the stages affected by changed inputs are re-run.
+        solutions_dir (string) [-]: if given, a table of every solution
+            evaluated for each logistic phase is written to the directory
+            as [logistic phase id].npz (see solution_table).
 
     Returns:
 
@@ -377,6 +394,37 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
     skipped = []
     something_installed = False
 
+    if result_cache is None:
+
+        stages = None
+
+    else:
+
+        stages = InstallStages(result_cache,
+                               vessels,
+                               equipments,
+                               other_rates,
+                               schedule_OLC=schedule_OLC,
+                               penet_rates=penet_rates,
+                               laying_rates=laying_rates,
+                               site=site,
+                               metocean=metocean,
+                               device=device,
+                               sub_device=sub_device,
+                               landfall=landfall,
+                               entry_point=entry_point,
+                               layout=layout,
+                               collection_point=collection_point,
+                               dynamic_cable=dynamic_cable,
+                               static_cable=static_cable,
+                               cable_route=cable_route,
+                               connectors=connectors,
+                               external_protection=external_protection,
+                               topology=topology,
+                               line=line,
+                               foundation=foundation,
+                               port=install_port)
+
     for x in install['plan']:
         
         for y in range(len(install['plan'][x])):
@@ -386,48 +434,37 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
 
             log_phase = logPhase_install[log_phase_id]
             log_phase.op_ve_init = log_phase.op_ve
-                        
-            msg = ("Checking installation requirements for phase: {}.").format(
-                   log_phase.description)
-
-            module_logger.info(msg)
-
-            # characterize the logistic requirements
-            install['requirement'] = glob_feas(log_phase,
-                                               log_phase_id,
-                                               site,
-                                               device,
-                                               sub_device,
-                                               layout,
-                                               collection_point,
-                                               dynamic_cable,
-                                               static_cable,
-                                               cable_route,
-                                               connectors,
-                                               external_protection,
-                                               topology,
-                                               line,
-                                               foundation)
-            
-            # Selection of the feasible equipment
-            install['eq_select'], log_phase = select_e(install, log_phase)
-                        
-            # Selection of the feasible vessels
-            install['ve_select'], log_phase = select_v(install, log_phase)
-                        
-            # matching requirements for combinations of port/vessel/equipment
-            install['combi_select'], log_phase, MATCH_FLAG = compatibility_ve(
-                install, log_phase,
-                install_port['Selected base port for installation'])
-
-            #TODO: Tidy this summation - check the data structure
-            Num_sols = 0
-
-            for strg in install['combi_select']:
-                Num_sols += len(strg)
 
-            msg = ("{} possible solutions found.").format(Num_sols)
-            module_logger.info(msg)
+            with phase(log_phase_id):
+
+                (log_phase,
+                 MATCH_FLAG,
+                 SCHEDULE_FLAG) = _assess_phase(x,
+                                                y,
+                                                install,
+                                                log_phase,
+                                                log_phase_id,
+                                                install_port,
+                                                site,
+                                                metocean,
+                                                device,
+                                                sub_device,
+                                                entry_point,
+                                                layout,
+                                                collection_point,
+                                                dynamic_cable,
+                                                static_cable,
+                                                cable_route,
+                                                connectors,
+                                                external_protection,
+                                                topology,
+                                                line,
+                                                foundation,
+                                                penet_rates,
+                                                laying_rates,
+                                                other_rates,
+                                                stages,
+                                                solutions_dir is not None)
 
             if MATCH_FLAG == 'NoSolutions':
 
@@ -445,33 +482,6 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
                 
                 continue
 
-            # schedule assessment of the different operation sequence
-            (install['end_dt'],
-             log_phase, 
-             SCHEDULE_FLAG) = sched(x,
-                                    y,
-                                    install,
-                                    log_phase,
-                                    log_phase_id,
-                                    site,
-                                    metocean,
-                                    device,
-                                    sub_device,
-                                    entry_point,
-                                    layout,
-                                    collection_point,
-                                    dynamic_cable,
-                                    static_cable,
-                                    cable_route,
-                                    connectors,
-                                    external_protection,
-                                    topology,
-                                    line,
-                                    foundation,
-                                    penet_rates,
-                                    laying_rates,
-                                    other_rates)
-
             if SCHEDULE_FLAG == 'NoWWindows':
                 
                 msg = ("Cannot complete installation phase {}. No suitable"
@@ -489,15 +499,16 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
                 continue
                 
             something_installed = True
+            install['findSolution'] = 'SolutionFound'
 
-            # cost assessment of the different operation sequence
-            install['COST'], log_phase = \
-                cost(install, log_phase, log_phase_id, other_rates)
+            if solutions_dir is not None:
+
+                solutions_path = os.path.join(solutions_dir,
+                                              "{}.npz".format(log_phase_id))
+                write_solution_table(get_solution_table(log_phase,
+                                                        log_phase_id),
+                                     solutions_path)
 
-            # assessment of the solution with minimum cost
-            install['optimal'] = opt_sol(log_phase, log_phase_id)
-            install['findSolution'] = 'SolutionFound'
-            
             # check for vessel fuel
             if install['optimal']['fuel cost'] == 0:
 
@@ -785,4 +796,223 @@ def installation_main(vessels, equipments, ports, phase_order, schedule_OLC,
     module_logger.info("Planning of project installation complete...")
 
     return Installation
- 
\ No newline at end of file
+
+
+def _assess_phase(x, y, install, log_phase, log_phase_id, install_port, site,
+                  metocean, device, sub_device, entry_point, layout,
+                  collection_point, dynamic_cable, static_cable, cable_route,
+                  connectors, external_protection, topology, line, foundation,
+                  penet_rates, laying_rates, other_rates, stages=None,
+                  keep_schedules=False):
+
+    '''Performs the requirement, selection, schedule, cost and optimal
+    solution steps of a logistic phase, setting the results in install. If
+    stages (InstallStages) is given, the results of unchanged stages are
+    reused. Otherwise, each solution is scheduled and costed in turn and,
+    unless keep_schedules is True, the schedules of the solutions that can
+    not be optimal are removed as soon as they are costed. Returns the
+    logistic phase and the match and schedule flags.'''
+
+    if stages is not None: stages.start_phase(log_phase_id, (x, y))
+
+    msg = ("Checking installation requirements for phase: {}.").format(
+           log_phase.description)
+
+    module_logger.info(msg)
+
+    MATCH_FLAG = _restore(stages, 'select', install, log_phase)
+
+    if MATCH_FLAG is None:
+
+        # characterize the logistic requirements
+        install['requirement'] = glob_feas(log_phase,
+                                           log_phase_id,
+                                           site,
+                                           device,
+                                           sub_device,
+                                           layout,
+                                           collection_point,
+                                           dynamic_cable,
+                                           static_cable,
+                                           cable_route,
+                                           connectors,
+                                           external_protection,
+                                           topology,
+                                           line,
+                                           foundation)
+
+        # Selection of the feasible equipment
+        install['eq_select'], log_phase = select_e(install, log_phase)
+
+        # Selection of the feasible vessels
+        install['ve_select'], log_phase = select_v(install, log_phase)
+
+        # matching requirements for combinations of port/vessel/equipment
+        install['combi_select'], log_phase, MATCH_FLAG = compatibility_ve(
+            install, log_phase,
+            install_port['Selected base port for installation'])
+
+        _store(stages, 'select', install, log_phase, MATCH_FLAG)
+
+    #TODO: Tidy this summation - check the data structure
+    Num_sols = 0
+
+    for strg in install['combi_select']:
+        Num_sols += len(strg)
+
+    msg = ("{} possible solutions found.").format(Num_sols)
+    module_logger.info(msg)
+
+    if MATCH_FLAG == 'NoSolutions': return log_phase, MATCH_FLAG, None
+
+    if stages is None:
+
+        sched_sols = iter_sched_sols(install,
+                                     log_phase,
+                                     log_phase_id,
+                                     site,
+                                     device,
+                                     sub_device,
+                                     entry_point,
+                                     layout,
+                                     collection_point,
+                                     dynamic_cable,
+                                     static_cable,
+                                     cable_route,
+                                     external_protection,
+                                     foundation,
+                                     penet_rates,
+                                     laying_rates,
+                                     other_rates)
+
+        selector, on_solution = _get_selector(log_phase,
+                                              log_phase_id,
+                                              other_rates,
+                                              keep_schedules)
+
+        # schedule, weather and cost assessment of each solution in turn
+        (install['end_dt'],
+         log_phase,
+         SCHEDULE_FLAG) = sched_weather(x,
+                                        install,
+                                        log_phase,
+                                        sched_sols,
+                                        device,
+                                        WaitingTime(metocean),
+                                        on_solution)
+
+        if SCHEDULE_FLAG == 'NoWWindows':
+            return log_phase, MATCH_FLAG, SCHEDULE_FLAG
+
+        install['COST'] = {seq: log_phase.op_ve[seq].sol_cost
+                                        for seq in range(len(log_phase.op_ve))}
+
+        # assessment of the solution with minimum cost
+        install['optimal'] = opt_sol(log_phase, log_phase_id, selector)
+
+        return log_phase, MATCH_FLAG, SCHEDULE_FLAG
+
+    # schedule assessment of the different operation sequence
+    sched_sols = _restore(stages, 'plan', install, log_phase)
+
+    if sched_sols is None:
+
+        sched_sols = get_sched_sols(install,
+                                    log_phase,
+                                    log_phase_id,
+                                    site,
+                                    device,
+                                    sub_device,
+                                    entry_point,
+                                    layout,
+                                    collection_point,
+                                    dynamic_cable,
+                                    static_cable,
+                                    cable_route,
+                                    external_protection,
+                                    foundation,
+                                    penet_rates,
+                                    laying_rates,
+                                    other_rates)
+
+        _store(stages, 'plan', install, log_phase, sched_sols)
+
+    SCHEDULE_FLAG = _restore(stages, 'weather', install, log_phase)
+
+    if SCHEDULE_FLAG is None:
+
+        (install['end_dt'],
+         log_phase,
+         SCHEDULE_FLAG) = sched_weather(x,
+                                        install,
+                                        log_phase,
+                                        sched_sols,
+                                        device,
+                                        WaitingTime(metocean))
+
+        _store(stages, 'weather', install, log_phase, SCHEDULE_FLAG)
+
+    if SCHEDULE_FLAG == 'NoWWindows':
+        return log_phase, MATCH_FLAG, SCHEDULE_FLAG
+
+    if _restore(stages, 'cost', install, log_phase) is None:
+
+        # cost assessment of the different operation sequence
+        install['COST'], log_phase = \
+            cost(install, log_phase, log_phase_id, other_rates)
+
+        # assessment of the solution with minimum cost
+        install['optimal'] = opt_sol(log_phase, log_phase_id)
+
+        _store(stages, 'cost', install, log_phase)
+
+    return log_phase, MATCH_FLAG, SCHEDULE_FLAG
+
+
+def _get_selector(log_phase, log_phase_id, other_rates, keep_schedules=False):
+
+    '''Returns a SolutionSelector and an on_solution function for
+    sched_weather, which costs each solution and pushes it to the selector.
+    Unless keep_schedules is True, the schedules of the solutions released
+    by the selector are removed.'''
+
+    solutions = {}
+
+    def release(seq, ind_sol):
+        solutions.pop((seq, ind_sol))['schedule'] = None
+
+    def on_solution(seq, ind_sol, sol):
+
+        sol_cost = get_sol_cost(log_phase, log_phase_id, seq, sol, other_rates)
+        log_phase.op_ve[seq].sol_cost[ind_sol] = sol_cost
+
+        if not keep_schedules: solutions[(seq, ind_sol)] = sol
+
+        selector.push(sol_cost, seq, ind_sol)
+
+    if keep_schedules:
+        selector = SolutionSelector()
+    else:
+        selector = SolutionSelector(release=release)
+
+    return selector, on_solution
+
+
+def _restore(stages, stage, install, log_phase):
+
+    if stages is None: return None
+
+    value = stages.restore(stage, install, log_phase)
+
+    if value is not None:
+        msg = "Reusing stored {} results for phase: {}.".format(
+                                                    stage,
+                                                    log_phase.description)
+        module_logger.info(msg)
+
+    return value
+
+
+def _store(stages, stage, install, log_phase, value=None):
+    if stages is None: return
+    stages.store(stage, install, log_phase, value)
@@ -95,7 +95,6 @@ setup(name='dtocean-logistics',
       license="GPLv3",
       packages=find_packages(),
       install_requires=[
-          'geopy',
           'networkx',
           'matplotlib<2',
           'numpy',
@@ -106,8 +105,17 @@ setup(name='dtocean-logistics',
           'xlrd<2'
       ],
       package_data={'dtocean_logistics': ['config/*.ini']},
+      entry_points={
+          'console_scripts':
+              ['dtocean-logistics-db-cache = '
+               'dtocean_logistics.load.db_cache:main',
+               'dtocean-logistics-profile = '
+               'dtocean_logistics.performance.profiling:main',
+               'dtocean-logistics-startup = '
+               'dtocean_logistics.performance.startup:main']},
       zip_safe=False,
-      tests_require=['pytest',
+      tests_require=['geopy',
+                     'pytest',
                      'pytest-mock',
                      'openpyxl',
                      'xlrd',
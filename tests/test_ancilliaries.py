@@ -15,9 +15,20 @@
 #    You should have received a copy of the GNU General Public License
 #    along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import utm
 import pytest
+import numpy as np
+import pandas as pd
+from geopy.distance import great_circle
 
-from dtocean_logistics.ancillaries import differences
+from dtocean_logistics.ancillaries import (DistanceCache,
+                                           FrozenDict,
+                                           LRUCache,
+                                           differences,
+                                           distance,
+                                           get_digest,
+                                           utm_to_latlon,
+                                           write_atomic)
 
 
 @pytest.mark.parametrize("test_input, expected", [
@@ -33,3 +44,165 @@ def test_differences(test_input, expected):
     result = differences(test_input)
     
     assert result == expected
+
+
+def test_distance():
+    
+    UTM_ini = [367391, 6125723, "30 U"]
+    UTM_fin = [367046, 6125033, "30 U"]
+    
+    [lat_ini, lon_ini] = utm.to_latlon(UTM_ini[0], UTM_ini[1], 30, "U")
+    [lat_fin, lon_fin] = utm.to_latlon(UTM_fin[0], UTM_fin[1], 30, "U")
+    expected = great_circle((lat_ini, lon_ini), (lat_fin, lon_fin)).kilometers
+    
+    result = distance(UTM_ini, UTM_fin)
+    
+    assert np.isclose(result, expected)
+    assert np.isclose(distance(UTM_fin, UTM_ini), expected)
+
+
+def test_utm_to_latlon_zones():
+    
+    x = [367391, 367046, 500000]
+    y = [6125723, 6125033, 5000000]
+    zones = ["30 U", "30 U", "31 U"]
+    
+    lat, lon = utm_to_latlon(x, y, zones)
+    
+    for i in range(3):
+        expected = utm.to_latlon(x[i], y[i], int(zones[i][:2]), zones[i][3])
+        assert np.isclose(lat[i], expected[0])
+        assert np.isclose(lon[i], expected[1])
+
+
+def test_DistanceCache_get_distances():
+    
+    test = DistanceCache()
+    
+    UTM_ini = [367391, 6125723, "30 U"]
+    x = [367246, 367226, 367046]
+    y = [6125433, 6125233, 6125033]
+    zones = ["30 U"] * 3
+    
+    result = test.get_distances(UTM_ini, x, y, zones)
+    
+    assert len(test) == 3
+    
+    for i in range(3):
+        expected = test(UTM_ini, [x[i], y[i], zones[i]])
+        assert np.isclose(result[i], expected)
+    
+    assert len(test) == 3
+
+
+def test_DistanceCache_max_size():
+    
+    test = DistanceCache(max_size=2)
+    
+    UTM_ini = [367391, 6125723, "30 U"]
+    x = [367246, 367226, 367046]
+    y = [6125433, 6125233, 6125033]
+    zones = ["30 U"] * 3
+    
+    test.get_distances(UTM_ini, x[:2], y[:2], zones[:2])
+    
+    # The first distance is used again, so the second is evicted
+    test(UTM_ini, [x[0], y[0], zones[0]])
+    test(UTM_ini, [x[2], y[2], zones[2]])
+    
+    assert len(test) == 2
+    assert test.get_stats()['evictions'] == 1
+    
+    test(UTM_ini, [x[0], y[0], zones[0]])
+    
+    assert test.get_stats()['hits'] == 2
+    
+    test.clear()
+    
+    assert len(test) == 0
+
+
+def test_LRUCache():
+    
+    test = LRUCache(max_size=2)
+    
+    test.put("a", 1)
+    test.put("b", 2)
+    
+    assert test.get("a") == 1
+    
+    test.put("c", 3)
+    
+    assert "a" in test
+    assert "b" not in test
+    assert test.get("b") is None
+    assert test.get_stats() == {'hits': 1,
+                                'misses': 1,
+                                'evictions': 1,
+                                'size': 2}
+
+
+def test_FrozenDict():
+    
+    test = FrozenDict({"a": 1})
+    
+    with pytest.raises(TypeError):
+        test["a"] = 2
+    
+    with pytest.raises(TypeError):
+        test.update({"b": 2})
+    
+    assert test == {"a": 1}
+
+
+def test_get_digest():
+    
+    x = np.array([1., 2.])
+    
+    assert get_digest("LpM1", 0, x) == get_digest("LpM1", 0, x.copy())
+    assert get_digest("LpM1", 0, x) != get_digest("LpM1", 1, x)
+    assert get_digest("LpM1", 0, x) != get_digest("LpM1", 0, x[::-1])
+
+
+def test_get_digest_scalars():
+    
+    assert get_digest(np.float64(1.5), np.int64(2)) == get_digest(1.5, 2)
+    assert get_digest(1) != get_digest(1.) != get_digest("1")
+    assert get_digest(u"a") != get_digest("a")
+
+
+def test_get_digest_long_values():
+    
+    # The repr of long pandas objects is truncated
+    x = pd.Series(np.arange(1000.))
+    y = x.copy()
+    y[500] = -1.
+    
+    assert get_digest(x) != get_digest(y)
+    assert get_digest(x.to_frame()) != get_digest(y.to_frame())
+    assert get_digest(x.values.astype(object)) != \
+                                        get_digest(y.values.astype(object))
+
+
+def test_write_atomic(tmpdir):
+    
+    path = str(tmpdir.join("test.txt"))
+    
+    write_atomic(path, lambda f: f.write("a"))
+    write_atomic(path, lambda f: f.write("b"))
+    
+    with open(path) as f:
+        assert f.read() == "b"
+    
+    def fail(f):
+        f.write("c")
+        raise ValueError
+    
+    with pytest.raises(ValueError):
+        write_atomic(path, fail)
+    
+    with open(path) as f:
+        assert f.read() == "b"
+    
+    
+    assert tmpdir.listdir() == [tmpdir.join("test.txt")]
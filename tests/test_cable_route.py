@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import pandas as pd
+
+from dtocean_logistics.ancillaries import distance
+from dtocean_logistics.load.cable_route import CableRouteIndex
+
+
+@pytest.fixture
+def cable_route():
+    
+    data = {'static cable id [-]': [2, 2, 1, 1, 2, 1],
+            'x coord [m]': [495000., 495100., 495500., 495600., 495200., 495700.],
+            'y coord [m]': [6000000., 6000000., 6000000., 6000100., 6000000.,
+                            6000200.],
+            'zone [-]': ["30 U"] * 6,
+            'soil type [-]': ['ls', 'ls', 'cs', 'cs', 'ms', 'cs'],
+            'bathymetry [m]': [10., 30., 20., 25., 15., 22.],
+            'burial depth [m]': [0., 1., 1., 1., 0., 2.],
+            'split pipe [-]': ['no', 'yes', 'no', 'no', 'no', 'no']}
+    
+    return pd.DataFrame(data)
+
+
+def test_CableRouteIndex_route(cable_route):
+    
+    route_index = CableRouteIndex(cable_route)
+    
+    assert 1 in route_index
+    assert 3 not in route_index
+    assert route_index.get_n_points(2) == 3
+    assert route_index.get_n_points(3) == 0
+    assert route_index.get_column(2, 'soil type [-]').tolist() == \
+                                                        ['ls', 'ls', 'ms']
+    assert route_index.get_point(1, 1) == [495600., 6000100., "30 U"]
+    assert route_index.get_first_point(2) == [495000., 6000000., "30 U"]
+    
+    with pytest.raises(IndexError):
+        route_index.get_point(1, 3)
+
+
+def test_CableRouteIndex_lengths(cable_route):
+    
+    route_index = CableRouteIndex(cable_route)
+    
+    expected = distance([495100., 6000000., "30 U"],
+                        [495200., 6000000., "30 U"])
+    
+    assert route_index.get_segment_length(2, 1) == expected
+    assert route_index.get_length(2) == \
+                route_index.get_segment_length(2, 0) + expected
+    
+    with pytest.raises(IndexError):
+        route_index.get_segment_length(2, 2)
+
+
+def test_CableRouteIndex_max(cable_route):
+    
+    route_index = CableRouteIndex(cable_route)
+    
+    assert route_index.get_max_depth(1) == 25.
+    assert route_index.get_max([1, 2, 3], 'bathymetry [m]') == 30.
+    assert route_index.get_max([1], 'burial depth [m]') == 2.
+    
+    with pytest.raises(ValueError):
+        route_index.get_max([3], 'bathymetry [m]')
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from dtocean_logistics.load.check_rules import (check_rules,
+                                                OneOf,
+                                                FLOAT_POSITIVE,
+                                                FLOAT_POSITIVE_NULL,
+                                                INTEGER,
+                                                INTEGER_LONG,
+                                                UNICODE)
+
+
+def test_rules_numeric_column():
+    
+    column = pd.Series([2., 0., -1., np.nan])
+    
+    assert FLOAT_POSITIVE.find_errors(column).tolist() == [False,
+                                                           True,
+                                                           True,
+                                                           False]
+    assert FLOAT_POSITIVE_NULL.find_errors(column).tolist() == [False,
+                                                                False,
+                                                                True,
+                                                                False]
+    assert UNICODE.find_errors(column).tolist() == [True, True, True, False]
+
+
+def test_rules_object_column():
+    
+    column = pd.Series([2., 3, u"a", None])
+    
+    assert FLOAT_POSITIVE.find_errors(column).tolist() == [False,
+                                                           False,
+                                                           True,
+                                                           False]
+    assert UNICODE.find_errors(column).tolist() == [True, True, False, False]
+
+
+def test_rules_integer():
+    
+    column = pd.Series([1., 2.5, np.nan])
+    
+    assert INTEGER.find_errors(column).tolist() == [False, True, False]
+    assert INTEGER_LONG.find_errors(column).tolist() == [True, True, False]
+    assert not INTEGER_LONG.find_errors(pd.Series([1, 2])).any()
+
+
+def test_OneOf():
+    
+    column = pd.Series(["yes", "no", "maybe", np.nan])
+    
+    assert OneOf(["yes", "no"]).find_errors(column).tolist() == [False,
+                                                                 False,
+                                                                 True,
+                                                                 True]
+    assert OneOf(["yes", "no"],
+                 allow_null=True).find_errors(column).tolist() == [False,
+                                                                   False,
+                                                                   True,
+                                                                   False]
+
+
+def test_check_rules():
+    
+    table = pd.DataFrame({"a": [1., -1., -2.],
+                          "b": ["yes", "maybe", "no"]},
+                         index=[10, 11, 12])
+    rules = [("a", FLOAT_POSITIVE),
+             ("b", OneOf(["yes", "no"]))]
+    
+    error, warnings = check_rules(table, rules, "Test", [])
+    
+    assert error
+    assert warnings == [
+        'Input: a = -1.0 in Test/index:11 is Wrong! Value must be a '
+        'positive float.',
+        'Input: b = maybe in Test/index:11 is Wrong! Only "yes" or "no" '
+        'accepted.',
+        'Input: a = -2.0 in Test/index:12 is Wrong! Value must be a '
+        'positive float.']
+
+
+def test_check_rules_no_errors():
+    
+    table = pd.DataFrame({"a": [1., 2.]})
+    warning_list = ["existing"]
+    
+    error, warnings = check_rules(table,
+                                  [("a", FLOAT_POSITIVE)],
+                                  "Test",
+                                  warning_list)
+    
+    assert not error
+    assert warnings == ["existing"]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from dtocean_logistics.load import load_port_data
+from dtocean_logistics.load import db_cache
+from dtocean_logistics.load.db_cache import (CACHE_DIR_NAME,
+                                             CACHE_ENV,
+                                             CachedWorkbook,
+                                             main,
+                                             open_workbook)
+
+this_dir = os.path.dirname(os.path.realpath(__file__))
+data_dir = os.path.join(this_dir, "..", "examples", "databases")
+
+
+@pytest.fixture
+def ports_path(tmpdir, monkeypatch):
+
+    monkeypatch.delenv(CACHE_ENV, raising=False)
+
+    src_path = os.path.join(data_dir, "logisticsDB_ports_python.xlsx")
+    dst_path = str(tmpdir.join("ports.xlsx"))
+    shutil.copy(src_path, dst_path)
+
+    return dst_path
+
+
+def test_open_workbook_no_cache(ports_path):
+    assert isinstance(open_workbook(ports_path), pd.ExcelFile)
+
+
+def test_open_workbook_env(ports_path, tmpdir, monkeypatch):
+
+    cache_dir = str(tmpdir.join("cache"))
+    monkeypatch.setenv(CACHE_ENV, cache_dir)
+
+    workbook = open_workbook(ports_path)
+
+    assert isinstance(workbook, CachedWorkbook)
+    assert workbook.cache_dir == cache_dir
+
+
+def test_CachedWorkbook_parse(mocker, ports_path, tmpdir):
+
+    cache_dir = str(tmpdir.join("cache"))
+    expected = pd.ExcelFile(ports_path).parse('python',
+                                              header=0,
+                                              index_col=0)
+
+    df = CachedWorkbook(ports_path, cache_dir).parse('python')
+    pd.testing.assert_frame_equal(df, expected)
+
+    # The workbook is not opened for cached sheets
+    mocker.patch.object(db_cache.pd, "ExcelFile", side_effect=AssertionError)
+
+    df = CachedWorkbook(ports_path, cache_dir).parse('python')
+    pd.testing.assert_frame_equal(df, expected)
+
+    # Numeric columns are not copied from the memory mapped files
+    column = df.select_dtypes("float").columns[0]
+    values = df[column].values
+    while values.base is not None and not isinstance(values, np.memmap):
+        values = values.base
+
+    assert isinstance(values, np.memmap)
+
+    # Tables can be modified
+    df.iloc[0, 1] = 0
+
+
+def test_CachedWorkbook_modified(ports_path, tmpdir):
+
+    cache_dir = str(tmpdir.join("cache"))
+
+    workbook = CachedWorkbook(ports_path, cache_dir)
+    workbook.parse('python')
+    sheets_dir = workbook._get_sheets_dir()
+
+    # Same contents
+    stat = os.stat(ports_path)
+    os.utime(ports_path, (stat.st_atime, stat.st_mtime + 10))
+
+    assert CachedWorkbook(ports_path, cache_dir)._get_sheets_dir() == \
+                                                                    sheets_dir
+
+    # New contents
+    shutil.copy(os.path.join(data_dir, "safety_factors.xlsx"), ports_path)
+    workbook = CachedWorkbook(ports_path, cache_dir)
+
+    assert workbook._get_sheets_dir() != sheets_dir
+    assert not workbook.parse('port_sf').empty
+
+
+def test_main(ports_path):
+
+    database_dir = os.path.dirname(ports_path)
+
+    assert main([database_dir]) == 0
+    assert os.path.isdir(os.path.join(database_dir, CACHE_DIR_NAME))
+
+    # The local cache is found by the loaders
+    workbook = open_workbook(ports_path)
+
+    assert isinstance(workbook, CachedWorkbook)
+
+    expected = pd.ExcelFile(ports_path).parse('python',
+                                              header=0,
+                                              index_col=0)
+    pd.testing.assert_frame_equal(load_port_data(ports_path), expected)
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+
+import pytest
+
+from dtocean_logistics.performance import instrumentation
+from dtocean_logistics.performance.instrumentation import (GLOBAL_PHASE,
+                                                           Instruments,
+                                                           timed)
+
+
+@pytest.fixture
+def instruments():
+
+    instruments = instrumentation.get_instruments()
+    instruments.reset()
+    instruments.enable()
+
+    yield instruments
+
+    instruments.disable()
+    instruments.reset()
+
+
+@timed("double")
+def double(x):
+    return 2 * x
+
+
+def test_Instruments_disabled():
+
+    instruments = Instruments()
+
+    with instruments.timer("stage"):
+        instruments.count("solutions")
+
+    assert instruments.get_report() == {"phases": {},
+                                        "totals": {"timers": {},
+                                                   "counters": {}}}
+
+
+def test_Instruments_phases():
+
+    instruments = Instruments()
+    instruments.enable()
+
+    with instruments.phase("a"):
+
+        with instruments.timer("stage"):
+            instruments.count("solutions", 2)
+
+        with instruments.timer("stage"):
+            pass
+
+    with instruments.phase("b"):
+        instruments.count("solutions")
+
+    instruments.count("solutions")
+
+    report = instruments.get_report()
+
+    assert report["phases"]["a"]["timers"]["stage"]["calls"] == 2
+    assert report["phases"]["a"]["counters"] == {"solutions": 2}
+    assert report["phases"]["b"]["counters"] == {"solutions": 1}
+    assert report["phases"][GLOBAL_PHASE]["counters"] == {"solutions": 1}
+    assert report["totals"]["counters"] == {"solutions": 4}
+    assert report["totals"]["timers"]["stage"]["calls"] == 2
+
+    timer = report["totals"]["timers"]["stage"]
+
+    assert timer["max"] <= timer["total"]
+
+
+def test_timed(instruments):
+
+    assert double(2) == 4
+    assert double.__name__ == "double"
+
+    instruments.disable()
+    double(2)
+
+    report = instruments.get_report()
+
+    assert report["totals"]["timers"]["double"]["calls"] == 1
+
+
+def test_write_report(tmpdir, instruments):
+
+    with instrumentation.phase("a"):
+        double(1)
+        instrumentation.count("solutions")
+
+    report_path = str(tmpdir.join("report.json"))
+    instrumentation.write_report(report_path)
+
+    with open(report_path) as report_file:
+        report = json.load(report_file)
+
+    assert report["phases"]["a"]["counters"] == {"solutions": 1}
+    assert report["phases"]["a"]["timers"]["double"]["calls"] == 1
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime as dt
+
+import pytest
+
+from dtocean_logistics.performance.optim_sol import SolutionSelector, opt_sol
+
+
+def get_sol_cost(total_cost, vessel_cost=0.):
+    return {'vessel cost': vessel_cost,
+            'equipment cost': 0.,
+            'port cost': 0.,
+            'fuel cost': 0.,
+            'total cost': total_cost}
+
+
+class MockOperation(object):
+
+    def __init__(self, description, total_costs):
+
+        self.description = description
+        self.sol = {}
+        self.sol_cost = {}
+
+        start = dt.datetime(2020, 1, 1)
+
+        for ind_sol, total_cost in enumerate(total_costs):
+
+            schedule = {'prep time': 10.,
+                        'sea time': 20.,
+                        'transit time': 5.,
+                        'waiting time': [1.],
+                        'global': {'nb of journeys': 1,
+                                   'nb of elements per journey': [1]},
+                        'weather windows start_dt': start,
+                        'weather windows depart_dt': start,
+                        'weather windows end_dt': start}
+
+            self.sol[ind_sol] = {'VEs': [], 'schedule': schedule}
+            self.sol_cost[ind_sol] = get_sol_cost(total_cost)
+
+
+class MockLogPhase(object):
+
+    def __init__(self):
+        self.op_ve = {0: MockOperation("first", [3., 2.]),
+                      1: MockOperation("second", [4., 1., 2.])}
+
+
+def test_SolutionSelector_k():
+
+    with pytest.raises(ValueError):
+        SolutionSelector(0)
+
+
+def test_SolutionSelector_get_best():
+
+    released = []
+    selector = SolutionSelector(2, lambda *args: released.append(args))
+
+    selector.push(get_sol_cost(3.), 0, 0)
+    selector.push(get_sol_cost(2.), 0, 1)
+    selector.push(get_sol_cost(4.), 1, 0)
+    selector.push(get_sol_cost(1.), 1, 1)
+    selector.push(get_sol_cost(2.), 1, 2)
+
+    assert selector.get_best() == [(1, 1), (0, 1)]
+    assert released == [(1, 0), (0, 0), (1, 2)]
+
+
+def test_SolutionSelector_ties():
+
+    selector = SolutionSelector()
+
+    selector.push(get_sol_cost(1., 1.), 1, 0)
+    selector.push(get_sol_cost(1., 0.), 1, 1)
+    selector.push(get_sol_cost(1., 0.), 0, 1)
+
+    assert selector.get_best() == [(0, 1)]
+
+
+def test_opt_sol_selector():
+
+    log_phase = MockLogPhase()
+    expected = opt_sol(log_phase, 'Devices')
+
+    def release(seq, ind_sol):
+        log_phase.op_ve[seq].sol[ind_sol]['schedule'] = None
+
+    selector = SolutionSelector(release=release)
+
+    for seq in range(len(log_phase.op_ve)):
+        for ind_sol in range(len(log_phase.op_ve[seq].sol)):
+            selector.push(log_phase.op_ve[seq].sol_cost[ind_sol],
+                          seq,
+                          ind_sol)
+
+    result = opt_sol(log_phase, 'Devices', selector)
+    schedules = [sol['schedule'] for op_ve in log_phase.op_ve.values()
+                                                for sol in op_ve.sol.values()]
+
+    assert result['total cost'] == expected['total cost'] == 1.
+    assert result['strategy'] == expected['strategy'] == "second"
+    assert result['schedule total time'] == 31.
+    assert sum(schedule is not None for schedule in schedules) == 1
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+from dtocean_logistics.performance.schedule.install.phase_plan import \
+                                                                    PhasePlan
+
+
+class MockOperation(object):
+
+    def __init__(self, time_value, time_function, time_other):
+        self.time_value = time_value
+        self.time_function = time_function
+        self.time_other = time_other
+
+
+def test_PhasePlan_route_index(site):
+
+    assert PhasePlan(site).route_index is None
+
+
+def test_PhasePlan_get_time_method(site):
+
+    plan = PhasePlan(site)
+    log_op = MockOperation(np.nan, "distance", np.nan)
+    time_method = plan.get_time_method(log_op)
+
+    assert pd.isnull(time_method[0])
+    assert time_method[1] == "distance"
+    assert plan.get_time_method(log_op) is time_method
+
+
+def test_PhasePlan_get_table(site, layout):
+
+    plan = PhasePlan(site)
+    calls = []
+
+    def select(table):
+        calls.append(table)
+        return table.iloc[:2]
+
+    table = plan.get_table(select, layout)
+
+    assert plan.get_table(select, layout) is table
+    assert len(calls) == 1
+    assert len(table) == 2
+
+
+def test_PhasePlan_get_point(site, layout):
+
+    plan = PhasePlan(site)
+    point = plan.get_point(layout, 1)
+
+    assert point == [367246, 6125433, "30 U"]
+
+    # Callers can modify the returned point
+    point[0] = 0
+
+    assert plan.get_point(layout, 1) == [367246, 6125433, "30 U"]
+
+
+def test_PhasePlan_get_point_prefix(site):
+
+    plan = PhasePlan(site)
+    table = pd.DataFrame({'upstream x coord [m]': [1., 2.],
+                          'upstream y coord [m]': [3., 4.],
+                          'upstream zone [-]': ["30 U", "31 U"]},
+                         index=[5, 6])
+
+    assert plan.get_point(table, 6, 'upstream ') == [2., 4., "31 U"]
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import utm
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from dtocean_logistics.ancillaries import distance
+from dtocean_logistics.phases import port_distances as pd_module
+from dtocean_logistics.phases.port_distances import (build_port_distances,
+                                                     get_port_distances)
+from dtocean_logistics.phases.select_port_OM import OM_port
+from dtocean_logistics.phases.transit_algorithm import SeaRouter
+
+
+def to_utm(lat, lon):
+    x, y, number, letter = utm.from_latlon(lat, lon)
+    return [x, y, "{} {}".format(number, letter)]
+
+
+@pytest.fixture(scope="module")
+def port_data():
+
+    rng = np.random.RandomState(5)
+    n_ports = 30
+
+    x = rng.uniform(300000, 700000, n_ports)
+    y = rng.uniform(5500000, 6000000, n_ports)
+    x[4] = np.nan
+
+    df = pd.DataFrame({'Name [-]': ["Port {}".format(i)
+                                                for i in xrange(n_ports)],
+                       'UTM x [m]': x,
+                       'UTM y [m]': y,
+                       'UTM zone [-]': ["30 U"] * n_ports,
+                       'Terminal load bearing [t/m^2]':
+                                           rng.uniform(0, 20, n_ports),
+                       'Terminal area [m^2]': rng.uniform(0, 10000, n_ports),
+                       'Type of terminal [Quay/Dry-dock]':
+                                                       ['Quay'] * n_ports},
+                      index=np.arange(n_ports) + 10)
+
+    return df
+
+
+@pytest.fixture(scope="module")
+def sites_coords():
+    return [[400000., 5700000., "30 U"],
+            [600000., 5900000., "30 U"]]
+
+
+def test_build_port_distances(port_data, sites_coords):
+
+    matrix = build_port_distances(port_data, sites_coords)
+
+    assert matrix.shape == (len(port_data), len(sites_coords))
+    assert np.isnan(matrix[4, :]).all()
+
+    for i, (_, port) in enumerate(port_data.iterrows()):
+
+        if i == 4: continue
+
+        port_coords = [port['UTM x [m]'],
+                       port['UTM y [m]'],
+                       port['UTM zone [-]']]
+
+        for j, site_coords in enumerate(sites_coords):
+            assert np.isclose(matrix[i, j], distance(site_coords, port_coords))
+
+
+def test_build_port_distances_sea_router():
+
+    lat = [50., 50., 50.5]
+    lon = [-5., -4., -4.9]
+    sea_router = SeaRouter(lat, lon, [(0, 1, 100.)])
+
+    ports_coords = [to_utm(50., -4.), to_utm(50.5, -4.9)]
+    x, y, zones = zip(*ports_coords)
+    port_data = pd.DataFrame({'UTM x [m]': x,
+                              'UTM y [m]': y,
+                              'UTM zone [-]': zones})
+
+    site_coords = to_utm(50., -5.)
+    matrix = build_port_distances(port_data, [site_coords], sea_router)
+
+    # The second port snaps to the first point
+    assert matrix[0, 0] == 100.
+    assert matrix[1, 0] == 0.
+
+    sea_router = SeaRouter(lat, lon, [(0, 1, 100.), (2, 2, 1.)])
+    matrix = build_port_distances(port_data, [site_coords], sea_router)
+
+    # The second port is not connected to the site
+    assert matrix[0, 0] == 100.
+    assert np.isclose(matrix[1, 0], distance(site_coords, ports_coords[1]))
+
+
+def test_get_port_distances_cache_dir(tmpdir, port_data, sites_coords):
+
+    cache_dir = str(tmpdir)
+    pd_module._port_distances.clear()
+
+    port_distances = get_port_distances(port_data,
+                                        sites_coords,
+                                        cache_dir=cache_dir)
+
+    assert get_port_distances(port_data, sites_coords) is port_distances
+    assert len(os.listdir(cache_dir)) == 1
+
+    pd_module._port_distances.clear()
+
+    stored = get_port_distances(port_data,
+                                sites_coords,
+                                cache_dir=cache_dir)
+
+    assert stored is not port_distances
+    assert isinstance(stored.matrix, np.memmap)
+    assert np.allclose(stored.matrix, port_distances.matrix, equal_nan=True)
+
+    for site_coords in sites_coords:
+        assert site_coords in stored
+        assert stored.get(0, site_coords) == \
+                                        port_distances.get(0, site_coords)
+
+
+def test_get_port_distances_invalid_file(tmpdir, port_data, sites_coords):
+
+    cache_dir = str(tmpdir)
+    pd_module._port_distances.clear()
+
+    get_port_distances(port_data, sites_coords, cache_dir=cache_dir)
+    pd_module._port_distances.clear()
+
+    cache_path = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+
+    with open(cache_path, "wb") as cache_file:
+        cache_file.write("not a matrix")
+
+    port_distances = get_port_distances(port_data,
+                                        sites_coords,
+                                        cache_dir=cache_dir)
+
+    assert port_distances.matrix.shape == (len(port_data), len(sites_coords))
+    assert isinstance(np.load(cache_path), np.ndarray)
+
+
+def test_OM_port_port_distances(port_data, sites_coords):
+
+    port_distances = get_port_distances(port_data, sites_coords)
+
+    for site_coords in sites_coords:
+
+        OM_outputs = pd.DataFrame({'ID [-]': ['INS_PORT'],
+                                   'x coord [m]': [site_coords[0]],
+                                   'y coord [m]': [site_coords[1]],
+                                   'zone [-]': [site_coords[2]]})
+
+        expected = OM_port(OM_outputs, port_data)
+        port = OM_port(OM_outputs, port_data, port_distances=port_distances)
+
+        assert port['Port database index [-]'] == \
+                                        expected['Port database index [-]']
+        assert np.isclose(port['Distance port-site [km]'],
+                          expected['Distance port-site [km]'])
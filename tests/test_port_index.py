@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from dtocean_logistics.ancillaries import get_distance_cache
+from dtocean_logistics.phases.port_index import PortIndex, get_port_index
+from dtocean_logistics.phases.select_port_OM import OM_port, OM_ports
+
+
+@pytest.fixture(scope="module")
+def port_data():
+
+    rng = np.random.RandomState(3)
+    n_ports = 200
+
+    x = rng.uniform(200000, 800000, n_ports)
+    y = rng.uniform(5000000, 6500000, n_ports)
+    x[[7, 50]] = np.nan
+
+    # Some ports have more than one terminal
+    names = ["Port {}".format(i // 2) for i in xrange(n_ports)]
+
+    area = rng.uniform(0, 10000, n_ports)
+    area[[3, 4]] = np.nan
+
+    df = pd.DataFrame({'Name [-]': names,
+                       'UTM x [m]': x,
+                       'UTM y [m]': y,
+                       'UTM zone [-]': ["30 U"] * n_ports,
+                       'Terminal load bearing [t/m^2]':
+                                           rng.uniform(0, 20, n_ports),
+                       'Terminal area [m^2]': area,
+                       'Type of terminal [Quay/Dry-dock]':
+                                           rng.choice(['Quay', 'Dry-dock'],
+                                                      n_ports)},
+                      index=np.arange(n_ports) + 100)
+
+    return df
+
+
+def get_closest_all(port_data, site_coords, n=5):
+
+    located = port_data[port_data['UTM x [m]'].notnull()]
+    dists = get_distance_cache().get_distances(site_coords,
+                                               located['UTM x [m]'],
+                                               located['UTM y [m]'],
+                                               located['UTM zone [-]'])
+
+    ports = sorted(zip(dists, located.index, located['Name [-]']))
+    closest = []
+
+    for i, (dist, label, name) in enumerate(ports):
+        if i > 0 and name == ports[i - 1][2]: continue
+        closest.append((dist, label))
+
+    return closest[:n]
+
+
+def test_PortIndex_apply_minimum(port_data):
+
+    port_index = PortIndex(port_data)
+    positions, deselected = port_index.apply_minimum(port_index.get_all(),
+                                                     'Terminal area [m^2]',
+                                                     5000.)
+
+    expected = port_data[port_data['Terminal area [m^2]'] >= 5000.]
+    expected = expected.append(
+                    port_data[port_data['Terminal area [m^2]'].isnull()])
+
+    assert (port_data.index[positions] == expected.index).all()
+    assert len(positions) + len(deselected) == len(port_data)
+    assert (port_data['Terminal area [m^2]'].iloc[deselected] < 5000.).all()
+
+
+@pytest.mark.parametrize("minimum", [0., 5000., 9500.])
+def test_PortIndex_get_closest_many(port_data, minimum):
+
+    port_index = PortIndex(port_data)
+    positions, _ = port_index.apply_minimum(port_index.get_all(),
+                                            'Terminal area [m^2]',
+                                            minimum)
+    feasible = port_data.iloc[positions]
+
+    sites_coords = [[300000., 5200000., "30 U"],
+                    [750000., 6400000., "30 U"],
+                    [500000., 5700000., "30 U"]]
+
+    results = port_index.get_closest_many(sites_coords, positions)
+
+    for site_coords, result in zip(sites_coords, results):
+
+        expected = get_closest_all(feasible, site_coords)
+
+        assert [port_data.index[x[1]] for x in result] == \
+                                                    [x[1] for x in expected]
+        assert np.isclose([x[0] for x in result],
+                          [x[0] for x in expected]).all()
+
+
+def test_get_port_index(port_data):
+
+    port_index = get_port_index(port_data)
+
+    assert get_port_index(port_data.copy()) is port_index
+    assert get_port_index(port_data.iloc[1:]) is not port_index
+
+
+def test_OM_port_no_feasible(port_data):
+
+    OM_outputs = pd.DataFrame({'ID [-]': ['OM_PORT'],
+                               'sp_length [m]': [1000.],
+                               'sp_width [m]': [1000.],
+                               'sp_height [m]': [1.],
+                               'sp_dry_mass [kg]': [1e12],
+                               'x coord [m]': [500000.],
+                               'y coord [m]': [5700000.],
+                               'zone [-]': ["30 U"]})
+
+    # Remove the ports with no requirements data
+    port_data = port_data[port_data['Terminal area [m^2]'].notnull()]
+    port = OM_port(OM_outputs, port_data)
+
+    expected = get_closest_all(port_data, [500000., 5700000., "30 U"])[0]
+
+    assert port['Port list satisfying the minimum requirements'].empty
+    assert port['Port database index [-]'] == expected[1]
+
+
+def test_OM_ports(port_data):
+
+    OM_outputs_list = []
+
+    for ID, x, area in [('OM_PORT', 300000., 10.),
+                        ('INS_PORT', 750000., 10.),
+                        ('OM_PORT', 500000., 10.),
+                        ('OM_PORT', 500000., 90.)]:
+
+        OM_outputs = pd.DataFrame({'ID [-]': [ID],
+                                   'sp_length [m]': [area],
+                                   'sp_width [m]': [area],
+                                   'sp_height [m]': [1.],
+                                   'sp_dry_mass [kg]': [1e5],
+                                   'x coord [m]': [x],
+                                   'y coord [m]': [5700000.],
+                                   'zone [-]': ["30 U"]})
+        OM_outputs_list.append(OM_outputs)
+
+    ports = OM_ports(OM_outputs_list, port_data)
+
+    for OM_outputs, port in zip(OM_outputs_list, ports):
+
+        expected = OM_port(OM_outputs, port_data)
+
+        assert port['Port database index [-]'] == \
+                                        expected['Port database index [-]']
+        assert port['Distance port-site [km]'] == \
+                                        expected['Distance port-site [km]']
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from dtocean_logistics.performance.instrumentation import (ProfileEvent,
+                                                           get_instruments)
+from dtocean_logistics.performance.profiling import (TraceCollector,
+                                                     get_expensive_olcs,
+                                                     get_expensive_solutions,
+                                                     main,
+                                                     read_trace)
+
+
+def make_event(stage, ind_sol, elapsed, olc=None):
+    return ProfileEvent("phase",
+                        stage,
+                        0,
+                        ind_sol,
+                        0 if olc else None,
+                        elapsed,
+                        "whole" if olc else None,
+                        100 if olc else None,
+                        olc)
+
+
+@pytest.fixture
+def trace_path(tmpdir):
+
+    trace_path = str(tmpdir.join("trace.gz"))
+
+    with TraceCollector(trace_path) as collector:
+
+        instruments = get_instruments()
+
+        with instruments.profile("weather", 0, 1):
+            instruments.fire("journey",
+                             0.1,
+                             journey=0,
+                             strategy="whole",
+                             n_windows=10,
+                             olc=(1., 0., 0., 0.))
+
+        collector(make_event("plan", 0, 1.))
+        collector(make_event("weather", 0, 0.5))
+        collector(make_event("journey", 0, 0.4, (2., 0., 0., 0.)))
+
+    # Events are not collected after exit
+    with get_instruments().profile("plan", 0, 2): pass
+
+    return trace_path
+
+
+def test_read_trace(trace_path):
+
+    trace = read_trace(trace_path)
+
+    assert list(trace["stage"]) == ["journey",
+                                    "weather",
+                                    "plan",
+                                    "weather",
+                                    "journey"]
+    assert trace["olc"][0] == (1., 0., 0., 0.)
+    assert trace["ind_sol"][0] == 1
+    assert (trace["weight"] == 1).all()
+
+
+def test_TraceCollector_sampling(tmpdir):
+
+    trace_path = str(tmpdir.join("trace.gz"))
+    collector = TraceCollector(trace_path, sample_every=3, min_elapsed=1.)
+
+    for i in xrange(7):
+        collector(make_event("plan", i, 0.1))
+
+    collector(make_event("plan", 7, 2.))
+    collector.close()
+
+    trace = read_trace(trace_path)
+
+    assert list(trace["ind_sol"]) == [2, 5, 7]
+    assert list(trace["weight"]) == [3, 3, 1]
+
+
+def test_TraceCollector_bad_sample_every(tmpdir):
+    with pytest.raises(ValueError):
+        TraceCollector(str(tmpdir.join("trace.gz")), sample_every=0)
+
+
+def test_get_expensive_solutions(trace_path):
+
+    ranked = get_expensive_solutions(read_trace(trace_path))
+
+    assert list(ranked["ind_sol"]) == [0, 1]
+    assert list(ranked["total"]) == [1.5, pytest.approx(0.1, abs=0.1)]
+    assert list(ranked["events"]) == [2, 1]
+
+
+def test_get_expensive_olcs(trace_path):
+
+    ranked = get_expensive_olcs(read_trace(trace_path), top=1)
+
+    assert list(ranked["olc"]) == [(2., 0., 0., 0.)]
+    assert list(ranked["mean windows"]) == [100]
+
+
+def test_main(capsys, trace_path):
+
+    assert main([trace_path, "-n", "1"]) == 0
+
+    out, _ = capsys.readouterr()
+
+    assert "(2.0, 0.0, 0.0, 0.0)" in out
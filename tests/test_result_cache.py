@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from dtocean_logistics.phases import EquipmentType, VesselType
+from dtocean_logistics.performance.result_cache import (InstallStages,
+                                                        ResultCache,
+                                                        get_content_digest,
+                                                        get_install_digests)
+
+
+@pytest.fixture
+def table():
+
+    df = pd.DataFrame({'a [-]': [1., 2., np.nan],
+                       'b [-]': ["x", "y", None],
+                       'c [-]': [pd.Timestamp("2018-01-01")] * 3},
+                      index=pd.Index([10, 11, 12], name="id [-]"))
+
+    return df
+
+
+def test_get_content_digest_equal(table):
+
+    other = table.copy()
+    other['a [-]'] = other['a [-]'].copy()
+
+    assert get_content_digest(table) == get_content_digest(other)
+    assert get_content_digest({"t": table, "n": 1}) == \
+                                    get_content_digest({"n": 1, "t": other})
+
+
+@pytest.mark.parametrize("change", [
+    lambda df: df.__setitem__('a [-]', [0., 2., np.nan]),
+    lambda df: df.__setitem__('b [-]', ["x", "z", None]),
+    lambda df: df.rename(columns={'a [-]': 'd [-]'}, inplace=True),
+    lambda df: df.set_index(pd.Index([10, 11, 13], name="id [-]"),
+                            inplace=True)])
+def test_get_content_digest_changed(table, change):
+
+    other = table.copy()
+    change(other)
+
+    assert get_content_digest(table) != get_content_digest(other)
+
+
+def test_get_content_digest_ve_types(table):
+
+    vessels = {'CLV': VesselType('CLV', table)}
+    equal = {'CLV': VesselType('CLV', table.copy())}
+    other = {'CLV': VesselType('CLV', table.iloc[:2])}
+
+    assert get_content_digest(vessels) == get_content_digest(equal)
+    assert get_content_digest(vessels) != get_content_digest(other)
+
+
+def test_ResultCache_copy():
+
+    result_cache = ResultCache()
+    value = {"a": [1, 2]}
+
+    result_cache.put("key", value)
+    value["a"].append(3)
+
+    stored = result_cache.get("key")
+    stored["a"].append(4)
+
+    assert "key" in result_cache
+    assert result_cache.get("key") == {"a": [1, 2]}
+    assert result_cache.get("missing", 0) == 0
+
+
+def test_ResultCache_max_size():
+
+    result_cache = ResultCache(max_size=2)
+
+    for i in range(3):
+        result_cache.put(str(i), i)
+
+    assert "0" not in result_cache
+    assert result_cache.get_stats()["evictions"] == 1
+
+
+def test_ResultCache_cache_dir(tmpdir):
+
+    cache_dir = str(tmpdir.join("results"))
+    ResultCache(cache_dir=cache_dir).put("key", [1, 2])
+
+    assert os.listdir(cache_dir) == ["key.pkl"]
+
+    result_cache = ResultCache(cache_dir=cache_dir)
+
+    assert "key" in result_cache
+    assert result_cache.get("key") == [1, 2]
+
+
+@pytest.fixture
+def vessels():
+
+    df = pd.DataFrame({'Name': ["a", "b", "c"],
+                       'Op max Day Rate [EURO/day]': [10, 20, 30]},
+                      index=pd.Index([10, 11, 12], name="id [-]"))
+
+    return {'CLV': VesselType('CLV', df),
+            'Tugboat': VesselType('Tugboat', df.copy())}
+
+
+@pytest.fixture
+def other_rates():
+
+    df = pd.DataFrame({'Value': [1., 2.]},
+                      index=['Fuel cost rate [EUR/l]', 'Other [-]'])
+
+    return df
+
+
+def test_get_install_digests(table, vessels, other_rates):
+
+    digests = get_install_digests(vessels, {}, other_rates, line=table)
+
+    vessels['CLV'].panda['Op max Day Rate [EURO/day]'] *= 2
+    changed = get_install_digests(vessels, {}, other_rates, line=table)
+
+    assert changed['vessels'] == digests['vessels']
+    assert changed['vessels:cost'] != digests['vessels:cost']
+    assert changed['line'] == digests['line']
+
+    # The day rate of tugboats is read when matching
+    vessels['Tugboat'].panda['Op max Day Rate [EURO/day]'] *= 2
+    changed = get_install_digests(vessels, {}, other_rates, line=table)
+
+    assert changed['vessels'] != digests['vessels']
+
+    other_rates.iloc[0, 0] = 3.
+    changed = get_install_digests(vessels, {}, other_rates, line=table)
+
+    assert changed['other_rates'] == digests['other_rates']
+    assert changed['other_rates:cost'] != digests['other_rates:cost']
+
+
+def make_stages(result_cache, vessels, other_rates, metocean):
+    return InstallStages(result_cache,
+                         vessels,
+                         {},
+                         other_rates,
+                         metocean=metocean,
+                         site="site",
+                         device="device",
+                         port="port",
+                         schedule_OLC="OLC",
+                         entry_point="entry")
+
+
+class MockOperation(object):
+
+    def __init__(self, row):
+        self.ve_combination = {0: "combination"}
+        self.sol = {0: {'VEs': [['CLV', 1, row]]}}
+        self.sol_cost = None
+
+
+class MockLogPhase(object):
+
+    def __init__(self, row):
+        self.op_ve = {0: MockOperation(row)}
+        self.nr_sol_feas = 1
+        self.nr_sol_match = 1
+
+
+def run_stages(stages, install, log_phase):
+
+    evaluated = []
+
+    stages.start_phase('Devices', (0, 0))
+
+    for stage in ['select', 'plan', 'weather', 'cost']:
+
+        if stages.restore(stage, install, log_phase) is not None: continue
+
+        evaluated.append(stage)
+
+        if stage == 'cost': install['COST'] = {0: {0: 1.}}
+
+        stages.store(stage, install, log_phase, stage)
+
+    return evaluated
+
+
+def test_InstallStages(table, vessels, other_rates):
+
+    result_cache = ResultCache()
+
+    def run(metocean="metocean"):
+
+        clv = vessels['CLV']
+
+        install = {'plan': {0: ['Devices']},
+                   'end_dt': [],
+                   'requirement': {},
+                   'eq_select': {},
+                   've_select': {},
+                   'combi_select': {},
+                   'optimal': {}}
+        log_phase = MockLogPhase(clv.panda.ix[11])
+
+        stages = make_stages(result_cache, vessels, other_rates, metocean)
+        evaluated = run_stages(stages, install, log_phase)
+
+        return evaluated, log_phase
+
+    assert run()[0] == ['select', 'plan', 'weather', 'cost']
+    assert run()[0] == []
+    assert run("other")[0] == ['weather', 'cost']
+
+    # Tables modified in place, as by safety_factors
+    vessels['CLV'].panda.loc[:, 'Op max Day Rate [EURO/day]'] *= 2
+    evaluated, log_phase = run()
+
+    assert evaluated == ['cost']
+
+    # Restored solutions use the current rows
+    row = log_phase.op_ve[0].sol[0]['VEs'][0][2]
+
+    assert row['Op max Day Rate [EURO/day]'] == 40
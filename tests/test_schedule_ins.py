@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from datetime import datetime
+
+import pandas as pd
+
+from dtocean_logistics.performance.schedule import schedule_ins
+from dtocean_logistics.performance.schedule.schedule_ins import (
+                                                            iter_sched_sols,
+                                                            sched_weather)
+
+
+class MockWaitingTime(object):
+
+    def __init__(self, flags):
+        self.flags = list(flags)
+
+    def __call__(self, log_phase, sched_sol, start_date):
+
+        journey = {'wait_dur': [1.], 'start_delay': [2.]}
+
+        return journey, self.flags.pop(0)
+
+
+def get_log_phase(mocker, nsols):
+
+    operation = mocker.Mock()
+    operation.sol = {i: {'VEs': [["Vessel", 1, {"Name": "vessel a"}]]}
+                                                        for i in range(nsols)}
+
+    log_phase = mocker.Mock()
+    log_phase.op_ve = {0: operation}
+
+    return log_phase
+
+
+def test_iter_sched_sols_weather(mocker, monkeypatch):
+
+    events = []
+
+    def mock_get_sched_sol(log_phase_id, seq, ind_sol, *args):
+        events.append(("plan", seq, ind_sol))
+        return {'prep time': 1.,
+                'sea time': 3.,
+                'waiting time': [],
+                'total time': [4.]}
+
+    def on_solution(seq, ind_sol, sol):
+        events.append(("solution", seq, ind_sol))
+
+    monkeypatch.setattr(schedule_ins, "get_sched_sol", mock_get_sched_sol)
+    monkeypatch.setattr(schedule_ins, "PhasePlan", lambda *args: None)
+
+    log_phase = get_log_phase(mocker, 3)
+    install = {'plan': {0: []}, 'end_dt': []}
+    device = pd.DataFrame({'Project start date [-]': [datetime(2000, 1, 1)]})
+
+    sched_sols = iter_sched_sols(install,
+                                 log_phase,
+                                 "Devices",
+                                 *[None] * 14)
+
+    # Nothing is scheduled until requested
+    assert not events
+
+    waiting_time = MockWaitingTime(['WindowFound',
+                                    'NoWWindows',
+                                    'WindowFound'])
+
+    _, log_phase, flag = sched_weather(0,
+                                       install,
+                                       log_phase,
+                                       sched_sols,
+                                       device,
+                                       waiting_time,
+                                       on_solution)
+
+    # Each solution is passed on before the next is scheduled and the
+    # solutions without a weather window are removed
+    assert flag == 'ScheduleFound'
+    assert events == [("plan", 0, 0),
+                      ("solution", 0, 0),
+                      ("plan", 0, 1),
+                      ("plan", 0, 2),
+                      ("solution", 0, 1)]
+    assert len(log_phase.op_ve[0].sol) == 2
+
+    sched_sol = log_phase.op_ve[0].sol[1]['schedule']
+
+    assert sched_sol['waiting time'] == [1.]
+    assert sched_sol['total time'] == [4., 2., 1.]
+    assert sched_sol['weather windows end_dt'] == datetime(2000, 1, 1, 7)
@@ -19,6 +19,10 @@
 
 from datetime import datetime
 
+import pytest
+import pandas as pd
+
+from dtocean_logistics.performance.schedule import schedule_om
 from dtocean_logistics.performance.schedule.schedule_om import (SchedOM,
                                                                 get_start)
 
@@ -47,3 +51,370 @@ def test_get_start_string():
     test = get_start(om)
     expected = now.replace(minute=0, second=0, microsecond=0)
     assert test == expected
+
+
+def test_SchedOM_get_sched_site_cache(monkeypatch):
+    
+    calls = []
+    
+    def mock_sched_site(*args):
+        calls.append(args)
+        sched_sol = args[-1]
+        sched_sol['total time'] = [1., 2.]
+        return sched_sol
+    
+    monkeypatch.setattr(schedule_om, "sched_site", mock_sched_site)
+    
+    om = pd.DataFrame({'element_ID [-]': ["a", "b"],
+                       'x coord [m]': [1., 2.],
+                       'y coord [m]': [3., 4.]})
+    om_reversed = om.iloc[::-1].reset_index(drop=True)
+    
+    test = SchedOM()
+    
+    def get_sched_site(om):
+        return test._get_sched_site("LpM1", 0, 0, None, None, None, None, om,
+                                    {'total time': [], 'waiting time': []})
+    
+    first = get_sched_site(om)
+    second = get_sched_site(om)
+    
+    assert len(calls) == 1
+    assert second is first
+    assert first['total time'] == (1., 2.)
+    
+    with pytest.raises(TypeError):
+        first['total time'] = []
+    
+    get_sched_site(om_reversed)
+    
+    assert len(calls) == 2
+    
+    # Columns other than the start date are part of the key
+    om_duration = om.copy()
+    om_duration['d_om [hour]'] = [1., 2.]
+    
+    get_sched_site(om_duration)
+    
+    assert len(calls) == 3
+    
+    om_start = om.copy()
+    om_start['t_start [-]'] = [datetime(2000, 1, 1)] * 2
+    
+    get_sched_site(om_start)
+    
+    assert len(calls) == 3
+    assert test.get_cache_stats() == {'hits': 2,
+                                      'misses': 3,
+                                      'evictions': 0,
+                                      'size': 3}
+
+
+def test_SchedOM_cache_size(monkeypatch):
+    
+    def mock_sched_site(*args):
+        return args[-1]
+    
+    monkeypatch.setattr(schedule_om, "sched_site", mock_sched_site)
+    
+    om = pd.DataFrame({'element_ID [-]': ["a"],
+                       'x coord [m]': [1.],
+                       'y coord [m]': [3.]})
+    
+    test = SchedOM(cache_size=1)
+    
+    for ind_sol in range(3):
+        test._get_sched_site("LpM1", 0, ind_sol, None, None, None, None, om,
+                             {'total time': [], 'waiting time': []})
+    
+    stats = test.get_cache_stats()
+    
+    assert stats['evictions'] == 2
+    assert stats['size'] == 1
+
+
+class MockWaitingTime(object):
+    
+    def __init__(self, fail_dates=None):
+        
+        if fail_dates is None: fail_dates = []
+        
+        self.fail_dates = fail_dates
+        self.calls = []
+    
+    def set_optimise_delay(self, value):
+        pass
+    
+    def get_start_delays(self, log_phase, sched_sol, start_dates):
+        
+        self.calls.append(list(start_dates))
+        results = []
+        
+        for start_date in start_dates:
+            
+            if start_date.day in self.fail_dates:
+                results.append(([], 'NoWWindows'))
+            else:
+                results.append(({'start_delay': [2.],
+                                 'wait_dur': [1.]}, 'WeatherWindowsFound'))
+        
+        return results
+
+
+def test_SchedOM_schedule_events(mocker, monkeypatch):
+    
+    calls = []
+    
+    def mock_sched_site(*args):
+        calls.append(args)
+        sched_sol = args[-1]
+        sched_sol['prep time'] = 10.
+        sched_sol['sea time'] = 5.
+        sched_sol['total time'] = [10., 5.]
+        return sched_sol
+    
+    monkeypatch.setattr(schedule_om, "sched_site", mock_sched_site)
+    
+    operation = mocker.Mock()
+    operation.sol = {0: {'VEs': [["Vessel", 1, {"Name": "vessel a"}]]},
+                     1: {'VEs': [["Vessel", 1, {"Name": "vessel b"}]]}}
+    
+    log_phase = mocker.Mock()
+    log_phase.op_ve = {0: operation}
+    
+    events = pd.DataFrame({'event [-]': [0, 1, 1, 2, 3],
+                           'log phase [-]': ["LpM1"] * 5,
+                           'element_ID [-]': ["a", "a", "b", "a", "a"],
+                           'x coord [m]': [1., 1., 2., 1., 1.],
+                           'y coord [m]': [3., 3., 4., 3., 3.],
+                           't_start [-]': [datetime(2000, 1, 1),
+                                           datetime(2000, 1, 2),
+                                           datetime(2000, 1, 2),
+                                           datetime(2000, 1, 3),
+                                           datetime(2000, 1, 4)]})
+    
+    waiting_time = MockWaitingTime(fail_dates=[4])
+    
+    test = SchedOM()
+    result = test.schedule_events({"LpM1": log_phase},
+                                  None,
+                                  None,
+                                  None,
+                                  None,
+                                  None,
+                                  None,
+                                  events,
+                                  custom_waiting=waiting_time)
+    
+    # Events 0, 2 and 3 share a site schedule
+    assert len(calls) == 4
+    assert waiting_time.calls[0] == [datetime(2000, 1, 1, 10),
+                                     datetime(2000, 1, 3, 10),
+                                     datetime(2000, 1, 4, 10)]
+    
+    assert result['event [-]'].tolist() == [0, 0, 1, 1, 2, 2]
+    assert result['solution [-]'].tolist() == [0, 1, 0, 1, 0, 1]
+    assert result['total time'].tolist() == [18.] * 6
+    assert result['weather windows depart_dt'].iloc[0] == \
+                                                datetime(2000, 1, 1, 12)
+    assert result['weather windows end_dt'].iloc[0] == \
+                                                datetime(2000, 1, 1, 18)
+    
+    # The log phase is not modified
+    assert 'schedule' not in operation.sol[0]
+
+
+def test_SchedOM_get_plans(mocker, monkeypatch):
+    
+    def mock_sched_site(*args):
+        sched_sol = args[-1]
+        sched_sol['prep time'] = 10.
+        sched_sol['sea time'] = 5.
+        sched_sol['total time'] = [10., 5.]
+        return sched_sol
+    
+    monkeypatch.setattr(schedule_om, "sched_site", mock_sched_site)
+    
+    operation = mocker.Mock()
+    operation.sol = {0: {'VEs': [["Vessel", 1, {"Name": "vessel a"}]]},
+                     1: {'VEs': [["Vessel", 1, {"Name": "vessel b"}]]}}
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    log_phase.op_ve = {0: operation}
+    
+    om = pd.DataFrame({'element_ID [-]': ["a"],
+                       'x coord [m]': [1.],
+                       'y coord [m]': [3.]})
+    
+    test = SchedOM()
+    plans = test.get_plans(log_phase,
+                           "LpM1",
+                           None,
+                           None,
+                           None,
+                           None,
+                           None,
+                           om)
+    
+    assert plans.keys() == [(0, 0), (0, 1)]
+    
+    plan = plans[(0, 1)]
+    
+    assert plan['type'] == 'site'
+    assert plan['description'] == "Mocked phase"
+    
+    with pytest.raises(TypeError):
+        plan['seq'] = 1
+    
+    waiting_time = MockWaitingTime(fail_dates=[2])
+    result = test.schedule_plan(plan,
+                                [datetime(2000, 1, 1), datetime(2000, 1, 2)],
+                                waiting_time)
+    
+    assert result[1] is False
+    assert result[0]['weather windows end_dt'] == datetime(2000, 1, 1, 18)
+    assert result[0]['total time'] == [10., 5., 2., 1.]
+    assert plan['schedule']['total time'] == (10., 5.)
+
+
+def test_SchedOM_get_plans_base(mocker, monkeypatch):
+    
+    def mock_sched_retrieve(*args):
+        sched_sol = args[-1]
+        sched_sol['journey'][0] = "retrieve"
+        sched_sol['prep time_retrieve'] = 1.
+        return sched_sol
+    
+    def mock_sched_replace(*args):
+        sched_sol = args[-1]
+        sched_sol['journey'][0] = "replace"
+        sched_sol['prep time_replace'] = 2.
+        sched_sol['prep time'] = 3.
+        sched_sol['sea time'] = 4.
+        sched_sol['total time'] = 7.
+        return sched_sol
+    
+    monkeypatch.setattr(schedule_om, "sched_retrieve", mock_sched_retrieve)
+    monkeypatch.setattr(schedule_om, "sched_replace", mock_sched_replace)
+    
+    operation = mocker.Mock()
+    operation.sol = {0: {'VEs': [["Vessel", 1, {"Name": "vessel a"}]]}}
+    operation.op_seq_sea = {}
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    log_phase.op_ve = {0: operation}
+    
+    om = pd.DataFrame({'element_ID [-]': ["a"],
+                       'd_om [hour]': [5.]})
+    
+    test = SchedOM()
+    plan = test.get_plans(log_phase,
+                          "LpM6",
+                          None,
+                          None,
+                          None,
+                          None,
+                          None,
+                          om)[(0, 0)]
+    
+    assert plan['type'] == 'base'
+    assert plan['retrieve journey'][0] == "retrieve"
+    assert plan['schedule']['journey'][0] == "replace"
+    
+    waiting_time = MockWaitingTime()
+    result = test.schedule_plan(plan, [datetime(2000, 1, 1)], waiting_time)
+    
+    # The retrieve journeys start after the retrieve preparation and the
+    # replace journeys after the retrieve delay and wait, the maintenance
+    # and the replace preparation
+    assert waiting_time.calls == [[datetime(2000, 1, 1, 1)],
+                                  [datetime(2000, 1, 1, 11)]]
+    
+    sched_sol = result[0]
+    depart_dt = sched_sol['weather windows depart_dt']
+    
+    assert sched_sol['total time'] == [2., 1., 2., 1.]
+    assert sched_sol['weather windows end_dt'] == datetime(2000, 1, 1, 14)
+    assert depart_dt['weather windows depart_dt_retrieve'] == \
+                                                    datetime(2000, 1, 1, 3)
+    assert depart_dt['weather windows depart_dt_replace'] == \
+                                                    datetime(2000, 1, 1, 13)
+
+
+def test_SchedOM_schedule_events_base_legs(mocker, monkeypatch):
+    
+    calls = []
+    
+    def mock_sched_retrieve(*args):
+        calls.append("retrieve")
+        sched_sol = args[-1]
+        sched_sol['journey'][0] = "retrieve"
+        sched_sol['prep time_retrieve'] = 1.
+        return sched_sol
+    
+    def mock_sched_replace(*args):
+        calls.append("replace")
+        sched_sol = args[-1]
+        sched_sol['journey'][0] = "replace"
+        sched_sol['prep time_replace'] = 2.
+        sched_sol['prep time'] = 3.
+        sched_sol['sea time'] = 4.
+        sched_sol['total time'] = 7.
+        return sched_sol
+    
+    monkeypatch.setattr(schedule_om, "sched_retrieve", mock_sched_retrieve)
+    monkeypatch.setattr(schedule_om, "sched_replace", mock_sched_replace)
+    
+    operation = mocker.Mock()
+    operation.sol = {0: {'VEs': [["Vessel", 1, {"Name": "vessel a"}]]}}
+    operation.op_seq_sea = {}
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    log_phase.op_ve = {0: operation}
+    
+    # The events only differ by the repair duration
+    events = pd.DataFrame({'event [-]': [0, 1],
+                           'log phase [-]': ["LpM6"] * 2,
+                           'element_ID [-]': ["a", "a"],
+                           'd_om [hour]': [5., 10.],
+                           't_start [-]': [datetime(2000, 1, 1)] * 2})
+    
+    waiting_time = MockWaitingTime()
+    
+    test = SchedOM()
+    result = test.schedule_events({"LpM6": log_phase},
+                                  None,
+                                  None,
+                                  None,
+                                  None,
+                                  None,
+                                  None,
+                                  events,
+                                  custom_waiting=waiting_time)
+    
+    # The repair duration is part of the leg key, but the retrieve leg is
+    # only evaluated once
+    assert calls == ["retrieve", "replace"] * 2
+    assert waiting_time.calls == [[datetime(2000, 1, 1, 1)],
+                                  [datetime(2000, 1, 1, 11)],
+                                  [datetime(2000, 1, 1, 16)]]
+    assert result['weather windows end_dt'].tolist() == \
+                        [datetime(2000, 1, 1, 14), datetime(2000, 1, 1, 19)]
+
+
+def test_SchedOM_get_plans_bad_phase(mocker):
+    
+    test = SchedOM()
+    
+    with pytest.raises(ValueError):
+        test.get_plans(mocker.Mock(),
+                       "LpM9",
+                       None,
+                       None,
+                       None,
+                       None,
+                       None,
+                       None)
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2021 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+# pragma pylint: disable=no-name-in-module
+
+import sys
+from datetime import datetime
+
+import pytest
+import numpy as np
+import pandas as pd
+
+from dtocean_logistics.performance.schedule import schedule_om
+from dtocean_logistics.performance.schedule.schedule_om import SchedOM
+from dtocean_logistics.performance.schedule.schedule_om_parallel import (
+                                                            ParallelSchedOM,
+                                                            SharedFrame)
+
+
+class Operation(object):
+
+    def __init__(self, sol):
+        self.sol = sol
+
+
+class LogPhase(object):
+
+    def __init__(self, op_ve):
+        self.description = "Test phase"
+        self.op_ve = op_ve
+
+
+class MockWaitingTime(object):
+
+    def set_optimise_delay(self, value):
+        pass
+
+    def get_start_delays(self, log_phase, sched_sol, start_dates):
+
+        results = []
+
+        for start_date in start_dates:
+
+            if start_date.day == 4:
+                results.append(([], 'NoWWindows'))
+            else:
+                results.append(({'start_delay': [float(start_date.day)],
+                                 'wait_dur': [1.]}, 'WeatherWindowsFound'))
+
+        return results
+
+
+def mock_sched_site(*args):
+
+    om = args[7]
+    sched_sol = args[-1]
+    sched_sol['prep time'] = 10.
+    sched_sol['sea time'] = float(len(om))
+    sched_sol['total time'] = [10., float(len(om))]
+
+    return sched_sol
+
+
+@pytest.fixture
+def events():
+
+    events = pd.DataFrame({'event [-]': [5, 1, 1, 2, 3, 0, 4],
+                           'log phase [-]': ["LpM1"] * 7,
+                           'element_ID [-]': ["a", "a", "b", "c", "a", "c",
+                                              "a"],
+                           'x coord [m]': [1., 1., 2., 2., 1., 2., 1.],
+                           'y coord [m]': [3., 3., 4., 4., 3., 4., 3.],
+                           't_start [-]': [datetime(2000, 1, 1),
+                                           datetime(2000, 1, 2),
+                                           datetime(2000, 1, 2),
+                                           datetime(2000, 1, 3),
+                                           datetime(2000, 1, 4),
+                                           datetime(2000, 1, 5),
+                                           datetime(2000, 1, 6)]})
+
+    return events
+
+
+@pytest.fixture
+def log_phases():
+
+    operation = Operation({0: {'VEs': [["Vessel", 1, {"Name": "a"}]]},
+                           1: {'VEs': [["Vessel", 1, {"Name": "b"}]]}})
+
+    return {"LpM1": LogPhase({0: operation})}
+
+
+def test_SharedFrame(tmpdir):
+
+    df = pd.DataFrame({'a': [1, 2, 3],
+                       'b': [1., 2., 3.],
+                       'c': ["x", "y", "z"],
+                       'd': [4, 5, 6],
+                       'e': pd.date_range("2000-01-01", periods=3)},
+                      index=[10, 20, 30])
+    df = df[['c', 'a', 'b', 'e', 'd']]
+
+    shared = SharedFrame.publish(df, str(tmpdir), "test")
+    test = shared.attach()
+
+    pd.testing.assert_frame_equal(test, df)
+
+    # The numeric columns are memory mapped and read only
+    assert not test['a'].values.flags.writeable
+    assert isinstance(test['b'].values.base, np.memmap)
+
+
+def test_ParallelSchedOM_get_tasks(events, log_phases):
+
+    test = ParallelSchedOM(log_phases, None, None, None, None, None, None,
+                           processes=1)
+    tasks = test.get_tasks(events)
+
+    # Events 5, 3 and 4 share elements so are scheduled by the same task
+    assert [task['event [-]'].unique().tolist() for task in tasks] == \
+                                                [[5, 3, 4], [2, 0], [1]]
+
+
+@pytest.mark.parametrize("processes", [
+    1,
+    pytest.param(2, marks=pytest.mark.skipif(
+                            sys.platform == "win32",
+                            reason="Mocks are only inherited by forking"))])
+def test_ParallelSchedOM_schedule_events(monkeypatch,
+                                         events,
+                                         log_phases,
+                                         processes):
+
+    monkeypatch.setattr(schedule_om, "sched_site", mock_sched_site)
+
+    waiting_time = MockWaitingTime()
+    expected = SchedOM().schedule_events(log_phases,
+                                         None,
+                                         None,
+                                         None,
+                                         None,
+                                         None,
+                                         None,
+                                         events,
+                                         custom_waiting=waiting_time)
+
+    with ParallelSchedOM(log_phases,
+                         None,
+                         None,
+                         None,
+                         None,
+                         None,
+                         None,
+                         custom_waiting=waiting_time,
+                         processes=processes) as executor:
+
+        result = executor.schedule_events(events)
+        empty = executor.schedule_events(events.iloc[:0])
+
+    assert result['event [-]'].tolist() == [5, 5, 1, 1, 2, 2, 0, 0, 4, 4]
+    pd.testing.assert_frame_equal(result.drop('schedule', axis=1),
+                                  expected.drop('schedule', axis=1))
+    assert empty.empty
+
+
+def test_ParallelSchedOM_not_started(events, log_phases):
+
+    test = ParallelSchedOM(log_phases, None, None, None, None, None, None,
+                           processes=1)
+
+    with pytest.raises(RuntimeError):
+        test.schedule_events(events)
@@ -26,8 +26,11 @@ import pytest
 import numpy as np
 import pandas as pd
 
+from dtocean_logistics.performance import instrumentation
 from dtocean_logistics.performance.schedule.schedule_shared import (
                                                         WaitingTime,
+                                                        get_year_totals,
+                                                        get_weather_percentiles,
                                                         get_window_indexes,
                                                         get_groups,
                                                         trim_weather_windows,
@@ -337,6 +340,24 @@ def test_WaitingTime_set_optimise_delay(metocean):
     assert test._optimise_delay
 
 
+def test_WaitingTime_from_prepared(metocean_synth):
+
+    original = WaitingTime(metocean_synth, max_start_delay=100)
+    metocean, kwargs = original.get_prepared()
+
+    test = WaitingTime.from_prepared(metocean, **kwargs)
+
+    olc = {'maxHs': 0.5,
+           'maxTp': 0.5,
+           'maxWs': 0.5,
+           'maxCs': 0.5}
+
+    assert test.metocean is original.metocean
+    assert test._max_start_delay == 100
+    assert test.get_weather_windows(dict(olc)) == \
+                                    original.get_weather_windows(dict(olc))
+
+
 def test_WaitingTime_get_weather_windows_basic(metocean_synth):
     
     test = WaitingTime(metocean_synth)
@@ -845,6 +866,395 @@ def test_WaitingTime_call_no_windows(mocker, metocean):
     assert not journey
 
 
+def test_WaitingTime_whole_window_delays(metocean_synth):
+    
+    test = WaitingTime(metocean_synth)
+    
+    olc = {'maxHs': 0.5,
+           'maxTp': 0.5,
+           'maxWs': 0.5,
+           'maxCs': 0.5}
+    
+    windows = test.get_weather_windows(olc)
+    start_dates = [dt.datetime(2000, 1, 1),
+                   dt.datetime(2000, 1, 1, 5),
+                   dt.datetime(2000, 2, 29, 20)]
+    
+    result = test._whole_window_delays(windows, start_dates, 10)
+    
+    for start_date, start_delay in zip(start_dates, result):
+        expected, _ = test._whole_window_strategy(windows, start_date, 10)
+        assert start_delay == expected
+
+
+def test_WaitingTime_get_start_delays(mocker, metocean):
+    
+    test = WaitingTime(metocean)
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    journey = {'prep_dur': [48, 48],
+               'prep_id': [u'Mobilisation', u'Vessel preparation & loading'],
+               'sea_dur': [35.52257567817756,
+                           6.0,
+                           2,
+                           4,
+                           0.0,
+                           35.52257567817756],
+               'sea_id': [u'Transportation from port to site',
+                          u'Vessel Positioning',
+                          u'Access to the element',
+                          u'Inspection or Maintenance Operations',
+                          u'Transportation from site to site',
+                          u'Transportation from site to port'],
+               'sea_olc': [[2.5, 0.0, 0.0, 0.0],
+                           [2.5, 0, 0, 0],
+                           [4, 6, 15, 2],
+                           [4, 6, 15, 2],
+                           [2.5, 0.0, 0.0, 0.0],
+                           [2.5, 0.0, 0.0, 0.0]],
+               'wait_dur': []}
+    
+    sched_sol = {"journey": {0: journey}}
+    start_dates = [dt.datetime(2000, 1, 1),
+                   dt.datetime(2000, 6, 15, 12),
+                   dt.datetime(2000, 12, 31, 23)]
+    
+    result = test.get_start_delays(log_phase, sched_sol, start_dates)
+    
+    assert len(result) == len(start_dates)
+    
+    for start_date, date_result in zip(start_dates, result):
+        assert date_result == test(log_phase, sched_sol, start_date)
+
+
+def test_WaitingTime_get_start_delays_years(mocker, metocean):
+    
+    test = WaitingTime(metocean, percentiles=[10, 50, 90])
+    expected = WaitingTime(metocean)
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    journey = {'sea_dur': [35.52257567817756, 6.0, 2, 4],
+               'sea_id': [u'Transportation from port to site',
+                          u'Vessel Positioning',
+                          u'Access to the element',
+                          u'Inspection or Maintenance Operations'],
+               'sea_olc': [[2.5, 0.0, 0.0, 0.0],
+                           [2.5, 0, 0, 0],
+                           [4, 6, 15, 2],
+                           [4, 6, 15, 2]],
+               'wait_dur': []}
+    
+    sched_sol = {"journey": {0: journey, 1: journey}}
+    start_dates = [dt.datetime(2000, 1, 1),
+                   dt.datetime(2000, 6, 15, 12)]
+    
+    result = test.get_start_delays(log_phase, sched_sol, start_dates)
+    means = expected.get_start_delays(log_phase, sched_sol, start_dates)
+    
+    n_years = len(test._unique_years)
+    
+    for (journey, flag), (expected_journey, _) in zip(result, means):
+        
+        assert flag == 'WeatherWindowsFound'
+        assert len(journey['year_start_delay']) == 2
+        assert len(journey['year_wait_dur']) == len(journey['wait_dur'])
+        
+        for year_delays, start_delay in zip(journey['year_start_delay'],
+                                            journey['start_delay']):
+            assert len(year_delays) == n_years
+            assert np.isclose(np.mean(year_delays), start_delay)
+        
+        assert journey['start_delay'] == expected_journey['start_delay']
+        assert journey['wait_dur'] == expected_journey['wait_dur']
+        assert 'year_start_delay' not in expected_journey
+        
+        year_delay, year_waiting = get_year_totals(journey)
+        
+        assert len(year_delay) == n_years
+        assert np.isclose(year_delay.mean(), np.mean(journey['start_delay']))
+        assert np.isclose(year_waiting.sum(),
+                          n_years * sum(journey['wait_dur']))
+    
+    assert get_year_totals(means[0][0]) is None
+
+
+@pytest.fixture
+def sequential_journeys():
+    
+    def get_journey(max_hs, sea_dur):
+        
+        journey = {'sea_dur': [sea_dur],
+                   'sea_id': [u'Inspection or Maintenance Operations'],
+                   'sea_olc': [[max_hs, 0., 0., 0.]],
+                   'wait_dur': []}
+        
+        return journey
+    
+    journeys = {0: get_journey(2., 20.),
+                1: get_journey(1.5, 30.),
+                2: get_journey(2.5, 10.)}
+    
+    return journeys
+
+
+def test_WaitingTime_sequential_single(mocker,
+                                       metocean,
+                                       sequential_journeys):
+    
+    test = WaitingTime(metocean, sequential=True)
+    expected = WaitingTime(metocean)
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    sched_sol = {"journey": {0: sequential_journeys[0]}}
+    start_dates = [dt.datetime(2000, 1, 5, 6),
+                   dt.datetime(2000, 6, 5, 6)]
+    
+    result = test.get_start_delays(log_phase, sched_sol, start_dates)
+    means = expected.get_start_delays(log_phase, sched_sol, start_dates)
+    
+    for (journey, flag), (expected_journey, expected_flag) in zip(result,
+                                                                  means):
+        
+        assert flag == expected_flag
+        assert journey['start_delay'] == expected_journey['start_delay']
+        assert journey['journey_delay'] == journey['start_delay']
+
+
+def test_WaitingTime_sequential(mocker, metocean, sequential_journeys):
+    
+    test = WaitingTime(metocean, sequential=True, percentiles=[50])
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    sched_sol = {"journey": sequential_journeys}
+    start_dates = [dt.datetime(2000, 1, 5, 6),
+                   dt.datetime(2000, 6, 5, 6)]
+    
+    result = test.get_start_delays(log_phase, sched_sol, start_dates)
+    
+    for journey, flag in result:
+        
+        assert flag == 'WeatherWindowsFound'
+        assert len(journey['start_delay']) == 1
+        assert len(journey['journey_delay']) == 3
+        assert np.isclose(journey['start_delay'][0],
+                          sum(journey['journey_delay']))
+        assert np.isclose(np.mean(journey['year_start_delay'][0]),
+                          journey['start_delay'][0])
+    
+    # In each year, the second journey starts when the first journey ends
+    sched_sol = {"journey": {0: sequential_journeys[0],
+                             1: sequential_journeys[1]}}
+    start_date = dt.datetime(2000, 1, 5, 6)
+    
+    result = test.get_start_delays(log_phase, sched_sol, [start_date])
+    year_delays = result[0][0]['year_start_delay'][0]
+    
+    prepared, kwargs = WaitingTime(metocean).get_prepared()
+    
+    for year, year_delay in zip(test._unique_years, year_delays):
+        
+        year_test = WaitingTime.from_prepared(prepared, **kwargs)
+        year_test._unique_years = [year]
+        
+        first, _ = year_test(log_phase,
+                             {"journey": {0: sequential_journeys[0]}},
+                             dt.datetime(year, 1, 5, 6))
+        
+        end_date = dt.datetime(year, 1, 5, 6) + dt.timedelta(
+                        hours=first['start_delay'][0] + 20. +
+                                                    sum(first['wait_dur']))
+        second, _ = year_test(log_phase,
+                              {"journey": {0: sequential_journeys[1]}},
+                              end_date)
+        
+        assert np.isclose(year_delay,
+                          first['start_delay'][0] + second['start_delay'][0])
+
+
+def test_WaitingTime_get_start_delays_duplicates(mocker,
+                                                 metocean,
+                                                 sequential_journeys):
+    
+    test = WaitingTime(metocean, percentiles=[50])
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    # The same limits, given with NaN and negative values
+    duplicate = {'sea_dur': [5., 15.],
+                 'sea_id': [u'Access to the element',
+                            u'Inspection or Maintenance Operations'],
+                 'sea_olc': [[2., np.nan, -1., 0.],
+                             [3., 0., 0., 0.]],
+                 'wait_dur': []}
+    
+    journeys = [sequential_journeys[0],
+                sequential_journeys[1],
+                duplicate,
+                sequential_journeys[0]]
+    
+    sched_sol = {"journey": dict(enumerate(journeys))}
+    start_dates = [dt.datetime(2000, 1, 5, 6),
+                   dt.datetime(2000, 6, 5, 6)]
+    
+    result = test.get_start_delays(log_phase, sched_sol, start_dates)
+    
+    # Only two unique journeys are evaluated for each date
+    assert test.get_cache_stats()['size'] == 4
+    
+    for i, journey in enumerate(journeys):
+        
+        expected = WaitingTime(metocean).get_start_delays(
+                                                    log_phase,
+                                                    {"journey": {0: journey}},
+                                                    start_dates)
+        
+        for (date_result, _), (expected_result, _) in zip(result, expected):
+            assert date_result['start_delay'][i] == \
+                                            expected_result['start_delay'][0]
+
+
+@pytest.mark.parametrize("sequential", [False, True])
+def test_WaitingTime_get_start_delays_hooks(mocker,
+                                            metocean,
+                                            sequential_journeys,
+                                            sequential):
+    
+    test = WaitingTime(metocean, sequential=sequential)
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    journeys = [sequential_journeys[0],
+                sequential_journeys[1],
+                sequential_journeys[0]]
+    
+    sched_sol = {"journey": dict(enumerate(journeys))}
+    start_dates = [dt.datetime(2000, 1, 5, 6)]
+    events = []
+    
+    instrumentation.add_hook(events.append)
+    
+    try:
+        with instrumentation.profile("weather", 1, 2, "phase"):
+            test.get_start_delays(log_phase, sched_sol, start_dates)
+    finally:
+        instrumentation.remove_hook(events.append)
+    
+    journey_events = events[:-1]
+    
+    assert [event.journey for event in journey_events] == [0, 1, 2]
+    assert journey_events[0].olc[0] == 2.
+    assert journey_events[1].olc[0] == 1.5
+    assert journey_events[0].n_windows > 0
+    
+    for event in journey_events:
+        assert event.stage == "journey"
+        assert (event.phase, event.seq, event.ind_sol) == ("phase", 1, 2)
+        assert event.strategy in ["whole", "combined", "reused"]
+    
+    if not sequential: assert journey_events[2].strategy == "reused"
+    
+    assert events[-1].stage == "weather"
+    assert events[-1].journey is None
+
+
+def test_WaitingTime_get_start_delays_memoised(mocker,
+                                               metocean,
+                                               sequential_journeys):
+    
+    test = WaitingTime(metocean)
+    
+    log_phase = mocker.Mock()
+    log_phase.description = "Mocked phase"
+    
+    sched_sol = {"journey": sequential_journeys}
+    start_dates = [dt.datetime(2000, 1, 5, 6),
+                   dt.datetime(2000, 6, 5, 6)]
+    
+    result = test.get_start_delays(log_phase, sched_sol, start_dates)
+    stats = test.get_cache_stats()
+    
+    assert stats['misses'] == 6
+    assert stats['hits'] == 0
+    
+    mocker.patch.object(test,
+                        '_whole_window_year_delays',
+                        side_effect=AssertionError)
+    
+    assert test.get_start_delays(log_phase, sched_sol, start_dates) == result
+    assert test.get_cache_stats()['hits'] == 6
+
+
+def test_WaitingTime_get_percentiles(metocean):
+    
+    test = WaitingTime(metocean, percentiles=[0, 50, 100])
+    year_values = {'a': [3., 1., 2.],
+                   'b': [10., 20., 60.]}
+    
+    result = test.get_percentiles(year_values)
+    
+    assert result['percentiles'] == [0., 50., 100.]
+    assert np.isclose(result['a'], [1., 2., 3.]).all()
+    assert np.isclose(result['b'], [10., 20., 60.]).all()
+    assert 'bootstrap std' not in result
+
+
+def test_WaitingTime_get_percentiles_bootstrap(metocean):
+    
+    test = WaitingTime(metocean,
+                       percentiles=[50, 90],
+                       n_bootstrap=100,
+                       bootstrap_seed=2)
+    year_values = {'a': [3., 1., 2., 8., 4.]}
+    
+    result = test.get_percentiles(year_values)
+    repeat = test.get_percentiles(year_values)
+    
+    assert np.isclose(result['a'], repeat['a']).all()
+    assert (result['a'] >= 1.).all() and (result['a'] <= 8.).all()
+    assert (result['bootstrap std']['a'] > 0).all()
+
+
+def test_WaitingTime_get_percentiles_not_set(metocean):
+    
+    test = WaitingTime(metocean)
+    
+    with pytest.raises(RuntimeError):
+        test.get_percentiles({'a': [1., 2.]})
+
+
+def test_WaitingTime_bad_percentiles(metocean):
+    
+    with pytest.raises(ValueError):
+        WaitingTime(metocean, percentiles=[50, 101])
+
+
+def test_get_weather_percentiles(metocean):
+    
+    test = WaitingTime(metocean, percentiles=[0, 100])
+    start_dt = dt.datetime(2000, 1, 1)
+    
+    result = get_weather_percentiles(test,
+                                     start_dt,
+                                     np.array([1., 5.]),
+                                     np.array([2., 4.]),
+                                     10.)
+    
+    assert np.isclose(result['start delay'], [1., 5.]).all()
+    assert np.isclose(result['waiting time'], [2., 4.]).all()
+    assert result['end_dt'] == [dt.datetime(2000, 1, 1, 13),
+                                dt.datetime(2000, 1, 1, 19)]
+
+
 def test_get_window_indexes():
     
     wdx = np.array([1.,  1.,  1.,  1.,  1.,  1.,  1.,  1.,  1.,  1.,  1.,  1.,
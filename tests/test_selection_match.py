@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import pandas as pd
+
+from dtocean_logistics.selection.match import copy_solution
+
+
+@pytest.fixture
+def vessel_panda():
+    
+    data = {'Name': ['A', 'B', 'C'],
+            'Transit speed [m/s]': [5., 6., 7.]}
+    
+    return pd.DataFrame(data, index=[10, 20, 30])
+
+
+def test_copy_solution(vessel_panda):
+    
+    row = vessel_panda.ix[10]
+    sol = {'VEs': [['CTV', 1, row, ['rov', 1, row, 0]]],
+           'schedule': {'prep time': [1.]}}
+    
+    new_sol = copy_solution(sol)
+    
+    assert new_sol['VEs'][0][2] is row
+    assert new_sol['VEs'][0][3][2] is row
+    assert new_sol['VEs'] is not sol['VEs']
+    assert new_sol['schedule'] is not sol['schedule']
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+import pandas as pd
+
+from dtocean_logistics.phases import VesselType
+from dtocean_logistics.phases.om.classes import DefPhase, LogPhase
+from dtocean_logistics.selection import om_cache
+from dtocean_logistics.selection.om_cache import (OMMatchCache,
+                                                  copy_matched_phase,
+                                                  get_ve_version)
+
+
+@pytest.fixture
+def vessels():
+    
+    ctv = pd.DataFrame({"Name": ["ctv a", "ctv b"],
+                        "Deck space [m^2]": [10., 20.]})
+    
+    return {"CTV": VesselType("CTV", ctv)}
+
+
+@pytest.fixture
+def mock_match(monkeypatch):
+    
+    calls = []
+    
+    def mock_logPhase_om_init(log_phase_id, log_op, vessels, equipments, om):
+        
+        calls.append(log_phase_id)
+        
+        log_phase = LogPhase(920, "Mocked phase")
+        log_phase.op_ve[0] = DefPhase(0, "Mocked sequence")
+        
+        ctv = vessels["CTV"]
+        log_phase.op_ve[0].ve_combination[0] = {'vessel': [(1, ctv)],
+                                                'equipment': []}
+        
+        return log_phase
+    
+    def mock_feas_om(*args):
+        return ({}, {}, {}, {}, {}, {})
+    
+    def mock_select(install, log_phase):
+        return {}, log_phase
+    
+    def mock_compatibility_ve(install, log_phase, port_chosen_data):
+        
+        ctv = log_phase.op_ve[0].ve_combination[0]['vessel'][0][1]
+        log_phase.op_ve[0].sol = {
+                0: {'port': port_chosen_data,
+                    'VEs': [["CTV", 1, ctv.panda.ix[0]]]}}
+        
+        return [log_phase.op_ve[0].sol], log_phase, 'SolutionsFound'
+    
+    monkeypatch.setattr(om_cache, "logPhase_om_init", mock_logPhase_om_init)
+    monkeypatch.setattr(om_cache, "feas_om", mock_feas_om)
+    monkeypatch.setattr(om_cache, "select_e", mock_select)
+    monkeypatch.setattr(om_cache, "select_v", mock_select)
+    monkeypatch.setattr(om_cache, "compatibility_ve", mock_compatibility_ve)
+    
+    return calls
+
+
+def get_om(mass):
+    
+    om = pd.DataFrame({'ID [-]': ["Insp1"],
+                       'element_ID [-]': ["device001"],
+                       'sp_dry_mass [kg]': [mass],
+                       't_start [-]': ["01:01:2000 00:00:00"]})
+    
+    return om
+
+
+def test_get_ve_version(vessels):
+    
+    first = get_ve_version(vessels, {})
+    
+    assert get_ve_version(vessels, {}) == first
+    
+    vessels["CTV"].panda.loc[0, "Deck space [m^2]"] = 5.
+    
+    assert get_ve_version(vessels, {}) != first
+
+
+def test_copy_matched_phase():
+    
+    log_phase = LogPhase(920, "Mocked phase")
+    log_phase.op_ve[0] = DefPhase(0, "Mocked sequence")
+    log_phase.op_ve[0].sol = {0: {'VEs': [["CTV", 1, pd.Series([1])]]}}
+    
+    test = copy_matched_phase(log_phase)
+    test.op_ve[0].sol[0]['schedule'] = {}
+    test.op_ve[0].sol = {}
+    
+    assert 'schedule' not in log_phase.op_ve[0].sol[0]
+    assert log_phase.op_ve[0].sol
+    assert test.op_ve[0].description == "Mocked sequence"
+
+
+def test_OMMatchCache(vessels, mock_match):
+    
+    port = pd.Series({"Name [-]": "port a"}, name=1)
+    test = OMMatchCache(None, vessels, {}, None, None, None, None, None, None)
+    
+    install, log_phase, flag = test("LpM1", get_om(100.), port)
+    
+    assert flag == 'SolutionsFound'
+    assert install['combi_select'][0] is log_phase.op_ve[0].sol
+    
+    # Modifying the result must not change the cache
+    log_phase.op_ve[0].sol[0]['schedule'] = {}
+    
+    install, log_phase, flag = test("LpM1", get_om(100.), port)
+    
+    assert len(mock_match) == 1
+    assert 'schedule' not in log_phase.op_ve[0].sol[0]
+    
+    # Selection must not modify the given vessel types
+    assert log_phase.op_ve[0].ve_combination[0]['vessel'][0][1] is not \
+                                                            vessels["CTV"]
+    
+    test("LpM1", get_om(200.), port)
+    test("LpM2", get_om(100.), port)
+    test("LpM1", get_om(100.), pd.Series({"Name [-]": "port b"}, name=2))
+    
+    assert len(mock_match) == 4
+    
+    # New vessel types change the key
+    test.set_ve_types(vessels, {"rov": VesselType("rov", pd.DataFrame())})
+    test("LpM1", get_om(100.), port)
+    
+    assert len(mock_match) == 5
+    assert test.get_stats() == {'hits': 1,
+                                'misses': 5,
+                                'evictions': 0,
+                                'size': 5}
+
+
+def test_OMMatchCache_max_size(vessels, mock_match):
+    
+    port = pd.Series({"Name [-]": "port a"}, name=1)
+    test = OMMatchCache(None,
+                        vessels,
+                        {},
+                        None,
+                        None,
+                        None,
+                        None,
+                        None,
+                        None,
+                        max_size=2)
+    
+    for mass in [100., 200., 300., 100.]:
+        test("LpM1", get_om(mass), port)
+    
+    stats = test.get_stats()
+    
+    assert len(mock_match) == 4
+    assert stats['evictions'] == 2
+    assert stats['size'] == 2
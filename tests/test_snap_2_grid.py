@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from dtocean_logistics.load.snap_2_grid import SnapToGrid, SitePoints
+
+
+def test_SitePoints_snap(site):
+    
+    snap_to_grid = SnapToGrid(site)
+    site_points = SitePoints(site)
+    
+    point = (site['x coord [m]'].iloc[3] + 1.,
+             site['y coord [m]'].iloc[3] - 1.)
+    
+    assert site_points.snap(point) == snap_to_grid(point)
+    assert site_points.snap(point) is site_points.snap(point)
+
+
+def test_SitePoints_get_value(site):
+    
+    site_points = SitePoints(site)
+    
+    x = site['x coord [m]'].iloc[5]
+    y = site['y coord [m]'].iloc[5]
+    zone = site['zone [-]'].iloc[5]
+    
+    site_depth = site[(site['x coord [m]'] == x) &
+                      (site['y coord [m]'] == y) &
+                      (site['zone [-]'] == zone)]
+    expected = site_depth['bathymetry [m]'].iloc[0]
+    
+    assert site_points.get_value(x, y, zone, 'bathymetry [m]') == expected
+
+
+def test_SitePoints_get_value_missing(site):
+    
+    site_points = SitePoints(site)
+    
+    with pytest.raises(IndexError):
+        site_points.get_value(-1., -1., "0 A", 'bathymetry [m]')
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import datetime as dt
+
+import pandas as pd
+import pandas.util.testing as pdt
+
+import pytest
+
+from dtocean_logistics.performance.optim_sol import opt_sol
+from dtocean_logistics.outputs.solution_table import (SOLUTION_COLUMNS,
+                                                      get_solution_table,
+                                                      read_solution_table,
+                                                      write_solution_table)
+
+
+class MockOperation(object):
+
+    def __init__(self, description, total_costs):
+
+        self.description = description
+        self.sol = {}
+        self.sol_cost = {}
+
+        vessel = pd.Series({'Name [-]': 'vessel'}, name=37)
+        equipment = pd.Series({'Name [-]': 'rov'}, name=2)
+        start = dt.datetime(2020, 1, 1)
+
+        for ind_sol, total_cost in enumerate(total_costs):
+
+            schedule = {'prep time': 10.,
+                        'sea time': 20. + ind_sol,
+                        'transit time': 5.,
+                        'waiting time': [1., 2.],
+                        'global': {'nb of journeys': 2,
+                                   'nb of elements per journey': [1, 1]},
+                        'weather windows start_dt': start,
+                        'weather windows depart_dt': start,
+                        'weather windows end_dt': start}
+
+            self.sol[ind_sol] = {'VEs': [['CLV', 1, vessel,
+                                          ['rov', 1, equipment]],
+                                         ['Tugboat', 2, vessel]],
+                                 'schedule': schedule}
+            self.sol_cost[ind_sol] = {'vessel cost': total_cost / 2.,
+                                      'equipment cost': total_cost / 4.,
+                                      'port cost': total_cost / 4.,
+                                      'fuel cost': 0.,
+                                      'total cost': total_cost}
+
+
+class MockLogPhase(object):
+
+    def __init__(self):
+        self.op_ve = {0: MockOperation("first", [3., 2.]),
+                      1: MockOperation("second", [4., 1., 2.])}
+
+
+@pytest.fixture
+def log_phase():
+    return MockLogPhase()
+
+
+def test_get_solution_table(log_phase):
+
+    table = get_solution_table(log_phase, 'Devices')
+
+    assert list(table.columns) == SOLUTION_COLUMNS
+    assert len(table) == 5
+    assert list(table["rank"]) == [4, 2, 5, 1, 3]
+    assert (table["vessel types"] == "CLV|Tugboat").all()
+    assert (table["vessel ids"] == "37|37").all()
+    assert (table["vessel quantities"] == "1|2").all()
+    assert (table["equipment types"] == "rov").all()
+    assert (table["waiting time [h]"] == 3.).all()
+    assert (table["nb of journeys"] == 2).all()
+    assert list(table["total time [h]"]) == [33., 34., 33., 34., 35.]
+
+
+def test_get_solution_table_optimal(log_phase):
+
+    table = get_solution_table(log_phase, 'Devices')
+    optimal = opt_sol(log_phase, 'Devices')
+    best = table[table["rank"] == 1].iloc[0]
+
+    assert best["total cost [EUR]"] == optimal['total cost']
+    assert best["strategy"] == optimal['strategy']
+    assert best["total time [h]"] == optimal['schedule total time']
+
+
+def test_write_read_solution_table(tmpdir, log_phase):
+
+    table = get_solution_table(log_phase, 'Devices')
+
+    file_path = str(tmpdir.join("Devices.npz"))
+    write_solution_table(table, file_path)
+    result = read_solution_table(file_path)
+
+    pdt.assert_frame_equal(result, table)
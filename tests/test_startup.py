@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from dtocean_logistics.performance.startup import (CORE_MODULES,
+                                                   main,
+                                                   measure_import)
+
+
+@pytest.mark.parametrize("module_name", CORE_MODULES + [
+                            "dtocean_logistics.phases.select_port",
+                            "dtocean_logistics.outputs.output_plotting2"])
+def test_measure_import_lazy(module_name):
+
+    result = measure_import(module_name, repeat=1)
+
+    assert len(result["total"]) == 1
+    assert result["package"][0] <= result["total"][0]
+    assert result["loaded"] == []
+
+
+def test_main(capsys):
+
+    assert main(["dtocean_logistics.ancillaries", "-r", "1"]) == 0
+
+    out, _ = capsys.readouterr()
+
+    assert "dtocean_logistics.ancillaries" in out
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright (C) 2018 Mathew Topper
+#
+#    This program is free software: you can redistribute it and/or modify
+#    it under the terms of the GNU General Public License as published by
+#    the Free Software Foundation, either version 3 of the License, or
+#    (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU General Public License for more details.
+#
+#    You should have received a copy of the GNU General Public License
+#    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import pickle
+
+import utm
+import numpy as np
+import pandas as pd
+import networkx as nx
+
+import pytest
+
+from dtocean_logistics.ancillaries import great_circle_distance
+from dtocean_logistics.phases.port_index import PortIndex
+from dtocean_logistics.phases.transit_algorithm import (SeaRouter,
+                                                        get_sea_router,
+                                                        transit_algorithm)
+
+
+def to_utm(lat, lon):
+    x, y, number, letter = utm.from_latlon(lat, lon)
+    return [x, y, "{} {}".format(number, letter)]
+
+
+@pytest.fixture(scope="module")
+def sea_files(tmpdir_factory):
+
+    lats = np.arange(50., 52.01, 0.1)
+    lons = np.arange(-6., -2.99, 0.125)
+
+    lat, lon = [x.ravel() for x in np.meshgrid(lats, lons, indexing='ij')]
+    ids = np.arange(len(lat)).reshape(len(lats), len(lons))
+
+    # A block of land in the middle of the grid
+    land = (lat > 50.65) & (lat < 51.75) & (lon > -4.8) & (lon < -4.2)
+
+    graph = nx.Graph()
+
+    for i in xrange(len(lats)):
+        for j in xrange(len(lons)):
+
+            for k, l in [(i + 1, j), (i, j + 1)]:
+
+                if k == len(lats) or l == len(lons): continue
+
+                start, end = ids[i, j], ids[k, l]
+                if land[start] or land[end]: continue
+
+                weight = great_circle_distance(lat[start],
+                                               lon[start],
+                                               lat[end],
+                                               lon[end])
+                graph.add_edge(start, end, weight=weight)
+
+    tmp = tmpdir_factory.mktemp("sea")
+    point_path = tmp.join("points.csv")
+    graph_path = tmp.join("graph.p")
+
+    rows = ["0\t0\t{:.0f}\t{:.0f}".format(x * 1e15, y * 1e15)
+                                                    for x, y in zip(lat, lon)]
+    point_path.write("\n".join(rows) + "\n")
+
+    with open(str(graph_path), "wb") as graph_file:
+        pickle.dump(graph, graph_file, 2)
+
+    return str(point_path), str(graph_path), graph, lat, lon
+
+
+def test_SeaRouter_get_distance(sea_files):
+
+    point_path, graph_path, graph, lat, lon = sea_files
+    router = SeaRouter.from_files(point_path, graph_path)
+
+    UTM_ini = to_utm(51.2, -5.5)
+    UTM_fin = to_utm(51.2, -3.5)
+
+    start, end = router.snap([UTM_ini, UTM_fin])
+    expected = nx.dijkstra_path_length(graph, start, end)
+
+    assert np.isclose(router.get_distance(UTM_ini, UTM_fin), expected)
+
+    # The route goes around the land
+    direct = great_circle_distance(lat[start], lon[start], lat[end], lon[end])
+    assert expected > direct
+
+
+def test_SeaRouter_get_route(sea_files):
+
+    point_path, graph_path, _, lat, lon = sea_files
+    router = SeaRouter.from_files(point_path, graph_path)
+
+    UTM_ini = to_utm(51.2, -5.5)
+    UTM_fin = to_utm(51.2, -3.5)
+
+    route_lat, route_lon = router.get_route(UTM_ini, UTM_fin)
+    legs = great_circle_distance(route_lat[:-1],
+                                 route_lon[:-1],
+                                 route_lat[1:],
+                                 route_lon[1:])
+
+    assert np.isclose(legs.sum(), router.get_distance(UTM_ini, UTM_fin))
+    assert np.isclose(route_lat[0], 51.2)
+    assert np.isclose(route_lon[-1], -3.5)
+
+
+def test_SeaRouter_tree_cache(sea_files):
+
+    point_path, graph_path, _, _, _ = sea_files
+    router = SeaRouter.from_files(point_path, graph_path)
+
+    UTM_ini = to_utm(51.2, -5.5)
+    UTM_fins = [to_utm(50.5, -3.5), to_utm(51.9, -3.5)]
+
+    dists = router.get_distances(UTM_ini, UTM_fins)
+
+    for UTM_fin, dist in zip(UTM_fins, dists):
+        assert router.get_distance(UTM_ini, UTM_fin) == dist
+
+    assert router.get_cache_stats()['misses'] == 1
+    assert router.get_cache_stats()['hits'] == 2
+
+
+def test_SeaRouter_unreachable():
+
+    lat = [50., 50., 51.]
+    lon = [-5., -4., -5.]
+    router = SeaRouter(lat, lon, [(0, 1, 70.)])
+
+    assert router.get_distance(to_utm(50., -5.), to_utm(50., -4.)) == 70.
+
+    # Nothing can be reached from point 1
+    router = SeaRouter(lat, lon, [(0, 1, 70.), (2, 0, 100.)], directed=True)
+
+    assert np.isinf(router.get_distance(to_utm(50., -4.), to_utm(51., -5.)))
+    assert router.get_route(to_utm(50., -4.), to_utm(51., -5.)) is None
+
+
+def test_transit_algorithm(sea_files):
+
+    point_path, graph_path, _, _, _ = sea_files
+
+    UTM_ini = to_utm(51.2, -5.5)
+    UTM_fin = to_utm(51.2, -3.5)
+
+    router = get_sea_router(point_path, graph_path)
+
+    assert get_sea_router(point_path, graph_path) is router
+    assert transit_algorithm(UTM_ini, UTM_fin, point_path, graph_path) == \
+                                        router.get_distance(UTM_ini, UTM_fin)
+
+
+def test_PortIndex_choose_sea_router(sea_files):
+
+    point_path, graph_path, _, _, _ = sea_files
+    router = get_sea_router(point_path, graph_path)
+
+    # The first port is closer, but is behind the land
+    ports_coords = [to_utm(51.2, -4.0), to_utm(51.2, -5.875)]
+    x, y, zones = zip(*ports_coords)
+
+    port_data = pd.DataFrame(
+                    {'Name [-]': ["Behind", "Open"],
+                     'UTM x [m]': x,
+                     'UTM y [m]': y,
+                     'UTM zone [-]': zones,
+                     'Terminal load bearing [t/m^2]': [10., 10.],
+                     'Terminal area [m^2]': [1000., 1000.],
+                     'Type of terminal [Quay/Dry-dock]': ["Quay", "Quay"]})
+
+    port_index = PortIndex(port_data)
+    site_coords = to_utm(51.2, -4.875)
+
+    _, direct_choice = port_index.choose(site_coords)
+    dist, sea_choice = port_index.choose(site_coords, sea_router=router)
+
+    assert direct_choice == 0
+    assert sea_choice == 1
+    assert dist == router.get_distance(site_coords, ports_coords[1])